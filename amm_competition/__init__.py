@@ -1,11 +1,13 @@
 """AMM Design Competition Framework."""
 
-from amm_competition.core.interfaces import AMMStrategy, FeeQuote
-from amm_competition.core.trade import TradeInfo, TradeSide
+from amm_competition.core.interfaces import AMMStrategy, FeeQuote, VectorizedAMMStrategy
+from amm_competition.core.trade import TradeBatch, TradeInfo, TradeSide
 
 __all__ = [
     "AMMStrategy",
+    "VectorizedAMMStrategy",
     "FeeQuote",
     "TradeInfo",
+    "TradeBatch",
     "TradeSide",
 ]
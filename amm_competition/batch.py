@@ -0,0 +1,440 @@
+"""Vectorized float64 engine for Python strategies.
+
+Simulates many seeds in lockstep: every array holds one entry per seed, and
+each step runs the same loop as the Rust engine (new fair price, arbitrage
+on each AMM, then retail orders split between the two AMMs). Strategies
+implement ``VectorizedAMMStrategy`` and see every seed's trades in one call,
+which makes prototyping fee rules in Python practical before porting them
+to Solidity.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from amm_competition.core.interfaces import VectorizedAMMStrategy
+from amm_competition.core.trade import TradeBatch
+from amm_competition.market.tape import SIDE_BUY, MarketTapeReader
+
+# Fees are clamped to [0, MAX_FEE], as in the Rust engine
+MAX_FEE = 0.1
+
+# Router skips legs at or below this size
+MIN_AMOUNT = 0.0001
+
+STRATEGIES = ["submission", "normalizer"]
+
+
+@dataclass(frozen=True)
+class BatchMarket:
+    """Fair prices and retail orders for a set of seeds.
+
+    Orders are stored flat; orders for seed ``i`` at step ``t`` are
+    ``order_offsets[i, t]:order_offsets[i, t + 1]``.
+    """
+    seeds: np.ndarray           # (n_seeds,)
+    initial_prices: np.ndarray  # (n_seeds,)
+    prices: np.ndarray          # (n_seeds, n_steps), fair price after each step
+    order_offsets: np.ndarray   # (n_seeds, n_steps + 1)
+    order_buys: np.ndarray      # bool, True where the trader buys X
+    order_sizes: np.ndarray     # Order sizes in Y
+    initial_x: np.ndarray       # (n_seeds,)
+    initial_y: np.ndarray       # (n_seeds,)
+
+    @property
+    def n_seeds(self) -> int:
+        return self.prices.shape[0]
+
+    @property
+    def n_steps(self) -> int:
+        return self.prices.shape[1]
+
+    @classmethod
+    def generate(cls, configs: Sequence[Any]) -> "BatchMarket":
+        """Sample a market per config (SimulationConfig or any object with its fields).
+
+        Uses NumPy's generator seeded with each config's seed, so markets
+        are reproducible but differ from the Rust engine's; use
+        ``from_tape`` to replay the exact markets of a Rust run.
+
+        Raises:
+            ValueError: If configs is empty or n_steps differs between configs
+        """
+        if not configs:
+            raise ValueError("At least one config is required")
+        n_steps = configs[0].n_steps
+        if any(config.n_steps != n_steps for config in configs):
+            raise ValueError("All configs must have the same n_steps")
+
+        prices = np.empty((len(configs), n_steps))
+        counts = np.empty((len(configs), n_steps), dtype=np.int64)
+        buys, sizes = [], []
+        for i, config in enumerate(configs):
+            rng = np.random.default_rng(config.seed)
+            drift = (config.gbm_mu - 0.5 * config.gbm_sigma ** 2) * config.gbm_dt
+            shocks = config.gbm_sigma * np.sqrt(config.gbm_dt) * rng.standard_normal(n_steps)
+            prices[i] = config.initial_price * np.exp(np.cumsum(drift + shocks))
+
+            counts[i] = rng.poisson(max(config.retail_arrival_rate, 0.01), n_steps)
+            sigma = max(config.retail_size_sigma, 0.01)
+            mu = np.log(max(config.retail_mean_size, 0.01)) - 0.5 * sigma * sigma
+            n_orders = int(counts[i].sum())
+            sizes.append(rng.lognormal(mu, sigma, n_orders))
+            buys.append(rng.random(n_orders) < config.retail_buy_prob)
+
+        return cls(
+            seeds=np.array([config.seed for config in configs], dtype=np.int64),
+            initial_prices=np.array([config.initial_price for config in configs], dtype=float),
+            prices=prices,
+            order_offsets=_offsets(counts),
+            order_buys=np.concatenate(buys),
+            order_sizes=np.concatenate(sizes),
+            initial_x=np.array([config.initial_x for config in configs], dtype=float),
+            initial_y=np.array([config.initial_y for config in configs], dtype=float),
+        )
+
+    @classmethod
+    def from_tape(
+        cls,
+        reader: MarketTapeReader,
+        initial_x: float,
+        initial_y: float,
+        seeds: Optional[Sequence[int]] = None,
+    ) -> "BatchMarket":
+        """Load markets recorded by ``amm_sim_rs.MarketTape`` (all seeds by default).
+
+        Raises:
+            ValueError: If the scenarios have different numbers of steps
+        """
+        scenarios = [reader.scenario(seed) for seed in seeds] if seeds is not None else list(reader)
+        n_steps = scenarios[0].n_steps
+        if any(scenario.n_steps != n_steps for scenario in scenarios):
+            raise ValueError("All scenarios must have the same number of steps")
+
+        counts = np.stack([np.diff(scenario.order_offsets.astype(np.int64)) for scenario in scenarios])
+        n = len(scenarios)
+        return cls(
+            seeds=np.array([scenario.seed for scenario in scenarios], dtype=np.int64),
+            initial_prices=np.array([scenario.initial_price for scenario in scenarios]),
+            prices=np.stack([scenario.prices for scenario in scenarios]),
+            order_offsets=_offsets(counts),
+            order_buys=np.concatenate([scenario.sides == SIDE_BUY for scenario in scenarios]),
+            order_sizes=np.concatenate([scenario.sizes for scenario in scenarios]),
+            initial_x=np.full(n, float(initial_x)),
+            initial_y=np.full(n, float(initial_y)),
+        )
+
+
+def _offsets(counts: np.ndarray) -> np.ndarray:
+    """Per-step order offsets into the flat order arrays, from per-step counts."""
+    starts = np.concatenate(([0], np.cumsum(counts)))
+    offsets = np.empty((counts.shape[0], counts.shape[1] + 1), dtype=np.int64)
+    row_starts = starts[:-1].reshape(counts.shape)
+    offsets[:, :-1] = row_starts
+    offsets[:, -1] = row_starts[:, -1] + counts[:, -1]
+    return offsets
+
+
+@dataclass
+class BatchResult:
+    """Per-seed outcomes; columns follow ``strategies``."""
+    strategies: list[str]
+    seeds: np.ndarray
+    edges: np.ndarray            # (n_seeds, 2)
+    pnl: np.ndarray              # (n_seeds, 2)
+    arb_volume_y: np.ndarray     # (n_seeds, 2)
+    retail_volume_y: np.ndarray  # (n_seeds, 2)
+    average_bid_fees: np.ndarray  # (n_seeds, 2)
+    average_ask_fees: np.ndarray  # (n_seeds, 2)
+
+    @property
+    def mean_edges(self) -> np.ndarray:
+        return self.edges.mean(axis=0)
+
+    def win_counts(self) -> tuple[int, int, int]:
+        """(submission wins, normalizer wins, draws) by edge."""
+        diff = self.edges[:, 0] - self.edges[:, 1]
+        return int((diff > 0).sum()), int((diff < 0).sum()), int((diff == 0).sum())
+
+
+class ConstantFee(VectorizedAMMStrategy):
+    """Fixed bid and ask fees (the vanilla normalizer is ``ConstantFee(0.003)``)."""
+
+    def __init__(self, bid_fee: float, ask_fee: Optional[float] = None):
+        self.bid_fee = bid_fee
+        self.ask_fee = bid_fee if ask_fee is None else ask_fee
+
+    def after_initialize_batch(self, initial_x, initial_y):
+        n = len(initial_x)
+        return np.full(n, self.bid_fee), np.full(n, self.ask_fee)
+
+    def after_swap_batch(self, trades):
+        n = len(trades.active)
+        return np.full(n, self.bid_fee), np.full(n, self.ask_fee)
+
+    def get_name(self) -> str:
+        return f"ConstantFee_{round(self.bid_fee * 10_000)}bps"
+
+
+class _BatchAMM:
+    """Constant product AMMs, one per seed, sharing a vectorized strategy.
+
+    Mirrors the Rust CFMM: fee-on-input, fees collected outside reserves.
+    Fees are always clamped to [0, MAX_FEE], so γ = 1 - f is positive.
+    ``quote_*`` methods return zeros where a trade is invalid; ``execute_*``
+    apply trades on ``active`` rows where the quote is positive and return
+    the rows that traded without notifying the strategy (see ``notify``).
+    """
+
+    def __init__(self, strategy: VectorizedAMMStrategy, initial_x: np.ndarray, initial_y: np.ndarray):
+        self.strategy = strategy
+        self.reserve_x = initial_x.astype(float)
+        self.reserve_y = initial_y.astype(float)
+        self.fees_x = np.zeros_like(self.reserve_x)
+        self.fees_y = np.zeros_like(self.reserve_x)
+        bid, ask = strategy.after_initialize_batch(self.reserve_x.copy(), self.reserve_y.copy())
+        self.bid_fee = _clamp_fees(bid)
+        self.ask_fee = _clamp_fees(ask)
+
+    def quote_buy_x(self, amount_x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """AMM buys ``amount_x``: (y_out, fee in X)."""
+        gamma = 1.0 - self.bid_fee
+        k = self.reserve_x * self.reserve_y
+        y_out = self.reserve_y - k / (self.reserve_x + amount_x * gamma)
+        ok = (amount_x > 0) & (y_out > 0)
+        return np.where(ok, y_out, 0.0), np.where(ok, amount_x * self.bid_fee, 0.0)
+
+    def quote_sell_x(self, amount_x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """AMM sells ``amount_x``: (total Y in, fee in Y)."""
+        gamma = 1.0 - self.ask_fee
+        k = self.reserve_x * self.reserve_y
+        net_y = k / (self.reserve_x - amount_x) - self.reserve_y
+        ok = (amount_x > 0) & (amount_x < self.reserve_x) & (net_y > 0)
+        total_y = net_y / gamma
+        return np.where(ok, total_y, 0.0), np.where(ok, total_y - net_y, 0.0)
+
+    def quote_x_for_y(self, amount_y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Trader pays ``amount_y`` for X: (x_out, fee in Y)."""
+        gamma = 1.0 - self.ask_fee
+        k = self.reserve_x * self.reserve_y
+        x_out = self.reserve_x - k / (self.reserve_y + amount_y * gamma)
+        ok = (amount_y > 0) & (x_out > 0)
+        return np.where(ok, x_out, 0.0), np.where(ok, amount_y * self.ask_fee, 0.0)
+
+    def execute_buy_x(self, amount_x, active) -> tuple[np.ndarray, np.ndarray]:
+        y_out, fee = self.quote_buy_x(amount_x)
+        ok = active & (y_out > 0)
+        self.reserve_x = np.where(ok, self.reserve_x + (amount_x - fee), self.reserve_x)
+        self.reserve_y = np.where(ok, self.reserve_y - y_out, self.reserve_y)
+        self.fees_x = np.where(ok, self.fees_x + fee, self.fees_x)
+        return ok, y_out
+
+    def execute_sell_x(self, amount_x, active) -> tuple[np.ndarray, np.ndarray]:
+        total_y, fee = self.quote_sell_x(amount_x)
+        ok = active & (total_y > 0)
+        self.reserve_x = np.where(ok, self.reserve_x - amount_x, self.reserve_x)
+        self.reserve_y = np.where(ok, self.reserve_y + (total_y - fee), self.reserve_y)
+        self.fees_y = np.where(ok, self.fees_y + fee, self.fees_y)
+        return ok, total_y
+
+    def execute_buy_x_with_y(self, amount_y, active) -> tuple[np.ndarray, np.ndarray]:
+        x_out, fee = self.quote_x_for_y(amount_y)
+        ok = active & (x_out > 0)
+        self.reserve_x = np.where(ok, self.reserve_x - x_out, self.reserve_x)
+        self.reserve_y = np.where(ok, self.reserve_y + (amount_y - fee), self.reserve_y)
+        self.fees_y = np.where(ok, self.fees_y + fee, self.fees_y)
+        return ok, x_out
+
+    def notify(self, active, is_buy, amount_x, amount_y, timestamp: int) -> None:
+        """Report trades on ``active`` rows to the strategy and take its new fees."""
+        if not active.any():
+            return
+        trades = TradeBatch(
+            active=active,
+            is_buy=is_buy & active,
+            amount_x=np.where(active, amount_x, 0.0),
+            amount_y=np.where(active, amount_y, 0.0),
+            timestamp=timestamp,
+            reserve_x=self.reserve_x.copy(),
+            reserve_y=self.reserve_y.copy(),
+        )
+        bid, ask = self.strategy.after_swap_batch(trades)
+        self.bid_fee = np.where(active, _clamp_fees(bid), self.bid_fee)
+        self.ask_fee = np.where(active, _clamp_fees(ask), self.ask_fee)
+
+
+def _clamp_fees(fees: Any) -> np.ndarray:
+    return np.minimum(np.maximum(np.asarray(fees, dtype=float), 0.0), MAX_FEE)
+
+
+def _arbitrage(amm: _BatchAMM, fair_price: np.ndarray, timestamp: int) -> tuple[np.ndarray, np.ndarray]:
+    """Close-form arbitrage on every seed; returns (AMM edge, Y volume)."""
+    rx, ry = amm.reserve_x, amm.reserve_y
+    k = rx * ry
+    spot = ry / rx
+
+    # AMM underprices X: buy X from it, Δx_out = x - sqrt(k / (γ·p))
+    gamma_ask = 1.0 - amm.ask_fee
+    buy_x = rx - np.sqrt(k / (gamma_ask * fair_price))
+    buy_x = np.minimum(buy_x, rx * 0.99)
+    buy = (spot < fair_price) & (fair_price > 0) & (buy_x > 0)
+    total_y, _ = amm.quote_sell_x(np.where(buy, buy_x, 0.0))
+    buy &= (total_y > 0) & (buy_x * fair_price - total_y > 0)
+
+    # AMM overprices X: sell X to it, Δx_in = (sqrt(k·γ / p) - x) / γ
+    gamma_bid = 1.0 - amm.bid_fee
+    sell_x = (np.sqrt(k * gamma_bid / fair_price) - rx) / gamma_bid
+    sell = (spot > fair_price) & (fair_price > 0) & (sell_x > 0)
+    y_out, _ = amm.quote_buy_x(np.where(sell, sell_x, 0.0))
+    sell &= (y_out > 0) & (y_out - sell_x * fair_price > 0)
+
+    bought, paid = amm.execute_sell_x(np.where(buy, buy_x, 0.0), buy)
+    sold, received = amm.execute_buy_x(np.where(sell, sell_x, 0.0), sell)
+    active = bought | sold
+    amount_x = np.where(sold, sell_x, np.where(bought, buy_x, 0.0))
+    amount_y = np.where(sold, received, np.where(bought, paid, 0.0))
+    amm.notify(active, sold, amount_x, amount_y, timestamp)
+
+    # AMM edge is the negative of arbitrageur profit at the fair price
+    edge = np.where(bought, paid - buy_x * fair_price, 0.0)
+    edge = np.where(sold, sell_x * fair_price - received, edge)
+    return edge, amount_y
+
+
+def _split(amount, out1, in1, fee1, out2, in2, fee2) -> np.ndarray:
+    """Amount routed to the first AMM so marginal prices are equal after the trade.
+
+    ``out``/``in`` are each AMM's reserves of the output and input token.
+    With γ_i = 1 - f_i, A_i = sqrt(out_i·γ_i·in_i) and r = A_1/A_2:
+    Δ_1* = (r·(in_2 + γ_2·Δ) - in_1) / (γ_1 + r·γ_2), clamped to [0, Δ].
+    """
+    gamma1, gamma2 = 1.0 - fee1, 1.0 - fee2
+    a1 = np.sqrt(out1 * gamma1 * in1)
+    a2 = np.sqrt(out2 * gamma2 * in2)
+    r = a1 / a2
+    denominator = gamma1 + r * gamma2
+    first = np.where(
+        denominator == 0, amount / 2.0, (r * (in2 + gamma2 * amount) - in1) / denominator
+    )
+    first = np.clip(first, 0.0, amount)
+    return np.where(a2 == 0, amount, first)
+
+
+def _route(
+    amms: list[_BatchAMM],
+    is_buy: np.ndarray,
+    size: np.ndarray,
+    active: np.ndarray,
+    fair_price: np.ndarray,
+    timestamp: int,
+) -> tuple[list[np.ndarray], list[np.ndarray]]:
+    """Split one retail order per active seed between the two AMMs.
+
+    Returns per-AMM (edge, Y volume) arrays.
+    """
+    first, second = amms
+    buys = active & is_buy
+    sells = active & ~is_buy
+
+    # Trader buys X with Y: split Y on ask fees, with Y as the input reserve
+    y_first = _split(
+        size, first.reserve_x, first.reserve_y, first.ask_fee,
+        second.reserve_x, second.reserve_y, second.ask_fee,
+    )
+    # Trader sells X: size in Y converted at the fair price, split on bid fees
+    total_x = size / fair_price
+    x_first = _split(
+        total_x, first.reserve_y, first.reserve_x, first.bid_fee,
+        second.reserve_y, second.reserve_x, second.bid_fee,
+    )
+    legs_y = (y_first, size - y_first)
+    legs_x = (x_first, total_x - x_first)
+
+    edges, volumes = [], []
+    for amm, leg_y, leg_x in zip(amms, legs_y, legs_x):
+        bought, x_out = amm.execute_buy_x_with_y(leg_y, buys & (leg_y > MIN_AMOUNT))
+        sold, y_out = amm.execute_buy_x(leg_x, sells & (leg_x > MIN_AMOUNT))
+        amount_x = np.where(sold, leg_x, x_out)
+        amount_y = np.where(sold, y_out, np.where(bought, leg_y, 0.0))
+        amm.notify(bought | sold, sold, amount_x, amount_y, timestamp)
+
+        edge = np.where(bought, leg_y - x_out * fair_price, 0.0)
+        edges.append(np.where(sold, leg_x * fair_price - y_out, edge))
+        volumes.append(amount_y)
+    return edges, volumes
+
+
+def run_batch(
+    submission: VectorizedAMMStrategy,
+    normalizer: VectorizedAMMStrategy,
+    market: BatchMarket,
+) -> BatchResult:
+    """Simulate ``submission`` against ``normalizer`` on every seed of ``market``.
+
+    Raises:
+        ValueError: If the same strategy object is passed twice (each AMM
+            needs its own per-seed state)
+    """
+    if submission is normalizer:
+        raise ValueError("submission and normalizer must be separate instances")
+
+    n, n_steps = market.n_seeds, market.n_steps
+    amms = [
+        _BatchAMM(submission, market.initial_x, market.initial_y),
+        _BatchAMM(normalizer, market.initial_x, market.initial_y),
+    ]
+    edges = np.zeros((n, 2))
+    arb_volume = np.zeros((n, 2))
+    retail_volume = np.zeros((n, 2))
+    bid_fee_totals = np.zeros((n, 2))
+    ask_fee_totals = np.zeros((n, 2))
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for t in range(n_steps):
+            fair_price = market.prices[:, t]
+
+            for i, amm in enumerate(amms):
+                edge, volume = _arbitrage(amm, fair_price, t)
+                edges[:, i] += edge
+                arb_volume[:, i] += volume
+
+            # Orders arrive in lockstep: slot j holds each seed's j-th order this step
+            starts = market.order_offsets[:, t]
+            counts = market.order_offsets[:, t + 1] - starts
+            for j in range(int(counts.max(initial=0))):
+                active = counts > j
+                index = np.where(active, starts + j, 0)
+                route_edges, volumes = _route(
+                    amms,
+                    market.order_buys[index],
+                    market.order_sizes[index],
+                    active,
+                    fair_price,
+                    t,
+                )
+                for i in range(2):
+                    edges[:, i] += route_edges[i]
+                    retail_volume[:, i] += volumes[i]
+
+            for i, amm in enumerate(amms):
+                bid_fee_totals[:, i] += amm.bid_fee
+                ask_fee_totals[:, i] += amm.ask_fee
+
+    final_price = market.prices[:, -1] if n_steps else market.initial_prices
+    pnl = np.empty((n, 2))
+    for i, amm in enumerate(amms):
+        initial_value = market.initial_x * market.initial_prices + market.initial_y
+        final_value = (amm.reserve_x + amm.fees_x) * final_price + amm.reserve_y + amm.fees_y
+        pnl[:, i] = final_value - initial_value
+
+    return BatchResult(
+        strategies=list(STRATEGIES),
+        seeds=market.seeds,
+        edges=edges,
+        pnl=pnl,
+        arb_volume_y=arb_volume,
+        retail_volume_y=retail_volume,
+        average_bid_fees=bid_fee_totals / max(n_steps, 1),
+        average_ask_fees=ask_fee_totals / max(n_steps, 1),
+    )
@@ -5,10 +5,19 @@ import sys
 from pathlib import Path
 
 from amm_competition.competition.match import MatchRunner, HyperparameterVariance
+from amm_competition.competition.result_store import ResultStore
 from amm_competition.evm.adapter import EVMStrategyAdapter
 from amm_competition.evm.baseline import load_vanilla_strategy
 from amm_competition.evm.compiler import SolidityCompiler
 from amm_competition.evm.validator import SolidityValidator
+from amm_competition.sweep import (
+    expand_grid,
+    parse_grid,
+    print_table,
+    save_table,
+    sweep_sources,
+    sweep_template,
+)
 import amm_sim_rs
 
 from amm_competition.competition.config import (
@@ -17,10 +26,15 @@ from amm_competition.competition.config import (
     baseline_nominal_retail_rate,
     baseline_nominal_retail_size,
     baseline_nominal_sigma,
+    build_base_config,
     resolve_n_workers,
 )
 
 
+def _print_progress(completed: int, total: int) -> None:
+    print(f"\r  {completed}/{total} simulations", end="", file=sys.stderr, flush=True)
+
+
 def run_match_command(args: argparse.Namespace) -> int:
     """Run simulations for a strategy and report its score."""
     strategy_path = Path(args.strategy)
@@ -43,7 +57,7 @@ def run_match_command(args: argparse.Namespace) -> int:
 
     # Compile
     print("Compiling strategy...")
-    compiler = SolidityCompiler()
+    compiler = SolidityCompiler(use_cache=not args.no_cache)
     compilation = compiler.compile(source_code)
     if not compilation.success:
         print("Compilation failed:")
@@ -119,16 +133,81 @@ def run_match_command(args: argparse.Namespace) -> int:
         config=config,
         n_workers=resolve_n_workers(),
         variance=variance,
+        # Cached seeds are not simulated, so profiling runs skip the store
+        result_store=None if args.no_cache or args.profile else ResultStore(),
+        profile=args.profile,
     )
-    result = runner.run_match(user_strategy, default_strategy)
+    progress = _print_progress if sys.stderr.isatty() else None
+    result = runner.run_match(user_strategy, default_strategy, progress=progress)
+    if progress is not None:
+        print(file=sys.stderr)
 
     # Display score (only the user's strategy Edge)
     avg_edge = result.total_edge_a / n_simulations
     print(f"\n{strategy_name} Edge: {avg_edge:.2f}")
 
+    if result.profile is not None:
+        print("\nEngine profile:")
+        print(result.profile.report(), end="")
+
     return 0
 
 
+def sweep_command(args: argparse.Namespace) -> int:
+    """Evaluate a template over a parameter grid, or several strategy files."""
+    paths = [Path(p) for p in args.strategies]
+    for path in paths:
+        if not path.exists():
+            print(f"Error: Strategy file not found: {path}")
+            return 1
+    if args.grid and len(paths) != 1:
+        print("Error: --grid takes exactly one template file")
+        return 1
+
+    config = build_base_config(seed=None)
+    if args.steps is not None:
+        config.n_steps = args.steps
+    n_simulations = (
+        args.simulations if args.simulations is not None else BASELINE_SETTINGS.n_simulations
+    )
+    runner = MatchRunner(
+        n_simulations=n_simulations,
+        config=config,
+        n_workers=resolve_n_workers(),
+        variance=BASELINE_VARIANCE,
+    )
+    compiler = SolidityCompiler(use_cache=not args.no_cache)
+    normalizer = load_vanilla_strategy()
+
+    try:
+        if args.grid:
+            parameter_sets = expand_grid(parse_grid(args.grid))
+            print(f"Sweeping {len(parameter_sets)} parameter sets x {n_simulations} simulations...")
+            result = sweep_template(
+                runner, paths[0].read_text(), parameter_sets, normalizer, compiler=compiler
+            )
+        else:
+            print(f"Sweeping {len(paths)} strategies x {n_simulations} simulations...")
+            sources = {str(path): path.read_text() for path in paths}
+            result = sweep_sources(runner, sources, normalizer, compiler=compiler)
+    except (ValueError, RuntimeError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    for label, errors in result.failures.items():
+        print(f"Skipped {label}:")
+        for error in errors:
+            print(f"  - {error}")
+
+    print()
+    print_table(result, limit=args.top)
+    if args.output:
+        save_table(result, Path(args.output))
+        print(f"\nWrote {len(result.rows)} rows to {args.output}")
+
+    return 0 if result.rows else 1
+
+
 def validate_command(args: argparse.Namespace) -> int:
     """Validate a Solidity strategy file without running it."""
     strategy_path = Path(args.strategy)
@@ -155,7 +234,7 @@ def validate_command(args: argparse.Namespace) -> int:
 
     # Compile
     print("Compiling strategy...")
-    compiler = SolidityCompiler()
+    compiler = SolidityCompiler(use_cache=not args.no_cache)
     compilation = compiler.compile(source_code)
     if not compilation.success:
         print("Compilation failed:")
@@ -187,6 +266,8 @@ Examples:
   amm-match run my_strategy.sol
   amm-match run my_strategy.sol --simulations 1000 --steps 1000
   amm-match validate my_strategy.sol
+  amm-match sweep template.sol --grid baseFee=20,24,28 --grid decay=8,9 -o grid.csv
+  amm-match sweep a.sol b.sol c.sol --simulations 200
         """,
     )
 
@@ -249,13 +330,75 @@ Examples:
         default=None,
         help="Lognormal sigma for retail sizes (defaults to shared baseline config)",
     )
+    run_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompile and re-simulate instead of reusing cached compile output and results",
+    )
+    run_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Report where the simulation engine spends its time (always re-simulates)",
+    )
     run_parser.set_defaults(func=run_match_command)
 
+    # Sweep command
+    sweep_parser = subparsers.add_parser(
+        "sweep", help="Compare a template over a parameter grid, or several strategies"
+    )
+    sweep_parser.add_argument(
+        "strategies",
+        nargs="+",
+        help="Strategy files (.sol), or one template when --grid is given",
+    )
+    sweep_parser.add_argument(
+        "--grid",
+        action="append",
+        default=[],
+        metavar="NAME=V1,V2,...",
+        help="Values for a template parameter declared with '// @param' (repeatable)",
+    )
+    sweep_parser.add_argument(
+        "--simulations",
+        type=int,
+        default=None,
+        help="Simulations per candidate (defaults to shared baseline config)",
+    )
+    sweep_parser.add_argument(
+        "--steps",
+        type=int,
+        default=None,
+        help="Steps per simulation (defaults to shared baseline config)",
+    )
+    sweep_parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="Write the full results table to this file (.csv, or .tsv for tabs)",
+    )
+    sweep_parser.add_argument(
+        "--top",
+        type=int,
+        default=None,
+        help="Only print the best N rows",
+    )
+    sweep_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always invoke solc instead of reusing cached compile output",
+    )
+    sweep_parser.set_defaults(func=sweep_command)
+
     # Validate command
     validate_parser = subparsers.add_parser(
         "validate", help="Validate a Solidity strategy without running"
     )
     validate_parser.add_argument("strategy", help="Path to Solidity strategy file (.sol)")
+    validate_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always invoke solc instead of reusing cached compile output",
+    )
     validate_parser.set_defaults(func=validate_command)
 
     args = parser.parse_args()
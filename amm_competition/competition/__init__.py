@@ -1,8 +1,10 @@
 """Competition framework."""
 
 from amm_competition.competition.match import MatchRunner, MatchResult
+from amm_competition.competition.sequential import StoppingRule
 
 __all__ = [
     "MatchRunner",
     "MatchResult",
+    "StoppingRule",
 ]
@@ -1,12 +1,18 @@
 """Match runner for baseline vs submission simulations using Rust engine."""
 
-from dataclasses import dataclass, field
+import asyncio
+import functools
+from dataclasses import asdict, dataclass, field
 from decimal import Decimal
-from typing import Optional
+from typing import Callable, Iterable, Mapping, Optional
 
 import amm_sim_rs
+import numpy as np
 
+from amm_competition.competition.result_store import ResultStore, SeedRecord
+from amm_competition.competition.sequential import RunningStats, StoppingRule
 from amm_competition.evm.adapter import EVMStrategyAdapter
+from amm_competition.evm.params import ParamValue, StrategyTemplate
 
 
 @dataclass
@@ -26,13 +32,38 @@ class HyperparameterVariance:
 
 
 @dataclass
-class LightweightStepResult:
-    """Minimal step data for charting."""
-    timestamp: int
-    fair_price: float
-    spot_prices: dict[str, float]
-    pnls: dict[str, float]
-    fees: dict[str, tuple[float, float]]
+class StepTrace:
+    """Columnar step data for charting.
+
+    Arrays are zero-copy NumPy views over the Rust engine's buffers.
+    Per-strategy arrays have shape ``(n_steps, len(strategies))``.
+    """
+    strategies: list[str]
+    timestamps: np.ndarray
+    fair_prices: np.ndarray
+    spot_prices: np.ndarray
+    pnls: np.ndarray
+    bid_fees: np.ndarray
+    ask_fees: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def column(self, strategy: str) -> int:
+        """Column index of a strategy in the per-strategy arrays."""
+        return self.strategies.index(strategy)
+
+    @classmethod
+    def from_rust(cls, trace: amm_sim_rs.StepTrace) -> "StepTrace":
+        return cls(
+            strategies=list(trace.strategies),
+            timestamps=np.asarray(trace.timestamps),
+            fair_prices=np.asarray(trace.fair_prices),
+            spot_prices=np.asarray(trace.spot_prices),
+            pnls=np.asarray(trace.pnls),
+            bid_fees=np.asarray(trace.bid_fees),
+            ask_fees=np.asarray(trace.ask_fees),
+        )
 
 
 @dataclass
@@ -44,10 +75,11 @@ class LightweightSimResult:
     edges: dict[str, Decimal]
     initial_fair_price: float
     initial_reserves: dict[str, tuple[float, float]]
-    steps: list[LightweightStepResult]
+    steps: StepTrace
     arb_volume_y: dict[str, float]
     retail_volume_y: dict[str, float]
     average_fees: dict[str, tuple[float, float]]
+    gas: dict[str, amm_sim_rs.GasProfile]
 
 
 @dataclass
@@ -63,6 +95,12 @@ class MatchResult:
     total_edge_a: Decimal
     total_edge_b: Decimal
     simulation_results: list[LightweightSimResult] = field(default_factory=list)
+    # Seeds evaluated (adaptive runs may stop before n_simulations)
+    seeds: list[int] = field(default_factory=list)
+    # CI for the per-seed score used by the stopping rule (adaptive runs only)
+    confidence_interval: Optional[tuple[float, float]] = None
+    # Phase timings of the simulations run (profiling runners only)
+    profile: Optional[amm_sim_rs.BatchProfile] = None
 
     @property
     def winner(self) -> Optional[str]:
@@ -77,12 +115,132 @@ class MatchResult:
         return self.wins_a + self.wins_b + self.draws
 
 
+@dataclass
+class CandidateComparison:
+    """Paired comparison of several candidates against one normalizer.
+
+    All candidates saw identical price paths and retail order streams for
+    each seed, so column differences are low-variance paired estimates.
+    Matrices have shape ``(n_seeds, n_candidates)``.
+    """
+    candidates: list[str]
+    seeds: np.ndarray
+    edges: np.ndarray
+    normalizer_edges: np.ndarray
+    pnl: np.ndarray
+
+    @property
+    def mean_edges(self) -> np.ndarray:
+        return self.edges.mean(axis=0)
+
+    def paired_difference(self, i: int, j: int) -> np.ndarray:
+        """Per-seed edge of candidate ``i`` minus candidate ``j``."""
+        return self.edges[:, i] - self.edges[:, j]
+
+    @property
+    def best(self) -> str:
+        return self.candidates[int(np.argmax(self.mean_edges))]
+
+
+class _MatchTally:
+    """Accumulates per-simulation results into a MatchResult."""
+
+    def __init__(self, store_results: bool):
+        self.store_results = store_results
+        self.wins_a = 0
+        self.wins_b = 0
+        self.draws = 0
+        self.total_pnl_a = Decimal("0")
+        self.total_pnl_b = Decimal("0")
+        self.total_edge_a = Decimal("0")
+        self.total_edge_b = Decimal("0")
+        self.simulation_results: list[LightweightSimResult] = []
+        self.seeds: list[int] = []
+
+    def add_record(self, record: SeedRecord) -> None:
+        """Count one simulation from its per-seed summary."""
+        edge_a = record.edge_submission
+        edge_b = record.edge_normalizer
+
+        self.total_pnl_a += Decimal(str(record.pnl_submission))
+        self.total_pnl_b += Decimal(str(record.pnl_normalizer))
+        self.total_edge_a += Decimal(str(edge_a))
+        self.total_edge_b += Decimal(str(edge_b))
+        self.seeds.append(record.seed)
+
+        if edge_a > edge_b:
+            self.wins_a += 1
+        elif edge_b > edge_a:
+            self.wins_b += 1
+        else:
+            self.draws += 1
+
+    def add(self, rust_result: amm_sim_rs.LightweightSimResult) -> None:
+        # Summaries use fixed positional keys from Rust
+        self.add_record(SeedRecord.from_rust(rust_result))
+
+        if self.store_results:
+            # Convert Rust result to Python dataclass (steps stay columnar)
+            self.simulation_results.append(LightweightSimResult(
+                seed=rust_result.seed,
+                strategies=rust_result.strategies,
+                pnl={k: Decimal(str(v)) for k, v in rust_result.pnl.items()},
+                edges={
+                    k: Decimal(str(v)) for k, v in rust_result.edges.items()
+                },
+                initial_fair_price=rust_result.initial_fair_price,
+                initial_reserves=rust_result.initial_reserves,
+                steps=StepTrace.from_rust(rust_result.steps),
+                arb_volume_y=rust_result.arb_volume_y,
+                retail_volume_y=rust_result.retail_volume_y,
+                average_fees=rust_result.average_fees,
+                gas=rust_result.gas,
+            ))
+
+    def result(
+        self,
+        name_a: str,
+        name_b: str,
+        confidence_interval: Optional[tuple[float, float]] = None,
+        profile: Optional[amm_sim_rs.BatchProfile] = None,
+    ) -> MatchResult:
+        return MatchResult(
+            strategy_a=name_a,
+            strategy_b=name_b,
+            wins_a=self.wins_a,
+            wins_b=self.wins_b,
+            draws=self.draws,
+            total_pnl_a=self.total_pnl_a,
+            total_pnl_b=self.total_pnl_b,
+            total_edge_a=self.total_edge_a,
+            total_edge_b=self.total_edge_b,
+            simulation_results=self.simulation_results,
+            seeds=self.seeds,
+            confidence_interval=confidence_interval,
+            profile=profile,
+        )
+
+
 # Re-export SimulationConfig from Rust for compatibility
 SimulationConfig = amm_sim_rs.SimulationConfig
 
 
 class MatchRunner:
-    """Runs matches using Rust simulation engine."""
+    """Runs matches using Rust simulation engine.
+
+    Pass a shared ``amm_sim_rs.SimulationPool`` to reuse worker threads and
+    deployed strategies across many matches (e.g. parameter sweeps); otherwise
+    the runner creates its own pool on first use.
+
+    With a ``result_store``, ``run_match`` reuses per-seed summaries from
+    earlier runs and only simulates seeds that are missing.
+
+    With a ``tape`` (see ``build_tape``), markets are replayed from the tape
+    instead of being sampled; results are identical either way.
+
+    With ``profile=True``, ``run_match`` records where the Rust engine spends
+    its time and returns it as the result's ``profile``.
+    """
 
     def __init__(
         self,
@@ -91,141 +249,270 @@ class MatchRunner:
         config: SimulationConfig,
         n_workers: int,
         variance: HyperparameterVariance,
+        pool: Optional[amm_sim_rs.SimulationPool] = None,
+        result_store: Optional[ResultStore] = None,
+        tape: Optional[amm_sim_rs.MarketTape] = None,
+        profile: bool = False,
     ):
         self.n_simulations = n_simulations
         self.base_config = config
         self.n_workers = n_workers
         self.variance = variance
+        self.pool = pool
+        self.result_store = result_store
+        self.tape = tape
+        self.profile = profile
+
+    def _simulation_pool(self) -> amm_sim_rs.SimulationPool:
+        if self.pool is None:
+            self.pool = amm_sim_rs.SimulationPool(self.n_workers)
+        return self.pool
+
+    def _engine_strategy(self, strategy: EVMStrategyAdapter):
+        """Strategy argument for the Rust engine: its native spec, else its bytecode.
+
+        Native specs are registered with the pool by code, so the same
+        contract compiled separately (e.g. submitted as strategy A) also
+        runs natively.
+        """
+        if strategy.native is None:
+            return strategy._bytecode
+        self._simulation_pool().register_native(strategy._bytecode, strategy.native)
+        return strategy.native
+
+    def _build_configs(self, seeds: Optional[range] = None) -> amm_sim_rs.ConfigSpace:
+        """Build simulation configs with optional variance.
+
+        Defaults to seeds ``0..n_simulations``. Configs are generated in Rust
+        as each simulation starts, drawing the varied parameters as
+        ``np.random.default_rng(seed).uniform`` does, so each seed's config
+        is the same whichever range it is built in.
+        """
+        if seeds is None:
+            seeds = range(self.n_simulations)
+        return amm_sim_rs.ConfigSpace(
+            self.base_config,
+            amm_sim_rs.HyperparameterVariance(**asdict(self.variance)),
+            seeds.start,
+            seeds.stop,
+        )
 
-    def _build_configs(self) -> list[amm_sim_rs.SimulationConfig]:
-        """Build simulation configs with optional variance."""
-        import numpy as np
-
-        configs = []
-        for i in range(self.n_simulations):
-            rng = np.random.default_rng(seed=i)
-
-            retail_mean_size = (
-                rng.uniform(self.variance.retail_mean_size_min, self.variance.retail_mean_size_max)
-                if self.variance.vary_retail_mean_size
-                else self.base_config.retail_mean_size
-            )
-            retail_arrival_rate = (
-                rng.uniform(self.variance.retail_arrival_rate_min, self.variance.retail_arrival_rate_max)
-                if self.variance.vary_retail_arrival_rate
-                else self.base_config.retail_arrival_rate
-            )
-            gbm_sigma = (
-                rng.uniform(self.variance.gbm_sigma_min, self.variance.gbm_sigma_max)
-                if self.variance.vary_gbm_sigma
-                else self.base_config.gbm_sigma
-            )
-
-            cfg = amm_sim_rs.SimulationConfig(
-                n_steps=self.base_config.n_steps,
-                initial_price=self.base_config.initial_price,
-                initial_x=self.base_config.initial_x,
-                initial_y=self.base_config.initial_y,
-                gbm_mu=self.base_config.gbm_mu,
-                gbm_sigma=gbm_sigma,
-                gbm_dt=self.base_config.gbm_dt,
-                retail_arrival_rate=retail_arrival_rate,
-                retail_mean_size=retail_mean_size,
-                retail_size_sigma=self.base_config.retail_size_sigma,
-                retail_buy_prob=self.base_config.retail_buy_prob,
-                seed=i,
-            )
-            configs.append(cfg)
-        return configs
+    def build_tape(self) -> amm_sim_rs.MarketTape:
+        """Materialize the markets for this runner's seeds and configs."""
+        return amm_sim_rs.MarketTape.generate(self._build_configs())
 
     def run_match(
         self,
         strategy_a: EVMStrategyAdapter,
         strategy_b: EVMStrategyAdapter,
         store_results: bool = False,
+        progress: Optional[Callable[[int, int], None]] = None,
     ) -> MatchResult:
-        """Run a complete match between two strategies."""
+        """Run a complete match between two strategies.
+
+        Results are aggregated as simulations complete. ``progress`` is called
+        with ``(completed, total)`` after each one; raising from it cancels
+        the remaining simulations.
+
+        When the runner has a result store and step results are not needed,
+        stored seeds are not re-simulated; ``progress`` then counts only the
+        seeds actually run.
+        """
         name_a = strategy_a.get_name()
         name_b = strategy_b.get_name()
 
         # Build configs
         configs = self._build_configs()
 
-        # Run simulations in Rust
-        batch_result = amm_sim_rs.run_batch(
-            list(strategy_a._bytecode),
-            list(strategy_b._bytecode),
+        if self.result_store is not None and not store_results:
+            return self._run_match_stored(strategy_a, strategy_b, configs.to_list(), progress)
+
+        # Stream simulations from Rust (per-step capture only when results are kept)
+        stream = self._simulation_pool().stream_batch(
+            self._engine_strategy(strategy_a),
+            self._engine_strategy(strategy_b),
             configs,
-            self.n_workers,
+            capture_steps=store_results,
+            ordered=True,
+            progress=progress,
+            tape=self.tape,
+            profile=self.profile,
         )
 
-        # Process results
-        wins_a = 0
-        wins_b = 0
-        draws = 0
-        total_pnl_a = Decimal("0")
-        total_pnl_b = Decimal("0")
-        total_edge_a = Decimal("0")
-        total_edge_b = Decimal("0")
-        simulation_results = []
-
-        for rust_result in batch_result.results:
-            # Get PnL values using fixed positional keys from Rust
-            pnl_a = rust_result.pnl.get("submission", 0.0)
-            pnl_b = rust_result.pnl.get("normalizer", 0.0)
-            edge_a = rust_result.edges.get("submission", 0.0)
-            edge_b = rust_result.edges.get("normalizer", 0.0)
-
-            total_pnl_a += Decimal(str(pnl_a))
-            total_pnl_b += Decimal(str(pnl_b))
-            total_edge_a += Decimal(str(edge_a))
-            total_edge_b += Decimal(str(edge_b))
-
-            if edge_a > edge_b:
-                wins_a += 1
-            elif edge_b > edge_a:
-                wins_b += 1
-            else:
-                draws += 1
-
-            if store_results:
-                # Convert Rust result to Python dataclass
-                steps = [
-                    LightweightStepResult(
-                        timestamp=s.timestamp,
-                        fair_price=s.fair_price,
-                        spot_prices=s.spot_prices,
-                        pnls=s.pnls,
-                        fees=s.fees,
+        tally = _MatchTally(store_results)
+        for rust_result in stream:
+            tally.add(rust_result)
+
+        return tally.result(name_a, name_b, profile=stream.profile)
+
+    def _run_match_stored(
+        self,
+        strategy_a: EVMStrategyAdapter,
+        strategy_b: EVMStrategyAdapter,
+        configs: list[amm_sim_rs.SimulationConfig],
+        progress: Optional[Callable[[int, int], None]],
+    ) -> MatchResult:
+        """Run a summary-only match, simulating only seeds not in the store."""
+        store = self.result_store
+        bytecode_a = strategy_a._bytecode
+        bytecode_b = strategy_b._bytecode
+        records = store.get_many(bytecode_a, bytecode_b, configs)
+        missing = [i for i, record in enumerate(records) if record is None]
+
+        profile = None
+        if missing:
+            stream = self._simulation_pool().stream_batch(
+                self._engine_strategy(strategy_a),
+                self._engine_strategy(strategy_b),
+                [configs[i] for i in missing],
+                capture_steps=False,
+                ordered=True,
+                progress=progress,
+                tape=self.tape,
+                profile=self.profile,
+            )
+            fresh = []
+            try:
+                for i, rust_result in zip(missing, stream):
+                    records[i] = SeedRecord.from_rust(rust_result)
+                    fresh.append((configs[i], records[i]))
+            finally:
+                # Keep finished seeds even if the run was cancelled
+                store.put_many(bytecode_a, bytecode_b, fresh)
+            profile = stream.profile
+
+        tally = _MatchTally(store_results=False)
+        for record in records:
+            tally.add_record(record)
+        return tally.result(strategy_a.get_name(), strategy_b.get_name(), profile=profile)
+
+    def run_match_adaptive(
+        self,
+        strategy_a: EVMStrategyAdapter,
+        strategy_b: EVMStrategyAdapter,
+        rule: StoppingRule,
+        reference: Optional[EVMStrategyAdapter] = None,
+        store_results: bool = False,
+    ) -> MatchResult:
+        """Run a match in chunks of seeds, stopping early per ``rule``.
+
+        The per-seed score is strategy A's edge or, when ``reference`` is
+        given, A's edge minus the reference's edge on the same seed (both
+        against strategy B). At most ``n_simulations`` seeds are run. The
+        returned result records the seeds used and the final CI.
+        """
+        name_a = strategy_a.get_name()
+        name_b = strategy_b.get_name()
+        pool = self._simulation_pool()
+
+        tally = _MatchTally(store_results)
+        stats = RunningStats()
+        for start in range(0, self.n_simulations, rule.chunk_size):
+            seeds = range(start, min(start + rule.chunk_size, self.n_simulations))
+            configs = self._build_configs(seeds)
+
+            results = list(pool.stream_batch(
+                self._engine_strategy(strategy_a),
+                self._engine_strategy(strategy_b),
+                configs,
+                capture_steps=store_results,
+                ordered=True,
+                tape=self.tape,
+            ))
+            reference_edges = None
+            if reference is not None:
+                reference_edges = [
+                    r.edges.get("submission", 0.0)
+                    for r in pool.stream_batch(
+                        self._engine_strategy(reference),
+                        self._engine_strategy(strategy_b),
+                        configs,
+                        capture_steps=False,
+                        ordered=True,
+                        tape=self.tape,
                     )
-                    for s in rust_result.steps
                 ]
 
-                sim_result = LightweightSimResult(
-                    seed=rust_result.seed,
-                    strategies=rust_result.strategies,
-                    pnl={k: Decimal(str(v)) for k, v in rust_result.pnl.items()},
-                    edges={
-                        k: Decimal(str(v)) for k, v in rust_result.edges.items()
-                    },
-                    initial_fair_price=rust_result.initial_fair_price,
-                    initial_reserves=rust_result.initial_reserves,
-                    steps=steps,
-                    arb_volume_y=rust_result.arb_volume_y,
-                    retail_volume_y=rust_result.retail_volume_y,
-                    average_fees=rust_result.average_fees,
-                )
-                simulation_results.append(sim_result)
+            for i, rust_result in enumerate(results):
+                tally.add(rust_result)
+                score = rust_result.edges.get("submission", 0.0)
+                if reference_edges is not None:
+                    score -= reference_edges[i]
+                stats.add(score)
 
-        return MatchResult(
-            strategy_a=name_a,
-            strategy_b=name_b,
-            wins_a=wins_a,
-            wins_b=wins_b,
-            draws=draws,
-            total_pnl_a=total_pnl_a,
-            total_pnl_b=total_pnl_b,
-            total_edge_a=total_edge_a,
-            total_edge_b=total_edge_b,
-            simulation_results=simulation_results,
+            if rule.should_stop(stats, self.n_simulations):
+                break
+
+        return tally.result(
+            name_a, name_b, confidence_interval=rule.interval(stats, self.n_simulations)
+        )
+
+    def compare_candidates(
+        self,
+        candidates: list[EVMStrategyAdapter],
+        normalizer: EVMStrategyAdapter,
+    ) -> CandidateComparison:
+        """Run every candidate against ``normalizer`` on shared seeds.
+
+        Each seed's market is generated once and replayed for all candidates
+        (common random numbers), in a single batch.
+        """
+        batch = self._simulation_pool().run_candidates(
+            [self._engine_strategy(c) for c in candidates],
+            self._engine_strategy(normalizer),
+            self._build_configs(),
+            tape=self.tape,
+        )
+        return CandidateComparison(
+            candidates=[c.get_name() for c in candidates],
+            seeds=np.asarray(batch.seeds),
+            edges=np.asarray(batch.edges),
+            normalizer_edges=np.asarray(batch.normalizer_edges),
+            pnl=np.asarray(batch.pnl),
+        )
+
+    def compare_parameters(
+        self,
+        template: StrategyTemplate,
+        bytecode: bytes,
+        parameter_sets: list[Mapping[str, ParamValue]],
+        normalizer: EVMStrategyAdapter,
+    ) -> CandidateComparison:
+        """Run one compiled template under several parameter sets.
+
+        ``bytecode`` is the template compiled once; each parameter set is
+        written into the strategy's slots at deploy time, so the whole grid
+        shares a single deployed code object and common random numbers.
+        """
+        batch = self._simulation_pool().run_parameterized(
+            bytecode,
+            self._engine_strategy(normalizer),
+            [template.encode(values) for values in parameter_sets],
+            self._build_configs(),
+            tape=self.tape,
+        )
+        return CandidateComparison(
+            candidates=[template.label(values) for values in parameter_sets],
+            seeds=np.asarray(batch.seeds),
+            edges=np.asarray(batch.edges),
+            normalizer_edges=np.asarray(batch.normalizer_edges),
+            pnl=np.asarray(batch.pnl),
+        )
+
+    async def run_match_async(
+        self,
+        strategy_a: EVMStrategyAdapter,
+        strategy_b: EVMStrategyAdapter,
+        store_results: bool = False,
+    ) -> MatchResult:
+        """Awaitable ``run_match``.
+
+        The Rust engine releases the GIL while simulating, so the event loop
+        stays responsive and several matches (or solc compiles) can be in
+        flight at once.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            functools.partial(self.run_match, strategy_a, strategy_b, store_results),
         )
@@ -0,0 +1,206 @@
+"""Persistent per-seed result store.
+
+Simulations are deterministic in (submission bytecode, normalizer bytecode,
+config, seed, engine version), so their summaries can be memoized across
+runs. The store is a single SQLite file; only per-seed summaries are kept,
+never step traces.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence
+
+import amm_sim_rs
+
+STORE_PATH_ENV = "AMM_RESULT_STORE"
+
+# SimulationConfig fields that affect the outcome (seed is keyed separately)
+CONFIG_FIELDS = (
+    "n_steps",
+    "initial_price",
+    "initial_x",
+    "initial_y",
+    "gbm_mu",
+    "gbm_sigma",
+    "gbm_dt",
+    "retail_arrival_rate",
+    "retail_mean_size",
+    "retail_size_sigma",
+    "retail_buy_prob",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    submission BLOB NOT NULL,
+    normalizer BLOB NOT NULL,
+    config BLOB NOT NULL,
+    seed INTEGER NOT NULL,
+    engine TEXT NOT NULL,
+    edge_submission REAL NOT NULL,
+    edge_normalizer REAL NOT NULL,
+    pnl_submission REAL NOT NULL,
+    pnl_normalizer REAL NOT NULL,
+    arb_volume_submission REAL NOT NULL,
+    arb_volume_normalizer REAL NOT NULL,
+    retail_volume_submission REAL NOT NULL,
+    retail_volume_normalizer REAL NOT NULL,
+    PRIMARY KEY (submission, normalizer, config, seed, engine)
+) WITHOUT ROWID
+"""
+
+_VALUE_COLUMNS = (
+    "edge_submission",
+    "edge_normalizer",
+    "pnl_submission",
+    "pnl_normalizer",
+    "arb_volume_submission",
+    "arb_volume_normalizer",
+    "retail_volume_submission",
+    "retail_volume_normalizer",
+)
+
+
+def default_store_path() -> Path:
+    """Store path from AMM_RESULT_STORE, or ~/.cache/amm-challenge/results.sqlite."""
+    override = os.environ.get(STORE_PATH_ENV)
+    if override:
+        return Path(override).expanduser()
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg).expanduser() if xdg else Path.home() / ".cache"
+    return base / "amm-challenge" / "results.sqlite"
+
+
+def engine_version() -> str:
+    """Identity of the installed Rust engine's build.
+
+    The crate version alone is not bumped when simulation output changes,
+    so the key includes the source hash embedded at build time. Engines
+    built before that hash existed are identified by their binary instead.
+    """
+    version = getattr(amm_sim_rs, "__version__", "unknown")
+    build = getattr(amm_sim_rs, "__build__", None)
+    if build is None:
+        module_file = getattr(amm_sim_rs, "__file__", None)
+        if module_file is None:
+            return "unknown"
+        build = hashlib.sha256(Path(module_file).read_bytes()).hexdigest()[:16]
+    return f"{version}+{build}"
+
+
+def config_digest(config: Any) -> bytes:
+    """Hash the outcome-relevant fields of a SimulationConfig (excluding seed)."""
+    fields = {name: getattr(config, name) for name in CONFIG_FIELDS}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode()).digest()
+
+
+@dataclass(frozen=True)
+class SeedRecord:
+    """Summary of one simulation, from the submission's point of view."""
+    seed: int
+    edge_submission: float
+    edge_normalizer: float
+    pnl_submission: float
+    pnl_normalizer: float
+    arb_volume_submission: float
+    arb_volume_normalizer: float
+    retail_volume_submission: float
+    retail_volume_normalizer: float
+
+    @classmethod
+    def from_rust(cls, result: Any) -> "SeedRecord":
+        return cls(
+            seed=result.seed,
+            edge_submission=result.edges.get("submission", 0.0),
+            edge_normalizer=result.edges.get("normalizer", 0.0),
+            pnl_submission=result.pnl.get("submission", 0.0),
+            pnl_normalizer=result.pnl.get("normalizer", 0.0),
+            arb_volume_submission=result.arb_volume_y.get("submission", 0.0),
+            arb_volume_normalizer=result.arb_volume_y.get("normalizer", 0.0),
+            retail_volume_submission=result.retail_volume_y.get("submission", 0.0),
+            retail_volume_normalizer=result.retail_volume_y.get("normalizer", 0.0),
+        )
+
+
+class ResultStore:
+    """SQLite-backed memo of per-seed simulation summaries.
+
+    Keys are (sha256 of submission bytecode, sha256 of normalizer bytecode,
+    config digest, seed, engine version). Safe to share between threads;
+    several processes may use the same file.
+    """
+
+    def __init__(self, path: Optional[Path] = None, engine: Optional[str] = None):
+        self.path = Path(path) if path is not None else default_store_path()
+        self.engine = engine if engine is not None else engine_version()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+
+    def get_many(
+        self,
+        submission_bytecode: bytes,
+        normalizer_bytecode: bytes,
+        configs: Sequence[Any],
+    ) -> list[Optional[SeedRecord]]:
+        """Look up each config; entries are None where nothing is stored."""
+        submission = hashlib.sha256(bytes(submission_bytecode)).digest()
+        normalizer = hashlib.sha256(bytes(normalizer_bytecode)).digest()
+        query = (
+            f"SELECT {', '.join(_VALUE_COLUMNS)} FROM results "
+            "WHERE submission = ? AND normalizer = ? AND config = ? AND seed = ? AND engine = ?"
+        )
+        records: list[Optional[SeedRecord]] = []
+        with self._lock:
+            for config in configs:
+                row = self._conn.execute(
+                    query,
+                    (submission, normalizer, config_digest(config), config.seed, self.engine),
+                ).fetchone()
+                records.append(SeedRecord(config.seed, *row) if row is not None else None)
+        return records
+
+    def put_many(
+        self,
+        submission_bytecode: bytes,
+        normalizer_bytecode: bytes,
+        entries: Iterable[tuple[Any, SeedRecord]],
+    ) -> None:
+        """Store (config, record) pairs, replacing existing entries."""
+        submission = hashlib.sha256(bytes(submission_bytecode)).digest()
+        normalizer = hashlib.sha256(bytes(normalizer_bytecode)).digest()
+        rows = [
+            (
+                submission,
+                normalizer,
+                config_digest(config),
+                config.seed,
+                self.engine,
+                *(getattr(record, column) for column in _VALUE_COLUMNS),
+            )
+            for config, record in entries
+        ]
+        placeholders = ", ".join("?" * (5 + len(_VALUE_COLUMNS)))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO results VALUES ({placeholders})", rows
+            )
+
+    def clear(self) -> None:
+        """Delete every stored result."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
@@ -0,0 +1,95 @@
+"""Sequential stopping rules for adaptive match evaluation."""
+
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Optional
+
+
+@dataclass
+class RunningStats:
+    """Running mean and variance (Welford's algorithm)."""
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, value: float) -> None:
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 until two values are seen)."""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std_error(self) -> float:
+        return math.sqrt(self.variance / self.n) if self.n > 0 else math.inf
+
+    def confidence_interval(self, confidence: float) -> tuple[float, float]:
+        """Normal-approximation CI for the mean."""
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        half_width = z * self.std_error
+        return (self.mean - half_width, self.mean + half_width)
+
+
+@dataclass(frozen=True)
+class StoppingRule:
+    """When to stop an adaptive match.
+
+    Seeds are evaluated in chunks of ``chunk_size``. After at least
+    ``min_simulations`` seeds, the match stops as soon as either:
+
+    - the CI half-width is at most ``precision``, or
+    - the CI lies entirely above or below ``threshold`` (e.g. the incumbent's
+      average edge, or 0 when scoring the difference against a reference).
+
+    With neither set, the match runs to its maximum number of simulations.
+
+    The rule looks at the data after every chunk, so each look spends part
+    of the error budget ``1 - confidence``: with a known maximum, the budget
+    is split evenly over its ``ceil(max_simulations / chunk_size)`` looks
+    (Bonferroni); otherwise look k spends ``6 / (π² k²)`` of it, which sums
+    to the budget over any number of looks. Either way the chance of ever
+    stopping on an interval that misses the true mean stays within
+    ``1 - confidence``.
+    """
+    confidence: float = 0.95
+    chunk_size: int = 50
+    min_simulations: int = 50
+    precision: Optional[float] = None
+    threshold: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if not 0 < self.confidence < 1:
+            raise ValueError("confidence must be between 0 and 1")
+        if self.chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+
+    def look_confidence(self, n: int, max_simulations: Optional[int] = None) -> float:
+        """Confidence level of the interval checked after ``n`` simulations."""
+        alpha = 1 - self.confidence
+        if max_simulations is not None:
+            looks = max(1, math.ceil(max_simulations / self.chunk_size))
+            return 1 - alpha / looks
+        look = max(1, math.ceil(n / self.chunk_size))
+        return 1 - alpha * 6 / (math.pi**2 * look**2)
+
+    def interval(
+        self, stats: RunningStats, max_simulations: Optional[int] = None
+    ) -> tuple[float, float]:
+        """CI for the mean at this look, valid under repeated looks."""
+        return stats.confidence_interval(self.look_confidence(stats.n, max_simulations))
+
+    def should_stop(self, stats: RunningStats, max_simulations: Optional[int] = None) -> bool:
+        if stats.n < max(self.min_simulations, 2):
+            return False
+
+        low, high = self.interval(stats, max_simulations)
+        if self.precision is not None and (high - low) / 2 <= self.precision:
+            return True
+        if self.threshold is not None and (high < self.threshold or low > self.threshold):
+            return True
+        return False
@@ -1,13 +1,15 @@
 """Core AMM components."""
 
-from amm_competition.core.interfaces import AMMStrategy, FeeQuote
-from amm_competition.core.trade import TradeInfo, TradeSide
+from amm_competition.core.interfaces import AMMStrategy, FeeQuote, VectorizedAMMStrategy
+from amm_competition.core.trade import TradeBatch, TradeInfo, TradeSide
 from amm_competition.core.amm import AMM
 
 __all__ = [
     "AMMStrategy",
+    "VectorizedAMMStrategy",
     "FeeQuote",
     "TradeInfo",
+    "TradeBatch",
     "TradeSide",
     "AMM",
 ]
@@ -3,7 +3,9 @@
 from abc import ABC, abstractmethod
 from decimal import Decimal
 
-from amm_competition.core.trade import FeeQuote, TradeInfo
+import numpy as np
+
+from amm_competition.core.trade import FeeQuote, TradeBatch, TradeInfo
 
 
 class AMMStrategy(ABC):
@@ -48,3 +50,53 @@ class AMMStrategy(ABC):
     def get_name(self) -> str:
         """Return the strategy name for display purposes."""
         return self.__class__.__name__
+
+
+class VectorizedAMMStrategy(AMMStrategy):
+    """AMM fee strategy that prices many independent simulations at once.
+
+    State is kept in arrays with one row per simulation, sized by
+    ``after_initialize_batch``. The batch engine (``amm_competition.batch``)
+    calls ``after_swap_batch`` whenever any simulation trades; rows where
+    ``trades.active`` is False did not trade and must keep their state.
+
+    Fees are decimals as in ``FeeQuote``. The scalar callbacks run the batch
+    ones on a single row, so a vectorized strategy also works with ``AMM``.
+    """
+
+    @abstractmethod
+    def after_initialize_batch(
+        self, initial_x: np.ndarray, initial_y: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Reset state for ``len(initial_x)`` simulations.
+
+        Returns:
+            (bid_fees, ask_fees) arrays, one entry per simulation
+        """
+        pass
+
+    @abstractmethod
+    def after_swap_batch(self, trades: TradeBatch) -> tuple[np.ndarray, np.ndarray]:
+        """Update state for the rows that traded.
+
+        Returns:
+            (bid_fees, ask_fees) arrays; entries for inactive rows are ignored
+        """
+        pass
+
+    def after_initialize(self, initial_x: Decimal, initial_y: Decimal) -> FeeQuote:
+        bid, ask = self.after_initialize_batch(
+            np.array([float(initial_x)]), np.array([float(initial_y)])
+        )
+        return _fee_quote(bid, ask)
+
+    def after_swap(self, trade: TradeInfo) -> FeeQuote:
+        bid, ask = self.after_swap_batch(TradeBatch.from_trade(trade))
+        return _fee_quote(bid, ask)
+
+
+def _fee_quote(bid: np.ndarray, ask: np.ndarray) -> FeeQuote:
+    return FeeQuote(
+        bid_fee=Decimal(str(float(np.asarray(bid)[0]))),
+        ask_fee=Decimal(str(float(np.asarray(ask)[0]))),
+    )
@@ -5,6 +5,8 @@ from decimal import Decimal
 from enum import Enum
 from typing import Literal
 
+import numpy as np
+
 
 class TradeSide(Enum):
     """Side of a trade from the AMM's perspective."""
@@ -53,3 +55,32 @@ class TradeInfo:
         if self.amount_x == 0:
             return Decimal("0")
         return self.amount_y / self.amount_x
+
+
+@dataclass(frozen=True)
+class TradeBatch:
+    """Trades from many independent simulations at the same step.
+
+    Arrays have one entry per simulation. Only rows where ``active`` is
+    True traded; the other rows hold zeros and must be ignored.
+    """
+    active: np.ndarray     # bool, True where a trade happened
+    is_buy: np.ndarray     # bool, True where the AMM bought X
+    amount_x: np.ndarray   # Amount of X traded
+    amount_y: np.ndarray   # Amount of Y traded
+    timestamp: int         # Simulation step number
+    reserve_x: np.ndarray  # Post-trade X reserves
+    reserve_y: np.ndarray  # Post-trade Y reserves
+
+    @classmethod
+    def from_trade(cls, trade: TradeInfo) -> "TradeBatch":
+        """A batch of one, for running vectorized strategies on single trades."""
+        return cls(
+            active=np.array([True]),
+            is_buy=np.array([trade.side == "buy"]),
+            amount_x=np.array([float(trade.amount_x)]),
+            amount_y=np.array([float(trade.amount_y)]),
+            timestamp=trade.timestamp,
+            reserve_x=np.array([float(trade.reserve_x)]),
+            reserve_y=np.array([float(trade.reserve_y)]),
+        )
@@ -3,12 +3,16 @@
 This module provides:
 - EVMStrategyExecutor: Executes Solidity strategies using pyrevm
 - SolidityCompiler: Compiles Solidity code using Foundry
+- CompileCache: On-disk cache of compiled strategies
+- StrategyTemplate: Strategy source with parameters injected via storage
 - SolidityValidator: Static analysis for security
 - EVMStrategyAdapter: Adapts EVM strategies to the AMMStrategy interface
 """
 
 from amm_competition.evm.executor import EVMStrategyExecutor, EVMExecutionResult
 from amm_competition.evm.compiler import SolidityCompiler, CompilationResult
+from amm_competition.evm.compile_cache import CompileCache
+from amm_competition.evm.params import StrategyParam, StrategyTemplate
 from amm_competition.evm.validator import SolidityValidator, ValidationResult
 from amm_competition.evm.adapter import EVMStrategyAdapter
 
@@ -17,6 +21,9 @@ __all__ = [
     "EVMExecutionResult",
     "SolidityCompiler",
     "CompilationResult",
+    "CompileCache",
+    "StrategyParam",
+    "StrategyTemplate",
     "SolidityValidator",
     "ValidationResult",
     "EVMStrategyAdapter",
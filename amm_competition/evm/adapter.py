@@ -22,6 +22,7 @@ class EVMStrategyAdapter(AMMStrategy):
         bytecode: bytes,
         abi: Optional[list] = None,
         name: Optional[str] = None,
+        native=None,
     ):
         """Initialize the adapter with compiled bytecode.
 
@@ -29,10 +30,14 @@ class EVMStrategyAdapter(AMMStrategy):
             bytecode: Compiled contract deployment bytecode
             abi: Contract ABI (optional)
             name: Override name for the strategy
+            native: Optional ``amm_sim_rs.NativeStrategySpec`` computing the
+                same fees as the contract; the Rust engine then runs it
+                natively instead of executing the bytecode
         """
         self._bytecode = bytecode
         self._abi = abi
         self._name_override = name
+        self.native = native
         self._executor = EVMStrategyExecutor(bytecode, abi)
 
         # Cache the name after first fetch
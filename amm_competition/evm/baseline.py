@@ -3,6 +3,8 @@
 from pathlib import Path
 from typing import Optional, Tuple
 
+import amm_sim_rs
+
 from amm_competition.evm.adapter import EVMStrategyAdapter
 from amm_competition.evm.compiler import SolidityCompiler
 
@@ -38,8 +40,12 @@ def load_vanilla_strategy() -> EVMStrategyAdapter:
     The normalizer AMM prevents degenerate strategies (like extreme fees)
     from appearing profitable by providing competition for retail flow.
 
+    The Rust engine runs it as a native constant-fee strategy, which gives
+    the same results as the compiled contract without EVM calls.
+
     Returns:
         EVMStrategyAdapter wrapping the compiled VanillaStrategy.sol (30 bps).
     """
     bytecode, abi = get_vanilla_bytecode_and_abi()
-    return EVMStrategyAdapter(bytecode=bytecode, abi=abi)
+    native = amm_sim_rs.NativeStrategySpec.constant_fee(30, name="Vanilla_30bps")
+    return EVMStrategyAdapter(bytecode=bytecode, abi=abi, native=native)
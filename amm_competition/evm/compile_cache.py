@@ -0,0 +1,132 @@
+"""Content-addressed on-disk cache for Solidity compilation artifacts."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+# Bump when the artifact layout changes so stale entries are never read.
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Environment overrides
+CACHE_DIR_ENV = "AMM_COMPILE_CACHE_DIR"
+DISABLE_ENV = "AMM_NO_COMPILE_CACHE"
+
+
+def default_cache_dir() -> Path:
+    """Cache directory from the environment, or ~/.cache/amm-challenge/solc."""
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override).expanduser()
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg).expanduser() if xdg else Path.home() / ".cache"
+    return base / "amm-challenge" / "solc"
+
+
+def cache_disabled_by_env() -> bool:
+    """Whether AMM_NO_COMPILE_CACHE is set to a truthy value."""
+    return os.environ.get(DISABLE_ENV, "").strip().lower() not in ("", "0", "false", "no")
+
+
+class CompileCache:
+    """Stores solc artifacts as one JSON file per compile input.
+
+    Entries are keyed by a SHA-256 of the full standard-JSON input (strategy
+    source, base contract sources, settings), the solc version and the
+    contract name, so any change to those is a miss. Only successful solc
+    outputs are stored; the caller re-applies its bytecode policy on every
+    hit. When the directory grows past ``max_bytes`` the least recently
+    used entries (by mtime, refreshed on each hit) are deleted.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(input_json: dict, solc_version: str, contract_name: str) -> str:
+        """Hash a compile request into a cache key."""
+        payload = json.dumps(
+            {
+                "format": CACHE_FORMAT_VERSION,
+                "solc": solc_version,
+                "contract": contract_name,
+                "input": input_json,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """Return the stored artifact for ``key``, or None on a miss."""
+        path = self._path(key)
+        try:
+            artifact = json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # Corrupt or unreadable entry; drop it and recompile
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return artifact
+
+    def put(self, key: str, artifact: dict[str, Any]) -> None:
+        """Store ``artifact`` under ``key`` and evict old entries if needed.
+
+        Write failures are ignored: the cache is an optimization only.
+        """
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(artifact))
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            return
+        self._evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self) -> None:
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            path.unlink(missing_ok=True)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def size_bytes(self) -> int:
+        """Total size of all cached entries."""
+        return sum(size for _, size, _ in self._entries())
+
+    def clear(self) -> None:
+        """Delete every cached entry."""
+        for _, _, path in self._entries():
+            path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries())
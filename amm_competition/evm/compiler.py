@@ -5,6 +5,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+from amm_competition.evm.compile_cache import CompileCache, cache_disabled_by_env
+
 
 @dataclass
 class CompilationResult:
@@ -21,7 +23,9 @@ class CompilationResult:
 class SolidityCompiler:
     """Compiles Solidity strategies using py-solc-x.
 
-    Uses inline sources to avoid filesystem dependencies.
+    Uses inline sources to avoid filesystem dependencies. Successful solc
+    outputs are kept in a content-addressed on-disk cache (see
+    compile_cache.CompileCache).
     """
 
     SOLC_VERSION = "0.8.24"
@@ -45,15 +49,30 @@ class SolidityCompiler:
         0xFF: "SELFDESTRUCT",
     }
 
-    def __init__(self):
-        """Initialize the compiler and ensure solc is installed."""
-        self._ensure_solc_installed()
+    # solc install check runs once per process, not once per compiler
+    _solc_ready = False
+
+    def __init__(self, use_cache: bool = True, cache: Optional[CompileCache] = None):
+        """Initialize the compiler.
+
+        Args:
+            use_cache: Reuse artifacts from the on-disk compile cache. Also
+                disabled by setting AMM_NO_COMPILE_CACHE=1.
+            cache: Cache to use (default: one in ~/.cache/amm-challenge/solc)
+        """
+        if not use_cache or cache_disabled_by_env():
+            self.cache: Optional[CompileCache] = None
+        else:
+            self.cache = cache if cache is not None else CompileCache()
 
     def _ensure_solc_installed(self) -> None:
         """Install solc if not already installed."""
+        if SolidityCompiler._solc_ready:
+            return
         installed = [str(v) for v in solcx.get_installed_solc_versions()]
         if self.SOLC_VERSION not in installed:
             solcx.install_solc(self.SOLC_VERSION)
+        SolidityCompiler._solc_ready = True
 
     def _load_base_contracts(self) -> dict[str, str]:
         """Load base contract sources from the contracts directory."""
@@ -65,9 +84,47 @@ class SolidityCompiler:
                 sources[contract] = src_file.read_text()
         return sources
 
+    def _build_input(self, source_code: str) -> dict:
+        """Build the solc standard-JSON input for a strategy source."""
+        # Load base contracts
+        base_sources = self._load_base_contracts()
+
+        # Build sources dict with all contracts
+        sources = {
+            "Strategy.sol": {"content": source_code},
+        }
+        for name, content in base_sources.items():
+            sources[name] = {"content": content}
+
+        return {
+            "language": "Solidity",
+            "sources": sources,
+            "settings": {
+                "optimizer": {
+                    "enabled": True,
+                    "runs": 200,
+                },
+                "viaIR": True,
+                "evmVersion": "paris",
+                "outputSelection": {
+                    "*": {
+                        "*": [
+                            "abi",
+                            "evm.bytecode.object",
+                            "evm.deployedBytecode.object",
+                            "storageLayout",
+                        ],
+                    },
+                },
+            },
+        }
+
     def compile(self, source_code: str, contract_name: str = "Strategy") -> CompilationResult:
         """Compile Solidity source code.
 
+        Repeat compiles of the same input are served from the compile cache;
+        the bytecode and storage policy checks run on every call.
+
         Args:
             source_code: The Solidity source code (must define a contract named `contract_name`)
             contract_name: Name of the contract to extract (default: "Strategy")
@@ -75,157 +132,155 @@ class SolidityCompiler:
         Returns:
             CompilationResult with bytecode, ABI, and any errors
         """
+        try:
+            input_json = self._build_input(source_code)
+
+            key = None
+            artifact = None
+            if self.cache is not None:
+                key = CompileCache.key(input_json, self.SOLC_VERSION, contract_name)
+                artifact = self.cache.get(key)
+
+            if artifact is None:
+                artifact = self._run_solc(input_json, contract_name)
+                if isinstance(artifact, CompilationResult):
+                    return artifact
+                if key is not None:
+                    self.cache.put(key, artifact)
+
+            return self._check_artifact(artifact)
+
+        except solcx.exceptions.SolcError as e:
+            return CompilationResult(
+                success=False,
+                errors=[f"Solidity compilation error: {str(e)}"],
+            )
+        except Exception as e:
+            return CompilationResult(
+                success=False,
+                errors=[f"Compilation error: {str(e)}"],
+            )
+
+    def _run_solc(self, input_json: dict, contract_name: str) -> dict | CompilationResult:
+        """Invoke solc and extract the contract's artifact.
+
+        Returns the artifact dict, or a failed CompilationResult when solc
+        reports errors or the contract is missing (failures are not cached).
+        """
         errors: list[str] = []
         warnings: list[str] = []
 
-        try:
-            # Load base contracts
-            base_sources = self._load_base_contracts()
-
-            # Build sources dict with all contracts
-            sources = {
-                "Strategy.sol": {"content": source_code},
-            }
-            for name, content in base_sources.items():
-                sources[name] = {"content": content}
-
-            # Build compile_standard input
-            input_json = {
-                "language": "Solidity",
-                "sources": sources,
-                "settings": {
-                    "optimizer": {
-                        "enabled": True,
-                        "runs": 200,
-                    },
-                    "viaIR": True,
-                    "evmVersion": "paris",
-                    "outputSelection": {
-                        "*": {
-                            "*": [
-                                "abi",
-                                "evm.bytecode.object",
-                                "evm.deployedBytecode.object",
-                                "storageLayout",
-                            ],
-                        },
-                    },
-                },
-            }
-
-            # Compile
-            output = solcx.compile_standard(
-                input_json,
-                solc_version=self.SOLC_VERSION,
-                base_path=str(self.CONTRACTS_SRC_DIR),
-                allow_paths=str(self.CONTRACTS_SRC_DIR),
+        self._ensure_solc_installed()
+
+        # Compile
+        output = solcx.compile_standard(
+            input_json,
+            solc_version=self.SOLC_VERSION,
+            base_path=str(self.CONTRACTS_SRC_DIR),
+            allow_paths=str(self.CONTRACTS_SRC_DIR),
+        )
+
+        # Check for errors in output
+        if "errors" in output:
+            for err in output["errors"]:
+                severity = err.get("severity", "error")
+                message = err.get("formattedMessage", err.get("message", "Unknown error"))
+                if severity == "error":
+                    errors.append(message)
+                elif severity == "warning":
+                    warnings.append(message)
+
+        if errors:
+            return CompilationResult(
+                success=False,
+                errors=errors,
+                warnings=warnings,
+            )
+
+        # Extract bytecode and ABI from the output
+        contracts = output.get("contracts", {})
+        strategy_contracts = contracts.get("Strategy.sol", {})
+
+        if contract_name not in strategy_contracts:
+            available = list(strategy_contracts.keys())
+            return CompilationResult(
+                success=False,
+                errors=[
+                    f"Contract '{contract_name}' not found in output. "
+                    f"Available contracts: {available}"
+                ],
+                warnings=warnings,
             )
 
-            # Check for errors in output
-            if "errors" in output:
-                for err in output["errors"]:
-                    severity = err.get("severity", "error")
-                    message = err.get("formattedMessage", err.get("message", "Unknown error"))
-                    if severity == "error":
-                        errors.append(message)
-                    elif severity == "warning":
-                        warnings.append(message)
-
-            if errors:
-                return CompilationResult(
-                    success=False,
-                    errors=errors,
-                    warnings=warnings,
-                )
-
-            # Extract bytecode and ABI from the output
-            contracts = output.get("contracts", {})
-            strategy_contracts = contracts.get("Strategy.sol", {})
-
-            if contract_name not in strategy_contracts:
-                available = list(strategy_contracts.keys())
-                return CompilationResult(
-                    success=False,
-                    errors=[
-                        f"Contract '{contract_name}' not found in output. "
-                        f"Available contracts: {available}"
-                    ],
-                    warnings=warnings,
-                )
-
-            contract_output = strategy_contracts[contract_name]
-            abi = contract_output.get("abi", [])
-            evm = contract_output.get("evm", {})
-
-            bytecode_hex = evm.get("bytecode", {}).get("object", "")
-            deployed_bytecode_hex = evm.get("deployedBytecode", {}).get("object", "")
-
-            if not bytecode_hex:
-                return CompilationResult(
-                    success=False,
-                    errors=["No bytecode in compiled output"],
-                    warnings=warnings,
-                )
-
-            creation_bytecode = bytes.fromhex(bytecode_hex)
-            deployed_bytecode = (
-                bytes.fromhex(deployed_bytecode_hex) if deployed_bytecode_hex else b""
+        contract_output = strategy_contracts[contract_name]
+        evm = contract_output.get("evm", {})
+        return {
+            "bytecode": evm.get("bytecode", {}).get("object", ""),
+            "deployed_bytecode": evm.get("deployedBytecode", {}).get("object", ""),
+            "abi": contract_output.get("abi", []),
+            "storage": contract_output.get("storageLayout", {}).get("storage", []),
+            "warnings": warnings,
+        }
+
+    def _check_artifact(self, artifact: dict) -> CompilationResult:
+        """Apply the bytecode and storage policy to a compiled artifact."""
+        warnings = list(artifact.get("warnings", []))
+        bytecode_hex = artifact.get("bytecode", "")
+        deployed_bytecode_hex = artifact.get("deployed_bytecode", "")
+
+        if not bytecode_hex:
+            return CompilationResult(
+                success=False,
+                errors=["No bytecode in compiled output"],
+                warnings=warnings,
             )
 
-            # Enforce forbidden-opcode policy in creation/init code too.
-            creation_hits = self._scan_forbidden_opcodes(creation_bytecode)
-            if creation_hits:
-                return CompilationResult(
-                    success=False,
-                    errors=[
-                        "Creation bytecode contains forbidden opcodes: "
-                        + ", ".join(creation_hits)
-                    ],
-                    warnings=warnings,
-                )
-
-            # Enforce forbidden-opcode policy directly on deployed runtime code.
-            forbidden_hits = self._scan_forbidden_opcodes(deployed_bytecode)
-            if forbidden_hits:
-                return CompilationResult(
-                    success=False,
-                    errors=[
-                        "Runtime bytecode contains forbidden opcodes: "
-                        + ", ".join(forbidden_hits)
-                    ],
-                    warnings=warnings,
-                )
-
-            # Enforce storage policy from compiler-provided layout.
-            storage_layout = contract_output.get("storageLayout", {})
-            storage_entries = storage_layout.get("storage", [])
-            storage_errors = self._validate_storage_layout(storage_entries)
-            if storage_errors:
-                return CompilationResult(
-                    success=False,
-                    errors=storage_errors,
-                    warnings=warnings,
-                )
+        creation_bytecode = bytes.fromhex(bytecode_hex)
+        deployed_bytecode = (
+            bytes.fromhex(deployed_bytecode_hex) if deployed_bytecode_hex else b""
+        )
 
+        # Enforce forbidden-opcode policy in creation/init code too.
+        creation_hits = self._scan_forbidden_opcodes(creation_bytecode)
+        if creation_hits:
             return CompilationResult(
-                success=True,
-                bytecode=creation_bytecode,
-                deployed_bytecode=deployed_bytecode or None,
-                abi=abi,
+                success=False,
+                errors=[
+                    "Creation bytecode contains forbidden opcodes: "
+                    + ", ".join(creation_hits)
+                ],
                 warnings=warnings,
             )
 
-        except solcx.exceptions.SolcError as e:
+        # Enforce forbidden-opcode policy directly on deployed runtime code.
+        forbidden_hits = self._scan_forbidden_opcodes(deployed_bytecode)
+        if forbidden_hits:
             return CompilationResult(
                 success=False,
-                errors=[f"Solidity compilation error: {str(e)}"],
+                errors=[
+                    "Runtime bytecode contains forbidden opcodes: "
+                    + ", ".join(forbidden_hits)
+                ],
+                warnings=warnings,
             )
-        except Exception as e:
+
+        # Enforce storage policy from compiler-provided layout.
+        storage_errors = self._validate_storage_layout(artifact.get("storage", []))
+        if storage_errors:
             return CompilationResult(
                 success=False,
-                errors=[f"Compilation error: {str(e)}"],
+                errors=storage_errors,
+                warnings=warnings,
             )
 
+        return CompilationResult(
+            success=True,
+            bytecode=creation_bytecode,
+            deployed_bytecode=deployed_bytecode or None,
+            abi=artifact.get("abi", []),
+            warnings=warnings,
+        )
+
     def _scan_forbidden_opcodes(self, bytecode: bytes) -> list[str]:
         """Disassemble bytecode and report forbidden opcodes."""
         if not bytecode:
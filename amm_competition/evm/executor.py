@@ -150,14 +150,10 @@ class EVMStrategyExecutor:
             bid_fee_wad = self._decode_uint256(result, 0)
             ask_fee_wad = self._decode_uint256(result, 32)
 
-            # Calculate gas used (pyrevm doesn't directly report this,
-            # so we estimate based on successful execution)
-            gas_used = self.GAS_LIMIT_INIT // 2  # Rough estimate
-
             return EVMExecutionResult(
                 bid_fee=self._wad_to_decimal(bid_fee_wad),
                 ask_fee=self._wad_to_decimal(ask_fee_wad),
-                gas_used=gas_used,
+                gas_used=self._last_gas_used(self.GAS_LIMIT_INIT),
                 success=True,
             )
 
@@ -235,7 +231,7 @@ class EVMStrategyExecutor:
             return EVMExecutionResult(
                 bid_fee=Decimal(bid_wad) / _WAD_DECIMAL,
                 ask_fee=Decimal(ask_wad) / _WAD_DECIMAL,
-                gas_used=self.GAS_LIMIT_TRADE // 2,
+                gas_used=self._last_gas_used(self.GAS_LIMIT_TRADE),
                 success=True,
             )
         except Exception as e:
@@ -247,6 +243,14 @@ class EVMStrategyExecutor:
                 error=str(e),
             )
 
+    def _last_gas_used(self, gas_limit: int) -> int:
+        """Gas used by the last call, including the 21000 intrinsic cost.
+
+        Falls back to `gas_limit` if the EVM reports no result.
+        """
+        result = self.evm.result
+        return result.gas_used if result is not None else gas_limit
+
     def get_name(self) -> str:
         """Call the strategy's getName function.
 
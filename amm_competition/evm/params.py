@@ -0,0 +1,107 @@
+"""Parameterized strategy templates.
+
+A template is an ordinary strategy whose tunable constants are read from
+``AMMStrategyBase.slots`` instead of being baked into the source. Each
+parameter is declared with a comment::
+
+    // @param baseFee 10 bps
+    // @param decayNum 11
+    // @param quadCoef 12 wad
+
+giving its name, the slot index it occupies and an optional unit (``bps``
+multiplies by 1e14, ``wad`` by 1e18; the default is a raw integer). The
+template is compiled once and each parameter set is written into storage
+before ``afterInitialize``, so the strategy must not overwrite those slots.
+"""
+
+import re
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Mapping, Union
+
+STRATEGY_SLOTS = 32
+
+UNIT_SCALES = {
+    "raw": Decimal(1),
+    "bps": Decimal(10) ** 14,
+    "wad": Decimal(10) ** 18,
+}
+
+_PARAM_PATTERN = re.compile(r"//\s*@param\s+(\w+)\s+(\d+)(?:\s+(raw|bps|wad))?\b")
+
+ParamValue = Union[int, float, str, Decimal]
+
+
+@dataclass(frozen=True)
+class StrategyParam:
+    """A tunable parameter stored in ``slots[slot]``."""
+    name: str
+    slot: int
+    unit: str = "raw"
+
+    def encode(self, value: ParamValue) -> int:
+        """Convert a value in this parameter's unit to its uint256 slot value."""
+        scaled = Decimal(str(value)) * UNIT_SCALES[self.unit]
+        if scaled != scaled.to_integral_value():
+            raise ValueError(
+                f"Parameter '{self.name}' = {value} is not a whole number of {self.unit} units"
+            )
+        encoded = int(scaled)
+        if not 0 <= encoded < 2**128:
+            raise ValueError(f"Parameter '{self.name}' = {value} is out of range")
+        return encoded
+
+
+@dataclass(frozen=True)
+class StrategyTemplate:
+    """Strategy source plus the parameters it reads from storage."""
+    source: str
+    params: tuple[StrategyParam, ...]
+
+    @classmethod
+    def from_source(cls, source: str) -> "StrategyTemplate":
+        """Parse ``// @param`` declarations from Solidity source.
+
+        Raises:
+            ValueError: If no parameters are declared, or names or slots clash
+        """
+        params = []
+        names: set[str] = set()
+        slots: set[int] = set()
+        for match in _PARAM_PATTERN.finditer(source):
+            name, slot, unit = match.group(1), int(match.group(2)), match.group(3) or "raw"
+            if slot >= STRATEGY_SLOTS:
+                raise ValueError(f"Parameter '{name}' uses slot {slot}; slots are 0-{STRATEGY_SLOTS - 1}")
+            if name in names:
+                raise ValueError(f"Parameter '{name}' is declared twice")
+            if slot in slots:
+                raise ValueError(f"Slot {slot} is used by more than one parameter")
+            names.add(name)
+            slots.add(slot)
+            params.append(StrategyParam(name=name, slot=slot, unit=unit))
+
+        if not params:
+            raise ValueError("Template declares no parameters (expected '// @param <name> <slot> [bps|wad]')")
+        return cls(source=source, params=tuple(params))
+
+    @property
+    def names(self) -> list[str]:
+        return [p.name for p in self.params]
+
+    def encode(self, values: Mapping[str, ParamValue]) -> list[tuple[int, int]]:
+        """Convert a parameter set into (slot, value) storage writes.
+
+        Raises:
+            ValueError: If a parameter is missing or unknown, or a value is invalid
+        """
+        unknown = set(values) - set(self.names)
+        if unknown:
+            raise ValueError(f"Unknown parameters: {sorted(unknown)}")
+        missing = [name for name in self.names if name not in values]
+        if missing:
+            raise ValueError(f"Missing values for parameters: {missing}")
+        return [(p.slot, p.encode(values[p.name])) for p in self.params]
+
+    def label(self, values: Mapping[str, ParamValue]) -> str:
+        """Short human-readable name for a parameter set."""
+        return ",".join(f"{name}={values[name]}" for name in self.names)
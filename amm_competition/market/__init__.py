@@ -4,10 +4,13 @@ from amm_competition.market.price_process import GBMPriceProcess
 from amm_competition.market.arbitrageur import Arbitrageur
 from amm_competition.market.retail import RetailTrader
 from amm_competition.market.router import OrderRouter
+from amm_competition.market.tape import MarketTapeReader, TapeScenario
 
 __all__ = [
     "GBMPriceProcess",
     "Arbitrageur",
     "RetailTrader",
     "OrderRouter",
+    "MarketTapeReader",
+    "TapeScenario",
 ]
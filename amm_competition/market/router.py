@@ -26,7 +26,8 @@ class OrderRouter:
     the trader and creates fair competition between AMMs based on their fees.
 
     For constant product AMMs (xy=k), the optimal split can be computed
-    analytically rather than using numerical methods.
+    analytically rather than using numerical methods: in closed form for two
+    AMMs, and by water-filling in O(N log N) for more.
     """
 
     def compute_optimal_split_buy(
@@ -46,6 +47,8 @@ class OrderRouter:
         A_i = sqrt(x_i * γ_i * y_i), r = A_1/A_2
         Δy_1* = (r * (y_2 + γ_2 * Y) - y_1) / (γ_1 + r * γ_2)
 
+        For more AMMs, water-fill on the same A_i (see `_water_fill`).
+
         Args:
             amms: List of AMMs to split across
             total_y: Total Y amount to spend
@@ -62,17 +65,12 @@ class OrderRouter:
         if len(amms) == 2:
             return self._split_buy_two_amms(amms[0], amms[1], total_y)
 
-        # For >2 AMMs, use iterative pairwise splitting
-        # (This is a simplification - true optimal would require solving simultaneously)
-        remaining = total_y
-        splits = []
-        for i, amm in enumerate(amms[:-1]):
-            # Split between this AMM and "the rest" (approximated by next AMM)
-            pair_split = self._split_buy_two_amms(amm, amms[i + 1], remaining)
-            splits.append(pair_split[0])
-            remaining = pair_split[1][1]
-        splits.append((amms[-1], remaining))
-        return splits
+        pools = [
+            (float(amm.reserve_y), float(amm.reserve_x), float(amm.current_fees.ask_fee))
+            for amm in amms
+        ]
+        amounts = self._water_fill(pools, float(total_y))
+        return [(amm, Decimal(str(amount))) for amm, amount in zip(amms, amounts)]
 
     def _split_buy_two_amms(
         self, amm1: AMM, amm2: AMM, total_y: Decimal
@@ -134,6 +132,8 @@ class OrderRouter:
         B_i = sqrt(y_i * γ_i * x_i), r = B_1/B_2
         Δx_1* = (r * (x_2 + γ_2 * X) - x_1) / (γ_1 + r * γ_2)
 
+        For more AMMs, water-fill on the same B_i (see `_water_fill`).
+
         Args:
             amms: List of AMMs to split across
             total_x: Total X amount to sell
@@ -150,15 +150,12 @@ class OrderRouter:
         if len(amms) == 2:
             return self._split_sell_two_amms(amms[0], amms[1], total_x)
 
-        # For >2 AMMs, use iterative pairwise splitting
-        remaining = total_x
-        splits = []
-        for i, amm in enumerate(amms[:-1]):
-            pair_split = self._split_sell_two_amms(amm, amms[i + 1], remaining)
-            splits.append(pair_split[0])
-            remaining = pair_split[1][1]
-        splits.append((amms[-1], remaining))
-        return splits
+        pools = [
+            (float(amm.reserve_x), float(amm.reserve_y), float(amm.current_fees.bid_fee))
+            for amm in amms
+        ]
+        amounts = self._water_fill(pools, float(total_x))
+        return [(amm, Decimal(str(amount))) for amm, amount in zip(amms, amounts)]
 
     def _split_sell_two_amms(
         self, amm1: AMM, amm2: AMM, total_x: Decimal
@@ -203,6 +200,46 @@ class OrderRouter:
 
         return [(amm1, Decimal(str(x1_amount))), (amm2, Decimal(str(x2_amount)))]
 
+    @staticmethod
+    def _water_fill(
+        pools: list[tuple[float, float, float]], total: float
+    ) -> list[float]:
+        """Split `total` input across any number of pools at equal marginal price.
+
+        Each pool is (reserve_in, reserve_out, fee). With γ_i = 1 - f_i and
+        D_i = sqrt(γ_i * x_i * y_i), the square root of a pool's marginal
+        price after taking Δ_i is (r_i + γ_i * Δ_i) / D_i. Every pool that
+        trades ends at a common level s:
+        Δ_i = (s * D_i - r_i) / γ_i, s = (total + Σ r_i/γ_i) / Σ D_i/γ_i
+        Pools join in order of r_i / D_i while s exceeds it; the rest take
+        nothing. Uses float internally, like the two-AMM splits.
+        """
+        candidates = []
+        for i, (reserve_in, reserve_out, fee) in enumerate(pools):
+            gamma = 1.0 - fee
+            if gamma <= 0:
+                continue
+            depth = math.sqrt(reserve_in * gamma * reserve_out)
+            if depth > 0:
+                candidates.append((reserve_in / depth, i, reserve_in, depth, gamma))
+        candidates.sort()
+
+        # Grow the active set until the level no longer reaches the next pool
+        sum_in = sum_depth = level = 0.0
+        active = 0
+        for threshold, _, reserve_in, depth, gamma in candidates:
+            if active and level <= threshold:
+                break
+            sum_in += reserve_in / gamma
+            sum_depth += depth / gamma
+            level = (total + sum_in) / sum_depth
+            active += 1
+
+        amounts = [0.0] * len(pools)
+        for _, i, reserve_in, depth, gamma in candidates[:active]:
+            amounts[i] = max(0.0, min(total, (level * depth - reserve_in) / gamma))
+        return amounts
+
     def route_order(
         self,
         order: RetailOrder,
@@ -0,0 +1,147 @@
+"""Read market tapes written by ``amm_sim_rs.MarketTape.save``.
+
+A tape holds, per seed, the fair-price path and retail order stream of a
+simulation. Arrays are memory-mapped, so opening a large tape is cheap and
+only the scenarios actually inspected are paged in. The file layout is
+documented in ``amm_sim_rs/src/market/tape.rs``.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Union
+
+import numpy as np
+
+MAGIC = b"AMMTAPE\0"
+VERSION = 1
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("n_scenarios", "<u4"),
+    ("reserved", "V16"),
+])
+
+ENTRY_DTYPE = np.dtype([
+    ("seed", "<u8"),
+    ("n_steps", "<u8"),
+    ("n_orders", "<u8"),
+    ("initial_price", "<f8"),
+    ("gbm_mu", "<f8"),
+    ("gbm_sigma", "<f8"),
+    ("gbm_dt", "<f8"),
+    ("retail_arrival_rate", "<f8"),
+    ("retail_mean_size", "<f8"),
+    ("retail_size_sigma", "<f8"),
+    ("retail_buy_prob", "<f8"),
+    ("prices_at", "<u8"),
+    ("offsets_at", "<u8"),
+    ("sides_at", "<u8"),
+    ("sizes_at", "<u8"),
+])
+
+# Market config fields recorded for each scenario
+PARAM_FIELDS = (
+    "initial_price",
+    "gbm_mu",
+    "gbm_sigma",
+    "gbm_dt",
+    "retail_arrival_rate",
+    "retail_mean_size",
+    "retail_size_sigma",
+    "retail_buy_prob",
+)
+
+SIDE_BUY = 0
+SIDE_SELL = 1
+
+
+@dataclass(frozen=True)
+class TapeScenario:
+    """One seed's market; arrays are read-only views into the tape file."""
+    seed: int
+    params: dict[str, float]
+    # Fair price after each step, shape (n_steps,)
+    prices: np.ndarray
+    # Orders for step t are [order_offsets[t], order_offsets[t + 1])
+    order_offsets: np.ndarray
+    # 0 = buy, 1 = sell (trader's perspective, re: X)
+    sides: np.ndarray
+    # Order sizes in Y
+    sizes: np.ndarray
+
+    @property
+    def n_steps(self) -> int:
+        return len(self.prices)
+
+    @property
+    def initial_price(self) -> float:
+        return self.params["initial_price"]
+
+    def orders(self, step: int) -> tuple[np.ndarray, np.ndarray]:
+        """(sides, sizes) of the retail orders arriving at ``step``."""
+        start, end = self.order_offsets[step], self.order_offsets[step + 1]
+        return self.sides[start:end], self.sizes[start:end]
+
+
+class MarketTapeReader:
+    """Memory-mapped view of a tape file.
+
+    Raises:
+        ValueError: If the file is not a tape or uses an unknown version
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._data = np.memmap(self.path, dtype=np.uint8, mode="r")
+        if len(self._data) < HEADER_DTYPE.itemsize:
+            raise ValueError(f"{self.path} is too short to be a market tape")
+
+        header = np.frombuffer(self._data, dtype=HEADER_DTYPE, count=1)[0]
+        if bytes(header["magic"]).ljust(8, b"\0") != MAGIC:
+            raise ValueError(f"{self.path} is not a market tape")
+        if header["version"] != VERSION:
+            raise ValueError(f"Unsupported tape version {header['version']}")
+
+        self.index = np.frombuffer(
+            self._data,
+            dtype=ENTRY_DTYPE,
+            count=int(header["n_scenarios"]),
+            offset=HEADER_DTYPE.itemsize,
+        )
+        self._positions = {int(seed): i for i, seed in enumerate(self.index["seed"])}
+
+    @property
+    def seeds(self) -> list[int]:
+        return [int(seed) for seed in self.index["seed"]]
+
+    def _array(self, dtype: str, offset: int, count: int) -> np.ndarray:
+        return np.frombuffer(self._data, dtype=dtype, count=count, offset=offset)
+
+    def __getitem__(self, i: int) -> TapeScenario:
+        entry = self.index[i]
+        n_steps = int(entry["n_steps"])
+        n_orders = int(entry["n_orders"])
+        return TapeScenario(
+            seed=int(entry["seed"]),
+            params={name: float(entry[name]) for name in PARAM_FIELDS},
+            prices=self._array("<f8", int(entry["prices_at"]), n_steps),
+            order_offsets=self._array("<u4", int(entry["offsets_at"]), n_steps + 1),
+            sides=self._array("u1", int(entry["sides_at"]), n_orders),
+            sizes=self._array("<f8", int(entry["sizes_at"]), n_orders),
+        )
+
+    def scenario(self, seed: int) -> TapeScenario:
+        """The scenario for ``seed``.
+
+        Raises:
+            KeyError: If the seed is not on the tape
+        """
+        return self[self._positions[seed]]
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __iter__(self) -> Iterator[TapeScenario]:
+        for i in range(len(self)):
+            yield self[i]
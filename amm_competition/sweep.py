@@ -0,0 +1,230 @@
+"""In-process strategy sweeps.
+
+Evaluates many strategies in one process with one simulation pool and one
+compiled normalizer, instead of invoking ``amm-match run`` per candidate.
+Two modes are supported:
+
+- a parameterized template (see ``amm_competition.evm.params``) evaluated
+  over a grid of parameter values, compiled once;
+- a list of Solidity source files, each validated and compiled separately.
+
+All candidates in a sweep share seeds and market scenarios, so their edges
+are directly comparable.
+"""
+
+import csv
+import itertools
+import math
+import sys
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Iterable, Mapping, Optional, Sequence, TextIO
+
+import numpy as np
+
+from amm_competition.competition.match import CandidateComparison, MatchRunner
+from amm_competition.evm.adapter import EVMStrategyAdapter
+from amm_competition.evm.compiler import SolidityCompiler
+from amm_competition.evm.params import ParamValue, StrategyTemplate
+from amm_competition.evm.validator import SolidityValidator
+
+
+@dataclass
+class SweepRow:
+    """Summary of one candidate across all seeds."""
+    label: str
+    mean_edge: float
+    std_error: float
+    mean_normalizer_edge: float
+    mean_pnl: float
+    params: dict[str, ParamValue] = field(default_factory=dict)
+
+
+@dataclass
+class SweepResult:
+    """Sweep outcome: rows sorted by mean edge (best first)."""
+    rows: list[SweepRow]
+    param_names: list[str] = field(default_factory=list)
+    # Candidates that failed validation or compilation, with their errors
+    failures: dict[str, list[str]] = field(default_factory=dict)
+    comparison: Optional[CandidateComparison] = None
+
+    @property
+    def best(self) -> Optional[SweepRow]:
+        return self.rows[0] if self.rows else None
+
+
+def parse_grid(specs: Iterable[str]) -> dict[str, list[str]]:
+    """Parse ``name=v1,v2,...`` specs into a parameter grid.
+
+    Raises:
+        ValueError: If a spec is malformed or a name repeats
+    """
+    grid: dict[str, list[str]] = {}
+    for spec in specs:
+        name, sep, values = spec.partition("=")
+        name = name.strip()
+        items = [v.strip() for v in values.split(",") if v.strip()]
+        if not sep or not name or not items:
+            raise ValueError(f"Invalid grid spec '{spec}' (expected name=v1,v2,...)")
+        if name in grid:
+            raise ValueError(f"Parameter '{name}' appears in more than one grid spec")
+        grid[name] = items
+    return grid
+
+
+def expand_grid(grid: Mapping[str, Sequence[ParamValue]]) -> list[dict[str, ParamValue]]:
+    """Cartesian product of a grid, in row-major order."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def _rows(
+    comparison: CandidateComparison,
+    parameter_sets: Optional[list[Mapping[str, ParamValue]]] = None,
+) -> list[SweepRow]:
+    n_seeds = comparison.edges.shape[0]
+    mean_edges = comparison.edges.mean(axis=0)
+    if n_seeds > 1:
+        std_errors = comparison.edges.std(axis=0, ddof=1) / math.sqrt(n_seeds)
+    else:
+        std_errors = np.full(len(comparison.candidates), math.nan)
+    mean_normalizer = comparison.normalizer_edges.mean(axis=0)
+    mean_pnl = comparison.pnl.mean(axis=0)
+
+    rows = [
+        SweepRow(
+            label=label,
+            mean_edge=float(mean_edges[i]),
+            std_error=float(std_errors[i]),
+            mean_normalizer_edge=float(mean_normalizer[i]),
+            mean_pnl=float(mean_pnl[i]),
+            params=dict(parameter_sets[i]) if parameter_sets is not None else {},
+        )
+        for i, label in enumerate(comparison.candidates)
+    ]
+    rows.sort(key=lambda row: row.mean_edge, reverse=True)
+    return rows
+
+
+def _check(source: str, validator: SolidityValidator) -> list[str]:
+    validation = validator.validate(source)
+    return [] if validation.valid else list(validation.errors)
+
+
+def sweep_template(
+    runner: MatchRunner,
+    source: str,
+    parameter_sets: list[Mapping[str, ParamValue]],
+    normalizer: EVMStrategyAdapter,
+    compiler: Optional[SolidityCompiler] = None,
+) -> SweepResult:
+    """Evaluate a parameterized template over ``parameter_sets``.
+
+    The template is validated and compiled once and deployed once; each
+    parameter set is injected into storage.
+
+    Raises:
+        ValueError: If the template or a parameter set is invalid
+        RuntimeError: If the template fails validation or compilation
+    """
+    template = StrategyTemplate.from_source(source)
+    # Encode up front so a bad value fails before any simulation runs
+    for values in parameter_sets:
+        template.encode(values)
+
+    errors = _check(source, SolidityValidator())
+    if errors:
+        raise RuntimeError(f"Template validation failed: {'; '.join(errors)}")
+    compilation = (compiler or SolidityCompiler()).compile(source)
+    if not compilation.success:
+        raise RuntimeError(f"Template compilation failed: {'; '.join(compilation.errors or [])}")
+
+    comparison = runner.compare_parameters(
+        template, compilation.bytecode, parameter_sets, normalizer
+    )
+    return SweepResult(
+        rows=_rows(comparison, parameter_sets),
+        param_names=template.names,
+        comparison=comparison,
+    )
+
+
+def sweep_sources(
+    runner: MatchRunner,
+    sources: Mapping[str, str],
+    normalizer: EVMStrategyAdapter,
+    compiler: Optional[SolidityCompiler] = None,
+) -> SweepResult:
+    """Evaluate several strategy sources, keyed by label.
+
+    Sources that fail validation or compilation are reported in
+    ``failures`` and skipped; the rest run as one batch.
+    """
+    compiler = compiler or SolidityCompiler()
+    validator = SolidityValidator()
+    candidates: list[EVMStrategyAdapter] = []
+    labels: list[str] = []
+    failures: dict[str, list[str]] = {}
+
+    for label, source in sources.items():
+        errors = _check(source, validator)
+        if errors:
+            failures[label] = errors
+            continue
+        compilation = compiler.compile(source)
+        if not compilation.success:
+            failures[label] = list(compilation.errors or [])
+            continue
+        candidates.append(EVMStrategyAdapter(bytecode=compilation.bytecode, abi=compilation.abi))
+        labels.append(label)
+
+    if not candidates:
+        return SweepResult(rows=[], failures=failures)
+
+    # Label rows by source rather than by getName(), which may repeat
+    comparison = replace(runner.compare_candidates(candidates, normalizer), candidates=labels)
+    return SweepResult(rows=_rows(comparison), failures=failures, comparison=comparison)
+
+
+def _table(result: SweepResult) -> tuple[list[str], list[list[str]]]:
+    header = ["rank", "label", *result.param_names,
+              "mean_edge", "std_error", "mean_normalizer_edge", "mean_pnl"]
+    body = [
+        [
+            str(rank),
+            row.label,
+            *(str(row.params.get(name, "")) for name in result.param_names),
+            f"{row.mean_edge:.4f}",
+            f"{row.std_error:.4f}",
+            f"{row.mean_normalizer_edge:.4f}",
+            f"{row.mean_pnl:.4f}",
+        ]
+        for rank, row in enumerate(result.rows, start=1)
+    ]
+    return header, body
+
+
+def write_table(result: SweepResult, out: TextIO, delimiter: str = ",") -> None:
+    """Write the results as CSV (or TSV with ``delimiter="\\t"``)."""
+    header, body = _table(result)
+    writer = csv.writer(out, delimiter=delimiter, lineterminator="\n")
+    writer.writerow(header)
+    writer.writerows(body)
+
+
+def save_table(result: SweepResult, path: Path) -> None:
+    """Write the results to ``path``; ``.tsv`` files are tab-separated."""
+    delimiter = "\t" if path.suffix == ".tsv" else ","
+    with path.open("w", newline="") as f:
+        write_table(result, f, delimiter=delimiter)
+
+
+def print_table(result: SweepResult, limit: Optional[int] = None, out: TextIO = sys.stdout) -> None:
+    """Print an aligned results table (top ``limit`` rows)."""
+    header, body = _table(result)
+    if limit is not None:
+        body = body[:limit]
+    widths = [max(len(cell) for cell in column) for column in zip(header, *body)]
+    for line in [header, *body]:
+        print("  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip(), file=out)
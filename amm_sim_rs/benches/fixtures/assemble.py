@@ -0,0 +1,254 @@
+"""Assemble the strategy bytecode fixtures used by the Rust benchmarks.
+
+Each fixture is deployment bytecode (hex, one line) for a contract with the
+strategy ABI of ``contracts/src/IAMMStrategy.sol``: it dispatches on the
+``afterInitialize``, ``afterSwap`` and ``getName`` selectors and returns the
+same fees and name as the Solidity contract it is named after. The fixtures
+are assembled rather than compiled so that benchmarks need no solc and the
+checked-in bytes never change with the compiler version.
+
+    python amm_sim_rs/benches/fixtures/assemble.py
+
+rewrites ``vanilla.hex``, ``starter.hex`` and ``dir_contrarian.hex`` next to
+this file.
+"""
+
+from itertools import count
+from pathlib import Path
+
+WAD = 10**18
+BPS = 10**14
+MAX_FEE = WAD // 10
+
+SELECTOR_AFTER_INITIALIZE = 0x837AEF47
+SELECTOR_AFTER_SWAP = 0xC2BABB57
+SELECTOR_GET_NAME = 0x17D7DE7C
+
+# Calldata offsets of the afterSwap TradeInfo fields
+IS_BUY = 4
+AMOUNT_Y = 68
+RESERVE_Y = 164
+
+OPCODES = {
+    "STOP": 0x00, "ADD": 0x01, "MUL": 0x02, "DIV": 0x04,
+    "LT": 0x10, "GT": 0x11, "EQ": 0x14, "ISZERO": 0x15, "SHR": 0x1C,
+    "CALLDATALOAD": 0x35, "CODECOPY": 0x39,
+    "POP": 0x50, "MSTORE": 0x52, "SLOAD": 0x54, "SSTORE": 0x55,
+    "JUMP": 0x56, "JUMPI": 0x57, "JUMPDEST": 0x5B,
+    "DUP1": 0x80, "DUP2": 0x81, "DUP3": 0x82, "DUP4": 0x83,
+    "SWAP1": 0x90, "SWAP2": 0x91,
+    "RETURN": 0xF3, "REVERT": 0xFD,
+}
+
+_labels = count()
+
+
+def label(prefix: str) -> str:
+    """A fresh label name."""
+    return f"{prefix}_{next(_labels)}"
+
+
+def push(value: int) -> tuple:
+    return ("push", value)
+
+
+def push_label(name: str) -> tuple:
+    return ("push_label", name)
+
+
+def jumpdest(name: str) -> tuple:
+    return ("label", name)
+
+
+def assemble(program: list) -> bytes:
+    """Encode a program of mnemonics, pushes and labels.
+
+    Label references are always PUSH2, so offsets are known in one pass.
+    """
+    offsets = {}
+    size = 0
+    for item in program:
+        if isinstance(item, str):
+            size += 1
+        elif item[0] == "push":
+            size += 1 + max(1, (item[1].bit_length() + 7) // 8)
+        elif item[0] == "push_label":
+            size += 3
+        else:
+            offsets[item[1]] = size
+            size += 1
+
+    code = bytearray()
+    for item in program:
+        if isinstance(item, str):
+            code.append(OPCODES[item])
+        elif item[0] == "push":
+            width = max(1, (item[1].bit_length() + 7) // 8)
+            code.append(0x5F + width)
+            code += item[1].to_bytes(width, "big")
+        elif item[0] == "push_label":
+            code.append(0x61)
+            code += offsets[item[1]].to_bytes(2, "big")
+        else:
+            code.append(OPCODES["JUMPDEST"])
+    return bytes(code)
+
+
+def deployer(runtime: bytes) -> bytes:
+    """Init code that returns `runtime` as the contract code."""
+    # PUSH2 len, DUP1, PUSH2 13, PUSH1 0, CODECOPY, PUSH1 0, RETURN
+    header = (
+        bytes([0x61]) + len(runtime).to_bytes(2, "big")
+        + bytes([0x80, 0x61, 0x00, 0x0D, 0x60, 0x00, 0x39, 0x60, 0x00, 0xF3])
+    )
+    assert len(header) == 13
+    return header + runtime
+
+
+def revert() -> list:
+    return [push(0), "DUP1", "REVERT"]
+
+
+def checked_mul() -> list:
+    """[x, y] -> [x * y], reverting on overflow like Solidity 0.8."""
+    ok = label("mul_ok")
+    return [
+        "DUP2", "DUP2", "MUL",                          # p x y
+        "DUP2", "ISZERO", push_label(ok), "JUMPI",
+        "DUP2", "DUP2", "DIV", "DUP4", "EQ", push_label(ok), "JUMPI",
+        *revert(),
+        jumpdest(ok), "SWAP2", "POP", "POP",
+    ]
+
+
+def checked_add() -> list:
+    """[x, y] -> [x + y], reverting on overflow."""
+    ok = label("add_ok")
+    return [
+        "DUP2", "ADD",                                  # s y
+        "DUP2", "DUP2", "LT", "ISZERO", push_label(ok), "JUMPI",
+        *revert(),
+        jumpdest(ok), "SWAP1", "POP",
+    ]
+
+
+def div_by(divisor: int) -> list:
+    """[x] -> [x / divisor]."""
+    return [push(divisor), "SWAP1", "DIV"]
+
+
+def maximum() -> list:
+    """[a, b] -> [max(a, b)]."""
+    take_b, end = label("max_b"), label("max_end")
+    return [
+        "DUP2", "DUP2", "LT", push_label(take_b), "JUMPI",
+        "SWAP1", "POP", push_label(end), "JUMP",
+        jumpdest(take_b), "POP",
+        jumpdest(end),
+    ]
+
+
+def minimum() -> list:
+    """[a, b] -> [min(a, b)]."""
+    take_b, end = label("min_b"), label("min_end")
+    return [
+        "DUP2", "DUP2", "GT", push_label(take_b), "JUMPI",
+        "SWAP1", "POP", push_label(end), "JUMP",
+        jumpdest(take_b), "POP",
+        jumpdest(end),
+    ]
+
+
+def return_pair() -> list:
+    """[a, b] -> return abi.encode(a, b)."""
+    return [push(0), "MSTORE", push(0x20), "MSTORE", push(0x40), push(0), "RETURN"]
+
+
+def return_name(name: str) -> list:
+    """Return `name` ABI-encoded as a string."""
+    data = name.encode()
+    assert len(data) <= 32
+    return [
+        push(0x20), push(0), "MSTORE",
+        push(len(data)), push(0x20), "MSTORE",
+        push(int.from_bytes(data.ljust(32, b"\0"), "big")), push(0x40), "MSTORE",
+        push(0x60), push(0), "RETURN",
+    ]
+
+
+def dispatch(after_initialize: list, after_swap: list, name: str) -> bytes:
+    """Runtime code routing the three strategy selectors to their bodies."""
+    init, swap, get_name = label("init"), label("swap"), label("name")
+    return assemble([
+        push(0), "CALLDATALOAD", push(0xE0), "SHR",
+        "DUP1", push(SELECTOR_AFTER_SWAP), "EQ", push_label(swap), "JUMPI",
+        "DUP1", push(SELECTOR_AFTER_INITIALIZE), "EQ", push_label(init), "JUMPI",
+        "DUP1", push(SELECTOR_GET_NAME), "EQ", push_label(get_name), "JUMPI",
+        *revert(),
+        jumpdest(init), *after_initialize,
+        jumpdest(swap), *after_swap,
+        jumpdest(get_name), *return_name(name),
+    ])
+
+
+def constant_fee(fee: int, name: str) -> bytes:
+    """VanillaStrategy / StarterStrategy: fixed fees, no storage."""
+    body = [push(fee), push(fee), *return_pair()]
+    return deployer(dispatch(body, body, name))
+
+
+def dir_contrarian() -> bytes:
+    """The DirContrarian spike/decay rule of my_strategy.sol (slots 0 and 1)."""
+    base = 24 * BPS
+    after_initialize = [
+        push(base), "DUP1", push(0), "SSTORE", "DUP1", push(1), "SSTORE",
+        "DUP1", *return_pair(),
+    ]
+
+    nonzero, buy, store = label("nonzero"), label("buy"), label("store")
+    after_swap = [
+        # ratio = wdiv(amountY, reserveY)
+        push(WAD), push(AMOUNT_Y), "CALLDATALOAD", *checked_mul(),
+        push(RESERVE_Y), "CALLDATALOAD",
+        "DUP1", push_label(nonzero), "JUMPI", *revert(),
+        jumpdest(nonzero), "SWAP1", "DIV",                          # ratio
+        # fresh = base + ratio * 5 / 4 + wmul(ratio, ratio) * 15
+        push(5), "DUP2", *checked_mul(), *div_by(4),                # lin ratio
+        "DUP2", "DUP1", *checked_mul(), *div_by(WAD),
+        push(15), *checked_mul(),                                   # quad lin ratio
+        *checked_add(), push(base), *checked_add(),                 # fresh ratio
+        "SWAP1", "POP",                                             # fresh
+        # decayed = max(fee * 8 / 9, base)
+        push(0), "SLOAD", push(8), *checked_mul(), *div_by(9), push(base), *maximum(),
+        push(1), "SLOAD", push(8), *checked_mul(), *div_by(9), push(base), *maximum(),
+        # stack: decayedAsk decayedBid fresh
+        push(IS_BUY), "CALLDATALOAD", push_label(buy), "JUMPI",
+        # AMM sold X: spike bid, decay ask
+        "SWAP1", "DUP3", *maximum(), "SWAP1", push_label(store), "JUMP",
+        # AMM bought X: spike ask, decay bid
+        jumpdest(buy), "DUP3", *maximum(),
+        # stack: ask bid fresh
+        jumpdest(store),
+        push(MAX_FEE), *minimum(), "SWAP1", push(MAX_FEE), *minimum(),
+        "DUP1", push(0), "SSTORE", "DUP1", push(0), "MSTORE", "POP",
+        "DUP1", push(1), "SSTORE", push(0x20), "MSTORE",
+        push(0x40), push(0), "RETURN",
+    ]
+    return deployer(dispatch(after_initialize, after_swap, "DirContrarian"))
+
+
+FIXTURES = {
+    "vanilla.hex": lambda: constant_fee(30 * BPS, "Vanilla_30bps"),
+    "starter.hex": lambda: constant_fee(50 * BPS, "StarterStrategy"),
+    "dir_contrarian.hex": dir_contrarian,
+}
+
+
+def main() -> None:
+    here = Path(__file__).parent
+    for filename, build in FIXTURES.items():
+        (here / filename).write_text(build().hex() + "\n")
+
+
+if __name__ == "__main__":
+    main()
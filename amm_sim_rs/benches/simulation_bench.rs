@@ -1,9 +1,42 @@
 //! Benchmarks for the simulation engine.
 
-use criterion::{black_box, criterion_group, criterion_main, Criterion};
+use criterion::{black_box, criterion_group, criterion_main, Criterion, Throughput};
 
-// Note: Full benchmarks require compiled Solidity bytecode.
-// These benchmarks test the non-EVM components.
+// Strategy bytecode fixtures with the full strategy ABI (selector dispatch,
+// getName). Regenerate with `python benches/fixtures/assemble.py`.
+
+/// VanillaStrategy: constant 30 bps.
+const VANILLA_INITCODE: &str = include_str!("fixtures/vanilla.hex");
+/// StarterStrategy: constant 50 bps.
+const STARTER_INITCODE: &str = include_str!("fixtures/starter.hex");
+/// DirContrarian (my_strategy.sol): spike/decay with two SLOADs, two SSTOREs
+/// and checked arithmetic on every call.
+const DIR_CONTRARIAN_INITCODE: &str = include_str!("fixtures/dir_contrarian.hex");
+
+fn decode_hex(hex: &str) -> Vec<u8> {
+    let hex = hex.trim();
+    (0..hex.len())
+        .step_by(2)
+        .map(|i| u8::from_str_radix(&hex[i..i + 2], 16).unwrap())
+        .collect()
+}
+
+fn bench_config(n_steps: u32, seed: u64) -> amm_sim_rs::types::config::SimulationConfig {
+    amm_sim_rs::types::config::SimulationConfig {
+        n_steps,
+        initial_price: 100.0,
+        initial_x: 100.0,
+        initial_y: 10000.0,
+        gbm_mu: 0.0,
+        gbm_sigma: 0.001,
+        gbm_dt: 1.0,
+        retail_arrival_rate: 0.8,
+        retail_mean_size: 20.0,
+        retail_size_sigma: 1.2,
+        retail_buy_prob: 0.5,
+        seed: Some(seed),
+    }
+}
 
 fn benchmark_wad_operations(c: &mut Criterion) {
     use amm_sim_rs::types::wad::Wad;
@@ -60,19 +93,225 @@ fn benchmark_trade_info_encoding(c: &mut Criterion) {
 fn benchmark_retail_trader(c: &mut Criterion) {
     use amm_sim_rs::market::RetailTrader;
 
-    let mut trader = RetailTrader::new(5.0, 2.0, 0.5, Some(42));
+    let mut trader = RetailTrader::new(5.0, 2.0, 0.5, 0.5, Some(42));
 
     c.bench_function("retail_generate_orders", |bench| {
         bench.iter(|| black_box(trader.generate_orders()))
     });
 }
 
+fn sample_trade() -> amm_sim_rs::types::trade_info::TradeInfo {
+    use amm_sim_rs::types::trade_info::TradeInfo;
+    use amm_sim_rs::types::wad::Wad;
+
+    TradeInfo::new(
+        true,
+        Wad::from_f64(1.5),
+        Wad::from_f64(1.5),
+        100,
+        Wad::from_f64(1001.5),
+        Wad::from_f64(998.5),
+    )
+}
+
+/// Compare afterSwap throughput of the persistent EVM against the previous
+/// approach of building a fresh `Evm` for every call, and against a native
+/// strategy.
+fn benchmark_evm_after_swap(c: &mut Criterion) {
+    use amm_sim_rs::evm::EVMStrategy;
+    use amm_sim_rs::strategy::NativeStrategySpec;
+    use amm_sim_rs::types::wad::Wad;
+    use revm::{
+        primitives::{AccountInfo, Address, Bytes, ExecutionResult, Output, TxKind, U256},
+        Evm, InMemoryDB,
+    };
+
+    let initcode = decode_hex(VANILLA_INITCODE);
+    let trade = sample_trade();
+
+    let mut group = c.benchmark_group("evm_after_swap");
+    group.throughput(Throughput::Elements(1));
+
+    let mut strategy = EVMStrategy::new(initcode.clone(), "Bench".to_string()).unwrap();
+    group.bench_function("persistent", |bench| {
+        bench.iter(|| black_box(strategy.after_swap(black_box(&trade)).unwrap()))
+    });
+
+    for (name, hex) in [("starter", STARTER_INITCODE), ("dir_contrarian", DIR_CONTRARIAN_INITCODE)] {
+        let mut strategy = EVMStrategy::new(decode_hex(hex), "Bench".to_string()).unwrap();
+        strategy.after_initialize(Wad::from_f64(100.0), Wad::from_f64(10000.0)).unwrap();
+        group.bench_function(name, |bench| {
+            bench.iter(|| black_box(strategy.after_swap(black_box(&trade)).unwrap()))
+        });
+    }
+
+    // The same fee rule evaluated natively, without the EVM
+    let mut native = NativeStrategySpec::constant_fee(Wad::from_bps(30), Wad::from_bps(30), "Bench".to_string())
+        .instantiate();
+    group.bench_function("native", |bench| {
+        bench.iter(|| black_box(native.after_swap(black_box(&trade)).unwrap()))
+    });
+
+    // Rebuild-per-call baseline
+    let caller = Address::with_last_byte(2);
+    let mut db = InMemoryDB::default();
+    db.insert_account_info(caller, AccountInfo { balance: U256::MAX, ..Default::default() });
+    let address = {
+        let mut evm = Evm::builder()
+            .with_db(&mut db)
+            .modify_tx_env(|tx| {
+                tx.caller = caller;
+                tx.transact_to = TxKind::Create;
+                tx.data = Bytes::from(initcode.clone());
+                tx.gas_limit = 10_000_000;
+            })
+            .build();
+        match evm.transact_commit().unwrap() {
+            ExecutionResult::Success { output: Output::Create(_, Some(address)), .. } => address,
+            other => panic!("deployment failed: {:?}", other),
+        }
+    };
+    let mut calldata = [0u8; 196];
+    trade.encode_calldata(&mut calldata);
+
+    group.bench_function("rebuild_per_call", |bench| {
+        bench.iter(|| {
+            let mut evm = Evm::builder()
+                .with_db(&mut db)
+                .modify_tx_env(|tx| {
+                    tx.caller = caller;
+                    tx.transact_to = TxKind::Call(address);
+                    tx.data = Bytes::copy_from_slice(&calldata);
+                    tx.gas_limit = 250_000;
+                })
+                .build();
+            black_box(evm.transact_commit().unwrap())
+        })
+    });
+
+    group.finish();
+}
+
+/// Per-simulation setup: full deployment vs. instantiating from a snapshot.
+fn benchmark_strategy_setup(c: &mut Criterion) {
+    use amm_sim_rs::evm::{EVMStrategy, StrategySnapshot};
+
+    let initcode = decode_hex(VANILLA_INITCODE);
+    let snapshot = StrategySnapshot::deploy(&initcode, "Bench".to_string()).unwrap();
+
+    let mut group = c.benchmark_group("strategy_setup");
+    group.bench_function("deploy", |bench| {
+        bench.iter(|| black_box(EVMStrategy::new(initcode.clone(), "Bench".to_string()).unwrap()))
+    });
+    group.bench_function("snapshot_instantiate", |bench| {
+        bench.iter(|| black_box(snapshot.instantiate()))
+    });
+    group.finish();
+}
+
+/// Market generation per step: sampling live vs. replaying a tape.
+fn benchmark_market_feed(c: &mut Criterion) {
+    use amm_sim_rs::market::scenario::LiveFeed;
+    use amm_sim_rs::market::{MarketFeed, MarketTape};
+
+    let config = bench_config(10_000, 1);
+    let tape = MarketTape::generate(std::slice::from_ref(&config)).unwrap();
+    let scenario = tape.scenario_for(&config).unwrap();
+
+    let mut group = c.benchmark_group("market_feed");
+    group.throughput(Throughput::Elements(config.n_steps as u64));
+    group.bench_function("live", |bench| {
+        bench.iter(|| {
+            let mut feed = LiveFeed::new(&config);
+            for _ in 0..config.n_steps {
+                black_box(feed.next_price());
+                black_box(feed.next_orders().len());
+            }
+        })
+    });
+    group.bench_function("tape_replay", |bench| {
+        bench.iter(|| {
+            let mut feed = scenario.replay();
+            for _ in 0..config.n_steps {
+                black_box(feed.next_price());
+                black_box(feed.next_orders().len());
+            }
+        })
+    });
+    group.finish();
+}
+
+/// Whole simulations: DirContrarian against the 30 bps normalizer.
+fn benchmark_engine_run(c: &mut Criterion) {
+    use amm_sim_rs::evm::StrategySnapshot;
+    use amm_sim_rs::simulation::SimulationEngine;
+
+    let submission = StrategySnapshot::deploy(&decode_hex(DIR_CONTRARIAN_INITCODE), "Submission".into()).unwrap();
+    let baseline = StrategySnapshot::deploy(&decode_hex(VANILLA_INITCODE), "Baseline".into()).unwrap();
+
+    let mut group = c.benchmark_group("engine_run");
+    group.sample_size(10);
+    for n_steps in [1_000u32, 10_000] {
+        let config = bench_config(n_steps, 1);
+        group.throughput(Throughput::Elements(n_steps as u64));
+        group.bench_function(format!("{}_steps", n_steps), |bench| {
+            bench.iter(|| {
+                let mut engine = SimulationEngine::new(config.clone()).with_step_capture(false);
+                black_box(
+                    engine
+                        .run(submission.instantiate().into(), baseline.instantiate().into())
+                        .unwrap(),
+                )
+            })
+        });
+    }
+    group.finish();
+}
+
+/// Batch throughput as the worker count grows.
+fn benchmark_parallel_scaling(c: &mut Criterion) {
+    use std::sync::Arc;
+
+    use amm_sim_rs::simulation::{run_simulations_parallel, SimulationBatchConfig};
+
+    let submission: Arc<[u8]> = decode_hex(DIR_CONTRARIAN_INITCODE).into();
+    let baseline: Arc<[u8]> = decode_hex(VANILLA_INITCODE).into();
+    let configs: Vec<_> = (0..32).map(|seed| bench_config(1_000, seed)).collect();
+
+    let mut group = c.benchmark_group("parallel_scaling");
+    group.sample_size(10);
+    group.throughput(Throughput::Elements(configs.len() as u64));
+    for n_workers in [1usize, 2, 4, 8] {
+        group.bench_function(format!("{}_workers", n_workers), |bench| {
+            bench.iter(|| {
+                black_box(
+                    run_simulations_parallel(SimulationBatchConfig {
+                        submission_bytecode: submission.clone(),
+                        baseline_bytecode: baseline.clone(),
+                        configs: configs.clone().into(),
+                        n_workers: Some(n_workers),
+                        capture_steps: false,
+                        profile: false,
+                    })
+                    .unwrap(),
+                )
+            })
+        });
+    }
+    group.finish();
+}
+
 criterion_group!(
     benches,
     benchmark_wad_operations,
     benchmark_price_process,
     benchmark_trade_info_encoding,
     benchmark_retail_trader,
+    benchmark_evm_after_swap,
+    benchmark_strategy_setup,
+    benchmark_market_feed,
+    benchmark_engine_run,
+    benchmark_parallel_scaling,
 );
 
 criterion_main!(benches);
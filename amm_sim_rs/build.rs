@@ -0,0 +1,57 @@
+//! Embeds a hash of the engine's sources as `AMM_ENGINE_BUILD`.
+//!
+//! Cached simulation results are keyed on it (see
+//! `amm_competition/competition/result_store.py`), so any change to the
+//! engine's code or dependencies invalidates them without a version bump.
+
+use std::env;
+use std::fs;
+use std::path::{Path, PathBuf};
+
+const FNV_OFFSET: u64 = 0xcbf2_9ce4_8422_2325;
+const FNV_PRIME: u64 = 0x0000_0100_0000_01b3;
+
+/// 64-bit FNV-1a, continued from `hash`.
+fn fnv1a(hash: u64, bytes: &[u8]) -> u64 {
+    bytes.iter().fold(hash, |hash, &byte| (hash ^ byte as u64).wrapping_mul(FNV_PRIME))
+}
+
+fn collect_files(dir: &Path, files: &mut Vec<PathBuf>) {
+    for entry in fs::read_dir(dir).expect("failed to read source directory") {
+        let path = entry.expect("failed to read source directory entry").path();
+        if path.is_dir() {
+            collect_files(&path, files);
+        } else {
+            files.push(path);
+        }
+    }
+}
+
+fn main() {
+    let root = PathBuf::from(env::var("CARGO_MANIFEST_DIR").expect("CARGO_MANIFEST_DIR is set by cargo"));
+
+    // A directory is rescanned for any change within it
+    let mut files = vec![root.join("Cargo.toml"), root.join("build.rs")];
+    for path in ["src", "Cargo.toml", "build.rs"] {
+        println!("cargo:rerun-if-changed={}", path);
+    }
+    let lock = root.join("Cargo.lock");
+    if lock.exists() {
+        println!("cargo:rerun-if-changed=Cargo.lock");
+        files.push(lock);
+    }
+    collect_files(&root.join("src"), &mut files);
+    files.sort();
+
+    // Relative paths with `/` keep the hash the same on every checkout
+    let mut hash = FNV_OFFSET;
+    for path in &files {
+        let relative = path.strip_prefix(&root).unwrap_or(path).to_string_lossy().replace('\\', "/");
+        let contents = fs::read(path).expect("failed to read source file");
+        hash = fnv1a(hash, relative.as_bytes());
+        hash = fnv1a(hash, &(contents.len() as u64).to_le_bytes());
+        hash = fnv1a(hash, &contents);
+    }
+
+    println!("cargo:rustc-env=AMM_ENGINE_BUILD={:016x}", hash);
+}
@@ -4,7 +4,10 @@
 //! into separate buckets rather than being reinvested into liquidity.
 //! This means fees count toward PnL but don't inflate the k constant.
 
-use crate::evm::EVMStrategy;
+use std::time::Instant;
+
+use crate::strategy::FeeStrategy;
+use crate::types::result::GasProfile;
 use crate::types::trade_info::TradeInfo;
 use crate::types::wad::Wad;
 
@@ -40,8 +43,8 @@ pub struct TradeResult {
 pub struct CFMM {
     /// Strategy name
     pub name: String,
-    /// EVM strategy for fee decisions
-    strategy: EVMStrategy,
+    /// Strategy for fee decisions
+    strategy: FeeStrategy,
     /// Current X reserves
     reserve_x: f64,
     /// Current Y reserves
@@ -54,11 +57,17 @@ pub struct CFMM {
     accumulated_fees_x: f64,
     /// Accumulated fees in Y (collected separately, not in reserves)
     accumulated_fees_y: f64,
+    /// Number of afterSwap calls
+    strategy_calls: u64,
+    /// Time spent in afterSwap calls (only measured with strategy timing on)
+    strategy_nanos: u64,
+    /// Whether to time afterSwap calls
+    time_strategy: bool,
 }
 
 impl CFMM {
     /// Create a new CFMM with the given strategy and reserves.
-    pub fn new(strategy: EVMStrategy, reserve_x: f64, reserve_y: f64) -> Self {
+    pub fn new(strategy: FeeStrategy, reserve_x: f64, reserve_y: f64) -> Self {
         let name = strategy.name().to_string();
         Self {
             name,
@@ -69,9 +78,27 @@ impl CFMM {
             initialized: false,
             accumulated_fees_x: 0.0,
             accumulated_fees_y: 0.0,
+            strategy_calls: 0,
+            strategy_nanos: 0,
+            time_strategy: false,
         }
     }
 
+    /// Enable or disable timing of the strategy's afterSwap calls.
+    pub fn set_strategy_timing(&mut self, enabled: bool) {
+        self.time_strategy = enabled;
+    }
+
+    /// Number of afterSwap calls and the nanoseconds spent in them.
+    pub fn strategy_stats(&self) -> (u64, u64) {
+        (self.strategy_calls, self.strategy_nanos)
+    }
+
+    /// Whether the strategy runs natively (no EVM).
+    pub fn is_native(&self) -> bool {
+        self.strategy.is_native()
+    }
+
     /// Initialize the AMM and get starting fees from strategy.
     pub fn initialize(&mut self) -> Result<(), crate::evm::strategy::EVMError> {
         let initial_x = Wad::from_f64(self.reserve_x);
@@ -112,6 +139,11 @@ impl CFMM {
         (self.accumulated_fees_x, self.accumulated_fees_y)
     }
 
+    /// Gas used by the strategy's `afterSwap` calls (EVM strategies only).
+    pub fn gas_profile(&self) -> Option<GasProfile> {
+        self.strategy.gas_profile()
+    }
+
     /// Fast quote for AMM buying X (trader selling X).
     ///
     /// Returns (y_out, fee_amount) or (0, 0) if invalid.
@@ -291,7 +323,16 @@ impl CFMM {
 
     /// Update fees from strategy after a trade.
     fn update_fees(&mut self, trade_info: &TradeInfo) {
-        if let Ok((bid_fee, ask_fee)) = self.strategy.after_swap(trade_info) {
+        self.strategy_calls += 1;
+        let result = if self.time_strategy {
+            let start = Instant::now();
+            let result = self.strategy.after_swap(trade_info);
+            self.strategy_nanos += start.elapsed().as_nanos() as u64;
+            result
+        } else {
+            self.strategy.after_swap(trade_info)
+        };
+        if let Ok((bid_fee, ask_fee)) = result {
             self.current_fees = FeeQuote::new(bid_fee.clamp_fee(), ask_fee.clamp_fee());
         }
         // On error, keep current fees
@@ -303,6 +344,8 @@ impl CFMM {
         self.reserve_y = reserve_y;
         self.accumulated_fees_x = 0.0;
         self.accumulated_fees_y = 0.0;
+        self.strategy_calls = 0;
+        self.strategy_nanos = 0;
         self.initialized = false;
         self.strategy.reset()
     }
@@ -1,5 +1,7 @@
 //! EVM execution module using revm.
 
+pub mod profile;
 pub mod strategy;
 
-pub use strategy::EVMStrategy;
+pub use profile::{GasStats, OpcodeCounter};
+pub use strategy::{EVMStrategy, StrategySnapshot, STRATEGY_SLOTS};
@@ -0,0 +1,149 @@
+//! Gas and opcode accounting for strategy calls.
+
+use std::collections::HashMap;
+
+use revm::{
+    interpreter::{opcode::OpCode, Interpreter},
+    Database, EvmContext, Inspector,
+};
+
+use crate::types::result::GasProfile;
+
+/// Width of the histogram buckets used for percentiles.
+const GAS_BUCKET: u64 = 1_000;
+
+/// Running gas statistics over a strategy's `afterSwap` calls.
+///
+/// Percentiles come from a fixed histogram, so they are exact to
+/// [`GAS_BUCKET`] gas and recording never allocates.
+#[derive(Debug, Clone)]
+pub struct GasStats {
+    calls: u64,
+    total: u64,
+    min: u64,
+    max: u64,
+    buckets: Vec<u32>,
+}
+
+impl GasStats {
+    /// Empty statistics for calls limited to `gas_limit`.
+    pub fn new(gas_limit: u64) -> Self {
+        Self {
+            calls: 0,
+            total: 0,
+            min: u64::MAX,
+            max: 0,
+            buckets: vec![0; (gas_limit / GAS_BUCKET) as usize + 1],
+        }
+    }
+
+    /// Record the gas used by one call.
+    #[inline]
+    pub fn record(&mut self, gas_used: u64) {
+        self.calls += 1;
+        self.total += gas_used;
+        self.min = self.min.min(gas_used);
+        self.max = self.max.max(gas_used);
+        let bucket = ((gas_used / GAS_BUCKET) as usize).min(self.buckets.len() - 1);
+        self.buckets[bucket] += 1;
+    }
+
+    /// Forget all recorded calls.
+    pub fn clear(&mut self) {
+        self.calls = 0;
+        self.total = 0;
+        self.min = u64::MAX;
+        self.max = 0;
+        self.buckets.fill(0);
+    }
+
+    /// Upper bound of the bucket holding the `q` quantile, capped at the maximum.
+    pub fn percentile(&self, q: f64) -> u64 {
+        if self.calls == 0 {
+            return 0;
+        }
+        let rank = ((q * self.calls as f64).ceil() as u64).max(1);
+        let mut seen = 0u64;
+        for (i, &count) in self.buckets.iter().enumerate() {
+            seen += count as u64;
+            if seen >= rank {
+                return ((i as u64 + 1) * GAS_BUCKET).min(self.max);
+            }
+        }
+        self.max
+    }
+
+    /// Summarize for a simulation result.
+    pub fn profile(&self, opcodes: Option<&OpcodeCounter>) -> GasProfile {
+        GasProfile {
+            calls: self.calls,
+            mean: if self.calls == 0 { 0.0 } else { self.total as f64 / self.calls as f64 },
+            min: if self.calls == 0 { 0 } else { self.min },
+            max: self.max,
+            p99: self.percentile(0.99),
+            opcodes: opcodes.map(OpcodeCounter::histogram).unwrap_or_default(),
+        }
+    }
+}
+
+/// Inspector counting executed opcodes.
+#[derive(Debug, Clone)]
+pub struct OpcodeCounter {
+    counts: [u64; 256],
+}
+
+impl Default for OpcodeCounter {
+    fn default() -> Self {
+        Self { counts: [0; 256] }
+    }
+}
+
+impl OpcodeCounter {
+    /// Executions per opcode mnemonic (opcodes never executed are omitted).
+    pub fn histogram(&self) -> HashMap<String, u64> {
+        self.counts
+            .iter()
+            .enumerate()
+            .filter(|(_, &count)| count > 0)
+            .map(|(opcode, &count)| {
+                let name = OpCode::new(opcode as u8)
+                    .map(|op| op.as_str().to_string())
+                    .unwrap_or_else(|| format!("0x{:02x}", opcode));
+                (name, count)
+            })
+            .collect()
+    }
+}
+
+impl<DB: Database> Inspector<DB> for OpcodeCounter {
+    #[inline]
+    fn step(&mut self, interp: &mut Interpreter, _context: &mut EvmContext<DB>) {
+        self.counts[interp.current_opcode() as usize] += 1;
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_gas_stats_summary() {
+        let mut stats = GasStats::new(250_000);
+        for gas in (1..=100).map(|i| 20_000 + i * 100) {
+            stats.record(gas);
+        }
+        stats.record(260_000);
+
+        let profile = stats.profile(None);
+        assert_eq!(profile.calls, 101);
+        assert_eq!(profile.min, 20_100);
+        assert_eq!(profile.max, 260_000);
+        assert_eq!(profile.p99, 31_000);
+        assert!(profile.opcodes.is_empty());
+        assert_eq!(stats.percentile(1.0), 260_000);
+
+        stats.clear();
+        assert_eq!(stats.profile(None).calls, 0);
+        assert_eq!(stats.profile(None).min, 0);
+    }
+}
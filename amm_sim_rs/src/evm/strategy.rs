@@ -1,14 +1,20 @@
 //! EVM strategy wrapper using revm.
 
+use std::sync::Arc;
+
 use revm::{
+    db::CacheDB,
+    interpreter::analysis::to_analysed,
     primitives::{
-        Address, Bytes, ExecutionResult, Output, U256,
+        Address, Bytes, ExecutionResult, Output, ResultAndState, B256, U256,
         AccountInfo, Bytecode, TxKind,
     },
-    Evm, InMemoryDB,
+    inspector_handle_register, DatabaseCommit, Evm, InMemoryDB,
 };
 use thiserror::Error;
 
+use crate::evm::profile::{GasStats, OpcodeCounter};
+use crate::types::result::GasProfile;
 use crate::types::trade_info::{encode_after_initialize, decode_fee_pair, TradeInfo, SELECTOR_GET_NAME};
 use crate::types::wad::Wad;
 
@@ -26,6 +32,9 @@ pub enum EVMError {
 
     #[error("Out of gas")]
     OutOfGas,
+
+    #[error("Invalid parameter: {0}")]
+    InvalidParameter(String),
 }
 
 /// Gas limits for strategy execution.
@@ -44,95 +53,282 @@ const CALLER_ADDRESS: Address = Address::new([
     0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x02,
 ]);
 
-/// EVM strategy executor.
+/// Number of `uint256` slots in `AMMStrategyBase.slots` (storage slots 0..31).
+pub const STRATEGY_SLOTS: usize = 32;
+
+/// Per-simulation database: a copy-on-write layer over a shared snapshot.
+pub type StrategyDB = CacheDB<Arc<InMemoryDB>>;
+
+/// A strategy's long-lived EVM, optionally with an opcode-counting inspector.
+enum StrategyEvm {
+    Plain(Evm<'static, (), StrategyDB>),
+    Profiled(Evm<'static, OpcodeCounter, StrategyDB>),
+}
+
+impl StrategyEvm {
+    /// Execute a call with `calldata` without committing its state changes.
+    #[inline]
+    fn transact(&mut self, calldata: &[u8], gas_limit: u64) -> Result<ResultAndState, EVMError> {
+        let result = match self {
+            StrategyEvm::Plain(evm) => {
+                let tx = evm.tx_mut();
+                tx.data = Bytes::copy_from_slice(calldata);
+                tx.gas_limit = gas_limit;
+                evm.transact()
+            }
+            StrategyEvm::Profiled(evm) => {
+                let tx = evm.tx_mut();
+                tx.data = Bytes::copy_from_slice(calldata);
+                tx.gas_limit = gas_limit;
+                evm.transact()
+            }
+        };
+        result.map_err(|e| EVMError::ExecutionFailed(format!("{:?}", e)))
+    }
+
+    fn db_mut(&mut self) -> &mut StrategyDB {
+        match self {
+            StrategyEvm::Plain(evm) => evm.db_mut(),
+            StrategyEvm::Profiled(evm) => evm.db_mut(),
+        }
+    }
+
+    fn opcodes(&self) -> Option<&OpcodeCounter> {
+        match self {
+            StrategyEvm::Plain(_) => None,
+            StrategyEvm::Profiled(evm) => Some(&evm.context.external),
+        }
+    }
+}
+
+/// Immutable post-deploy state of a strategy.
 ///
-/// Wraps a Solidity AMM strategy and executes it using revm.
-pub struct EVMStrategy {
-    /// Strategy name (cached after first call)
+/// The contract is deployed and its name fetched once; every simulation then
+/// instantiates an [`EVMStrategy`] whose writes land in its own cache layer
+/// on top of the shared state.
+///
+/// A snapshot may also carry storage overrides (see [`Self::with_storage`]),
+/// which are written into each instance's cache layer before the first call.
+/// This lets one deployed code object serve many parameterizations.
+#[derive(Clone)]
+pub struct StrategySnapshot {
+    /// Strategy name returned by getName()
     name: String,
-    /// Compiled bytecode (for reset)
-    bytecode: Vec<u8>,
-    /// In-memory database for EVM state
-    db: InMemoryDB,
-    /// Pre-allocated calldata buffer for after_swap (196 bytes)
-    trade_calldata: [u8; 196],
+    /// Account/storage state right after deployment
+    state: Arc<InMemoryDB>,
+    /// (slot, value) pairs applied on top of `state` in every instance
+    storage: Arc<Vec<(U256, U256)>>,
+    /// Count executed opcodes in every instance
+    profile_opcodes: bool,
 }
 
-impl EVMStrategy {
-    /// Create a new EVM strategy from compiled bytecode.
-    pub fn new(bytecode: Vec<u8>, default_name: String) -> Result<Self, EVMError> {
-        let mut strategy = Self {
+impl StrategySnapshot {
+    /// Deploy a strategy from compiled bytecode and capture its state.
+    pub fn deploy(bytecode: &[u8], default_name: String) -> Result<Self, EVMError> {
+        let mut snapshot = Self {
             name: default_name,
-            bytecode: bytecode.clone(),
-            db: InMemoryDB::default(),
-            trade_calldata: [0u8; 196],
+            state: Arc::new(deploy_state(bytecode)?),
+            storage: Arc::new(Vec::new()),
+            profile_opcodes: false,
         };
 
-        strategy.deploy()?;
-        strategy.fetch_name()?;
+        let mut probe = snapshot.instantiate();
+        probe.fetch_name()?;
+        snapshot.name = probe.name;
+
+        Ok(snapshot)
+    }
+
+    /// Get the strategy name.
+    pub fn name(&self) -> &str {
+        &self.name
+    }
+
+    /// Hash of the deployed runtime code.
+    pub fn code_hash(&self) -> B256 {
+        self.state
+            .accounts
+            .get(&STRATEGY_ADDRESS)
+            .map(|account| account.info.code_hash)
+            .unwrap_or_default()
+    }
+
+    /// Whether instances start from storage overrides (see [`StrategySnapshot::with_storage`]).
+    pub fn has_storage_overrides(&self) -> bool {
+        !self.storage.is_empty()
+    }
+
+    /// Share this snapshot's deployed state with different storage overrides.
+    ///
+    /// `storage` holds (slot index, value) pairs for `AMMStrategyBase.slots`;
+    /// indices must be below [`STRATEGY_SLOTS`].
+    pub fn with_storage(&self, storage: Vec<(usize, U256)>) -> Result<Self, EVMError> {
+        let storage = storage
+            .into_iter()
+            .map(|(slot, value)| {
+                if slot >= STRATEGY_SLOTS {
+                    return Err(EVMError::InvalidParameter(format!(
+                        "slot {} out of range (strategies have {} slots)",
+                        slot, STRATEGY_SLOTS
+                    )));
+                }
+                Ok((U256::from(slot), value))
+            })
+            .collect::<Result<Vec<_>, _>>()?;
+
+        Ok(Self {
+            name: self.name.clone(),
+            state: Arc::clone(&self.state),
+            storage: Arc::new(storage),
+            profile_opcodes: self.profile_opcodes,
+        })
+    }
 
-        Ok(strategy)
+    /// This snapshot with opcode counting enabled in its instances.
+    ///
+    /// The inspector slows every call, so use it for profiling only.
+    pub fn with_opcode_profile(&self) -> Self {
+        Self { profile_opcodes: true, ..self.clone() }
     }
 
-    /// Deploy the contract to the EVM.
-    fn deploy(&mut self) -> Result<(), EVMError> {
-        // Reset database
-        self.db = InMemoryDB::default();
-
-        // Give caller some balance
-        let caller_info = AccountInfo {
-            balance: U256::from(1_000_000_000_000_000_000_000u128),
-            nonce: 0,
-            code_hash: Default::default(),
-            code: None,
+    /// Create a fresh strategy instance backed by this snapshot.
+    pub fn instantiate(&self) -> EVMStrategy {
+        EVMStrategy {
+            name: self.name.clone(),
+            evm: self.build_evm(),
+            snapshot: self.clone(),
+            trade_calldata: [0u8; 196],
+            swap_gas: GasStats::new(GAS_LIMIT_TRADE),
+        }
+    }
+
+    /// Build an EVM over this snapshot with its storage overrides applied.
+    fn build_evm(&self) -> StrategyEvm {
+        let mut evm = if self.profile_opcodes {
+            StrategyEvm::Profiled(build_profiled_evm(&self.state))
+        } else {
+            StrategyEvm::Plain(build_evm(&self.state))
         };
-        self.db.insert_account_info(CALLER_ADDRESS, caller_info);
-
-        // First, run the deployment transaction
-        let deployed_code = {
-            let mut evm = Evm::builder()
-                .with_db(&mut self.db)
-                .modify_tx_env(|tx| {
-                    tx.caller = CALLER_ADDRESS;
-                    tx.transact_to = TxKind::Create;
-                    tx.data = Bytes::copy_from_slice(&self.bytecode);
-                    tx.value = U256::ZERO;
-                    tx.gas_limit = 10_000_000;
-                })
-                .build();
-
-            let result = evm.transact_commit()
-                .map_err(|e| EVMError::DeploymentFailed(format!("{:?}", e)))?;
-
-            match result {
-                ExecutionResult::Success { output, .. } => {
-                    match output {
-                        Output::Create(code, _) => Ok(code),
-                        Output::Call(_) => {
-                            Err(EVMError::DeploymentFailed("Expected Create output".into()))
-                        }
+        for &(slot, value) in self.storage.iter() {
+            // The in-memory backing database cannot fail
+            evm.db_mut()
+                .insert_account_storage(STRATEGY_ADDRESS, slot, value)
+                .expect("in-memory storage write");
+        }
+        evm
+    }
+}
+
+/// Run the deployment transaction and return the resulting state.
+fn deploy_state(bytecode: &[u8]) -> Result<InMemoryDB, EVMError> {
+    let mut db = InMemoryDB::default();
+
+    // Give caller some balance
+    let caller_info = AccountInfo {
+        balance: U256::from(1_000_000_000_000_000_000_000u128),
+        nonce: 0,
+        code_hash: Default::default(),
+        code: None,
+    };
+    db.insert_account_info(CALLER_ADDRESS, caller_info);
+
+    // First, run the deployment transaction
+    let deployed_code = {
+        let mut evm = Evm::builder()
+            .with_db(&mut db)
+            .modify_tx_env(|tx| {
+                tx.caller = CALLER_ADDRESS;
+                tx.transact_to = TxKind::Create;
+                tx.data = Bytes::copy_from_slice(bytecode);
+                tx.value = U256::ZERO;
+                tx.gas_limit = 10_000_000;
+            })
+            .build();
+
+        let result = evm.transact_commit()
+            .map_err(|e| EVMError::DeploymentFailed(format!("{:?}", e)))?;
+
+        match result {
+            ExecutionResult::Success { output, .. } => {
+                match output {
+                    Output::Create(code, _) => Ok(code),
+                    Output::Call(_) => {
+                        Err(EVMError::DeploymentFailed("Expected Create output".into()))
                     }
                 }
-                ExecutionResult::Revert { output, .. } => {
-                    Err(EVMError::DeploymentFailed(format!("Reverted: {:?}", output)))
-                }
-                ExecutionResult::Halt { reason, .. } => {
-                    Err(EVMError::DeploymentFailed(format!("Halted: {:?}", reason)))
-                }
             }
-        }?;
-
-        // Now insert the code at our fixed address
-        let bytecode = Bytecode::new_raw(deployed_code);
-        let account_info = AccountInfo {
-            balance: U256::ZERO,
-            nonce: 1,
-            code_hash: bytecode.hash_slow(),
-            code: Some(bytecode),
-        };
-        self.db.insert_account_info(STRATEGY_ADDRESS, account_info);
+            ExecutionResult::Revert { output, .. } => {
+                Err(EVMError::DeploymentFailed(format!("Reverted: {:?}", output)))
+            }
+            ExecutionResult::Halt { reason, .. } => {
+                Err(EVMError::DeploymentFailed(format!("Halted: {:?}", reason)))
+            }
+        }
+    }?;
+
+    // Now insert the code at our fixed address. The jump table is
+    // analysed once here rather than on every call.
+    let bytecode = Bytecode::new_raw(deployed_code);
+    let code_hash = bytecode.hash_slow();
+    let account_info = AccountInfo {
+        balance: U256::ZERO,
+        nonce: 1,
+        code_hash,
+        code: Some(to_analysed(bytecode)),
+    };
+    db.insert_account_info(STRATEGY_ADDRESS, account_info);
+
+    Ok(db)
+}
 
-        Ok(())
+/// Build a long-lived EVM that calls the strategy on top of `state`.
+fn build_evm(state: &Arc<InMemoryDB>) -> Evm<'static, (), StrategyDB> {
+    Evm::builder()
+        .with_db(CacheDB::new(Arc::clone(state)))
+        .modify_tx_env(|tx| {
+            tx.caller = CALLER_ADDRESS;
+            tx.transact_to = TxKind::Call(STRATEGY_ADDRESS);
+            tx.value = U256::ZERO;
+        })
+        .build()
+}
+
+/// Like [`build_evm`], with an [`OpcodeCounter`] inspecting every call.
+fn build_profiled_evm(state: &Arc<InMemoryDB>) -> Evm<'static, OpcodeCounter, StrategyDB> {
+    Evm::builder()
+        .with_db(CacheDB::new(Arc::clone(state)))
+        .with_external_context(OpcodeCounter::default())
+        .modify_tx_env(|tx| {
+            tx.caller = CALLER_ADDRESS;
+            tx.transact_to = TxKind::Call(STRATEGY_ADDRESS);
+            tx.value = U256::ZERO;
+        })
+        .append_handler_register(inspector_handle_register)
+        .build()
+}
+
+/// EVM strategy executor.
+///
+/// Wraps a Solidity AMM strategy and executes it using revm. The EVM is
+/// built once per instance and kept alive, so each call only swaps the
+/// calldata and gas limit instead of rebuilding handlers, env and state.
+pub struct EVMStrategy {
+    /// Strategy name (cached after first call)
+    name: String,
+    /// Deployment snapshot (for reset)
+    snapshot: StrategySnapshot,
+    /// Long-lived EVM owning the copy-on-write database
+    evm: StrategyEvm,
+    /// Pre-allocated calldata buffer for after_swap (196 bytes)
+    trade_calldata: [u8; 196],
+    /// Gas used by after_swap calls since the last reset
+    swap_gas: GasStats,
+}
+
+impl EVMStrategy {
+    /// Create a new EVM strategy from compiled bytecode.
+    pub fn new(bytecode: Vec<u8>, default_name: String) -> Result<Self, EVMError> {
+        Ok(StrategySnapshot::deploy(&bytecode, default_name)?.instantiate())
     }
 
     /// Fetch the strategy name from the contract.
@@ -180,53 +376,70 @@ impl EVMStrategy {
         // Encode trade info into pre-allocated buffer
         trade.encode_calldata(&mut self.trade_calldata);
 
-        // Copy calldata to avoid borrow conflict
-        let calldata = self.trade_calldata;
-        let result = self.call(&calldata, GAS_LIMIT_TRADE)?;
+        let ResultAndState { result, state } = self.evm.transact(&self.trade_calldata, GAS_LIMIT_TRADE)?;
+        self.evm.db_mut().commit(state);
+        self.swap_gas.record(result.gas_used());
 
-        decode_fee_pair(&result)
+        decode_fee_pair(&call_output(result)?)
             .ok_or_else(|| EVMError::InvalidReturnData("Failed to decode fee pair".into()))
     }
 
+    /// Like [`EVMStrategy::after_swap`], also reporting whether the call
+    /// wrote to storage.
+    pub fn after_swap_observed(&mut self, trade: &TradeInfo) -> Result<((Wad, Wad), bool), EVMError> {
+        trade.encode_calldata(&mut self.trade_calldata);
+        let ResultAndState { result, state } = self.evm.transact(&self.trade_calldata, GAS_LIMIT_TRADE)?;
+        let wrote_storage = state
+            .get(&STRATEGY_ADDRESS)
+            .map_or(false, |account| account.storage.values().any(|slot| slot.is_changed()));
+        self.evm.db_mut().commit(state);
+
+        let fees = decode_fee_pair(&call_output(result)?)
+            .ok_or_else(|| EVMError::InvalidReturnData("Failed to decode fee pair".into()))?;
+        Ok((fees, wrote_storage))
+    }
+
+    /// Gas used by `after_swap` calls since the last reset, with the opcode
+    /// histogram of all calls when the snapshot profiles opcodes.
+    pub fn gas_profile(&self) -> GasProfile {
+        self.swap_gas.profile(self.evm.opcodes())
+    }
+
     /// Reset the strategy for a new simulation.
     pub fn reset(&mut self) -> Result<(), EVMError> {
-        self.deploy()
+        self.evm = self.snapshot.build_evm();
+        self.swap_gas.clear();
+        Ok(())
     }
 
-    /// Make a call to the contract.
-    fn call(&mut self, calldata: &[u8], gas_limit: u64) -> Result<Vec<u8>, EVMError> {
-        let mut evm = Evm::builder()
-            .with_db(&mut self.db)
-            .modify_tx_env(|tx| {
-                tx.caller = CALLER_ADDRESS;
-                tx.transact_to = TxKind::Call(STRATEGY_ADDRESS);
-                tx.data = Bytes::copy_from_slice(calldata);
-                tx.value = U256::ZERO;
-                tx.gas_limit = gas_limit;
-            })
-            .build();
+    /// Make a call to the contract using the persistent EVM.
+    fn call(&mut self, calldata: &[u8], gas_limit: u64) -> Result<Bytes, EVMError> {
+        let ResultAndState { result, state } = self.evm.transact(calldata, gas_limit)?;
+        self.evm.db_mut().commit(state);
 
-        let result = evm.transact_commit()
-            .map_err(|e| EVMError::ExecutionFailed(format!("{:?}", e)))?;
+        call_output(result)
+    }
+}
 
-        match result {
-            ExecutionResult::Success { output, .. } => {
-                match output {
-                    Output::Call(data) => Ok(data.to_vec()),
-                    Output::Create(_, _) => {
-                        Err(EVMError::ExecutionFailed("Unexpected Create output".into()))
-                    }
+/// Map the result of a strategy call to its return data.
+fn call_output(result: ExecutionResult) -> Result<Bytes, EVMError> {
+    match result {
+        ExecutionResult::Success { output, .. } => {
+            match output {
+                Output::Call(data) => Ok(data),
+                Output::Create(_, _) => {
+                    Err(EVMError::ExecutionFailed("Unexpected Create output".into()))
                 }
             }
-            ExecutionResult::Revert { output, .. } => {
-                Err(EVMError::ExecutionFailed(format!("Reverted: {:?}", output)))
-            }
-            ExecutionResult::Halt { reason, .. } => {
-                if matches!(reason, revm::primitives::HaltReason::OutOfGas(_)) {
-                    Err(EVMError::OutOfGas)
-                } else {
-                    Err(EVMError::ExecutionFailed(format!("Halted: {:?}", reason)))
-                }
+        }
+        ExecutionResult::Revert { output, .. } => {
+            Err(EVMError::ExecutionFailed(format!("Reverted: {:?}", output)))
+        }
+        ExecutionResult::Halt { reason, .. } => {
+            if matches!(reason, revm::primitives::HaltReason::OutOfGas(_)) {
+                Err(EVMError::OutOfGas)
+            } else {
+                Err(EVMError::ExecutionFailed(format!("Halted: {:?}", reason)))
             }
         }
     }
@@ -248,14 +461,97 @@ fn u256_to_usize(data: &[u8]) -> Option<usize> {
 
 impl Clone for EVMStrategy {
     fn clone(&self) -> Self {
-        // Create a fresh strategy from bytecode
-        Self::new(self.bytecode.clone(), self.name.clone())
-            .expect("Failed to clone EVMStrategy")
+        // Create a fresh strategy from the deployment snapshot
+        self.snapshot.instantiate()
     }
 }
 
 #[cfg(test)]
 mod tests {
-    // Note: Full tests require EVM bytecode, which is complex to embed.
-    // The Python integration tests will verify correctness.
+    use super::*;
+
+    /// Hand-assembled contract returning (slots[0], slots[1]) for any call.
+    const SLOT_READER_INITCODE: &str =
+        "6011600c60003960116000f360005460005260015460205260406000f3";
+
+    fn decode_hex(hex: &str) -> Vec<u8> {
+        (0..hex.len())
+            .step_by(2)
+            .map(|i| u8::from_str_radix(&hex[i..i + 2], 16).unwrap())
+            .collect()
+    }
+
+    fn fees(strategy: &mut EVMStrategy) -> (i128, i128) {
+        let (bid, ask) = strategy
+            .after_initialize(Wad::from_f64(100.0), Wad::from_f64(10000.0))
+            .unwrap();
+        (bid.0, ask.0)
+    }
+
+    #[test]
+    fn test_storage_overrides_apply_per_snapshot() {
+        let base = StrategySnapshot::deploy(&decode_hex(SLOT_READER_INITCODE), "Reader".into()).unwrap();
+        let tuned = base
+            .with_storage(vec![(0, U256::from(30u64)), (1, U256::from(45u64))])
+            .unwrap();
+
+        assert_eq!(fees(&mut base.instantiate()), (0, 0));
+
+        let mut strategy = tuned.instantiate();
+        assert_eq!(fees(&mut strategy), (30, 45));
+        strategy.reset().unwrap();
+        assert_eq!(fees(&mut strategy), (30, 45));
+        assert_eq!(fees(&mut strategy.clone()), (30, 45));
+
+        // Overrides never leak into the shared deployed state
+        assert_eq!(fees(&mut base.instantiate()), (0, 0));
+    }
+
+    #[test]
+    fn test_storage_override_slot_out_of_range() {
+        let base = StrategySnapshot::deploy(&decode_hex(SLOT_READER_INITCODE), "Reader".into()).unwrap();
+        assert!(base.with_storage(vec![(STRATEGY_SLOTS, U256::ZERO)]).is_err());
+    }
+
+    #[test]
+    fn test_after_swap_gas_and_opcodes() {
+        let base = StrategySnapshot::deploy(&decode_hex(SLOT_READER_INITCODE), "Reader".into()).unwrap();
+        let trade = TradeInfo::new(
+            true,
+            Wad::from_f64(1.0),
+            Wad::from_f64(100.0),
+            1,
+            Wad::from_f64(101.0),
+            Wad::from_f64(9900.0),
+        );
+
+        let mut strategy = base.instantiate();
+        fees(&mut strategy);
+        strategy.after_swap(&trade).unwrap();
+        strategy.after_swap(&trade).unwrap();
+        let profile = strategy.gas_profile();
+        assert_eq!(profile.calls, 2);
+        assert!(profile.min > 21_000);
+        assert_eq!(profile.min, profile.max);
+        assert!(profile.opcodes.is_empty());
+
+        strategy.reset().unwrap();
+        assert_eq!(strategy.gas_profile().calls, 0);
+
+        // Two SLOADs per call: afterInitialize and both swaps
+        let mut profiled = base.with_opcode_profile().instantiate();
+        fees(&mut profiled);
+        profiled.after_swap(&trade).unwrap();
+        profiled.after_swap(&trade).unwrap();
+        let profile = profiled.gas_profile();
+        assert_eq!(profile.max, strategy_gas(&base, &trade));
+        assert_eq!(profile.opcodes.get("SLOAD"), Some(&6));
+        assert_eq!(profile.opcodes.get("RETURN"), Some(&3));
+    }
+
+    fn strategy_gas(snapshot: &StrategySnapshot, trade: &TradeInfo) -> u64 {
+        let mut strategy = snapshot.instantiate();
+        strategy.after_swap(trade).unwrap();
+        strategy.gas_profile().max
+    }
 }
@@ -9,69 +9,135 @@ pub mod evm;
 pub mod amm;
 pub mod market;
 pub mod simulation;
+pub mod strategy;
 
 use pyo3::prelude::*;
 
-use crate::simulation::runner::{run_simulations_parallel, SimulationBatchConfig};
-use crate::types::config::SimulationConfig;
-use crate::types::result::{BatchSimulationResult, LightweightSimResult};
+use crate::market::MarketTape;
+use crate::simulation::pool::SimulationPool;
+use crate::simulation::profile::{BatchProfile, PhaseTimes};
+use crate::simulation::stream::BatchStream;
+use crate::simulation::runner::{run_simulation, run_simulations_parallel, SimulationBatchConfig};
+use crate::strategy::{BytecodeInput, NativeStrategySpec, StrategyInput};
+use crate::types::config::{ConfigSet, ConfigSpace, HyperparameterVariance, SimulationConfig};
+use crate::types::result::{
+    BatchSimulationResult, CandidateBatchResult, GasProfile, LightweightSimResult, StepArray,
+    StepTrace,
+};
 
 /// Run multiple simulations in parallel using Rust engine.
 ///
 /// # Arguments
 /// * `submission_bytecode` - Compiled bytecode for the submission strategy
+///   (`bytes`, any byte buffer, or a list of ints)
 /// * `baseline_bytecode` - Compiled bytecode for the baseline strategy
-/// * `configs` - List of simulation configurations (one per simulation)
+/// * `configs` - List of simulation configurations (one per simulation), or a
+///   `ConfigSpace` generating them per seed
 /// * `n_workers` - Number of parallel workers (0 = auto-detect)
+/// * `capture_steps` - Capture per-step results (false = summary only)
+/// * `profile` - Record per-phase timings in the result's `profile`
 ///
 /// # Returns
 /// BatchSimulationResult containing all simulation results
+///
+/// The GIL is released while the batch runs.
 #[pyfunction]
-#[pyo3(signature = (submission_bytecode, baseline_bytecode, configs, n_workers = 0))]
+#[pyo3(signature = (
+    submission_bytecode,
+    baseline_bytecode,
+    configs,
+    n_workers = 0,
+    capture_steps = true,
+    profile = false
+))]
 fn run_batch(
-    submission_bytecode: Vec<u8>,
-    baseline_bytecode: Vec<u8>,
-    configs: Vec<SimulationConfig>,
+    py: Python<'_>,
+    submission_bytecode: BytecodeInput,
+    baseline_bytecode: BytecodeInput,
+    configs: ConfigSet,
     n_workers: usize,
+    capture_steps: bool,
+    profile: bool,
 ) -> PyResult<BatchSimulationResult> {
     let batch_config = SimulationBatchConfig {
-        submission_bytecode,
-        baseline_bytecode,
+        submission_bytecode: submission_bytecode.0,
+        baseline_bytecode: baseline_bytecode.0,
         configs,
         n_workers: if n_workers == 0 { None } else { Some(n_workers) },
+        capture_steps,
+        profile,
     };
 
-    run_simulations_parallel(batch_config)
+    py.allow_threads(|| run_simulations_parallel(batch_config))
         .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))
 }
 
 /// Run a single simulation and return lightweight result.
+///
+/// The GIL is released while the simulation runs.
 #[pyfunction]
+#[pyo3(signature = (submission_bytecode, baseline_bytecode, config, capture_steps = true))]
 fn run_single(
-    submission_bytecode: Vec<u8>,
-    baseline_bytecode: Vec<u8>,
+    py: Python<'_>,
+    submission_bytecode: BytecodeInput,
+    baseline_bytecode: BytecodeInput,
     config: SimulationConfig,
+    capture_steps: bool,
 ) -> PyResult<LightweightSimResult> {
-    use crate::simulation::engine::SimulationEngine;
-    use crate::evm::strategy::EVMStrategy;
-
-    let submission = EVMStrategy::new(submission_bytecode, "Submission".to_string())
-        .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))?;
-    let baseline = EVMStrategy::new(baseline_bytecode, "Baseline".to_string())
-        .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))?;
+    py.allow_threads(|| {
+        run_simulation(&submission_bytecode, &baseline_bytecode, config, capture_steps)
+    })
+    .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))
+}
 
-    let mut engine = SimulationEngine::new(config);
-    engine.run(submission, baseline)
-        .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))
+/// Run N candidate strategies against one normalizer with common random numbers.
+///
+/// For each config the price path and retail order stream are generated once
+/// and replayed against every candidate, so per-seed comparisons between
+/// candidates are paired. Any strategy may be a `NativeStrategySpec`
+/// instead of bytecode.
+///
+/// # Returns
+/// CandidateBatchResult with `(n_seeds, n_candidates)` edge matrices
+#[pyfunction]
+#[pyo3(signature = (candidate_bytecodes, normalizer_bytecode, configs, n_workers = 0))]
+fn run_candidates(
+    py: Python<'_>,
+    candidate_bytecodes: Vec<StrategyInput>,
+    normalizer_bytecode: StrategyInput,
+    configs: ConfigSet,
+    n_workers: usize,
+) -> PyResult<CandidateBatchResult> {
+    py.allow_threads(|| {
+        let pool = SimulationPool::with_workers(if n_workers == 0 { None } else { Some(n_workers) })?;
+        pool.run_candidate_batch(&candidate_bytecodes, &normalizer_bytecode, configs, None)
+    })
+    .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))
 }
 
 /// Python module definition
 #[pymodule]
 fn amm_sim_rs(m: &Bound<'_, PyModule>) -> PyResult<()> {
+    m.add("__version__", env!("CARGO_PKG_VERSION"))?;
+    // Hash of the engine sources (see build.rs); keys the result cache
+    m.add("__build__", env!("AMM_ENGINE_BUILD"))?;
     m.add_function(wrap_pyfunction!(run_batch, m)?)?;
     m.add_function(wrap_pyfunction!(run_single, m)?)?;
+    m.add_function(wrap_pyfunction!(run_candidates, m)?)?;
     m.add_class::<SimulationConfig>()?;
+    m.add_class::<HyperparameterVariance>()?;
+    m.add_class::<ConfigSpace>()?;
+    m.add_class::<SimulationPool>()?;
+    m.add_class::<MarketTape>()?;
+    m.add_class::<NativeStrategySpec>()?;
+    m.add_class::<BatchStream>()?;
     m.add_class::<LightweightSimResult>()?;
+    m.add_class::<GasProfile>()?;
+    m.add_class::<BatchProfile>()?;
+    m.add_class::<PhaseTimes>()?;
+    m.add_class::<StepTrace>()?;
+    m.add_class::<StepArray>()?;
     m.add_class::<BatchSimulationResult>()?;
+    m.add_class::<CandidateBatchResult>()?;
     Ok(())
 }
@@ -5,8 +5,6 @@ use crate::amm::CFMM;
 /// Result of an arbitrage attempt.
 #[derive(Debug, Clone)]
 pub struct ArbResult {
-    /// AMM name
-    pub amm_name: String,
     /// Profit from the arbitrage
     pub profit: f64,
     /// Side: "buy" or "sell" from AMM perspective
@@ -89,7 +87,6 @@ impl Arbitrageur {
         let _trade = amm.execute_sell_x(amount_x, timestamp)?;
 
         Some(ArbResult {
-            amm_name: amm.name.clone(),
             profit,
             side: "sell", // AMM sells X
             amount_x,
@@ -138,7 +135,6 @@ impl Arbitrageur {
         let _trade = amm.execute_buy_x(amount_x, timestamp)?;
 
         Some(ArbResult {
-            amm_name: amm.name.clone(),
             profit,
             side: "buy", // AMM buys X
             amount_x,
@@ -146,10 +142,11 @@ impl Arbitrageur {
         })
     }
 
-    /// Execute arbitrage on multiple AMMs.
-    pub fn arbitrage_all(&self, amms: &mut [CFMM], fair_price: f64, timestamp: u64) -> Vec<ArbResult> {
+    /// Execute arbitrage on multiple AMMs, pairing each result with its AMM's index.
+    pub fn arbitrage_all(&self, amms: &mut [CFMM], fair_price: f64, timestamp: u64) -> Vec<(usize, ArbResult)> {
         amms.iter_mut()
-            .filter_map(|amm| self.execute_arb(amm, fair_price, timestamp))
+            .enumerate()
+            .filter_map(|(index, amm)| Some((index, self.execute_arb(amm, fair_price, timestamp)?)))
             .collect()
     }
 }
@@ -4,8 +4,12 @@ pub mod price_process;
 pub mod arbitrageur;
 pub mod retail;
 pub mod router;
+pub mod scenario;
+pub mod tape;
 
 pub use price_process::GBMPriceProcess;
 pub use arbitrageur::Arbitrageur;
 pub use retail::{RetailTrader, RetailOrder};
 pub use router::OrderRouter;
+pub use scenario::{MarketFeed, MarketParams, MarketScenario};
+pub use tape::{MarketTape, TapeError};
@@ -73,14 +73,23 @@ impl RetailTrader {
     /// Generate retail orders for one time step.
     #[inline]
     pub fn generate_orders(&mut self) -> Vec<RetailOrder> {
-        // Number of arrivals follows Poisson distribution
-        let n_arrivals = self.poisson.sample(&mut self.rng) as usize;
+        let mut orders = Vec::new();
+        self.generate_orders_into(&mut orders);
+        orders
+    }
 
-        if n_arrivals == 0 {
-            return Vec::new();
-        }
+    /// Generate one time step's orders into `orders`, replacing its contents.
+    ///
+    /// Draws the same orders as [`generate_orders`](Self::generate_orders);
+    /// reusing one buffer avoids an allocation per step once it has grown
+    /// to the largest step seen.
+    #[inline]
+    pub fn generate_orders_into(&mut self, orders: &mut Vec<RetailOrder>) {
+        orders.clear();
 
-        let mut orders = Vec::with_capacity(n_arrivals);
+        // Number of arrivals follows Poisson distribution
+        let n_arrivals = self.poisson.sample(&mut self.rng) as usize;
+        orders.reserve(n_arrivals);
 
         for _ in 0..n_arrivals {
             // Lognormally distributed sizes
@@ -95,8 +104,6 @@ impl RetailTrader {
 
             orders.push(RetailOrder { side, size });
         }
-
-        orders
     }
 
     /// Reset the random state.
@@ -128,6 +135,25 @@ mod tests {
         }
     }
 
+    #[test]
+    fn test_generate_orders_into_reuses_buffer() {
+        let mut trader1 = RetailTrader::new(5.0, 2.0, 0.5, 0.5, Some(42));
+        let mut trader2 = RetailTrader::new(5.0, 2.0, 0.5, 0.5, Some(42));
+        let mut buffer = Vec::with_capacity(64);
+        let ptr = buffer.as_ptr();
+
+        for _ in 0..50 {
+            let orders = trader1.generate_orders();
+            trader2.generate_orders_into(&mut buffer);
+            assert_eq!(orders.len(), buffer.len());
+            for (a, b) in orders.iter().zip(buffer.iter()) {
+                assert_eq!(a.side, b.side);
+                assert_eq!(a.size, b.size);
+            }
+        }
+        assert_eq!(buffer.as_ptr(), ptr);
+    }
+
     #[test]
     fn test_retail_trader_positive_sizes() {
         let mut trader = RetailTrader::new(5.0, 2.0, 0.5, 0.5, Some(42));
@@ -6,8 +6,8 @@ use crate::market::retail::RetailOrder;
 /// Result of routing a trade to an AMM.
 #[derive(Debug, Clone)]
 pub struct RoutedTrade {
-    /// AMM name
-    pub amm_name: String,
+    /// Index of the AMM in the slice passed to the router
+    pub amm_index: usize,
     /// Amount of Y spent (buy) or received (sell)
     pub amount_y: f64,
     /// Amount of X traded
@@ -23,13 +23,37 @@ pub struct RoutedTrade {
 /// the trader and creates fair competition between AMMs based on their fees.
 ///
 /// For constant product AMMs (xy=k), the optimal split can be computed
-/// analytically rather than using numerical methods.
-pub struct OrderRouter;
+/// analytically rather than using numerical methods: in closed form for two
+/// AMMs, and by water-filling in O(N log N) for more.
+pub struct OrderRouter {
+    /// Pools considered by the current N-AMM split (reused between orders)
+    depths: Vec<PoolDepth>,
+    /// Input amount per AMM from the current N-AMM split
+    amounts: Vec<f64>,
+}
+
+/// One pool's terms in the water-filling split.
+///
+/// For input reserve r (y when buying X, x when selling X), the pool's
+/// marginal price after taking Δ of input satisfies
+/// sqrt(marginal) ∝ (r + γΔ) / D with depth D = sqrt(γ·x·y). Pools enter
+/// the split once the common level passes their threshold r / D.
+#[derive(Debug, Clone, Copy)]
+struct PoolDepth {
+    index: usize,
+    reserve_in: f64,
+    depth: f64,
+    gamma: f64,
+    threshold: f64,
+}
 
 impl OrderRouter {
     /// Create a new order router.
     pub fn new() -> Self {
-        Self
+        Self {
+            depths: Vec::new(),
+            amounts: Vec::new(),
+        }
     }
 
     /// Compute optimal Y split for buying X across two AMMs.
@@ -116,46 +140,108 @@ impl OrderRouter {
         (x1_amount, x2_amount)
     }
 
+    /// Compute the optimal split of `total_in` across any number of AMMs.
+    ///
+    /// Equalizes post-trade marginal prices over the pools that trade; each
+    /// active pool i takes Δ_i = (s·D_i - r_i) / γ_i, where the level
+    /// s = (total + Σ r_i/γ_i) / Σ D_i/γ_i runs over the active set. Pools
+    /// are sorted by threshold r_i / D_i and added while s exceeds the next
+    /// threshold, so the whole split is one sort and one pass.
+    ///
+    /// Fills `self.amounts` with one input amount per AMM (zero for pools
+    /// left out). Buys spend Y at the ask fee; sells spend X at the bid fee.
+    fn split_many_amms(&mut self, amms: &[CFMM], total_in: f64, buy: bool) {
+        self.depths.clear();
+        for (index, amm) in amms.iter().enumerate() {
+            let (x, y) = amm.reserves();
+            let fees = amm.fees();
+            let fee = if buy { fees.ask_fee } else { fees.bid_fee };
+            let gamma = 1.0 - fee.to_f64();
+            let depth = (x * gamma * y).sqrt();
+            // Pools that return nothing for any input never join the split
+            if !(gamma > 0.0 && depth > 0.0) {
+                continue;
+            }
+            let reserve_in = if buy { y } else { x };
+            self.depths.push(PoolDepth {
+                index,
+                reserve_in,
+                depth,
+                gamma,
+                threshold: reserve_in / depth,
+            });
+        }
+        self.depths.sort_unstable_by(|a, b| a.threshold.total_cmp(&b.threshold));
+
+        // Grow the active set until the level no longer reaches the next pool
+        let mut sum_in = 0.0;
+        let mut sum_depth = 0.0;
+        let mut level = 0.0;
+        let mut active = 0;
+        for pool in &self.depths {
+            if active > 0 && level <= pool.threshold {
+                break;
+            }
+            sum_in += pool.reserve_in / pool.gamma;
+            sum_depth += pool.depth / pool.gamma;
+            level = (total_in + sum_in) / sum_depth;
+            active += 1;
+        }
+
+        self.amounts.clear();
+        self.amounts.resize(amms.len(), 0.0);
+        for pool in &self.depths[..active] {
+            let amount = (level * pool.depth - pool.reserve_in) / pool.gamma;
+            self.amounts[pool.index] = amount.max(0.0).min(total_in);
+        }
+    }
+
     /// Route a single retail order across AMMs.
     pub fn route_order(
-        &self,
+        &mut self,
         order: &RetailOrder,
         amms: &mut [CFMM],
         fair_price: f64,
         timestamp: u64,
     ) -> Vec<RoutedTrade> {
-        if amms.is_empty() {
-            return Vec::new();
-        }
-
-        if amms.len() == 1 {
-            return self.route_to_single_amm(order, &mut amms[0], fair_price, timestamp);
-        }
+        let mut trades = Vec::new();
+        self.route_order_into(order, amms, fair_price, timestamp, &mut trades);
+        trades
+    }
 
-        // For 2 AMMs, use optimal splitting
-        if amms.len() == 2 {
-            return self.route_to_two_amms(order, amms, fair_price, timestamp);
+    /// Route a single retail order, appending its fills to `trades`.
+    pub fn route_order_into(
+        &mut self,
+        order: &RetailOrder,
+        amms: &mut [CFMM],
+        fair_price: f64,
+        timestamp: u64,
+        trades: &mut Vec<RoutedTrade>,
+    ) {
+        match amms.len() {
+            0 => {}
+            1 => self.route_to_single_amm(order, &mut amms[0], 0, fair_price, timestamp, trades),
+            // For 2 AMMs, use optimal splitting
+            2 => self.route_to_two_amms(order, amms, fair_price, timestamp, trades),
+            // For >2 AMMs, water-fill across all of them
+            _ => self.route_to_many_amms(order, amms, fair_price, timestamp, trades),
         }
-
-        // For >2 AMMs, use iterative pairwise splitting
-        // (Simplified - true optimal would require solving simultaneously)
-        self.route_to_many_amms(order, amms, fair_price, timestamp)
     }
 
     fn route_to_single_amm(
         &self,
         order: &RetailOrder,
         amm: &mut CFMM,
+        amm_index: usize,
         fair_price: f64,
         timestamp: u64,
-    ) -> Vec<RoutedTrade> {
-        let mut trades = Vec::new();
-
+        trades: &mut Vec<RoutedTrade>,
+    ) {
         if order.side == "buy" {
             // Trader wants to buy X, spending Y
             if let Some(result) = amm.execute_buy_x_with_y(order.size, timestamp) {
                 trades.push(RoutedTrade {
-                    amm_name: amm.name.clone(),
+                    amm_index,
                     amount_y: order.size,
                     amount_x: result.trade_info.amount_x.to_f64(),
                     amm_buys_x: false,
@@ -166,15 +252,13 @@ impl OrderRouter {
             let total_x = order.size / fair_price;
             if let Some(result) = amm.execute_buy_x(total_x, timestamp) {
                 trades.push(RoutedTrade {
-                    amm_name: amm.name.clone(),
+                    amm_index,
                     amount_y: result.trade_info.amount_y.to_f64(),
                     amount_x: total_x,
                     amm_buys_x: true,
                 });
             }
         }
-
-        trades
     }
 
     fn route_to_two_amms(
@@ -183,8 +267,8 @@ impl OrderRouter {
         amms: &mut [CFMM],
         fair_price: f64,
         timestamp: u64,
-    ) -> Vec<RoutedTrade> {
-        let mut trades = Vec::new();
+        trades: &mut Vec<RoutedTrade>,
+    ) {
         const MIN_AMOUNT: f64 = 0.0001;
 
         // Split amms mutably
@@ -198,7 +282,7 @@ impl OrderRouter {
             if y1 > MIN_AMOUNT {
                 if let Some(result) = amm1.execute_buy_x_with_y(y1, timestamp) {
                     trades.push(RoutedTrade {
-                        amm_name: amm1.name.clone(),
+                        amm_index: 0,
                         amount_y: y1,
                         amount_x: result.trade_info.amount_x.to_f64(),
                         amm_buys_x: false,
@@ -209,7 +293,7 @@ impl OrderRouter {
             if y2 > MIN_AMOUNT {
                 if let Some(result) = amm2.execute_buy_x_with_y(y2, timestamp) {
                     trades.push(RoutedTrade {
-                        amm_name: amm2.name.clone(),
+                        amm_index: 1,
                         amount_y: y2,
                         amount_x: result.trade_info.amount_x.to_f64(),
                         amm_buys_x: false,
@@ -224,7 +308,7 @@ impl OrderRouter {
             if x1 > MIN_AMOUNT {
                 if let Some(result) = amm1.execute_buy_x(x1, timestamp) {
                     trades.push(RoutedTrade {
-                        amm_name: amm1.name.clone(),
+                        amm_index: 0,
                         amount_y: result.trade_info.amount_y.to_f64(),
                         amount_x: x1,
                         amm_buys_x: true,
@@ -235,7 +319,7 @@ impl OrderRouter {
             if x2 > MIN_AMOUNT {
                 if let Some(result) = amm2.execute_buy_x(x2, timestamp) {
                     trades.push(RoutedTrade {
-                        amm_name: amm2.name.clone(),
+                        amm_index: 1,
                         amount_y: result.trade_info.amount_y.to_f64(),
                         amount_x: x2,
                         amm_buys_x: true,
@@ -243,42 +327,86 @@ impl OrderRouter {
                 }
             }
         }
-
-        trades
     }
 
     fn route_to_many_amms(
-        &self,
+        &mut self,
         order: &RetailOrder,
         amms: &mut [CFMM],
         fair_price: f64,
         timestamp: u64,
-    ) -> Vec<RoutedTrade> {
-        // Simplified: just use first two AMMs
-        // Full implementation would need recursive splitting
-        if amms.len() >= 2 {
-            self.route_to_two_amms(order, &mut amms[0..2], fair_price, timestamp)
+        trades: &mut Vec<RoutedTrade>,
+    ) {
+        const MIN_AMOUNT: f64 = 0.0001;
+
+        // The split is computed from pre-trade state, as for two AMMs, and
+        // filled in AMM order
+        if order.side == "buy" {
+            // Trader wants to buy X, spending Y
+            self.split_many_amms(amms, order.size, true);
+            for (amm_index, (amm, &amount_y)) in amms.iter_mut().zip(&self.amounts).enumerate() {
+                if amount_y <= MIN_AMOUNT {
+                    continue;
+                }
+                if let Some(result) = amm.execute_buy_x_with_y(amount_y, timestamp) {
+                    trades.push(RoutedTrade {
+                        amm_index,
+                        amount_y,
+                        amount_x: result.trade_info.amount_x.to_f64(),
+                        amm_buys_x: false,
+                    });
+                }
+            }
         } else {
-            self.route_to_single_amm(order, &mut amms[0], fair_price, timestamp)
+            // Trader wants to sell X, receiving Y
+            let total_x = order.size / fair_price;
+            self.split_many_amms(amms, total_x, false);
+            for (amm_index, (amm, &amount_x)) in amms.iter_mut().zip(&self.amounts).enumerate() {
+                if amount_x <= MIN_AMOUNT {
+                    continue;
+                }
+                if let Some(result) = amm.execute_buy_x(amount_x, timestamp) {
+                    trades.push(RoutedTrade {
+                        amm_index,
+                        amount_y: result.trade_info.amount_y.to_f64(),
+                        amount_x,
+                        amm_buys_x: true,
+                    });
+                }
+            }
         }
     }
 
     /// Route multiple orders.
     pub fn route_orders(
-        &self,
+        &mut self,
         orders: &[RetailOrder],
         amms: &mut [CFMM],
         fair_price: f64,
         timestamp: u64,
     ) -> Vec<RoutedTrade> {
-        let mut all_trades = Vec::new();
+        let mut trades = Vec::new();
+        self.route_orders_into(orders, amms, fair_price, timestamp, &mut trades);
+        trades
+    }
 
+    /// Route multiple orders into `trades`, replacing its contents.
+    ///
+    /// The engine keeps one buffer per simulation, so routing allocates
+    /// nothing once the buffer (and, for more than two AMMs, the router's
+    /// split scratch) has grown to the busiest step.
+    pub fn route_orders_into(
+        &mut self,
+        orders: &[RetailOrder],
+        amms: &mut [CFMM],
+        fair_price: f64,
+        timestamp: u64,
+        trades: &mut Vec<RoutedTrade>,
+    ) {
+        trades.clear();
         for order in orders {
-            let trades = self.route_order(order, amms, fair_price, timestamp);
-            all_trades.extend(trades);
+            self.route_order_into(order, amms, fair_price, timestamp, trades);
         }
-
-        all_trades
     }
 }
 
@@ -291,6 +419,19 @@ impl Default for OrderRouter {
 #[cfg(test)]
 mod tests {
     use super::*;
+    use crate::strategy::NativeStrategySpec;
+    use crate::types::Wad;
+
+    fn constant_fee_amm(bps: i128) -> CFMM {
+        constant_fee_pool(bps, 100.0, 10_000.0)
+    }
+
+    fn constant_fee_pool(bps: i128, x: f64, y: f64) -> CFMM {
+        let spec = NativeStrategySpec::constant_fee(Wad::from_bps(bps), Wad::from_bps(bps), "Fixed".into());
+        let mut amm = CFMM::new(spec.instantiate().into(), x, y);
+        amm.initialize().unwrap();
+        amm
+    }
 
     #[test]
     fn test_split_formulas() {
@@ -315,4 +456,93 @@ mod tests {
         // Should be approximately equal split
         assert!((y1_amount - 50.0).abs() < 1.0);
     }
+
+    #[test]
+    fn test_routed_trades_carry_amm_index() {
+        let mut amms = vec![constant_fee_amm(30), constant_fee_amm(80)];
+        let mut router = OrderRouter::new();
+
+        // A cheaper pool takes the larger share, and each fill names its pool
+        let orders = [RetailOrder { side: "buy", size: 50.0 }, RetailOrder { side: "sell", size: 50.0 }];
+        let trades = router.route_orders(&orders, &mut amms, 100.0, 0);
+        let indices: Vec<usize> = trades.iter().map(|trade| trade.amm_index).collect();
+        assert_eq!(indices, vec![0, 1, 0, 1]);
+        assert!(trades[0].amount_y > trades[1].amount_y);
+
+        let single = router.route_orders(&orders[..1], &mut amms[1..], 100.0, 1);
+        assert_eq!(single.len(), 1);
+        assert_eq!(single[0].amm_index, 0);
+    }
+
+    #[test]
+    fn test_many_amm_split_equalizes_marginal_prices() {
+        let amms = vec![
+            constant_fee_pool(30, 100.0, 10_000.0),
+            constant_fee_pool(50, 120.0, 12_050.0),
+            constant_fee_pool(10, 80.0, 7_990.0),
+            constant_fee_pool(900, 100.0, 10_000.0),
+        ];
+        let mut router = OrderRouter::new();
+
+        for (buy, total) in [(true, 200.0), (false, 2.0)] {
+            router.split_many_amms(&amms, total, buy);
+            assert!((router.amounts.iter().sum::<f64>() - total).abs() < 1e-9);
+
+            // sqrt of each pool's post-trade marginal price: (r + γΔ) / sqrt(γxy)
+            let levels: Vec<f64> = amms
+                .iter()
+                .zip(&router.amounts)
+                .map(|(amm, &amount)| {
+                    let (x, y) = amm.reserves();
+                    let fees = amm.fees();
+                    let fee = if buy { fees.ask_fee } else { fees.bid_fee };
+                    let gamma = 1.0 - fee.to_f64();
+                    let reserve_in = if buy { y } else { x };
+                    (reserve_in + gamma * amount) / (x * gamma * y).sqrt()
+                })
+                .collect();
+
+            // The three cheap pools trade to one price; the 9% pool is
+            // already above it and sits out
+            assert!(router.amounts[..3].iter().all(|&amount| amount > 0.0));
+            assert!((levels[1] - levels[0]).abs() < 1e-12);
+            assert!((levels[2] - levels[0]).abs() < 1e-12);
+            assert_eq!(router.amounts[3], 0.0);
+            assert!(levels[3] > levels[0]);
+        }
+    }
+
+    #[test]
+    fn test_many_amm_split_matches_two_amm_closed_form() {
+        let amms = vec![constant_fee_pool(30, 100.0, 10_000.0), constant_fee_pool(50, 120.0, 12_050.0)];
+        let mut router = OrderRouter::new();
+
+        let (y1, y2) = router.split_buy_two_amms(&amms[0], &amms[1], 200.0);
+        router.split_many_amms(&amms, 200.0, true);
+        assert!((router.amounts[0] - y1).abs() < 1e-9);
+        assert!((router.amounts[1] - y2).abs() < 1e-9);
+
+        let (x1, x2) = router.split_sell_two_amms(&amms[0], &amms[1], 2.0);
+        router.split_many_amms(&amms, 2.0, false);
+        assert!((router.amounts[0] - x1).abs() < 1e-12);
+        assert!((router.amounts[1] - x2).abs() < 1e-12);
+    }
+
+    #[test]
+    fn test_routes_orders_across_every_amm() {
+        let mut amms = vec![constant_fee_amm(30), constant_fee_amm(30), constant_fee_amm(30)];
+        let mut router = OrderRouter::new();
+
+        // Identical pools share an order equally
+        let orders = [RetailOrder { side: "buy", size: 90.0 }, RetailOrder { side: "sell", size: 90.0 }];
+        let trades = router.route_orders(&orders, &mut amms, 100.0, 0);
+        let indices: Vec<usize> = trades.iter().map(|trade| trade.amm_index).collect();
+        assert_eq!(indices, vec![0, 1, 2, 0, 1, 2]);
+        for trade in &trades[..3] {
+            assert!((trade.amount_y - 30.0).abs() < 1e-9);
+        }
+        for trade in &trades[3..] {
+            assert!((trade.amount_x - trades[3].amount_x).abs() < 1e-9);
+        }
+    }
 }
@@ -0,0 +1,237 @@
+//! Market scenarios: the exogenous price path and retail order stream.
+//!
+//! Neither the GBM path nor the retail flow depends on AMM state, so a
+//! scenario can be generated once per seed and replayed against any number
+//! of strategies (common random numbers).
+
+use crate::market::{GBMPriceProcess, RetailOrder, RetailTrader};
+use crate::types::config::SimulationConfig;
+
+/// Source of fair prices and retail orders, one step at a time.
+pub trait MarketFeed {
+    /// Fair price before the first step.
+    fn initial_price(&self) -> f64;
+
+    /// Advance one step and return the new fair price.
+    fn next_price(&mut self) -> f64;
+
+    /// Retail orders arriving in the current step.
+    fn next_orders(&mut self) -> &[RetailOrder];
+}
+
+/// Generates the market on the fly from a config's seeds.
+pub struct LiveFeed {
+    initial_price: f64,
+    price_process: GBMPriceProcess,
+    retail_trader: RetailTrader,
+    orders: Vec<RetailOrder>,
+}
+
+impl LiveFeed {
+    /// Create a feed seeded like the engine: GBM uses `seed`, retail `seed + 1`.
+    pub fn new(config: &SimulationConfig) -> Self {
+        let seed = config.seed.unwrap_or(0);
+
+        // Initialize price process
+        let price_process = GBMPriceProcess::new(
+            config.initial_price,
+            config.gbm_mu,
+            config.gbm_sigma,
+            config.gbm_dt,
+            Some(seed),
+        );
+
+        // Initialize retail trader with different seed
+        let retail_trader = RetailTrader::new(
+            config.retail_arrival_rate,
+            config.retail_mean_size,
+            config.retail_size_sigma,
+            config.retail_buy_prob,
+            Some(seed + 1),
+        );
+
+        Self {
+            initial_price: price_process.current_price(),
+            price_process,
+            retail_trader,
+            orders: Vec::new(),
+        }
+    }
+}
+
+impl MarketFeed for LiveFeed {
+    fn initial_price(&self) -> f64 {
+        self.initial_price
+    }
+
+    #[inline]
+    fn next_price(&mut self) -> f64 {
+        self.price_process.step()
+    }
+
+    #[inline]
+    fn next_orders(&mut self) -> &[RetailOrder] {
+        self.retail_trader.generate_orders_into(&mut self.orders);
+        &self.orders
+    }
+}
+
+/// The config fields that determine a market scenario.
+#[derive(Debug, Clone, Copy, PartialEq)]
+pub struct MarketParams {
+    pub seed: u64,
+    pub n_steps: u32,
+    pub initial_price: f64,
+    pub gbm_mu: f64,
+    pub gbm_sigma: f64,
+    pub gbm_dt: f64,
+    pub retail_arrival_rate: f64,
+    pub retail_mean_size: f64,
+    pub retail_size_sigma: f64,
+    pub retail_buy_prob: f64,
+}
+
+impl MarketParams {
+    /// Extract the market-generating fields of `config`.
+    pub fn of(config: &SimulationConfig) -> Self {
+        Self {
+            seed: config.seed.unwrap_or(0),
+            n_steps: config.n_steps,
+            initial_price: config.initial_price,
+            gbm_mu: config.gbm_mu,
+            gbm_sigma: config.gbm_sigma,
+            gbm_dt: config.gbm_dt,
+            retail_arrival_rate: config.retail_arrival_rate,
+            retail_mean_size: config.retail_mean_size,
+            retail_size_sigma: config.retail_size_sigma,
+            retail_buy_prob: config.retail_buy_prob,
+        }
+    }
+}
+
+/// A fully materialised market for one config.
+#[derive(Debug, Clone)]
+pub struct MarketScenario {
+    /// Inputs the scenario was generated from
+    pub params: MarketParams,
+    /// Fair price before the first step
+    pub initial_price: f64,
+    /// Fair price after each step
+    pub prices: Vec<f64>,
+    /// Orders for step `t` are `orders[order_offsets[t]..order_offsets[t + 1]]`
+    pub order_offsets: Vec<u32>,
+    /// All retail orders, in arrival order
+    pub orders: Vec<RetailOrder>,
+}
+
+impl MarketScenario {
+    /// Record the market a live run of `config` would see.
+    pub fn generate(config: &SimulationConfig) -> Self {
+        let n_steps = config.n_steps as usize;
+        let mut feed = LiveFeed::new(config);
+        let mut scenario = Self {
+            params: MarketParams::of(config),
+            initial_price: feed.initial_price(),
+            prices: Vec::with_capacity(n_steps),
+            order_offsets: Vec::with_capacity(n_steps + 1),
+            orders: Vec::new(),
+        };
+
+        scenario.order_offsets.push(0);
+        for _ in 0..n_steps {
+            scenario.prices.push(feed.next_price());
+            let orders = feed.next_orders();
+            scenario.orders.extend_from_slice(orders);
+            scenario.order_offsets.push(scenario.orders.len() as u32);
+        }
+
+        scenario
+    }
+
+    /// Number of steps in the scenario.
+    pub fn n_steps(&self) -> usize {
+        self.prices.len()
+    }
+
+    /// Create a feed that replays this scenario.
+    pub fn replay(&self) -> ReplayFeed<'_> {
+        ReplayFeed { scenario: self, step: 0 }
+    }
+}
+
+/// Replays a [`MarketScenario`] step by step.
+pub struct ReplayFeed<'a> {
+    scenario: &'a MarketScenario,
+    step: usize,
+}
+
+impl MarketFeed for ReplayFeed<'_> {
+    fn initial_price(&self) -> f64 {
+        self.scenario.initial_price
+    }
+
+    #[inline]
+    fn next_price(&mut self) -> f64 {
+        let price = self.scenario.prices[self.step];
+        self.step += 1;
+        price
+    }
+
+    #[inline]
+    fn next_orders(&mut self) -> &[RetailOrder] {
+        // Called after next_price, so the current step is `step - 1`
+        let start = self.scenario.order_offsets[self.step - 1] as usize;
+        let end = self.scenario.order_offsets[self.step] as usize;
+        &self.scenario.orders[start..end]
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn config() -> SimulationConfig {
+        SimulationConfig {
+            n_steps: 200,
+            initial_price: 100.0,
+            initial_x: 100.0,
+            initial_y: 10000.0,
+            gbm_mu: 0.0,
+            gbm_sigma: 0.001,
+            gbm_dt: 1.0,
+            retail_arrival_rate: 5.0,
+            retail_mean_size: 2.0,
+            retail_size_sigma: 0.7,
+            retail_buy_prob: 0.5,
+            seed: Some(7),
+        }
+    }
+
+    #[test]
+    fn test_replay_matches_live_feed() {
+        let config = config();
+        let scenario = MarketScenario::generate(&config);
+        let mut live = LiveFeed::new(&config);
+        let mut replay = scenario.replay();
+
+        assert_eq!(live.initial_price(), replay.initial_price());
+        for _ in 0..config.n_steps {
+            assert_eq!(live.next_price(), replay.next_price());
+            let live_orders = live.next_orders().to_vec();
+            let replay_orders = replay.next_orders();
+            assert_eq!(live_orders.len(), replay_orders.len());
+            for (a, b) in live_orders.iter().zip(replay_orders.iter()) {
+                assert_eq!(a.side, b.side);
+                assert_eq!(a.size, b.size);
+            }
+        }
+    }
+
+    #[test]
+    fn test_scenario_offsets_cover_orders() {
+        let scenario = MarketScenario::generate(&config());
+        assert_eq!(scenario.n_steps(), 200);
+        assert_eq!(scenario.order_offsets.len(), 201);
+        assert_eq!(*scenario.order_offsets.last().unwrap() as usize, scenario.orders.len());
+    }
+}
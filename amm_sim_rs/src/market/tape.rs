@@ -0,0 +1,424 @@
+//! Market tapes: pre-generated scenarios for a set of seeds.
+//!
+//! A tape stores, per seed, the fair-price path and retail order stream a
+//! live run would sample. Simulations replay it instead of drawing random
+//! numbers, and external tools can read the exact market a run saw.
+//!
+//! File layout (little-endian, every section 8-byte aligned):
+//!
+//! ```text
+//! header  magic "AMMTAPE\0" | version u32 | n_scenarios u32 | 16 reserved bytes
+//! index   n_scenarios x 120-byte entries:
+//!           seed u64, n_steps u64, n_orders u64,
+//!           initial_price, gbm_mu, gbm_sigma, gbm_dt, retail_arrival_rate,
+//!           retail_mean_size, retail_size_sigma, retail_buy_prob (f64),
+//!           prices_at, offsets_at, sides_at, sizes_at (u64 file offsets)
+//! data    per scenario: prices f64[n_steps], order_offsets u32[n_steps + 1],
+//!         sides u8[n_orders] (0 = buy, 1 = sell), sizes f64[n_orders]
+//! ```
+//!
+//! Every array sits at a recorded absolute offset, so readers can
+//! memory-map them directly (see `amm_competition.market.tape`).
+
+use std::collections::HashMap;
+use std::path::Path;
+use std::sync::Arc;
+
+use pyo3::prelude::*;
+use rayon::prelude::*;
+use thiserror::Error;
+
+use crate::market::scenario::{MarketParams, MarketScenario};
+use crate::market::RetailOrder;
+use crate::types::config::{ConfigSet, SimulationConfig};
+
+const MAGIC: &[u8; 8] = b"AMMTAPE\0";
+const VERSION: u32 = 1;
+const HEADER_LEN: usize = 32;
+const ENTRY_LEN: usize = 120;
+
+/// Errors reading, writing or looking up a tape.
+#[derive(Error, Debug)]
+pub enum TapeError {
+    #[error("I/O error: {0}")]
+    Io(#[from] std::io::Error),
+
+    #[error("Invalid tape: {0}")]
+    Format(String),
+
+    #[error("Seed {0} is not on the tape")]
+    MissingSeed(u64),
+
+    #[error("Seed {0} on the tape was generated with a different market config")]
+    ConfigMismatch(u64),
+
+    #[error("Seed {0} appears more than once")]
+    DuplicateSeed(u64),
+}
+
+/// Scenarios for a set of seeds, shared by every simulation that replays them.
+///
+/// Cloning is cheap; the scenarios themselves are never copied.
+#[pyclass(frozen)]
+#[derive(Clone)]
+pub struct MarketTape {
+    scenarios: Arc<Vec<MarketScenario>>,
+    /// Seed -> position in `scenarios`
+    index: Arc<HashMap<u64, usize>>,
+}
+
+impl MarketTape {
+    /// Build a tape from scenarios with distinct seeds.
+    pub fn from_scenarios(scenarios: Vec<MarketScenario>) -> Result<Self, TapeError> {
+        let mut index = HashMap::with_capacity(scenarios.len());
+        for (i, scenario) in scenarios.iter().enumerate() {
+            if index.insert(scenario.params.seed, i).is_some() {
+                return Err(TapeError::DuplicateSeed(scenario.params.seed));
+            }
+        }
+        Ok(Self {
+            scenarios: Arc::new(scenarios),
+            index: Arc::new(index),
+        })
+    }
+
+    /// Generate the scenario for each config in parallel.
+    pub fn generate(configs: &[SimulationConfig]) -> Result<Self, TapeError> {
+        Self::from_scenarios(configs.par_iter().map(MarketScenario::generate).collect())
+    }
+
+    /// Like [`generate`](Self::generate), building each config on its worker.
+    pub fn generate_set(configs: &ConfigSet) -> Result<Self, TapeError> {
+        Self::from_scenarios(configs.par_iter().map(|config| MarketScenario::generate(&config)).collect())
+    }
+
+    /// All scenarios, in tape order.
+    pub fn scenarios(&self) -> &[MarketScenario] {
+        &self.scenarios
+    }
+
+    /// The scenario for `config`, checking it was generated from the same market config.
+    pub fn scenario_for(&self, config: &SimulationConfig) -> Result<&MarketScenario, TapeError> {
+        let params = MarketParams::of(config);
+        let scenario = self
+            .index
+            .get(&params.seed)
+            .map(|&i| &self.scenarios[i])
+            .ok_or(TapeError::MissingSeed(params.seed))?;
+        if scenario.params != params {
+            return Err(TapeError::ConfigMismatch(params.seed));
+        }
+        Ok(scenario)
+    }
+
+    /// Serialize to the tape file format.
+    pub fn to_bytes(&self) -> Vec<u8> {
+        let n = self.scenarios.len();
+        let mut buf = Vec::with_capacity(HEADER_LEN + n * ENTRY_LEN);
+        buf.extend_from_slice(MAGIC);
+        buf.extend_from_slice(&VERSION.to_le_bytes());
+        buf.extend_from_slice(&(n as u32).to_le_bytes());
+        buf.resize(HEADER_LEN + n * ENTRY_LEN, 0);
+
+        for (i, scenario) in self.scenarios.iter().enumerate() {
+            let prices_at = buf.len();
+            for price in &scenario.prices {
+                buf.extend_from_slice(&price.to_le_bytes());
+            }
+            let offsets_at = buf.len();
+            for offset in &scenario.order_offsets {
+                buf.extend_from_slice(&offset.to_le_bytes());
+            }
+            pad8(&mut buf);
+            let sides_at = buf.len();
+            buf.extend(scenario.orders.iter().map(|order| side_code(order.side)));
+            pad8(&mut buf);
+            let sizes_at = buf.len();
+            for order in &scenario.orders {
+                buf.extend_from_slice(&order.size.to_le_bytes());
+            }
+
+            let p = &scenario.params;
+            let mut entry = Vec::with_capacity(ENTRY_LEN);
+            for value in [p.seed, p.n_steps as u64, scenario.orders.len() as u64] {
+                entry.extend_from_slice(&value.to_le_bytes());
+            }
+            for value in [
+                p.initial_price,
+                p.gbm_mu,
+                p.gbm_sigma,
+                p.gbm_dt,
+                p.retail_arrival_rate,
+                p.retail_mean_size,
+                p.retail_size_sigma,
+                p.retail_buy_prob,
+            ] {
+                entry.extend_from_slice(&value.to_le_bytes());
+            }
+            for value in [prices_at, offsets_at, sides_at, sizes_at] {
+                entry.extend_from_slice(&(value as u64).to_le_bytes());
+            }
+            let at = HEADER_LEN + i * ENTRY_LEN;
+            buf[at..at + ENTRY_LEN].copy_from_slice(&entry);
+        }
+
+        buf
+    }
+
+    /// Parse a tape from its file contents.
+    pub fn from_bytes(data: &[u8]) -> Result<Self, TapeError> {
+        let reader = Reader { data };
+        if data.len() < HEADER_LEN || &data[..8] != MAGIC {
+            return Err(TapeError::Format("bad magic".into()));
+        }
+        let version = reader.u32(8)?;
+        if version != VERSION {
+            return Err(TapeError::Format(format!("unsupported version {}", version)));
+        }
+        let n = reader.u32(12)? as usize;
+
+        let mut scenarios = Vec::with_capacity(n);
+        for i in 0..n {
+            let at = HEADER_LEN + i * ENTRY_LEN;
+            reader.section(at, 1, ENTRY_LEN)?;
+            let n_steps = reader.u64(at + 8)? as usize;
+            let n_orders = reader.u64(at + 16)? as usize;
+            let params = MarketParams {
+                seed: reader.u64(at)?,
+                n_steps: n_steps as u32,
+                initial_price: reader.f64(at + 24)?,
+                gbm_mu: reader.f64(at + 32)?,
+                gbm_sigma: reader.f64(at + 40)?,
+                gbm_dt: reader.f64(at + 48)?,
+                retail_arrival_rate: reader.f64(at + 56)?,
+                retail_mean_size: reader.f64(at + 64)?,
+                retail_size_sigma: reader.f64(at + 72)?,
+                retail_buy_prob: reader.f64(at + 80)?,
+            };
+            let prices_at = reader.u64(at + 88)? as usize;
+            let offsets_at = reader.u64(at + 96)? as usize;
+            let sides_at = reader.u64(at + 104)? as usize;
+            let sizes_at = reader.u64(at + 112)? as usize;
+            reader.section(prices_at, n_steps, 8)?;
+            reader.section(offsets_at, n_steps + 1, 4)?;
+            reader.section(sides_at, n_orders, 1)?;
+            reader.section(sizes_at, n_orders, 8)?;
+
+            let prices = (0..n_steps)
+                .map(|t| reader.f64(prices_at + 8 * t))
+                .collect::<Result<Vec<_>, _>>()?;
+            let order_offsets = (0..=n_steps)
+                .map(|t| reader.u32(offsets_at + 4 * t))
+                .collect::<Result<Vec<_>, _>>()?;
+            if order_offsets.last().map(|&end| end as usize) != Some(n_orders)
+                || order_offsets.windows(2).any(|w| w[0] > w[1])
+            {
+                return Err(TapeError::Format(format!("bad order offsets for seed {}", params.seed)));
+            }
+            let orders = (0..n_orders)
+                .map(|k| {
+                    Ok(RetailOrder {
+                        side: side_name(reader.u8(sides_at + k)?)?,
+                        size: reader.f64(sizes_at + 8 * k)?,
+                    })
+                })
+                .collect::<Result<Vec<_>, TapeError>>()?;
+
+            scenarios.push(MarketScenario {
+                params,
+                initial_price: params.initial_price,
+                prices,
+                order_offsets,
+                orders,
+            });
+        }
+
+        Self::from_scenarios(scenarios)
+    }
+
+    /// Write the tape to `path`.
+    pub fn save(&self, path: &Path) -> Result<(), TapeError> {
+        std::fs::write(path, self.to_bytes())?;
+        Ok(())
+    }
+
+    /// Read a tape from `path`.
+    pub fn load(path: &Path) -> Result<Self, TapeError> {
+        Self::from_bytes(&std::fs::read(path)?)
+    }
+}
+
+fn pad8(buf: &mut Vec<u8>) {
+    let len = (buf.len() + 7) & !7;
+    buf.resize(len, 0);
+}
+
+fn side_code(side: &str) -> u8 {
+    if side == "buy" { 0 } else { 1 }
+}
+
+fn side_name(code: u8) -> Result<&'static str, TapeError> {
+    match code {
+        0 => Ok("buy"),
+        1 => Ok("sell"),
+        other => Err(TapeError::Format(format!("bad order side {}", other))),
+    }
+}
+
+/// Bounds-checked little-endian reads.
+struct Reader<'a> {
+    data: &'a [u8],
+}
+
+impl Reader<'_> {
+    /// Check that `count` items of `width` bytes starting at `at` fit in the data.
+    fn section(&self, at: usize, count: usize, width: usize) -> Result<(), TapeError> {
+        count
+            .checked_mul(width)
+            .and_then(|len| at.checked_add(len))
+            .filter(|&end| end <= self.data.len())
+            .map(|_| ())
+            .ok_or_else(|| TapeError::Format(format!("section at byte {} overruns the tape", at)))
+    }
+
+    fn bytes<const N: usize>(&self, at: usize) -> Result<[u8; N], TapeError> {
+        self.data
+            .get(at..at + N)
+            .and_then(|b| b.try_into().ok())
+            .ok_or_else(|| TapeError::Format(format!("truncated at byte {}", at)))
+    }
+
+    fn u8(&self, at: usize) -> Result<u8, TapeError> {
+        Ok(self.bytes::<1>(at)?[0])
+    }
+
+    fn u32(&self, at: usize) -> Result<u32, TapeError> {
+        Ok(u32::from_le_bytes(self.bytes(at)?))
+    }
+
+    fn u64(&self, at: usize) -> Result<u64, TapeError> {
+        Ok(u64::from_le_bytes(self.bytes(at)?))
+    }
+
+    fn f64(&self, at: usize) -> Result<f64, TapeError> {
+        Ok(f64::from_le_bytes(self.bytes(at)?))
+    }
+}
+
+fn to_py_err(e: TapeError) -> PyErr {
+    match e {
+        TapeError::Io(e) => e.into(),
+        e => PyErr::new::<pyo3::exceptions::PyValueError, _>(e.to_string()),
+    }
+}
+
+#[pymethods]
+impl MarketTape {
+    /// Generate the market scenario for each config (seeds must be distinct).
+    #[staticmethod]
+    #[pyo3(name = "generate")]
+    fn py_generate(py: Python<'_>, configs: ConfigSet) -> PyResult<Self> {
+        py.allow_threads(|| Self::generate_set(&configs)).map_err(to_py_err)
+    }
+
+    /// Read a tape file.
+    #[staticmethod]
+    #[pyo3(name = "load")]
+    fn py_load(py: Python<'_>, path: std::path::PathBuf) -> PyResult<Self> {
+        py.allow_threads(|| Self::load(&path)).map_err(to_py_err)
+    }
+
+    /// Write the tape to a file.
+    #[pyo3(name = "save")]
+    fn py_save(&self, py: Python<'_>, path: std::path::PathBuf) -> PyResult<()> {
+        py.allow_threads(|| self.save(&path)).map_err(to_py_err)
+    }
+
+    /// Seeds on the tape, in tape order.
+    #[getter]
+    fn seeds(&self) -> Vec<u64> {
+        self.scenarios.iter().map(|s| s.params.seed).collect()
+    }
+
+    /// Total number of retail orders across all scenarios.
+    #[getter]
+    fn n_orders(&self) -> usize {
+        self.scenarios.iter().map(|s| s.orders.len()).sum()
+    }
+
+    fn __len__(&self) -> usize {
+        self.scenarios.len()
+    }
+
+    fn __repr__(&self) -> String {
+        format!("MarketTape(scenarios={}, orders={})", self.scenarios.len(), self.n_orders())
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn config(seed: u64) -> SimulationConfig {
+        SimulationConfig {
+            n_steps: 100,
+            initial_price: 100.0,
+            initial_x: 100.0,
+            initial_y: 10000.0,
+            gbm_mu: 0.0,
+            gbm_sigma: 0.001,
+            gbm_dt: 1.0,
+            retail_arrival_rate: 5.0,
+            retail_mean_size: 2.0,
+            retail_size_sigma: 0.7,
+            retail_buy_prob: 0.5,
+            seed: Some(seed),
+        }
+    }
+
+    #[test]
+    fn test_round_trip() {
+        let configs: Vec<_> = (0..4).map(config).collect();
+        let tape = MarketTape::generate(&configs).unwrap();
+        let bytes = tape.to_bytes();
+        let read = MarketTape::from_bytes(&bytes).unwrap();
+
+        assert_eq!(bytes.len() % 8, 0);
+        for (config, original) in configs.iter().zip(tape.scenarios()) {
+            let scenario = read.scenario_for(config).unwrap();
+            assert_eq!(scenario.params, original.params);
+            assert_eq!(scenario.initial_price, original.initial_price);
+            assert_eq!(scenario.prices, original.prices);
+            assert_eq!(scenario.order_offsets, original.order_offsets);
+            assert_eq!(scenario.orders.len(), original.orders.len());
+            for (a, b) in scenario.orders.iter().zip(&original.orders) {
+                assert_eq!(a.side, b.side);
+                assert_eq!(a.size, b.size);
+            }
+        }
+    }
+
+    #[test]
+    fn test_lookup_checks_seed_and_config() {
+        let tape = MarketTape::generate(&[config(1)]).unwrap();
+
+        assert!(matches!(tape.scenario_for(&config(2)), Err(TapeError::MissingSeed(2))));
+        let mut other = config(1);
+        other.gbm_sigma = 0.002;
+        assert!(matches!(tape.scenario_for(&other), Err(TapeError::ConfigMismatch(1))));
+        assert!(matches!(
+            MarketTape::generate(&[config(1), config(1)]),
+            Err(TapeError::DuplicateSeed(1))
+        ));
+    }
+
+    #[test]
+    fn test_rejects_corrupt_tapes() {
+        let bytes = MarketTape::generate(&[config(1)]).unwrap().to_bytes();
+
+        assert!(MarketTape::from_bytes(&bytes[..bytes.len() - 8]).is_err());
+        let mut bad_magic = bytes.clone();
+        bad_magic[0] = b'X';
+        assert!(MarketTape::from_bytes(&bad_magic).is_err());
+    }
+}
@@ -3,10 +3,12 @@
 use std::collections::HashMap;
 
 use crate::amm::CFMM;
-use crate::evm::EVMStrategy;
-use crate::market::{Arbitrageur, GBMPriceProcess, OrderRouter, RetailTrader};
+use crate::market::scenario::{LiveFeed, MarketFeed, MarketScenario};
+use crate::market::{Arbitrageur, OrderRouter};
+use crate::simulation::profile::{PhaseClock, PhaseTimes};
+use crate::strategy::FeeStrategy;
 use crate::types::config::SimulationConfig;
-use crate::types::result::{LightweightSimResult, LightweightStepResult};
+use crate::types::result::{GasProfile, LightweightSimResult, StepTraceBuilder};
 
 /// Error type for simulation.
 #[derive(Debug)]
@@ -26,241 +28,488 @@ impl std::fmt::Display for SimulationError {
 
 impl std::error::Error for SimulationError {}
 
+/// Running totals for one AMM over a simulation.
+#[derive(Debug, Clone, Copy, Default)]
+struct AmmTally {
+    edge: f64,
+    arb_volume_y: f64,
+    retail_volume_y: f64,
+    bid_fee_total: f64,
+    ask_fee_total: f64,
+}
+
 /// Main simulation engine for AMM competition.
 ///
 /// Runs a simulation with the following loop per step:
 /// 1. Generate new fair price via GBM
 /// 2. Arbitrageur extracts profit from each AMM
 /// 3. Retail orders arrive and are routed to best AMM
+///
+/// Per-step results are captured by default. Scoring runs that only need
+/// the summary can disable capture with [`SimulationEngine::with_step_capture`].
+///
+/// With [`SimulationEngine::with_profiling`], each run also records the time
+/// spent per phase, available from [`SimulationEngine::phase_times`].
 pub struct SimulationEngine {
     config: SimulationConfig,
+    capture_steps: bool,
+    profile: bool,
+    times: PhaseTimes,
 }
 
 impl SimulationEngine {
     /// Create a new simulation engine.
     pub fn new(config: SimulationConfig) -> Self {
-        Self { config }
+        Self {
+            config,
+            capture_steps: true,
+            profile: false,
+            times: PhaseTimes::default(),
+        }
+    }
+
+    /// Enable or disable per-step capture (summary-only mode when false).
+    pub fn with_step_capture(mut self, capture_steps: bool) -> Self {
+        self.capture_steps = capture_steps;
+        self
+    }
+
+    /// Enable or disable per-phase timing.
+    pub fn with_profiling(mut self, profile: bool) -> Self {
+        self.profile = profile;
+        self
+    }
+
+    /// Phase times of the last run (all zero unless profiling is enabled).
+    pub fn phase_times(&self) -> &PhaseTimes {
+        &self.times
     }
 
     /// Run a complete simulation.
     pub fn run(
         &mut self,
-        submission: EVMStrategy,
-        baseline: EVMStrategy,
+        submission: FeeStrategy,
+        baseline: FeeStrategy,
     ) -> Result<LightweightSimResult, SimulationError> {
-        let seed = self.config.seed.unwrap_or(0);
-
-        // Initialize price process
-        let mut price_process = GBMPriceProcess::new(
-            self.config.initial_price,
-            self.config.gbm_mu,
-            self.config.gbm_sigma,
-            self.config.gbm_dt,
-            Some(seed),
-        );
+        self.run_market(head_to_head(submission, baseline))
+    }
 
-        // Initialize retail trader with different seed
-        let mut retail_trader = RetailTrader::new(
-            self.config.retail_arrival_rate,
-            self.config.retail_mean_size,
-            self.config.retail_size_sigma,
-            self.config.retail_buy_prob,
-            Some(seed + 1),
-        );
+    /// Run a simulation against a pre-generated market scenario.
+    ///
+    /// Produces the same result as [`SimulationEngine::run`] when the
+    /// scenario was generated from this engine's config.
+    pub fn run_scenario(
+        &mut self,
+        scenario: &MarketScenario,
+        submission: FeeStrategy,
+        baseline: FeeStrategy,
+    ) -> Result<LightweightSimResult, SimulationError> {
+        self.run_market_scenario(scenario, head_to_head(submission, baseline))
+    }
 
-        let arbitrageur = Arbitrageur::new();
-        let router = OrderRouter::new();
+    /// Run a simulation with one AMM per named strategy.
+    ///
+    /// Retail flow is split across all AMMs by the router; results are
+    /// keyed by the given names, which must be distinct.
+    pub fn run_market(
+        &mut self,
+        strategies: Vec<(String, FeeStrategy)>,
+    ) -> Result<LightweightSimResult, SimulationError> {
+        let feed = LiveFeed::new(&self.config);
+        self.run_with_feed(feed, strategies)
+    }
 
-        // Create AMMs with fixed positional names to avoid HashMap collision
-        // when both contracts return the same getName()
-        let submission_name = "submission".to_string();
-        let baseline_name = "normalizer".to_string();
+    /// [`SimulationEngine::run_market`] against a pre-generated market scenario.
+    pub fn run_market_scenario(
+        &mut self,
+        scenario: &MarketScenario,
+        strategies: Vec<(String, FeeStrategy)>,
+    ) -> Result<LightweightSimResult, SimulationError> {
+        if scenario.n_steps() != self.config.n_steps as usize {
+            return Err(SimulationError::InvalidConfig(format!(
+                "Scenario has {} steps, config expects {}",
+                scenario.n_steps(),
+                self.config.n_steps
+            )));
+        }
+        self.run_with_feed(scenario.replay(), strategies)
+    }
 
-        let mut amm_submission = CFMM::new(
-            submission,
-            self.config.initial_x,
-            self.config.initial_y,
-        );
-        amm_submission.name = submission_name.clone();
+    fn run_with_feed<F: MarketFeed>(
+        &mut self,
+        mut feed: F,
+        strategies: Vec<(String, FeeStrategy)>,
+    ) -> Result<LightweightSimResult, SimulationError> {
+        let mut times = PhaseTimes::default();
+        let mut total_clock = PhaseClock::start(self.profile);
+        let mut clock = PhaseClock::start(self.profile);
+        let seed = self.config.seed.unwrap_or(0);
 
-        let mut amm_baseline = CFMM::new(
-            baseline,
-            self.config.initial_x,
-            self.config.initial_y,
-        );
-        amm_baseline.name = baseline_name.clone();
+        if strategies.is_empty() {
+            return Err(SimulationError::InvalidConfig("No strategies to simulate".into()));
+        }
+        for (i, (name, _)) in strategies.iter().enumerate() {
+            if strategies[..i].iter().any(|(other, _)| other == name) {
+                return Err(SimulationError::InvalidConfig(format!("Duplicate strategy name {:?}", name)));
+            }
+        }
 
-        // Initialize AMMs
-        amm_submission.initialize()
-            .map_err(|e| SimulationError::EVMError(e.to_string()))?;
-        amm_baseline.initialize()
-            .map_err(|e| SimulationError::EVMError(e.to_string()))?;
+        let arbitrageur = Arbitrageur::new();
+        let mut router = OrderRouter::new();
+
+        // Create AMMs under the caller's names; results are keyed by these
+        // rather than getName(), which several contracts may share
+        let mut amms = Vec::with_capacity(strategies.len());
+        let mut names = Vec::with_capacity(strategies.len());
+        for (name, strategy) in strategies {
+            let mut amm = CFMM::new(strategy, self.config.initial_x, self.config.initial_y);
+            amm.name = name.clone();
+            amm.initialize()
+                .map_err(|e| SimulationError::EVMError(e.to_string()))?;
+            amms.push(amm);
+            names.push(name);
+        }
 
         // Record initial state
-        let initial_fair_price = price_process.current_price();
-        let mut initial_reserves = HashMap::new();
-        initial_reserves.insert(
-            submission_name.clone(),
-            (amm_submission.reserves().0, amm_submission.reserves().1),
-        );
-        initial_reserves.insert(
-            baseline_name.clone(),
-            (amm_baseline.reserves().0, amm_baseline.reserves().1),
-        );
+        let initial_fair_price = feed.initial_price();
 
-        // Track edge per strategy
-        let mut edges: HashMap<String, f64> = HashMap::new();
-        edges.insert(submission_name.clone(), 0.0);
-        edges.insert(baseline_name.clone(), 0.0);
+        // Everything per-AMM below is indexed like `amms`
+        for amm in amms.iter_mut() {
+            amm.set_strategy_timing(self.profile);
+        }
+        let initial_reserves: Vec<(f64, f64)> = amms.iter().map(|amm| amm.reserves()).collect();
+        let mut tallies = vec![AmmTally::default(); amms.len()];
 
         // Run simulation steps
-        let mut steps = Vec::with_capacity(self.config.n_steps as usize);
-
-        // Store AMMs in a Vec for easier mutable access
-        let mut amms = vec![amm_submission, amm_baseline];
-        let names = vec![submission_name.clone(), baseline_name.clone()];
-
-        // Track cumulative volumes
-        let mut arb_volume_y: HashMap<String, f64> = HashMap::new();
-        let mut retail_volume_y: HashMap<String, f64> = HashMap::new();
-        // Track cumulative fees for averaging
-        let mut cumulative_bid_fees: HashMap<String, f64> = HashMap::new();
-        let mut cumulative_ask_fees: HashMap<String, f64> = HashMap::new();
-        for name in &names {
-            arb_volume_y.insert(name.clone(), 0.0);
-            retail_volume_y.insert(name.clone(), 0.0);
-            cumulative_bid_fees.insert(name.clone(), 0.0);
-            cumulative_ask_fees.insert(name.clone(), 0.0);
-        }
+        let capacity = if self.capture_steps { self.config.n_steps as usize } else { 0 };
+        let mut steps = StepTraceBuilder::with_capacity(names.clone(), capacity);
+
+        // Strategy time spent during arbitrage and routing, removed from
+        // those phases at the end
+        let mut arb_strategy_ns = 0;
+        let mut routing_strategy_ns = 0;
 
+        // Fills of the current step; reused so routing allocates only while
+        // it grows to the busiest step
+        let mut routed_trades = Vec::new();
+
+        let mut final_fair_price = initial_fair_price;
+        clock.lap(&mut times.setup_ns);
         for t in 0..self.config.n_steps {
             // 1. Generate new fair price
-            let fair_price = price_process.step();
+            let fair_price = feed.next_price();
+            final_fair_price = fair_price;
+            clock.lap(&mut times.price_ns);
+            let before_arb = if clock.enabled() { strategy_nanos(&amms) } else { 0 };
 
             // 2. Arbitrageur extracts profit from each AMM
-            for amm in amms.iter_mut() {
+            for (amm, tally) in amms.iter_mut().zip(tallies.iter_mut()) {
                 if let Some(arb_result) = arbitrageur.execute_arb(amm, fair_price, t as u64) {
-                    *arb_volume_y.get_mut(&arb_result.amm_name).unwrap() += arb_result.amount_y;
-                    let entry = edges.entry(arb_result.amm_name).or_insert(0.0);
+                    tally.arb_volume_y += arb_result.amount_y;
                     // AMM edge is the negative of arbitrageur profit at true price
-                    *entry += -arb_result.profit;
+                    tally.edge += -arb_result.profit;
                 }
             }
 
+            clock.lap(&mut times.arbitrage_ns);
+            let before_routing = if clock.enabled() { strategy_nanos(&amms) } else { 0 };
+            arb_strategy_ns += before_routing - before_arb;
+
             // 3. Retail orders arrive and get routed
-            let orders = retail_trader.generate_orders();
-            let routed_trades = router.route_orders(&orders, &mut amms, fair_price, t as u64);
-            for trade in routed_trades {
-                *retail_volume_y.get_mut(&trade.amm_name).unwrap() += trade.amount_y;
+            let orders = feed.next_orders();
+            router.route_orders_into(orders, &mut amms, fair_price, t as u64, &mut routed_trades);
+            for trade in &routed_trades {
+                let tally = &mut tallies[trade.amm_index];
+                tally.retail_volume_y += trade.amount_y;
                 let trade_edge = if trade.amm_buys_x {
                     trade.amount_x * fair_price - trade.amount_y
                 } else {
                     trade.amount_y - trade.amount_x * fair_price
                 };
-                let entry = edges.entry(trade.amm_name).or_insert(0.0);
-                *entry += trade_edge;
+                tally.edge += trade_edge;
             }
 
-            // 4. Capture step result and accumulate fees
-            let step = capture_step(
-                t,
-                fair_price,
-                &amms,
-                &names,
-                &initial_reserves,
-                initial_fair_price,
-            );
-            // Accumulate fees for averaging
-            for name in &names {
-                if let Some((bid_fee, ask_fee)) = step.fees.get(name) {
-                    *cumulative_bid_fees.get_mut(name).unwrap() += bid_fee;
-                    *cumulative_ask_fees.get_mut(name).unwrap() += ask_fee;
-                }
+            clock.lap(&mut times.routing_ns);
+            if clock.enabled() {
+                routing_strategy_ns += strategy_nanos(&amms) - before_routing;
             }
-            steps.push(step);
-        }
 
-        // Calculate final PnL (reserves + accumulated fees)
-        let final_fair_price = price_process.current_price();
-        let mut pnl = HashMap::new();
+            // 4. Accumulate fees for averaging
+            for (amm, tally) in amms.iter().zip(tallies.iter_mut()) {
+                let fee_quote = amm.fees();
+                tally.bid_fee_total += fee_quote.bid_fee.to_f64();
+                tally.ask_fee_total += fee_quote.ask_fee.to_f64();
+            }
 
-        // Calculate average fees
-        let n_steps = self.config.n_steps as f64;
-        let mut average_fees: HashMap<String, (f64, f64)> = HashMap::new();
-        for name in &names {
-            let avg_bid = cumulative_bid_fees.get(name).unwrap() / n_steps;
-            let avg_ask = cumulative_ask_fees.get(name).unwrap() / n_steps;
-            average_fees.insert(name.clone(), (avg_bid, avg_ask));
+            // 5. Capture step result
+            if self.capture_steps {
+                capture_step(
+                    &mut steps,
+                    t,
+                    fair_price,
+                    &amms,
+                    &initial_reserves,
+                    initial_fair_price,
+                );
+            }
+            clock.lap(&mut times.capture_ns);
         }
 
-        for (amm, name) in amms.iter().zip(names.iter()) {
-            let (init_x, init_y) = initial_reserves.get(name).unwrap();
-            let init_value = init_x * initial_fair_price + init_y;
-            let (final_x, final_y) = amm.reserves();
-            let (fees_x, fees_y) = amm.accumulated_fees();
-            let reserves_value = final_x * final_fair_price + final_y;
-            let fees_value = fees_x * final_fair_price + fees_y;
-            let final_value = reserves_value + fees_value;
-            pnl.insert(name.clone(), final_value - init_value);
+        // Name the per-AMM totals for the result
+        let n_steps = self.config.n_steps as f64;
+        let mut pnl = HashMap::with_capacity(amms.len());
+        let mut edges = HashMap::with_capacity(amms.len());
+        let mut arb_volume_y = HashMap::with_capacity(amms.len());
+        let mut retail_volume_y = HashMap::with_capacity(amms.len());
+        let mut average_fees = HashMap::with_capacity(amms.len());
+        let mut named_reserves = HashMap::with_capacity(amms.len());
+        let mut gas: HashMap<String, GasProfile> = HashMap::new();
+        for (i, (amm, name)) in amms.iter().zip(names.iter()).enumerate() {
+            let tally = &tallies[i];
+            let (init_x, init_y) = initial_reserves[i];
+            pnl.insert(
+                name.clone(),
+                amm_value(amm, final_fair_price) - (init_x * initial_fair_price + init_y),
+            );
+            edges.insert(name.clone(), tally.edge);
+            arb_volume_y.insert(name.clone(), tally.arb_volume_y);
+            retail_volume_y.insert(name.clone(), tally.retail_volume_y);
+            average_fees.insert(
+                name.clone(),
+                (tally.bid_fee_total / n_steps, tally.ask_fee_total / n_steps),
+            );
+            named_reserves.insert(name.clone(), (init_x, init_y));
+            if let Some(profile) = amm.gas_profile() {
+                gas.insert(name.clone(), profile);
+            }
         }
 
-        Ok(LightweightSimResult {
+        let result = LightweightSimResult {
             seed,
-            strategies: vec![submission_name, baseline_name],
+            strategies: names,
             pnl,
             edges,
             initial_fair_price,
-            initial_reserves,
-            steps,
+            initial_reserves: named_reserves,
+            steps: steps.finish(),
             arb_volume_y,
             retail_volume_y,
             average_fees,
-        })
+            gas,
+        };
+
+        if self.profile {
+            for amm in &amms {
+                let (calls, nanos) = amm.strategy_stats();
+                times.strategy_calls += calls;
+                if !amm.is_native() {
+                    times.evm_calls += calls;
+                }
+                times.strategy_ns += nanos;
+            }
+            times.arbitrage_ns = times.arbitrage_ns.saturating_sub(arb_strategy_ns);
+            times.routing_ns = times.routing_ns.saturating_sub(routing_strategy_ns);
+            times.simulations = 1;
+            times.steps = self.config.n_steps as u64;
+            total_clock.lap(&mut times.total_ns);
+        }
+        self.times = times;
+
+        Ok(result)
     }
 }
 
+/// The two-AMM market of [`SimulationEngine::run`], under fixed positional
+/// names so that both contracts may return the same getName().
+fn head_to_head(submission: FeeStrategy, baseline: FeeStrategy) -> Vec<(String, FeeStrategy)> {
+    vec![("submission".to_string(), submission), ("normalizer".to_string(), baseline)]
+}
+
+/// Total time spent in `afterSwap` calls across `amms`.
+fn strategy_nanos(amms: &[CFMM]) -> u64 {
+    amms.iter().map(|amm| amm.strategy_stats().1).sum()
+}
+
+/// Value of an AMM's reserves plus accumulated fees at `fair_price`.
+#[inline]
+fn amm_value(amm: &CFMM, fair_price: f64) -> f64 {
+    let (x, y) = amm.reserves();
+    let (fees_x, fees_y) = amm.accumulated_fees();
+    (x * fair_price + y) + (fees_x * fair_price + fees_y)
+}
+
 fn capture_step(
+    steps: &mut StepTraceBuilder,
     timestamp: u32,
     fair_price: f64,
     amms: &[CFMM],
-    names: &[String],
-    initial_reserves: &HashMap<String, (f64, f64)>,
+    initial_reserves: &[(f64, f64)],
     initial_fair_price: f64,
-) -> LightweightStepResult {
-    let mut spot_prices = HashMap::new();
-    let mut pnls = HashMap::new();
-    let mut fees = HashMap::new();
-
-    for (amm, name) in amms.iter().zip(names.iter()) {
-        spot_prices.insert(name.clone(), amm.spot_price());
+) {
+    steps.begin_step(timestamp, fair_price);
 
+    for (amm, &(init_x, init_y)) in amms.iter().zip(initial_reserves) {
         let fee_quote = amm.fees();
-        fees.insert(
-            name.clone(),
-            (fee_quote.bid_fee.to_f64(), fee_quote.ask_fee.to_f64()),
-        );
 
-        // Calculate running PnL (reserves + accumulated fees)
-        let (init_x, init_y) = initial_reserves.get(name).unwrap();
+        // Running PnL (reserves + accumulated fees)
         let init_value = init_x * initial_fair_price + init_y;
-        let (curr_x, curr_y) = amm.reserves();
-        let (fees_x, fees_y) = amm.accumulated_fees();
-        let reserves_value = curr_x * fair_price + curr_y;
-        let fees_value = fees_x * fair_price + fees_y;
-        let curr_value = reserves_value + fees_value;
-        pnls.insert(name.clone(), curr_value - init_value);
-    }
 
-    LightweightStepResult {
-        timestamp,
-        fair_price,
-        spot_prices,
-        pnls,
-        fees,
+        steps.push_amm(
+            amm.spot_price(),
+            amm_value(amm, fair_price) - init_value,
+            fee_quote.bid_fee.to_f64(),
+            fee_quote.ask_fee.to_f64(),
+        );
     }
 }
 
 #[cfg(test)]
 mod tests {
-    // Full tests require EVM bytecode - see integration tests
+    // Tests with EVM strategies require bytecode - see integration tests
+
+    use std::alloc::{GlobalAlloc, Layout, System};
+    use std::cell::Cell;
+
+    use super::*;
+    use crate::market::{GBMPriceProcess, RetailTrader};
+    use crate::strategy::{NativeStrategySpec, SpikeDecay};
+    use crate::types::Wad;
+
+    /// System allocator that counts allocations made by threads that opt in.
+    struct CountingAllocator;
+
+    thread_local! {
+        static COUNTING: Cell<bool> = const { Cell::new(false) };
+        static ALLOCATIONS: Cell<u64> = const { Cell::new(0) };
+    }
+
+    fn count_allocation() {
+        let _ = COUNTING.try_with(|counting| {
+            if counting.get() {
+                ALLOCATIONS.with(|n| n.set(n.get() + 1));
+            }
+        });
+    }
+
+    unsafe impl GlobalAlloc for CountingAllocator {
+        unsafe fn alloc(&self, layout: Layout) -> *mut u8 {
+            count_allocation();
+            System.alloc(layout)
+        }
+
+        unsafe fn alloc_zeroed(&self, layout: Layout) -> *mut u8 {
+            count_allocation();
+            System.alloc_zeroed(layout)
+        }
+
+        unsafe fn realloc(&self, ptr: *mut u8, layout: Layout, new_size: usize) -> *mut u8 {
+            count_allocation();
+            System.realloc(ptr, layout, new_size)
+        }
+
+        unsafe fn dealloc(&self, ptr: *mut u8, layout: Layout) {
+            System.dealloc(ptr, layout)
+        }
+    }
+
+    #[global_allocator]
+    static ALLOCATOR: CountingAllocator = CountingAllocator;
+
+    /// Allocations made by this thread while running `f`.
+    fn allocations_during<T>(f: impl FnOnce() -> T) -> (T, u64) {
+        ALLOCATIONS.with(|n| n.set(0));
+        COUNTING.with(|counting| counting.set(true));
+        let value = f();
+        COUNTING.with(|counting| counting.set(false));
+        (value, ALLOCATIONS.with(|n| n.get()))
+    }
+
+    fn config(n_steps: u32) -> SimulationConfig {
+        SimulationConfig::new(n_steps, 100.0, 100.0, 10000.0, 0.0, 0.001, 1.0, 5.0, 2.0, 0.7, 0.5, Some(3))
+    }
+
+    fn strategies() -> (FeeStrategy, FeeStrategy) {
+        let submission = NativeStrategySpec::spike_decay(SpikeDecay::default(), "DirContrarian".into());
+        let baseline = NativeStrategySpec::constant_fee(Wad::from_bps(30), Wad::from_bps(30), "Vanilla".into());
+        (submission.instantiate().into(), baseline.instantiate().into())
+    }
+
+    #[test]
+    fn test_step_loop_does_not_allocate() {
+        let config = config(1_000);
+        let mut prices = GBMPriceProcess::new(100.0, 0.0, 0.001, 1.0, Some(3));
+        let mut trader = RetailTrader::new(5.0, 2.0, 0.7, 0.5, Some(4));
+        let (submission, baseline) = strategies();
+        let mut amms = vec![
+            CFMM::new(submission, config.initial_x, config.initial_y),
+            CFMM::new(baseline, config.initial_x, config.initial_y),
+        ];
+        for amm in amms.iter_mut() {
+            amm.initialize().unwrap();
+        }
+        let arbitrageur = Arbitrageur::new();
+        let mut router = OrderRouter::new();
+        // Sized past any step a rate-5 Poisson will produce
+        let mut orders = Vec::with_capacity(256);
+        let mut trades = Vec::with_capacity(512);
+
+        let (fills, allocations) = allocations_during(|| {
+            let mut fills = 0;
+            for t in 0..config.n_steps as u64 {
+                let fair_price = prices.step();
+                for amm in amms.iter_mut() {
+                    arbitrageur.execute_arb(amm, fair_price, t);
+                }
+                trader.generate_orders_into(&mut orders);
+                router.route_orders_into(&orders, &mut amms, fair_price, t, &mut trades);
+                fills += trades.len();
+            }
+            fills
+        });
+
+        assert!(fills > 1_000);
+        assert_eq!(allocations, 0);
+    }
+
+    #[test]
+    fn test_engine_allocations_do_not_scale_with_steps() {
+        let run = |n_steps| {
+            let (submission, baseline) = strategies();
+            let mut engine = SimulationEngine::new(config(n_steps)).with_step_capture(false);
+            allocations_during(|| engine.run(submission, baseline).unwrap()).1
+        };
+
+        // Setup and result assembly allocate a fixed amount; the step
+        // buffers may grow a few more times in the longer run
+        let short = run(200);
+        let long = run(5_000);
+        assert!(long <= short + 4, "{} allocations for 200 steps, {} for 5000", short, long);
+    }
+
+    #[test]
+    fn test_market_hosts_any_number_of_strategies() {
+        let (submission, baseline) = strategies();
+        let rival = NativeStrategySpec::constant_fee(Wad::from_bps(50), Wad::from_bps(50), "Starter".into());
+        let market = vec![
+            ("submission".to_string(), submission),
+            ("rival".to_string(), rival.instantiate().into()),
+            ("normalizer".to_string(), baseline),
+        ];
+
+        let result = SimulationEngine::new(config(500)).run_market(market).unwrap();
+        assert_eq!(result.strategies, vec!["submission", "rival", "normalizer"]);
+        for name in &result.strategies {
+            assert!(result.retail_volume_y[name] > 0.0, "{} took no retail flow", name);
+        }
+        // The 50 bps pool quotes worse than the 30 bps one and wins less flow
+        assert!(result.retail_volume_y["rival"] < result.retail_volume_y["normalizer"]);
+    }
+
+    #[test]
+    fn test_market_rejects_duplicate_names() {
+        let (submission, baseline) = strategies();
+        let market = vec![("amm".to_string(), submission), ("amm".to_string(), baseline)];
+        let error = SimulationEngine::new(config(10)).run_market(market).unwrap_err();
+        assert!(matches!(error, SimulationError::InvalidConfig(_)));
+    }
 }
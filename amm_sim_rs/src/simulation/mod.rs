@@ -2,6 +2,12 @@
 
 pub mod engine;
 pub mod runner;
+pub mod pool;
+pub mod profile;
+pub mod stream;
 
 pub use engine::SimulationEngine;
 pub use runner::{run_simulations_parallel, SimulationBatchConfig};
+pub use pool::SimulationPool;
+pub use profile::{BatchProfile, PhaseTimes};
+pub use stream::BatchStream;
@@ -0,0 +1,481 @@
+//! Long-lived simulation pool shared across batches.
+
+use std::collections::HashMap;
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::sync::{Arc, Mutex};
+
+use pyo3::prelude::*;
+use rayon::ThreadPool;
+use revm::primitives::{keccak256, B256, U256};
+
+use crate::evm::StrategySnapshot;
+use crate::market::MarketTape;
+use crate::simulation::engine::SimulationError;
+use crate::simulation::runner::{
+    build_thread_pool, deploy_snapshot, run_candidates_in_pool, run_market_in_pool,
+    run_snapshots_in_pool,
+};
+use crate::simulation::stream::BatchStream;
+use crate::strategy::{
+    constant_fee_equivalent, BytecodeInput, NativeStrategySpec, StrategyInput, StrategySource,
+};
+use crate::types::config::ConfigSet;
+use crate::types::result::{BatchSimulationResult, CandidateBatchResult};
+
+/// Persistent worker pool for running many batches.
+///
+/// Keeps its rayon threads alive between batches and caches deployed
+/// strategy snapshots keyed by bytecode hash, so repeated batches (e.g.
+/// parameter sweeps against a fixed baseline) skip both pool spin-up and
+/// redeployment. Snapshots are immutable and shared by all workers.
+///
+/// Wherever a method takes strategy bytecode it also accepts a
+/// `NativeStrategySpec`, which runs a built-in fee rule without the EVM.
+///
+/// Contracts registered with `register_native` are matched by runtime code
+/// hash and run as their native rule. With `probe_constant_fees`, any other
+/// contract is also probed once for constant fees (see
+/// [`constant_fee_equivalent`]); probing samples a few trades rather than
+/// proving equivalence, so it is off unless asked for. With
+/// `verify_native_calls > 0`, each substituted simulation checks its first
+/// calls against the EVM and follows the EVM after a mismatch.
+///
+/// Every EVM strategy's `afterSwap` gas is reported in each result's `gas`.
+/// With `opcode_profile`, strategies also count the opcodes they execute;
+/// substitution is then off so that every strategy runs in the EVM.
+#[pyclass]
+pub struct SimulationPool {
+    pool: ThreadPool,
+    snapshots: Mutex<HashMap<B256, StrategySnapshot>>,
+    /// Native rules registered by runtime code hash
+    registered: Mutex<HashMap<B256, NativeStrategySpec>>,
+    /// Probe results, keyed like `snapshots`
+    equivalents: Mutex<HashMap<B256, Option<NativeStrategySpec>>>,
+    native_substitution: bool,
+    /// Substitute unregistered contracts whose probes return constant fees
+    probe_constant_fees: bool,
+    verify_native_calls: usize,
+    native_mismatches: Arc<AtomicUsize>,
+    opcode_profile: bool,
+}
+
+impl SimulationPool {
+    /// Create a pool with `n_workers` threads (None = auto-detect).
+    pub fn with_workers(n_workers: Option<usize>) -> Result<Self, SimulationError> {
+        Ok(Self {
+            pool: build_thread_pool(n_workers)?,
+            snapshots: Mutex::new(HashMap::new()),
+            registered: Mutex::new(HashMap::new()),
+            equivalents: Mutex::new(HashMap::new()),
+            native_substitution: true,
+            probe_constant_fees: false,
+            verify_native_calls: 0,
+            native_mismatches: Arc::new(AtomicUsize::new(0)),
+            opcode_profile: false,
+        })
+    }
+
+    /// Enable or disable native substitution, verifying the first
+    /// `verify_calls` strategy calls of every substituted simulation.
+    pub fn with_native_substitution(mut self, enabled: bool, verify_calls: usize) -> Self {
+        self.native_substitution = enabled;
+        self.verify_native_calls = verify_calls;
+        self
+    }
+
+    /// Also substitute unregistered contracts that probe as constant fees.
+    pub fn with_constant_fee_probe(mut self, enabled: bool) -> Self {
+        self.probe_constant_fees = enabled;
+        self
+    }
+
+    /// Count the opcodes executed by every EVM strategy (slow; disables
+    /// native substitution).
+    pub fn with_opcode_profile(mut self, enabled: bool) -> Self {
+        self.opcode_profile = enabled;
+        self
+    }
+
+    /// The underlying thread pool.
+    pub fn thread_pool(&self) -> &ThreadPool {
+        &self.pool
+    }
+
+    /// Get the snapshot for `bytecode`, deploying it on first use.
+    pub fn snapshot(&self, bytecode: &[u8], default_name: &str) -> Result<StrategySnapshot, SimulationError> {
+        let key = keccak256(bytecode);
+        let cached = self.snapshots.lock().unwrap().get(&key).cloned();
+        let snapshot = match cached {
+            Some(snapshot) => snapshot,
+            None => {
+                // Deploy outside the lock; a concurrent deploy of the same code is harmless
+                let snapshot = deploy_snapshot(bytecode, default_name)?;
+                self.snapshots
+                    .lock()
+                    .unwrap()
+                    .entry(key)
+                    .or_insert_with(|| snapshot.clone());
+                snapshot
+            }
+        };
+        if self.opcode_profile {
+            return Ok(snapshot.with_opcode_profile());
+        }
+        Ok(snapshot)
+    }
+
+    /// Resolve a strategy argument, deploying bytecode through the snapshot cache.
+    pub fn source(&self, strategy: &StrategyInput, default_name: &str) -> Result<StrategySource, SimulationError> {
+        let bytecode = match strategy {
+            StrategyInput::Native(spec) => return Ok(spec.clone().into()),
+            StrategyInput::Bytecode(bytecode) => bytecode,
+        };
+        let snapshot = self.snapshot(bytecode, default_name)?;
+        let spec = match self.native_equivalent(bytecode, &snapshot) {
+            Some(spec) => spec,
+            None => return Ok(snapshot.into()),
+        };
+        if self.verify_native_calls == 0 {
+            return Ok(spec.into());
+        }
+        Ok(StrategySource::Verified {
+            snapshot,
+            spec,
+            calls: self.verify_native_calls,
+            mismatches: Arc::clone(&self.native_mismatches),
+        })
+    }
+
+    /// Native rule that `snapshot` (deployed from `bytecode`) can run as, if any.
+    fn native_equivalent(&self, bytecode: &[u8], snapshot: &StrategySnapshot) -> Option<NativeStrategySpec> {
+        if !self.native_substitution || self.opcode_profile || snapshot.has_storage_overrides() {
+            return None;
+        }
+        if let Some(spec) = self.registered.lock().unwrap().get(&snapshot.code_hash()) {
+            return Some(spec.with_name(snapshot.name().to_string()));
+        }
+        if !self.probe_constant_fees {
+            return None;
+        }
+
+        let key = keccak256(bytecode);
+        if let Some(spec) = self.equivalents.lock().unwrap().get(&key) {
+            return spec.clone();
+        }
+        // Probe outside the lock, as for deployment
+        let spec = constant_fee_equivalent(snapshot);
+        self.equivalents.lock().unwrap().insert(key, spec.clone());
+        spec
+    }
+
+    /// Run `bytecode` as `spec` wherever its runtime code appears.
+    pub fn register_native(&self, bytecode: &[u8], spec: NativeStrategySpec) -> Result<(), SimulationError> {
+        let snapshot = self.snapshot(bytecode, spec.name())?;
+        self.registered.lock().unwrap().insert(snapshot.code_hash(), spec);
+        Ok(())
+    }
+
+    /// Run a batch of simulations on this pool.
+    pub fn run(
+        &self,
+        submission: &StrategyInput,
+        baseline: &StrategyInput,
+        configs: ConfigSet,
+        capture_steps: bool,
+        tape: Option<&MarketTape>,
+        profile: bool,
+    ) -> Result<BatchSimulationResult, SimulationError> {
+        let submission = self.source(submission, "Submission")?;
+        let baseline = self.source(baseline, "Baseline")?;
+        run_snapshots_in_pool(&self.pool, &submission, &baseline, configs, capture_steps, tape, profile)
+    }
+
+    /// Run a batch of markets with one AMM per `(name, strategy)` pair.
+    pub fn run_market_batch(
+        &self,
+        market: &[(String, StrategyInput)],
+        configs: ConfigSet,
+        capture_steps: bool,
+        tape: Option<&MarketTape>,
+    ) -> Result<BatchSimulationResult, SimulationError> {
+        let market = market
+            .iter()
+            .map(|(name, strategy)| self.source(strategy, name).map(|source| (name.clone(), source)))
+            .collect::<Result<Vec<_>, _>>()?;
+        run_market_in_pool(&self.pool, &market, configs, capture_steps, tape)
+    }
+
+    /// Run several candidates against one normalizer on shared scenarios.
+    pub fn run_candidate_batch(
+        &self,
+        candidates: &[StrategyInput],
+        normalizer: &StrategyInput,
+        configs: ConfigSet,
+        tape: Option<&MarketTape>,
+    ) -> Result<CandidateBatchResult, SimulationError> {
+        let candidates = candidates
+            .iter()
+            .map(|candidate| self.source(candidate, "Submission"))
+            .collect::<Result<Vec<_>, _>>()?;
+        let normalizer = self.source(normalizer, "Baseline")?;
+        run_candidates_in_pool(&self.pool, &candidates, &normalizer, configs, tape)
+    }
+
+    /// Run one compiled template under several parameter vectors.
+    ///
+    /// The template is deployed once; each parameter vector becomes a
+    /// snapshot sharing that code with its own `slots` overrides.
+    pub fn run_parameter_batch(
+        &self,
+        template_bytecode: &[u8],
+        normalizer: &StrategyInput,
+        parameters: Vec<Vec<(usize, u128)>>,
+        configs: ConfigSet,
+        tape: Option<&MarketTape>,
+    ) -> Result<CandidateBatchResult, SimulationError> {
+        let template = self.snapshot(template_bytecode, "Submission")?;
+        let candidates = parameters
+            .into_iter()
+            .map(|values| {
+                let storage = values
+                    .into_iter()
+                    .map(|(slot, value)| (slot, U256::from(value)))
+                    .collect();
+                template
+                    .with_storage(storage)
+                    .map(StrategySource::from)
+                    .map_err(|e| SimulationError::InvalidConfig(e.to_string()))
+            })
+            .collect::<Result<Vec<_>, _>>()?;
+        let normalizer = self.source(normalizer, "Baseline")?;
+        run_candidates_in_pool(&self.pool, &candidates, &normalizer, configs, tape)
+    }
+}
+
+#[pymethods]
+impl SimulationPool {
+    #[new]
+    #[pyo3(signature = (
+        n_workers = 0,
+        native_substitution = true,
+        verify_native_calls = 0,
+        opcode_profile = false,
+        probe_constant_fees = false
+    ))]
+    fn new(
+        n_workers: usize,
+        native_substitution: bool,
+        verify_native_calls: usize,
+        opcode_profile: bool,
+        probe_constant_fees: bool,
+    ) -> PyResult<Self> {
+        Self::with_workers(if n_workers == 0 { None } else { Some(n_workers) })
+            .map(|pool| {
+                pool.with_native_substitution(native_substitution, verify_native_calls)
+                    .with_constant_fee_probe(probe_constant_fees)
+                    .with_opcode_profile(opcode_profile)
+            })
+            .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))
+    }
+
+    /// Run `bytecode` as the native strategy `spec` wherever its runtime
+    /// code is passed to this pool (e.g. a recompiled VanillaStrategy).
+    #[pyo3(name = "register_native")]
+    fn py_register_native(&self, py: Python<'_>, bytecode: BytecodeInput, spec: NativeStrategySpec) -> PyResult<()> {
+        py.allow_threads(|| self.register_native(&bytecode, spec))
+            .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))
+    }
+
+    /// Run a batch of simulations (same arguments as `amm_sim_rs.run_batch`).
+    ///
+    /// The GIL is released while the batch runs, so several threads may
+    /// submit batches to the same pool concurrently. With a `MarketTape`,
+    /// each config's market is replayed from the tape instead of sampled.
+    #[pyo3(signature = (
+        submission_bytecode,
+        baseline_bytecode,
+        configs,
+        capture_steps = true,
+        tape = None,
+        profile = false
+    ))]
+    fn run_batch(
+        &self,
+        py: Python<'_>,
+        submission_bytecode: StrategyInput,
+        baseline_bytecode: StrategyInput,
+        configs: ConfigSet,
+        capture_steps: bool,
+        tape: Option<MarketTape>,
+        profile: bool,
+    ) -> PyResult<BatchSimulationResult> {
+        py.allow_threads(|| {
+            self.run(&submission_bytecode, &baseline_bytecode, configs, capture_steps, tape.as_ref(), profile)
+        })
+        .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))
+    }
+
+    /// Run a batch of markets in which every strategy runs its own AMM.
+    ///
+    /// Each retail order is split across all AMMs at equal marginal price,
+    /// so the strategies compete for the same flow. Results are keyed by
+    /// `names`, which default to `amm_0`, `amm_1`, ... in strategy order.
+    #[pyo3(signature = (strategies, configs, names = None, capture_steps = true, tape = None))]
+    fn run_market(
+        &self,
+        py: Python<'_>,
+        strategies: Vec<StrategyInput>,
+        configs: ConfigSet,
+        names: Option<Vec<String>>,
+        capture_steps: bool,
+        tape: Option<MarketTape>,
+    ) -> PyResult<BatchSimulationResult> {
+        let names = names.unwrap_or_else(|| (0..strategies.len()).map(|i| format!("amm_{}", i)).collect());
+        if strategies.is_empty() || names.len() != strategies.len() {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+                "Expected one name per strategy and at least one strategy, got {} names for {} strategies",
+                names.len(),
+                strategies.len()
+            )));
+        }
+        if names.iter().enumerate().any(|(i, name)| names[..i].contains(name)) {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>("Strategy names must be distinct"));
+        }
+        let market: Vec<(String, StrategyInput)> = names.into_iter().zip(strategies).collect();
+        py.allow_threads(|| self.run_market_batch(&market, configs, capture_steps, tape.as_ref()))
+            .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))
+    }
+
+    /// Run N candidates against one normalizer with common random numbers.
+    ///
+    /// Each seed's price path and retail order stream are generated once and
+    /// shared by all candidates. Returns a `CandidateBatchResult` whose
+    /// matrices are `(n_seeds, n_candidates)`.
+    #[pyo3(signature = (candidate_bytecodes, normalizer_bytecode, configs, tape = None))]
+    fn run_candidates(
+        &self,
+        py: Python<'_>,
+        candidate_bytecodes: Vec<StrategyInput>,
+        normalizer_bytecode: StrategyInput,
+        configs: ConfigSet,
+        tape: Option<MarketTape>,
+    ) -> PyResult<CandidateBatchResult> {
+        py.allow_threads(|| {
+            self.run_candidate_batch(&candidate_bytecodes, &normalizer_bytecode, configs, tape.as_ref())
+        })
+        .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))
+    }
+
+    /// Run a parameterized template against one normalizer.
+    ///
+    /// `parameters` holds one list of `(slot, value)` pairs per candidate;
+    /// each value is written to `slots[slot]` before `afterInitialize`. The
+    /// template is compiled and deployed once for the whole grid. Scenarios
+    /// are shared across candidates as in `run_candidates`.
+    #[pyo3(signature = (template_bytecode, normalizer_bytecode, parameters, configs, tape = None))]
+    fn run_parameterized(
+        &self,
+        py: Python<'_>,
+        template_bytecode: BytecodeInput,
+        normalizer_bytecode: StrategyInput,
+        parameters: Vec<Vec<(usize, u128)>>,
+        configs: ConfigSet,
+        tape: Option<MarketTape>,
+    ) -> PyResult<CandidateBatchResult> {
+        py.allow_threads(|| {
+            self.run_parameter_batch(
+                &template_bytecode,
+                &normalizer_bytecode,
+                parameters,
+                configs,
+                tape.as_ref(),
+            )
+        })
+        .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))
+    }
+
+    /// Start a batch and return an iterator over results as they complete.
+    ///
+    /// # Arguments
+    /// * `ordered` - Yield results in config order instead of completion order
+    /// * `progress` - Optional callable `progress(completed, total)`, invoked on
+    ///   the consuming thread after each result; raising from it cancels the batch
+    /// * `tape` - Optional `MarketTape` to replay markets from
+    /// * `profile` - Record per-phase timings, read from the stream's `profile`
+    #[pyo3(signature = (
+        submission_bytecode,
+        baseline_bytecode,
+        configs,
+        capture_steps = true,
+        ordered = false,
+        progress = None,
+        tape = None,
+        profile = false
+    ))]
+    fn stream_batch(
+        &self,
+        py: Python<'_>,
+        submission_bytecode: StrategyInput,
+        baseline_bytecode: StrategyInput,
+        configs: ConfigSet,
+        capture_steps: bool,
+        ordered: bool,
+        progress: Option<PyObject>,
+        tape: Option<MarketTape>,
+        profile: bool,
+    ) -> PyResult<BatchStream> {
+        let (submission, baseline) = py
+            .allow_threads(|| {
+                Ok::<_, SimulationError>((
+                    self.source(&submission_bytecode, "Submission")?,
+                    self.source(&baseline_bytecode, "Baseline")?,
+                ))
+            })
+            .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))?;
+
+        Ok(BatchStream::spawn(
+            &self.pool,
+            &submission,
+            &baseline,
+            configs,
+            capture_steps,
+            ordered,
+            progress,
+            tape,
+            profile,
+        ))
+    }
+
+    /// Number of worker threads.
+    #[getter]
+    fn n_workers(&self) -> usize {
+        self.pool.current_num_threads()
+    }
+
+    /// Number of cached strategy snapshots.
+    #[getter]
+    fn cached_strategies(&self) -> usize {
+        self.snapshots.lock().unwrap().len()
+    }
+
+    /// Number of verified calls where a substituted native strategy
+    /// disagreed with the EVM.
+    #[getter]
+    fn native_mismatches(&self) -> usize {
+        self.native_mismatches.load(Ordering::Relaxed)
+    }
+
+    /// Drop all cached strategy snapshots and probe results.
+    fn clear_cache(&self) {
+        self.snapshots.lock().unwrap().clear();
+        self.equivalents.lock().unwrap().clear();
+    }
+
+    fn __repr__(&self) -> String {
+        format!(
+            "SimulationPool(n_workers={}, cached_strategies={})",
+            self.n_workers(),
+            self.cached_strategies()
+        )
+    }
+}
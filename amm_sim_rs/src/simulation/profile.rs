@@ -0,0 +1,298 @@
+//! Phase timing for the simulation loop.
+//!
+//! Profiling is off by default. When off, each phase boundary costs one
+//! branch on an empty [`PhaseClock`]; no clock is read.
+
+use std::fmt::Write;
+use std::sync::Mutex;
+use std::time::Instant;
+
+use pyo3::prelude::*;
+
+/// Time spent in each phase of the simulation loop, in nanoseconds.
+///
+/// `arbitrage` and `routing` exclude the strategy calls made while
+/// executing trades, which are counted in `strategy`.
+#[pyclass(frozen)]
+#[derive(Debug, Clone, Copy, Default)]
+pub struct PhaseTimes {
+    /// AMM creation and `afterInitialize`
+    #[pyo3(get)]
+    pub setup_ns: u64,
+
+    /// Fair price generation (or replay)
+    #[pyo3(get)]
+    pub price_ns: u64,
+
+    /// Arbitrage, excluding strategy calls
+    #[pyo3(get)]
+    pub arbitrage_ns: u64,
+
+    /// Retail order generation and routing, excluding strategy calls
+    #[pyo3(get)]
+    pub routing_ns: u64,
+
+    /// `afterSwap` calls
+    #[pyo3(get)]
+    pub strategy_ns: u64,
+
+    /// Fee averaging and step capture
+    #[pyo3(get)]
+    pub capture_ns: u64,
+
+    /// Whole simulations, including result assembly
+    #[pyo3(get)]
+    pub total_ns: u64,
+
+    /// Simulations run
+    #[pyo3(get)]
+    pub simulations: u64,
+
+    /// Steps simulated
+    #[pyo3(get)]
+    pub steps: u64,
+
+    /// `afterSwap` calls
+    #[pyo3(get)]
+    pub strategy_calls: u64,
+
+    /// `afterSwap` calls into EVM strategies
+    #[pyo3(get)]
+    pub evm_calls: u64,
+}
+
+impl PhaseTimes {
+    /// Add another set of counters to this one.
+    pub fn merge(&mut self, other: &PhaseTimes) {
+        self.setup_ns += other.setup_ns;
+        self.price_ns += other.price_ns;
+        self.arbitrage_ns += other.arbitrage_ns;
+        self.routing_ns += other.routing_ns;
+        self.strategy_ns += other.strategy_ns;
+        self.capture_ns += other.capture_ns;
+        self.total_ns += other.total_ns;
+        self.simulations += other.simulations;
+        self.steps += other.steps;
+        self.strategy_calls += other.strategy_calls;
+        self.evm_calls += other.evm_calls;
+    }
+
+    /// Time not attributed to any phase (result assembly, bookkeeping).
+    pub fn other_ns(&self) -> u64 {
+        let phases = self.setup_ns
+            + self.price_ns
+            + self.arbitrage_ns
+            + self.routing_ns
+            + self.strategy_ns
+            + self.capture_ns;
+        self.total_ns.saturating_sub(phases)
+    }
+}
+
+#[pymethods]
+impl PhaseTimes {
+    #[getter(other_ns)]
+    fn py_other_ns(&self) -> u64 {
+        self.other_ns()
+    }
+
+    fn __repr__(&self) -> String {
+        format!(
+            "PhaseTimes(simulations={}, total_ns={}, strategy_calls={})",
+            self.simulations, self.total_ns, self.strategy_calls
+        )
+    }
+}
+
+/// Lap timer over the simulation loop; does nothing when disabled.
+pub struct PhaseClock {
+    last: Option<Instant>,
+}
+
+impl PhaseClock {
+    /// Start a clock, or an inert one when `enabled` is false.
+    #[inline]
+    pub fn start(enabled: bool) -> Self {
+        Self { last: enabled.then(Instant::now) }
+    }
+
+    /// Whether this clock is reading time.
+    #[inline]
+    pub fn enabled(&self) -> bool {
+        self.last.is_some()
+    }
+
+    /// Add the time since the previous lap to `counter` and start a new lap.
+    #[inline]
+    pub fn lap(&mut self, counter: &mut u64) {
+        if let Some(last) = self.last {
+            let now = Instant::now();
+            *counter += now.duration_since(last).as_nanos() as u64;
+            self.last = Some(now);
+        }
+    }
+}
+
+/// Collects [`PhaseTimes`] per rayon worker over one batch.
+pub struct BatchProfiler {
+    started: Instant,
+    workers: Vec<Mutex<PhaseTimes>>,
+}
+
+impl BatchProfiler {
+    /// Start profiling a batch on a pool of `n_workers` threads.
+    pub fn new(n_workers: usize) -> Self {
+        Self {
+            started: Instant::now(),
+            workers: (0..n_workers.max(1)).map(|_| Mutex::new(PhaseTimes::default())).collect(),
+        }
+    }
+
+    /// Add one simulation's times to the calling worker's counters.
+    pub fn record(&self, times: &PhaseTimes) {
+        let worker = rayon::current_thread_index().unwrap_or(0) % self.workers.len();
+        self.workers[worker].lock().unwrap().merge(times);
+    }
+
+    /// Snapshot of the counters so far.
+    pub fn finish(&self) -> BatchProfile {
+        BatchProfile {
+            workers: self.workers.iter().map(|w| *w.lock().unwrap()).collect(),
+            wall_ns: self.started.elapsed().as_nanos() as u64,
+        }
+    }
+}
+
+/// Where a batch spent its time, per worker thread.
+#[pyclass(frozen)]
+#[derive(Debug, Clone)]
+pub struct BatchProfile {
+    /// Counters per worker thread
+    #[pyo3(get)]
+    pub workers: Vec<PhaseTimes>,
+
+    /// Wall-clock time of the batch
+    #[pyo3(get)]
+    pub wall_ns: u64,
+}
+
+impl BatchProfile {
+    /// Counters summed over all workers.
+    pub fn total(&self) -> PhaseTimes {
+        let mut total = PhaseTimes::default();
+        for worker in &self.workers {
+            total.merge(worker);
+        }
+        total
+    }
+
+    /// Human-readable table of phase times.
+    pub fn report(&self) -> String {
+        let total = self.total();
+        let seconds = |ns: u64| ns as f64 / 1e9;
+        let share = |ns: u64| {
+            if total.total_ns == 0 { 0.0 } else { 100.0 * ns as f64 / total.total_ns as f64 }
+        };
+
+        let mut out = String::new();
+        let _ = writeln!(out, "{:<12} {:>10} {:>7}", "phase", "cpu (s)", "share");
+        for (phase, ns) in [
+            ("setup", total.setup_ns),
+            ("price", total.price_ns),
+            ("arbitrage", total.arbitrage_ns),
+            ("routing", total.routing_ns),
+            ("strategy", total.strategy_ns),
+            ("capture", total.capture_ns),
+            ("other", total.other_ns()),
+        ] {
+            let _ = writeln!(out, "{:<12} {:>10.3} {:>6.1}%", phase, seconds(ns), share(ns));
+        }
+        let _ = writeln!(out, "{:<12} {:>10.3}", "total", seconds(total.total_ns));
+        let _ = writeln!(out, "{:<12} {:>10.3}", "wall", seconds(self.wall_ns));
+
+        let per_call = if total.strategy_calls == 0 {
+            0.0
+        } else {
+            total.strategy_ns as f64 / total.strategy_calls as f64
+        };
+        let _ = writeln!(
+            out,
+            "\n{} simulations, {} steps, {} afterSwap calls ({} EVM), {:.0} ns/call",
+            total.simulations, total.steps, total.strategy_calls, total.evm_calls, per_call
+        );
+        for (i, worker) in self.workers.iter().enumerate() {
+            let _ = writeln!(
+                out,
+                "worker {:>2}: {:>6} simulations, {:>8.3} s busy",
+                i,
+                worker.simulations,
+                seconds(worker.total_ns)
+            );
+        }
+        out
+    }
+}
+
+#[pymethods]
+impl BatchProfile {
+    /// Counters summed over all workers.
+    #[getter(total)]
+    fn py_total(&self) -> PhaseTimes {
+        self.total()
+    }
+
+    /// Human-readable table of phase times.
+    #[pyo3(name = "report")]
+    fn py_report(&self) -> String {
+        self.report()
+    }
+
+    fn __str__(&self) -> String {
+        self.report()
+    }
+
+    fn __repr__(&self) -> String {
+        format!(
+            "BatchProfile(workers={}, wall_ns={})",
+            self.workers.len(),
+            self.wall_ns
+        )
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_inert_clock_reads_no_time() {
+        let mut clock = PhaseClock::start(false);
+        let mut counter = 0;
+        clock.lap(&mut counter);
+        assert!(!clock.enabled());
+        assert_eq!(counter, 0);
+    }
+
+    #[test]
+    fn test_batch_profile_totals() {
+        let times = PhaseTimes {
+            price_ns: 10,
+            strategy_ns: 30,
+            total_ns: 50,
+            simulations: 1,
+            strategy_calls: 3,
+            ..Default::default()
+        };
+        let profiler = BatchProfiler::new(2);
+        profiler.record(&times);
+        profiler.record(&times);
+
+        let profile = profiler.finish();
+        assert_eq!(profile.workers.len(), 2);
+        let total = profile.total();
+        assert_eq!(total.simulations, 2);
+        assert_eq!(total.total_ns, 100);
+        assert_eq!(total.other_ns(), 20);
+        assert!(profile.report().contains("6 afterSwap calls"));
+    }
+}
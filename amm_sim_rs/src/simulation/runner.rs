@@ -1,62 +1,120 @@
 //! Parallel simulation runner using rayon.
 
+use std::sync::Arc;
+
 use rayon::prelude::*;
+use rayon::ThreadPool;
 
-use crate::evm::EVMStrategy;
+use crate::evm::StrategySnapshot;
 use crate::simulation::engine::{SimulationEngine, SimulationError};
-use crate::types::config::SimulationConfig;
-use crate::types::result::{BatchSimulationResult, LightweightSimResult};
+use crate::simulation::profile::BatchProfiler;
+use crate::strategy::StrategySource;
+use crate::types::config::{ConfigSet, SimulationConfig};
+use crate::market::{MarketScenario, MarketTape};
+use crate::types::result::{BatchSimulationResult, CandidateBatchResult, LightweightSimResult};
 
 /// Configuration for a batch of simulations.
 pub struct SimulationBatchConfig {
     /// Bytecode for the submission strategy
-    pub submission_bytecode: Vec<u8>,
+    pub submission_bytecode: Arc<[u8]>,
     /// Bytecode for the baseline strategy
-    pub baseline_bytecode: Vec<u8>,
-    /// List of simulation configs (one per simulation)
-    pub configs: Vec<SimulationConfig>,
+    pub baseline_bytecode: Arc<[u8]>,
+    /// Simulation configs (one per simulation)
+    pub configs: ConfigSet,
     /// Number of parallel workers (None = auto-detect)
     pub n_workers: Option<usize>,
+    /// Capture per-step results (false = summary-only mode)
+    pub capture_steps: bool,
+    /// Record per-phase timings (see [`crate::simulation::profile`])
+    pub profile: bool,
 }
 
-/// Run multiple simulations in parallel.
-pub fn run_simulations_parallel(
-    batch_config: SimulationBatchConfig,
-) -> Result<BatchSimulationResult, SimulationError> {
-    // Configure thread pool
-    let n_workers = batch_config.n_workers.unwrap_or_else(|| {
+/// Build a rayon thread pool (None = auto-detect, capped at 8 workers).
+pub fn build_thread_pool(n_workers: Option<usize>) -> Result<ThreadPool, SimulationError> {
+    let n_workers = n_workers.unwrap_or_else(|| {
         rayon::current_num_threads().min(8)
     });
 
-    // Build custom thread pool if needed
-    let pool = rayon::ThreadPoolBuilder::new()
+    rayon::ThreadPoolBuilder::new()
         .num_threads(n_workers)
         .build()
-        .map_err(|e| SimulationError::InvalidConfig(format!("Failed to create thread pool: {}", e)))?;
+        .map_err(|e| SimulationError::InvalidConfig(format!("Failed to create thread pool: {}", e)))
+}
+
+/// Deploy a strategy once, mapping failures to a simulation error.
+pub fn deploy_snapshot(bytecode: &[u8], default_name: &str) -> Result<StrategySnapshot, SimulationError> {
+    StrategySnapshot::deploy(bytecode, default_name.to_string())
+        .map_err(|e| SimulationError::EVMError(e.to_string()))
+}
+
+/// Look up the scenario for `config` on `tape`.
+fn tape_scenario<'a>(tape: &'a MarketTape, config: &SimulationConfig) -> Result<&'a MarketScenario, SimulationError> {
+    tape.scenario_for(config)
+        .map_err(|e| SimulationError::InvalidConfig(e.to_string()))
+}
+
+/// Run one simulation, replaying its market from `tape` when one is given.
+///
+/// With a `profiler`, the simulation's phase times are added to the
+/// calling worker's counters.
+pub fn simulate(
+    config: SimulationConfig,
+    submission: &StrategySource,
+    baseline: &StrategySource,
+    capture_steps: bool,
+    tape: Option<&MarketTape>,
+    profiler: Option<&BatchProfiler>,
+) -> Result<LightweightSimResult, SimulationError> {
+    let scenario = tape.map(|tape| tape_scenario(tape, &config)).transpose()?;
+    let mut engine = SimulationEngine::new(config)
+        .with_step_capture(capture_steps)
+        .with_profiling(profiler.is_some());
+    let result = match scenario {
+        Some(scenario) => engine.run_scenario(scenario, submission.instantiate(), baseline.instantiate()),
+        None => engine.run(submission.instantiate(), baseline.instantiate()),
+    }?;
+    if let Some(profiler) = profiler {
+        profiler.record(engine.phase_times());
+    }
+    Ok(result)
+}
 
-    // Clone bytecodes for each worker (they need their own EVM instances)
-    let submission_bytecode = batch_config.submission_bytecode;
-    let baseline_bytecode = batch_config.baseline_bytecode;
+/// Run one simulation with an AMM per named strategy source.
+pub fn simulate_market(
+    config: SimulationConfig,
+    market: &[(String, StrategySource)],
+    capture_steps: bool,
+    tape: Option<&MarketTape>,
+) -> Result<LightweightSimResult, SimulationError> {
+    let scenario = tape.map(|tape| tape_scenario(tape, &config)).transpose()?;
+    let strategies = market
+        .iter()
+        .map(|(name, source)| (name.clone(), source.instantiate()))
+        .collect();
+    let mut engine = SimulationEngine::new(config).with_step_capture(capture_steps);
+    match scenario {
+        Some(scenario) => engine.run_market_scenario(scenario, strategies),
+        None => engine.run_market(strategies),
+    }
+}
+
+/// Run a batch on `pool`, instantiating both strategies from their sources.
+pub fn run_snapshots_in_pool(
+    pool: &ThreadPool,
+    submission: &StrategySource,
+    baseline: &StrategySource,
+    configs: ConfigSet,
+    capture_steps: bool,
+    tape: Option<&MarketTape>,
+    profile: bool,
+) -> Result<BatchSimulationResult, SimulationError> {
+    let profiler = profile.then(|| BatchProfiler::new(pool.current_num_threads()));
 
     // Run simulations in parallel
     let results: Result<Vec<LightweightSimResult>, SimulationError> = pool.install(|| {
-        batch_config.configs
-            .into_par_iter()
-            .map(|config| {
-                // Create fresh EVM strategies for this worker
-                let submission = EVMStrategy::new(
-                    submission_bytecode.clone(),
-                    "Submission".to_string(),
-                ).map_err(|e| SimulationError::EVMError(e.to_string()))?;
-
-                let baseline = EVMStrategy::new(
-                    baseline_bytecode.clone(),
-                    "Baseline".to_string(),
-                ).map_err(|e| SimulationError::EVMError(e.to_string()))?;
-
-                let mut engine = SimulationEngine::new(config);
-                engine.run(submission, baseline)
-            })
+        configs
+            .par_iter()
+            .map(|config| simulate(config, submission, baseline, capture_steps, tape, profiler.as_ref()))
             .collect()
     });
 
@@ -69,23 +127,135 @@ pub fn run_simulations_parallel(
         Vec::new()
     };
 
-    Ok(BatchSimulationResult { results, strategies })
+    Ok(BatchSimulationResult {
+        results,
+        strategies,
+        profile: profiler.map(|profiler| profiler.finish()),
+    })
+}
+
+/// Run a batch of N-AMM markets on `pool`, one AMM per named source.
+pub fn run_market_in_pool(
+    pool: &ThreadPool,
+    market: &[(String, StrategySource)],
+    configs: ConfigSet,
+    capture_steps: bool,
+    tape: Option<&MarketTape>,
+) -> Result<BatchSimulationResult, SimulationError> {
+    let results = pool.install(|| {
+        configs
+            .par_iter()
+            .map(|config| simulate_market(config, market, capture_steps, tape))
+            .collect::<Result<Vec<LightweightSimResult>, SimulationError>>()
+    })?;
+
+    Ok(BatchSimulationResult {
+        results,
+        strategies: market.iter().map(|(name, _)| name.clone()).collect(),
+        profile: None,
+    })
+}
+
+/// Run many candidates against one normalizer with common random numbers.
+///
+/// For each config the market scenario (price path and retail orders) is
+/// generated once, or taken from `tape`, and replayed against every
+/// candidate in parallel.
+pub fn run_candidates_in_pool(
+    pool: &ThreadPool,
+    candidates: &[StrategySource],
+    normalizer: &StrategySource,
+    configs: ConfigSet,
+    tape: Option<&MarketTape>,
+) -> Result<CandidateBatchResult, SimulationError> {
+    let seeds = configs.seeds();
+    let n_candidates = candidates.len();
+
+    // (candidate edge, normalizer edge, candidate pnl) per (seed, candidate)
+    let rows: Result<Vec<Vec<(f64, f64, f64)>>, SimulationError> = pool.install(|| {
+        configs
+            .par_iter()
+            .map(|config| {
+                let generated;
+                let scenario = match tape {
+                    Some(tape) => tape_scenario(tape, &config)?,
+                    None => {
+                        generated = MarketScenario::generate(&config);
+                        &generated
+                    }
+                };
+                candidates
+                    .par_iter()
+                    .map(|candidate| {
+                        let mut engine = SimulationEngine::new(config.clone()).with_step_capture(false);
+                        let result = engine.run_scenario(
+                            scenario,
+                            candidate.instantiate(),
+                            normalizer.instantiate(),
+                        )?;
+                        Ok((
+                            result.edges.get("submission").copied().unwrap_or(0.0),
+                            result.edges.get("normalizer").copied().unwrap_or(0.0),
+                            result.pnl.get("submission").copied().unwrap_or(0.0),
+                        ))
+                    })
+                    .collect::<Result<Vec<_>, SimulationError>>()
+            })
+            .collect()
+    });
+
+    let cells = seeds.len() * n_candidates;
+    let mut edges = Vec::with_capacity(cells);
+    let mut normalizer_edges = Vec::with_capacity(cells);
+    let mut pnl = Vec::with_capacity(cells);
+    for (edge, normalizer_edge, candidate_pnl) in rows?.into_iter().flatten() {
+        edges.push(edge);
+        normalizer_edges.push(normalizer_edge);
+        pnl.push(candidate_pnl);
+    }
+
+    Ok(CandidateBatchResult {
+        seeds,
+        n_candidates,
+        edges: Arc::new(edges),
+        normalizer_edges: Arc::new(normalizer_edges),
+        pnl: Arc::new(pnl),
+    })
+}
+
+/// Run multiple simulations in parallel.
+pub fn run_simulations_parallel(
+    batch_config: SimulationBatchConfig,
+) -> Result<BatchSimulationResult, SimulationError> {
+    let pool = build_thread_pool(batch_config.n_workers)?;
+
+    // Deploy each strategy once; simulations start from copy-on-write clones
+    let submission = deploy_snapshot(&batch_config.submission_bytecode, "Submission")?;
+    let baseline = deploy_snapshot(&batch_config.baseline_bytecode, "Baseline")?;
+
+    run_snapshots_in_pool(
+        &pool,
+        &submission.into(),
+        &baseline.into(),
+        batch_config.configs,
+        batch_config.capture_steps,
+        None,
+        batch_config.profile,
+    )
 }
 
 /// Run a single simulation (non-parallel).
 pub fn run_simulation(
-    submission_bytecode: Vec<u8>,
-    baseline_bytecode: Vec<u8>,
+    submission_bytecode: &[u8],
+    baseline_bytecode: &[u8],
     config: SimulationConfig,
+    capture_steps: bool,
 ) -> Result<LightweightSimResult, SimulationError> {
-    let submission = EVMStrategy::new(submission_bytecode, "Submission".to_string())
-        .map_err(|e| SimulationError::EVMError(e.to_string()))?;
-
-    let baseline = EVMStrategy::new(baseline_bytecode, "Baseline".to_string())
-        .map_err(|e| SimulationError::EVMError(e.to_string()))?;
+    let submission = deploy_snapshot(submission_bytecode, "Submission")?.instantiate();
+    let baseline = deploy_snapshot(baseline_bytecode, "Baseline")?.instantiate();
 
-    let mut engine = SimulationEngine::new(config);
-    engine.run(submission, baseline)
+    let mut engine = SimulationEngine::new(config).with_step_capture(capture_steps);
+    engine.run(submission.into(), baseline.into())
 }
 
 #[cfg(test)]
@@ -0,0 +1,225 @@
+//! Streaming batch execution.
+
+use std::collections::BTreeMap;
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::mpsc::{sync_channel, Receiver};
+use std::sync::{Arc, Mutex};
+
+use pyo3::prelude::*;
+use rayon::ThreadPool;
+
+use crate::market::MarketTape;
+use crate::simulation::engine::SimulationError;
+use crate::simulation::profile::{BatchProfile, BatchProfiler};
+use crate::simulation::runner::simulate;
+use crate::strategy::StrategySource;
+use crate::types::config::ConfigSet;
+use crate::types::result::LightweightSimResult;
+
+type IndexedResult = (usize, Result<LightweightSimResult, SimulationError>);
+
+/// Consumer-side state, guarded by a single lock.
+struct StreamState {
+    /// Dropped on cancel, so workers blocked on a full channel return
+    receiver: Option<Receiver<IndexedResult>>,
+    /// Out-of-order results waiting for their turn (ordered mode only)
+    pending: BTreeMap<usize, Result<LightweightSimResult, SimulationError>>,
+    /// Number of results handed out so far
+    yielded: usize,
+}
+
+/// Iterator over simulation results as they complete.
+///
+/// Results arrive in completion order, or in config order when the stream
+/// was created with `ordered=True`. Workers block once a small number of
+/// unread results are queued, which bounds peak memory for long runs.
+/// Call `cancel()` (or drop the stream) to skip simulations not yet started.
+#[pyclass]
+pub struct BatchStream {
+    state: Mutex<StreamState>,
+    cancelled: Arc<AtomicBool>,
+    total: usize,
+    ordered: bool,
+    /// Optional `progress(completed, total)` callback
+    progress: Option<PyObject>,
+    /// Phase timings, when the stream was created with profiling
+    profiler: Option<Arc<BatchProfiler>>,
+}
+
+impl BatchStream {
+    /// Spawn one task per config on `pool` and return a stream of results.
+    pub fn spawn(
+        pool: &ThreadPool,
+        submission: &StrategySource,
+        baseline: &StrategySource,
+        configs: ConfigSet,
+        capture_steps: bool,
+        ordered: bool,
+        progress: Option<PyObject>,
+        tape: Option<MarketTape>,
+        profile: bool,
+    ) -> Self {
+        let total = configs.len();
+        let profiler = profile.then(|| Arc::new(BatchProfiler::new(pool.current_num_threads())));
+        let capacity = (2 * pool.current_num_threads()).max(16);
+        let (sender, receiver) = sync_channel(capacity);
+        let cancelled = Arc::new(AtomicBool::new(false));
+
+        let configs = Arc::new(configs);
+        for index in 0..total {
+            let configs = Arc::clone(&configs);
+            let sender = sender.clone();
+            let cancelled = Arc::clone(&cancelled);
+            let submission = submission.clone();
+            let baseline = baseline.clone();
+            let tape = tape.clone();
+            let profiler = profiler.clone();
+            pool.spawn(move || {
+                if cancelled.load(Ordering::Relaxed) {
+                    return;
+                }
+                let result = simulate(
+                    configs.get(index),
+                    &submission,
+                    &baseline,
+                    capture_steps,
+                    tape.as_ref(),
+                    profiler.as_deref(),
+                );
+                // The receiver is gone if the stream was cancelled; nothing to do
+                let _ = sender.send((index, result));
+            });
+        }
+
+        Self {
+            state: Mutex::new(StreamState {
+                receiver: Some(receiver),
+                pending: BTreeMap::new(),
+                yielded: 0,
+            }),
+            cancelled,
+            total,
+            ordered,
+            progress,
+            profiler,
+        }
+    }
+
+    /// Block until the next result is available (None when exhausted).
+    pub fn next_result(&self) -> Option<Result<LightweightSimResult, SimulationError>> {
+        let mut state = self.state.lock().unwrap();
+        loop {
+            if state.yielded >= self.total || self.cancelled.load(Ordering::Relaxed) {
+                return None;
+            }
+
+            if self.ordered {
+                let next_index = state.yielded;
+                if let Some(result) = state.pending.remove(&next_index) {
+                    state.yielded += 1;
+                    return Some(result);
+                }
+            }
+
+            // All senders gone means every remaining task was skipped
+            let (index, result) = state.receiver.as_ref()?.recv().ok()?;
+            if self.ordered {
+                state.pending.insert(index, result);
+            } else {
+                state.yielded += 1;
+                return Some(result);
+            }
+        }
+    }
+
+    /// Stop scheduling new simulations; in-flight ones finish and are discarded.
+    ///
+    /// Dropping the receiver wakes workers blocked on a full channel, so the
+    /// pool's threads are free for other batches even while this stream
+    /// object is still referenced.
+    pub fn cancel(&self) {
+        // Set first: a consumer blocked in `recv` holds the lock, and exits
+        // on its next result once it sees the flag
+        self.cancelled.store(true, Ordering::Relaxed);
+        let mut state = self.state.lock().unwrap();
+        state.receiver = None;
+        state.pending.clear();
+    }
+}
+
+impl Drop for BatchStream {
+    fn drop(&mut self) {
+        self.cancel();
+    }
+}
+
+#[pymethods]
+impl BatchStream {
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    fn __next__(&self, py: Python<'_>) -> PyResult<Option<LightweightSimResult>> {
+        match py.allow_threads(|| self.next_result()) {
+            Some(Ok(result)) => {
+                if let Some(progress) = &self.progress {
+                    // An exception from the callback cancels the stream
+                    if let Err(e) = progress.call1(py, (self.completed(), self.total)) {
+                        self.cancel();
+                        return Err(e);
+                    }
+                }
+                Ok(Some(result))
+            }
+            Some(Err(e)) => {
+                self.cancel();
+                Err(PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))
+            }
+            None => Ok(None),
+        }
+    }
+
+    /// Stop the stream; remaining simulations are skipped.
+    #[pyo3(name = "cancel")]
+    fn py_cancel(&self) {
+        self.cancel();
+    }
+
+    /// Whether the stream has been cancelled.
+    #[getter]
+    fn cancelled(&self) -> bool {
+        self.cancelled.load(Ordering::Relaxed)
+    }
+
+    /// Phase timings of the simulations finished so far (None unless the
+    /// stream was created with `profile=True`).
+    #[getter]
+    fn profile(&self) -> Option<BatchProfile> {
+        self.profiler.as_ref().map(|profiler| profiler.finish())
+    }
+
+    /// Number of results yielded so far.
+    #[getter]
+    fn completed(&self) -> usize {
+        self.state.lock().unwrap().yielded
+    }
+
+    /// Total number of simulations in the batch.
+    #[getter]
+    fn total(&self) -> usize {
+        self.total
+    }
+
+    fn __len__(&self) -> usize {
+        self.total
+    }
+
+    fn __repr__(&self) -> String {
+        format!(
+            "BatchStream(completed={}, total={}, ordered={})",
+            self.completed(),
+            self.total,
+            self.ordered
+        )
+    }
+}
@@ -0,0 +1,119 @@
+//! Recognize compiled strategies that a native rule can stand in for.
+//!
+//! A strategy qualifies as a constant fee when, after `afterInitialize`,
+//! no probe `afterSwap` call writes storage and every call returns the
+//! same (bid, ask) as initialization. Probing cannot prove that for all
+//! inputs, so pools can cross-check the first calls of every simulation
+//! against the EVM (see [`VerifiedStrategy`](super::VerifiedStrategy)).
+
+use crate::evm::StrategySnapshot;
+use crate::strategy::NativeStrategySpec;
+use crate::types::trade_info::TradeInfo;
+use crate::types::wad::Wad;
+
+/// Starting reserves `afterInitialize` is probed with.
+const PROBE_RESERVES: [(f64, f64); 2] = [(100.0, 10_000.0), (1_000.0, 1_000.0)];
+
+/// Trades `afterSwap` is probed with: both directions, dust to most of the
+/// pool, early and late timestamps.
+fn probe_trades() -> [TradeInfo; 6] {
+    let trade = |is_buy: bool, amount_x: f64, amount_y: f64, timestamp: u64, reserve_x: f64, reserve_y: f64| {
+        TradeInfo::new(
+            is_buy,
+            Wad::from_f64(amount_x),
+            Wad::from_f64(amount_y),
+            timestamp,
+            Wad::from_f64(reserve_x),
+            Wad::from_f64(reserve_y),
+        )
+    };
+    [
+        trade(true, 0.2, 19.9, 0, 100.2, 9_980.1),
+        trade(false, 0.2, 20.1, 1, 100.0, 10_000.2),
+        trade(true, 1e-6, 1e-4, 17, 100.0, 10_000.2),
+        trade(false, 60.0, 6_000.0, 2_500, 40.0, 16_000.0),
+        trade(true, 150.0, 9_000.0, 9_999, 250.0, 4_000.0),
+        trade(false, 3.0, 250.0, 1_000_000, 97.0, 10_300.0),
+    ]
+}
+
+/// Constant-fee equivalent of `snapshot`, if probing finds one.
+///
+/// Snapshots with storage overrides are never substituted: their behaviour
+/// depends on slots the probe cannot see change.
+pub fn constant_fee_equivalent(snapshot: &StrategySnapshot) -> Option<NativeStrategySpec> {
+    if snapshot.has_storage_overrides() {
+        return None;
+    }
+
+    let mut fees = None;
+    for (initial_x, initial_y) in PROBE_RESERVES {
+        let mut strategy = snapshot.instantiate();
+        let initial = strategy
+            .after_initialize(Wad::from_f64(initial_x), Wad::from_f64(initial_y))
+            .ok()?;
+        if fees.map_or(false, |fees| fees != initial) {
+            return None;
+        }
+        fees = Some(initial);
+
+        for trade in probe_trades().iter() {
+            let (quote, wrote_storage) = strategy.after_swap_observed(trade).ok()?;
+            if wrote_storage || quote != initial {
+                return None;
+            }
+        }
+    }
+
+    let (bid_fee, ask_fee) = fees?;
+    Some(NativeStrategySpec::constant_fee(bid_fee, ask_fee, snapshot.name().to_string()))
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    /// Returns 30 bps for both fees from every call.
+    const CONSTANT_FEE_INITCODE: &str = "601b600c600039601b6000f3\
+660aa87bee538000600052660aa87bee53800060205260406000f3";
+
+    /// Increments slots[0] on every call and returns it for both fees.
+    const COUNTER_INITCODE: &str = "6016600c60003960166000f3\
+600054600101806000558060005260205260406000f3";
+
+    /// Returns the calldata word at offset 100 (afterSwap's timestamp) for both fees.
+    const TIMESTAMP_ECHO_INITCODE: &str = "600f600c600039600f6000f3\
+606435806000526020526040\
+6000f3";
+
+    fn snapshot(initcode: &str) -> StrategySnapshot {
+        let bytecode: Vec<u8> = (0..initcode.len())
+            .step_by(2)
+            .map(|i| u8::from_str_radix(&initcode[i..i + 2], 16).unwrap())
+            .collect();
+        StrategySnapshot::deploy(&bytecode, "Probe".into()).unwrap()
+    }
+
+    #[test]
+    fn test_detects_constant_fee() {
+        let spec = constant_fee_equivalent(&snapshot(CONSTANT_FEE_INITCODE)).unwrap();
+        assert_eq!(
+            spec,
+            NativeStrategySpec::constant_fee(Wad::from_bps(30), Wad::from_bps(30), spec.name().to_string())
+        );
+    }
+
+    #[test]
+    fn test_rejects_stateful_and_input_dependent() {
+        assert!(constant_fee_equivalent(&snapshot(COUNTER_INITCODE)).is_none());
+        assert!(constant_fee_equivalent(&snapshot(TIMESTAMP_ECHO_INITCODE)).is_none());
+    }
+
+    #[test]
+    fn test_skips_storage_overrides() {
+        let tuned = snapshot(CONSTANT_FEE_INITCODE)
+            .with_storage(vec![(0, revm::primitives::U256::from(1u64))])
+            .unwrap();
+        assert!(constant_fee_equivalent(&tuned).is_none());
+    }
+}
@@ -0,0 +1,318 @@
+//! Fee strategies: compiled contracts run in the EVM, or native built-ins.
+//!
+//! The engine only sees [`FeeStrategy`]. A [`StrategySource`] is the
+//! immutable, shareable form that each simulation instantiates from, and
+//! [`StrategyInput`] is what the Python API accepts in place of bytecode.
+
+pub mod equivalence;
+pub mod native;
+
+use std::ops::Deref;
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::sync::Arc;
+
+use pyo3::buffer::PyBuffer;
+use pyo3::prelude::*;
+use pyo3::types::PyBytes;
+
+use crate::evm::strategy::EVMError;
+use crate::evm::{EVMStrategy, StrategySnapshot};
+use crate::types::result::GasProfile;
+use crate::types::trade_info::TradeInfo;
+use crate::types::wad::Wad;
+
+pub use equivalence::constant_fee_equivalent;
+pub use native::{NativeKind, NativeStrategy, NativeStrategySpec, SpikeDecay};
+
+/// A strategy instance driving one AMM's fees.
+pub enum FeeStrategy {
+    Evm(EVMStrategy),
+    Native(NativeStrategy),
+    Verified(Box<VerifiedStrategy>),
+}
+
+impl FeeStrategy {
+    /// Get the strategy name.
+    pub fn name(&self) -> &str {
+        match self {
+            FeeStrategy::Evm(strategy) => strategy.name(),
+            FeeStrategy::Native(strategy) => strategy.name(),
+            FeeStrategy::Verified(strategy) => strategy.native.name(),
+        }
+    }
+
+    /// Initialize the strategy with starting reserves.
+    ///
+    /// Returns (bid_fee, ask_fee) in WAD.
+    pub fn after_initialize(&mut self, initial_x: Wad, initial_y: Wad) -> Result<(Wad, Wad), EVMError> {
+        match self {
+            FeeStrategy::Evm(strategy) => strategy.after_initialize(initial_x, initial_y),
+            FeeStrategy::Native(strategy) => Ok(strategy.after_initialize(initial_x, initial_y)),
+            FeeStrategy::Verified(strategy) => strategy.after_initialize(initial_x, initial_y),
+        }
+    }
+
+    /// Handle a trade event and return updated fees.
+    ///
+    /// Returns (bid_fee, ask_fee) in WAD.
+    #[inline]
+    pub fn after_swap(&mut self, trade: &TradeInfo) -> Result<(Wad, Wad), EVMError> {
+        match self {
+            FeeStrategy::Evm(strategy) => strategy.after_swap(trade),
+            FeeStrategy::Native(strategy) => strategy.after_swap(trade).ok_or_else(native_revert),
+            FeeStrategy::Verified(strategy) => strategy.after_swap(trade),
+        }
+    }
+
+    /// Whether this strategy runs without the EVM.
+    pub fn is_native(&self) -> bool {
+        matches!(self, FeeStrategy::Native(_))
+    }
+
+    /// Gas used by `afterSwap` calls so far (EVM strategies only).
+    pub fn gas_profile(&self) -> Option<GasProfile> {
+        match self {
+            FeeStrategy::Evm(strategy) => Some(strategy.gas_profile()),
+            FeeStrategy::Native(_) | FeeStrategy::Verified(_) => None,
+        }
+    }
+
+    /// Reset the strategy for a new simulation.
+    pub fn reset(&mut self) -> Result<(), EVMError> {
+        match self {
+            FeeStrategy::Evm(strategy) => strategy.reset(),
+            FeeStrategy::Native(strategy) => {
+                strategy.reset();
+                Ok(())
+            }
+            FeeStrategy::Verified(strategy) => strategy.reset(),
+        }
+    }
+}
+
+/// Error for a native call where the contract would revert.
+fn native_revert() -> EVMError {
+    EVMError::ExecutionFailed("Reverted: arithmetic error".into())
+}
+
+/// A native stand-in for a compiled strategy, cross-checked against the EVM.
+///
+/// The first `calls` calls of each simulation run both implementations. On
+/// a mismatch the instance counts it and follows the EVM for the rest of
+/// the simulation, so results stay exact; after `calls` matching calls
+/// only the native rule runs.
+pub struct VerifiedStrategy {
+    native: NativeStrategy,
+    evm: EVMStrategy,
+    calls: usize,
+    remaining: usize,
+    diverged: bool,
+    mismatches: Arc<AtomicUsize>,
+}
+
+impl VerifiedStrategy {
+    /// Record a mismatch between the two results and return the EVM's.
+    fn check(
+        &mut self,
+        native: Result<(Wad, Wad), EVMError>,
+        evm: Result<(Wad, Wad), EVMError>,
+    ) -> Result<(Wad, Wad), EVMError> {
+        self.remaining -= 1;
+        if native.as_ref().ok() != evm.as_ref().ok() {
+            self.diverged = true;
+            self.mismatches.fetch_add(1, Ordering::Relaxed);
+        }
+        evm
+    }
+
+    fn after_initialize(&mut self, initial_x: Wad, initial_y: Wad) -> Result<(Wad, Wad), EVMError> {
+        if self.diverged {
+            return self.evm.after_initialize(initial_x, initial_y);
+        }
+        let native = Ok(self.native.after_initialize(initial_x, initial_y));
+        if self.remaining == 0 {
+            return native;
+        }
+        let evm = self.evm.after_initialize(initial_x, initial_y);
+        self.check(native, evm)
+    }
+
+    #[inline]
+    fn after_swap(&mut self, trade: &TradeInfo) -> Result<(Wad, Wad), EVMError> {
+        if self.diverged {
+            return self.evm.after_swap(trade);
+        }
+        let native = self.native.after_swap(trade).ok_or_else(native_revert);
+        if self.remaining == 0 {
+            return native;
+        }
+        let evm = self.evm.after_swap(trade);
+        self.check(native, evm)
+    }
+
+    fn reset(&mut self) -> Result<(), EVMError> {
+        self.native.reset();
+        self.evm.reset()?;
+        self.remaining = self.calls;
+        self.diverged = false;
+        Ok(())
+    }
+}
+
+impl From<EVMStrategy> for FeeStrategy {
+    fn from(strategy: EVMStrategy) -> Self {
+        FeeStrategy::Evm(strategy)
+    }
+}
+
+impl From<NativeStrategy> for FeeStrategy {
+    fn from(strategy: NativeStrategy) -> Self {
+        FeeStrategy::Native(strategy)
+    }
+}
+
+/// Immutable strategy definition shared by all simulations of a batch.
+#[derive(Clone)]
+pub enum StrategySource {
+    Evm(StrategySnapshot),
+    Native(NativeStrategySpec),
+    /// A compiled strategy run natively, checking its first `calls` calls
+    /// per simulation against the EVM and counting mismatches.
+    Verified {
+        snapshot: StrategySnapshot,
+        spec: NativeStrategySpec,
+        calls: usize,
+        mismatches: Arc<AtomicUsize>,
+    },
+}
+
+impl StrategySource {
+    /// Get the strategy name.
+    pub fn name(&self) -> &str {
+        match self {
+            StrategySource::Evm(snapshot) => snapshot.name(),
+            StrategySource::Native(spec) => spec.name(),
+            StrategySource::Verified { snapshot, .. } => snapshot.name(),
+        }
+    }
+
+    /// Create a fresh strategy for one simulation.
+    pub fn instantiate(&self) -> FeeStrategy {
+        match self {
+            StrategySource::Evm(snapshot) => snapshot.instantiate().into(),
+            StrategySource::Native(spec) => spec.instantiate().into(),
+            StrategySource::Verified { snapshot, spec, calls, mismatches } => {
+                FeeStrategy::Verified(Box::new(VerifiedStrategy {
+                    native: spec.instantiate(),
+                    evm: snapshot.instantiate(),
+                    calls: *calls,
+                    remaining: *calls,
+                    diverged: false,
+                    mismatches: Arc::clone(mismatches),
+                }))
+            }
+        }
+    }
+}
+
+impl From<StrategySnapshot> for StrategySource {
+    fn from(snapshot: StrategySnapshot) -> Self {
+        StrategySource::Evm(snapshot)
+    }
+}
+
+impl From<NativeStrategySpec> for StrategySource {
+    fn from(spec: NativeStrategySpec) -> Self {
+        StrategySource::Native(spec)
+    }
+}
+
+/// A strategy argument from Python: a `NativeStrategySpec` or compiled bytecode.
+#[derive(FromPyObject)]
+pub enum StrategyInput {
+    Native(NativeStrategySpec),
+    Bytecode(BytecodeInput),
+}
+
+/// Contract bytecode from Python.
+///
+/// Accepts `bytes` (copied in one block), any object exporting a byte
+/// buffer (`bytearray`, `memoryview`, a uint8 NumPy array) or a list of
+/// ints. The copy is shared by reference from then on.
+#[derive(Debug, Clone)]
+pub struct BytecodeInput(pub Arc<[u8]>);
+
+impl<'py> FromPyObject<'py> for BytecodeInput {
+    fn extract_bound(ob: &Bound<'py, PyAny>) -> PyResult<Self> {
+        if let Ok(bytes) = ob.downcast::<PyBytes>() {
+            return Ok(Self(Arc::from(bytes.as_bytes())));
+        }
+        if let Ok(buffer) = PyBuffer::<u8>::get_bound(ob) {
+            return Ok(Self(Arc::from(buffer.to_vec(ob.py())?)));
+        }
+        Ok(Self(Arc::from(ob.extract::<Vec<u8>>()?)))
+    }
+}
+
+impl Deref for BytecodeInput {
+    type Target = [u8];
+
+    fn deref(&self) -> &[u8] {
+        &self.0
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    /// Returns 30 bps for both fees from every call.
+    const CONSTANT_FEE_INITCODE: &str = "601b600c600039601b6000f3\
+660aa87bee538000600052660aa87bee53800060205260406000f3";
+
+    fn verified(bps: i128, calls: usize, mismatches: &Arc<AtomicUsize>) -> FeeStrategy {
+        let bytecode: Vec<u8> = (0..CONSTANT_FEE_INITCODE.len())
+            .step_by(2)
+            .map(|i| u8::from_str_radix(&CONSTANT_FEE_INITCODE[i..i + 2], 16).unwrap())
+            .collect();
+        StrategySource::Verified {
+            snapshot: StrategySnapshot::deploy(&bytecode, "Fixed".into()).unwrap(),
+            spec: NativeStrategySpec::constant_fee(Wad::from_bps(bps), Wad::from_bps(bps), "Fixed".into()),
+            calls,
+            mismatches: Arc::clone(mismatches),
+        }
+        .instantiate()
+    }
+
+    #[test]
+    fn test_verified_strategy_follows_evm_on_mismatch() {
+        let trade = TradeInfo::new(
+            true,
+            Wad::from_f64(1.0),
+            Wad::from_f64(100.0),
+            1,
+            Wad::from_f64(101.0),
+            Wad::from_f64(9_900.0),
+        );
+        let expected = (Wad::from_bps(30), Wad::from_bps(30));
+        let mismatches = Arc::new(AtomicUsize::new(0));
+
+        let mut matching = verified(30, 2, &mismatches);
+        assert_eq!(matching.after_initialize(Wad::from_f64(100.0), Wad::from_f64(10_000.0)).unwrap(), expected);
+        assert_eq!(matching.after_swap(&trade).unwrap(), expected);
+        assert_eq!(matching.after_swap(&trade).unwrap(), expected);
+        assert_eq!(mismatches.load(Ordering::Relaxed), 0);
+
+        let mut wrong = verified(31, 2, &mismatches);
+        assert_eq!(wrong.after_initialize(Wad::from_f64(100.0), Wad::from_f64(10_000.0)).unwrap(), expected);
+        for _ in 0..4 {
+            assert_eq!(wrong.after_swap(&trade).unwrap(), expected);
+        }
+        assert_eq!(mismatches.load(Ordering::Relaxed), 1);
+
+        // Without verification the native rule runs unchecked
+        let mut unchecked = verified(31, 0, &mismatches);
+        unchecked.reset().unwrap();
+        assert_eq!(unchecked.after_swap(&trade).unwrap().0, Wad::from_bps(31));
+    }
+}
@@ -0,0 +1,338 @@
+//! Built-in fee rules evaluated natively instead of in the EVM.
+//!
+//! Each rule reproduces the integer arithmetic of the Solidity contract it
+//! stands in for (uint256, truncating division, checked overflow), so a
+//! native strategy returns the same fees as the compiled contract and
+//! simulations are bit-identical, only without interpreter overhead.
+
+use pyo3::prelude::*;
+use revm::primitives::U256;
+
+use crate::types::trade_info::TradeInfo;
+use crate::types::wad::{Wad, BPS, MAX_FEE, WAD};
+
+/// Parameters of the spike/decay family (`DirContrarian` in `my_strategy.sol`).
+///
+/// After each trade with `ratio = wdiv(amountY, reserveY)`:
+///
+/// ```text
+/// fresh = base + ratio * linear_num / linear_den + wmul(ratio, ratio) * quadratic
+/// decayed = max(fee * decay_num / decay_den, base)
+/// ```
+///
+/// When `directional`, only the side that was just hit (the ask after the
+/// AMM bought X, the bid after it sold X) takes `max(fresh, decayed)` and
+/// the other side decays; otherwise both sides do. Fees are clamped to
+/// `[0, MAX_FEE]` after every update.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub struct SpikeDecay {
+    pub base_fee: Wad,
+    pub linear_num: u64,
+    pub linear_den: u64,
+    pub quadratic: u64,
+    pub decay_num: u64,
+    pub decay_den: u64,
+    pub directional: bool,
+}
+
+impl Default for SpikeDecay {
+    /// The constants of `DirContrarian`.
+    fn default() -> Self {
+        Self {
+            base_fee: Wad::from_bps(24),
+            linear_num: 5,
+            linear_den: 4,
+            quadratic: 15,
+            decay_num: 8,
+            decay_den: 9,
+            directional: true,
+        }
+    }
+}
+
+impl SpikeDecay {
+    /// Next (bid, ask) from the current fees, or None where the contract
+    /// would revert (division by zero or overflow).
+    fn next(&self, bid_fee: U256, ask_fee: U256, trade: &TradeInfo) -> Option<(U256, U256)> {
+        let wad = U256::from(WAD as u128);
+        let base = to_u256(self.base_fee);
+        let reserve_y = to_u256(trade.reserve_y);
+        if reserve_y.is_zero() {
+            return None;
+        }
+
+        let ratio = to_u256(trade.amount_y).checked_mul(wad)? / reserve_y;
+        let linear = ratio.checked_mul(U256::from(self.linear_num))? / U256::from(self.linear_den);
+        let quadratic = (ratio.checked_mul(ratio)? / wad).checked_mul(U256::from(self.quadratic))?;
+        let fresh = base.checked_add(linear)?.checked_add(quadratic)?;
+
+        let decay = |fee: U256| -> Option<U256> {
+            let decayed = fee.checked_mul(U256::from(self.decay_num))? / U256::from(self.decay_den);
+            Some(decayed.max(base))
+        };
+        let decayed_bid = decay(bid_fee)?;
+        let decayed_ask = decay(ask_fee)?;
+
+        let (bid, ask) = if !self.directional {
+            (fresh.max(decayed_bid), fresh.max(decayed_ask))
+        } else if trade.is_buy {
+            (decayed_bid, fresh.max(decayed_ask))
+        } else {
+            (fresh.max(decayed_bid), decayed_ask)
+        };
+
+        let max_fee = U256::from(MAX_FEE as u128);
+        Some((bid.min(max_fee), ask.min(max_fee)))
+    }
+}
+
+/// A built-in fee rule.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum NativeKind {
+    /// Fixed (bid, ask) fees, e.g. the 30 bps normalizer.
+    ConstantFee { bid_fee: Wad, ask_fee: Wad },
+    /// Fee spikes with trade size and decays toward a base fee.
+    SpikeDecay(SpikeDecay),
+}
+
+/// Specification of a native strategy, passed from Python in place of bytecode.
+///
+/// Instances are immutable; each simulation instantiates its own
+/// [`NativeStrategy`] holding the mutable fee state.
+#[pyclass(frozen)]
+#[derive(Debug, Clone, PartialEq)]
+pub struct NativeStrategySpec {
+    kind: NativeKind,
+    name: String,
+}
+
+impl NativeStrategySpec {
+    /// Constant fees (WAD, at most `MAX_FEE`).
+    pub fn constant_fee(bid_fee: Wad, ask_fee: Wad, name: String) -> Self {
+        Self { kind: NativeKind::ConstantFee { bid_fee, ask_fee }, name }
+    }
+
+    /// Spike/decay rule with the given parameters.
+    pub fn spike_decay(params: SpikeDecay, name: String) -> Self {
+        Self { kind: NativeKind::SpikeDecay(params), name }
+    }
+
+    /// The rule this spec describes.
+    pub fn kind(&self) -> &NativeKind {
+        &self.kind
+    }
+
+    /// Strategy name (what the contract's `getName()` would return).
+    pub fn name(&self) -> &str {
+        &self.name
+    }
+
+    /// The same rule under another name.
+    pub fn with_name(&self, name: String) -> Self {
+        Self { kind: self.kind, name }
+    }
+
+    /// Create a fresh strategy for one simulation.
+    pub fn instantiate(&self) -> NativeStrategy {
+        NativeStrategy {
+            spec: self.clone(),
+            bid_fee: U256::ZERO,
+            ask_fee: U256::ZERO,
+        }
+    }
+}
+
+fn bps_to_wad(bps: u32, what: &str) -> PyResult<Wad> {
+    let fee = Wad::from_bps(bps as i128);
+    if fee.raw() > MAX_FEE {
+        return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+            "{} must be at most {} bps, got {}",
+            what,
+            MAX_FEE / BPS,
+            bps
+        )));
+    }
+    Ok(fee)
+}
+
+#[pymethods]
+impl NativeStrategySpec {
+    /// Constant fees in basis points; `ask_bps` defaults to `bid_bps`.
+    #[staticmethod]
+    #[pyo3(name = "constant_fee", signature = (bid_bps, ask_bps = None, name = None))]
+    fn py_constant_fee(bid_bps: u32, ask_bps: Option<u32>, name: Option<String>) -> PyResult<Self> {
+        let bid_fee = bps_to_wad(bid_bps, "bid_bps")?;
+        let ask_fee = bps_to_wad(ask_bps.unwrap_or(bid_bps), "ask_bps")?;
+        let name = name.unwrap_or_else(|| format!("Constant_{}bps", bid_bps));
+        Ok(Self::constant_fee(bid_fee, ask_fee, name))
+    }
+
+    /// Spike/decay rule; the defaults reproduce `DirContrarian`.
+    ///
+    /// `linear` and `decay` are `(numerator, denominator)` pairs.
+    #[staticmethod]
+    #[pyo3(
+        name = "spike_decay",
+        signature = (
+            base_fee_bps = 24,
+            linear = (5, 4),
+            quadratic = 15,
+            decay = (8, 9),
+            directional = true,
+            name = None
+        )
+    )]
+    fn py_spike_decay(
+        base_fee_bps: u32,
+        linear: (u64, u64),
+        quadratic: u64,
+        decay: (u64, u64),
+        directional: bool,
+        name: Option<String>,
+    ) -> PyResult<Self> {
+        if linear.1 == 0 || decay.1 == 0 {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "linear and decay denominators must be non-zero",
+            ));
+        }
+        let params = SpikeDecay {
+            base_fee: bps_to_wad(base_fee_bps, "base_fee_bps")?,
+            linear_num: linear.0,
+            linear_den: linear.1,
+            quadratic,
+            decay_num: decay.0,
+            decay_den: decay.1,
+            directional,
+        };
+        let name = name.unwrap_or_else(|| "DirContrarian".to_string());
+        Ok(Self::spike_decay(params, name))
+    }
+
+    #[getter(name)]
+    fn py_name(&self) -> String {
+        self.name.clone()
+    }
+
+    fn __repr__(&self) -> String {
+        format!("NativeStrategySpec({:?}, name={:?})", self.kind, self.name)
+    }
+}
+
+/// A native strategy instance with its per-simulation fee state.
+#[derive(Debug, Clone)]
+pub struct NativeStrategy {
+    spec: NativeStrategySpec,
+    bid_fee: U256,
+    ask_fee: U256,
+}
+
+impl NativeStrategy {
+    /// Get the strategy name.
+    pub fn name(&self) -> &str {
+        self.spec.name()
+    }
+
+    /// Opening (bid, ask) fees in WAD.
+    pub fn after_initialize(&mut self, _initial_x: Wad, _initial_y: Wad) -> (Wad, Wad) {
+        let (bid, ask) = match self.spec.kind {
+            NativeKind::ConstantFee { bid_fee, ask_fee } => (bid_fee, ask_fee),
+            NativeKind::SpikeDecay(params) => (params.base_fee, params.base_fee),
+        };
+        self.bid_fee = to_u256(bid);
+        self.ask_fee = to_u256(ask);
+        (bid, ask)
+    }
+
+    /// Updated (bid, ask) fees in WAD, or None where the contract would revert.
+    #[inline]
+    pub fn after_swap(&mut self, trade: &TradeInfo) -> Option<(Wad, Wad)> {
+        match self.spec.kind {
+            NativeKind::ConstantFee { bid_fee, ask_fee } => Some((bid_fee, ask_fee)),
+            NativeKind::SpikeDecay(params) => {
+                let (bid, ask) = params.next(self.bid_fee, self.ask_fee, trade)?;
+                self.bid_fee = bid;
+                self.ask_fee = ask;
+                Some((to_wad(bid), to_wad(ask)))
+            }
+        }
+    }
+
+    /// Reset the fee state for a new simulation.
+    pub fn reset(&mut self) {
+        self.bid_fee = U256::ZERO;
+        self.ask_fee = U256::ZERO;
+    }
+}
+
+/// Widen a WAD to uint256 the way `TradeInfo::encode_calldata` does.
+#[inline]
+fn to_u256(value: Wad) -> U256 {
+    U256::from(value.raw() as u128)
+}
+
+/// Narrow a clamped fee (at most `MAX_FEE`) back to WAD.
+#[inline]
+fn to_wad(fee: U256) -> Wad {
+    Wad::new(fee.as_limbs()[0] as i128)
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn trade(is_buy: bool, amount_y: f64) -> TradeInfo {
+        TradeInfo::new(
+            is_buy,
+            Wad::from_f64(amount_y / 100.0),
+            Wad::from_f64(amount_y),
+            1,
+            Wad::from_f64(100.0),
+            Wad::from_f64(10_000.0),
+        )
+    }
+
+    fn dir_contrarian() -> NativeStrategy {
+        NativeStrategySpec::spike_decay(SpikeDecay::default(), "DirContrarian".into()).instantiate()
+    }
+
+    #[test]
+    fn test_constant_fee() {
+        let spec = NativeStrategySpec::constant_fee(Wad::from_bps(30), Wad::from_bps(40), "Fixed".into());
+        let mut strategy = spec.instantiate();
+        assert_eq!(strategy.name(), "Fixed");
+        assert_eq!(strategy.after_initialize(Wad::new(0), Wad::new(0)), (Wad::from_bps(30), Wad::from_bps(40)));
+        assert_eq!(strategy.after_swap(&trade(true, 500.0)), Some((Wad::from_bps(30), Wad::from_bps(40))));
+    }
+
+    #[test]
+    fn test_spike_decay_matches_dir_contrarian() {
+        let mut strategy = dir_contrarian();
+        let base = Wad::from_bps(24);
+        assert_eq!(strategy.after_initialize(Wad::new(0), Wad::new(0)), (base, base));
+
+        // ratio = 0.01: spike = 0.0125 + 0.0001 * 15, only the ask widens after a buy
+        let (bid, ask) = strategy.after_swap(&trade(true, 100.0)).unwrap();
+        assert_eq!(bid, base);
+        assert_eq!(ask.raw(), base.raw() + 12_500_000_000_000_000 + 1_500_000_000_000_000);
+
+        // A tiny sell widens the bid slightly and decays the ask by 8/9
+        let (bid, next_ask) = strategy.after_swap(&trade(false, 0.01)).unwrap();
+        assert!(bid > base);
+        assert_eq!(next_ask.raw(), ask.raw() * 8 / 9);
+    }
+
+    #[test]
+    fn test_spike_decay_clamps_and_reverts() {
+        let mut strategy = dir_contrarian();
+        strategy.after_initialize(Wad::new(0), Wad::new(0));
+        let (_, ask) = strategy.after_swap(&trade(true, 5_000.0)).unwrap();
+        assert_eq!(ask.raw(), MAX_FEE);
+
+        let mut empty = trade(true, 1.0);
+        empty.reserve_y = Wad::new(0);
+        assert_eq!(strategy.after_swap(&empty), None);
+
+        strategy.reset();
+        assert_eq!(strategy.after_initialize(Wad::new(0), Wad::new(0)).0, Wad::from_bps(24));
+    }
+}
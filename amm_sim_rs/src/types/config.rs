@@ -1,6 +1,9 @@
 //! Simulation configuration.
 
 use pyo3::prelude::*;
+use rayon::prelude::*;
+
+use crate::types::numpy_rng::NumpyRng;
 
 /// Configuration for a simulation run.
 #[pyclass]
@@ -111,18 +114,30 @@ impl SimulationConfig {
 }
 
 /// Configuration for hyperparameter variance across simulations.
+///
+/// Each varied parameter is drawn uniformly from `[min, max)`.
+#[pyclass]
 #[derive(Debug, Clone)]
 pub struct HyperparameterVariance {
+    #[pyo3(get, set)]
     pub retail_mean_size_min: f64,
+    #[pyo3(get, set)]
     pub retail_mean_size_max: f64,
+    #[pyo3(get, set)]
     pub vary_retail_mean_size: bool,
 
+    #[pyo3(get, set)]
     pub retail_arrival_rate_min: f64,
+    #[pyo3(get, set)]
     pub retail_arrival_rate_max: f64,
+    #[pyo3(get, set)]
     pub vary_retail_arrival_rate: bool,
 
+    #[pyo3(get, set)]
     pub gbm_sigma_min: f64,
+    #[pyo3(get, set)]
     pub gbm_sigma_max: f64,
+    #[pyo3(get, set)]
     pub vary_gbm_sigma: bool,
 }
 
@@ -134,21 +149,37 @@ impl HyperparameterVariance {
         use rand_pcg::Pcg64;
 
         let mut rng = Pcg64::seed_from_u64(seed);
+        self.vary(base, seed, |min, max| rng.gen_range(min..max))
+    }
 
+    /// Like [`apply`](Self::apply), but drawing as
+    /// `np.random.default_rng(seed).uniform(min, max)` does.
+    pub fn apply_numpy(&self, base: &SimulationConfig, seed: u64) -> SimulationConfig {
+        let mut rng = NumpyRng::new(seed);
+        self.vary(base, seed, |min, max| rng.uniform(min, max))
+    }
+
+    /// Draw the varied parameters in a fixed order (mean size, arrival rate, sigma).
+    fn vary(
+        &self,
+        base: &SimulationConfig,
+        seed: u64,
+        mut draw: impl FnMut(f64, f64) -> f64,
+    ) -> SimulationConfig {
         let retail_mean_size = if self.vary_retail_mean_size {
-            rng.gen_range(self.retail_mean_size_min..self.retail_mean_size_max)
+            draw(self.retail_mean_size_min, self.retail_mean_size_max)
         } else {
             base.retail_mean_size
         };
 
         let retail_arrival_rate = if self.vary_retail_arrival_rate {
-            rng.gen_range(self.retail_arrival_rate_min..self.retail_arrival_rate_max)
+            draw(self.retail_arrival_rate_min, self.retail_arrival_rate_max)
         } else {
             base.retail_arrival_rate
         };
 
         let gbm_sigma = if self.vary_gbm_sigma {
-            rng.gen_range(self.gbm_sigma_min..self.gbm_sigma_max)
+            draw(self.gbm_sigma_min, self.gbm_sigma_max)
         } else {
             base.gbm_sigma
         };
@@ -168,4 +199,257 @@ impl HyperparameterVariance {
             seed: Some(seed),
         }
     }
+
+    /// Varied ranges that are empty (`min >= max`).
+    fn empty_ranges(&self) -> Vec<&'static str> {
+        [
+            ("retail_mean_size", self.vary_retail_mean_size, self.retail_mean_size_min, self.retail_mean_size_max),
+            ("retail_arrival_rate", self.vary_retail_arrival_rate, self.retail_arrival_rate_min, self.retail_arrival_rate_max),
+            ("gbm_sigma", self.vary_gbm_sigma, self.gbm_sigma_min, self.gbm_sigma_max),
+        ]
+        .into_iter()
+        .filter(|&(_, vary, min, max)| vary && !(min < max))
+        .map(|(name, ..)| name)
+        .collect()
+    }
+}
+
+#[pymethods]
+impl HyperparameterVariance {
+    #[new]
+    #[pyo3(signature = (
+        retail_mean_size_min,
+        retail_mean_size_max,
+        vary_retail_mean_size,
+        retail_arrival_rate_min,
+        retail_arrival_rate_max,
+        vary_retail_arrival_rate,
+        gbm_sigma_min,
+        gbm_sigma_max,
+        vary_gbm_sigma
+    ))]
+    pub fn new(
+        retail_mean_size_min: f64,
+        retail_mean_size_max: f64,
+        vary_retail_mean_size: bool,
+        retail_arrival_rate_min: f64,
+        retail_arrival_rate_max: f64,
+        vary_retail_arrival_rate: bool,
+        gbm_sigma_min: f64,
+        gbm_sigma_max: f64,
+        vary_gbm_sigma: bool,
+    ) -> Self {
+        Self {
+            retail_mean_size_min,
+            retail_mean_size_max,
+            vary_retail_mean_size,
+            retail_arrival_rate_min,
+            retail_arrival_rate_max,
+            vary_retail_arrival_rate,
+            gbm_sigma_min,
+            gbm_sigma_max,
+            vary_gbm_sigma,
+        }
+    }
+
+    fn __repr__(&self) -> String {
+        format!(
+            "HyperparameterVariance(retail_mean_size={}, retail_arrival_rate={}, gbm_sigma={})",
+            self.vary_retail_mean_size, self.vary_retail_arrival_rate, self.vary_gbm_sigma
+        )
+    }
+}
+
+/// A base config varied per seed over the seeds `start..stop`.
+///
+/// Accepted wherever a list of configs is: each simulation's config is
+/// generated from its seed on the worker that runs it, so a batch of any
+/// size costs one Python object. With `numpy_compatible` (the default) the
+/// draws are those of `np.random.default_rng(seed).uniform`, matching
+/// configs built in Python; otherwise they use the engine's own PCG.
+#[pyclass(frozen)]
+#[derive(Debug, Clone)]
+pub struct ConfigSpace {
+    #[pyo3(get)]
+    pub base: SimulationConfig,
+    #[pyo3(get)]
+    pub variance: HyperparameterVariance,
+    #[pyo3(get)]
+    pub start: u64,
+    #[pyo3(get)]
+    pub stop: u64,
+    #[pyo3(get)]
+    pub numpy_compatible: bool,
+}
+
+impl ConfigSpace {
+    /// Number of seeds.
+    pub fn len(&self) -> usize {
+        (self.stop - self.start) as usize
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.start == self.stop
+    }
+
+    /// The config for `seed` (which need not lie in the range).
+    pub fn config(&self, seed: u64) -> SimulationConfig {
+        if self.numpy_compatible {
+            self.variance.apply_numpy(&self.base, seed)
+        } else {
+            self.variance.apply(&self.base, seed)
+        }
+    }
+}
+
+#[pymethods]
+impl ConfigSpace {
+    #[new]
+    #[pyo3(signature = (base, variance, start, stop, numpy_compatible = true))]
+    fn py_new(
+        base: SimulationConfig,
+        variance: HyperparameterVariance,
+        start: u64,
+        stop: u64,
+        numpy_compatible: bool,
+    ) -> PyResult<Self> {
+        if stop < start {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+                "stop ({}) must not be less than start ({})",
+                stop, start
+            )));
+        }
+        // The engine's PCG cannot sample an empty range; NumPy returns `min`
+        let empty = variance.empty_ranges();
+        if !numpy_compatible && !empty.is_empty() {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+                "varied ranges must have min < max: {}",
+                empty.join(", ")
+            )));
+        }
+        Ok(Self { base, variance, start, stop, numpy_compatible })
+    }
+
+    /// The config for `seed`.
+    #[pyo3(name = "config")]
+    fn py_config(&self, seed: u64) -> SimulationConfig {
+        self.config(seed)
+    }
+
+    /// Every config in the range, as a list.
+    fn to_list(&self, py: Python<'_>) -> Vec<SimulationConfig> {
+        py.allow_threads(|| ConfigSet::Space(self.clone()).par_iter().collect())
+    }
+
+    fn __len__(&self) -> usize {
+        self.len()
+    }
+
+    fn __getitem__(&self, index: isize) -> PyResult<SimulationConfig> {
+        let len = self.len() as isize;
+        let index = if index < 0 { index + len } else { index };
+        if !(0..len).contains(&index) {
+            return Err(PyErr::new::<pyo3::exceptions::PyIndexError, _>("config index out of range"));
+        }
+        Ok(self.config(self.start + index as u64))
+    }
+
+    fn __repr__(&self) -> String {
+        format!(
+            "ConfigSpace(seeds={}..{}, numpy_compatible={})",
+            self.start, self.stop, self.numpy_compatible
+        )
+    }
+}
+
+/// The configs of a batch: an explicit list or a [`ConfigSpace`].
+#[derive(Debug, Clone, FromPyObject)]
+pub enum ConfigSet {
+    Space(ConfigSpace),
+    List(Vec<SimulationConfig>),
+}
+
+impl ConfigSet {
+    pub fn len(&self) -> usize {
+        match self {
+            ConfigSet::Space(space) => space.len(),
+            ConfigSet::List(configs) => configs.len(),
+        }
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.len() == 0
+    }
+
+    /// The `index`th config, generated on demand for a space.
+    pub fn get(&self, index: usize) -> SimulationConfig {
+        match self {
+            ConfigSet::Space(space) => space.config(space.start + index as u64),
+            ConfigSet::List(configs) => configs[index].clone(),
+        }
+    }
+
+    /// Seeds in batch order (unseeded configs count as seed 0).
+    pub fn seeds(&self) -> Vec<u64> {
+        match self {
+            ConfigSet::Space(space) => (space.start..space.stop).collect(),
+            ConfigSet::List(configs) => configs.iter().map(|c| c.seed.unwrap_or(0)).collect(),
+        }
+    }
+
+    /// All configs in order, each built on the worker that consumes it.
+    pub fn par_iter(&self) -> impl IndexedParallelIterator<Item = SimulationConfig> + '_ {
+        (0..self.len()).into_par_iter().map(move |index| self.get(index))
+    }
+}
+
+impl From<Vec<SimulationConfig>> for ConfigSet {
+    fn from(configs: Vec<SimulationConfig>) -> Self {
+        ConfigSet::List(configs)
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn base() -> SimulationConfig {
+        SimulationConfig::new(100, 100.0, 100.0, 10000.0, 0.0, 0.001, 1.0, 0.8, 20.0, 1.2, 0.5, None)
+    }
+
+    fn variance() -> HyperparameterVariance {
+        HyperparameterVariance::new(19.0, 21.0, true, 0.6, 1.0, true, 0.000882, 0.001008, false)
+    }
+
+    #[test]
+    fn test_numpy_variance_matches_python() {
+        // rng = np.random.default_rng(7); rng.uniform(19, 21); rng.uniform(0.6, 1.0)
+        let config = variance().apply_numpy(&base(), 7);
+        assert_eq!(config.retail_mean_size, 20.250190933209335);
+        assert_eq!(config.retail_arrival_rate, 0.9588855203878301);
+        assert_eq!(config.gbm_sigma, 0.001);
+        assert_eq!(config.seed, Some(7));
+    }
+
+    #[test]
+    fn test_config_set_space_generates_by_seed() {
+        let space = ConfigSpace {
+            base: base(),
+            variance: variance(),
+            start: 5,
+            stop: 9,
+            numpy_compatible: false,
+        };
+        let set = ConfigSet::Space(space.clone());
+
+        assert_eq!(set.len(), 4);
+        assert_eq!(set.seeds(), vec![5, 6, 7, 8]);
+        let configs: Vec<_> = set.par_iter().collect();
+        for (config, seed) in configs.iter().zip(5..) {
+            let expected = space.variance.apply(&space.base, seed);
+            assert_eq!(config.seed, Some(seed));
+            assert_eq!(config.retail_mean_size, expected.retail_mean_size);
+            assert_eq!(config.retail_arrival_rate, expected.retail_arrival_rate);
+        }
+    }
 }
@@ -3,9 +3,13 @@
 pub mod wad;
 pub mod trade_info;
 pub mod config;
+pub mod numpy_rng;
 pub mod result;
 
 pub use wad::Wad;
 pub use trade_info::TradeInfo;
-pub use config::SimulationConfig;
-pub use result::{LightweightSimResult, LightweightStepResult, BatchSimulationResult};
+pub use config::{ConfigSet, ConfigSpace, HyperparameterVariance, SimulationConfig};
+pub use result::{
+    LightweightSimResult, StepArray, StepTrace, StepTraceBuilder, BatchSimulationResult,
+    CandidateBatchResult,
+};
@@ -0,0 +1,124 @@
+//! NumPy's `default_rng(seed)` generator, bit for bit.
+//!
+//! `np.random.default_rng(seed)` is a PCG64 (128-bit LCG, XSL-RR output)
+//! seeded through `SeedSequence`. Porting both lets Rust reproduce configs
+//! that were drawn in Python with `rng.uniform(low, high)`.
+
+const INIT_A: u32 = 0x43b0_d7e5;
+const MULT_A: u32 = 0x931e_8875;
+const INIT_B: u32 = 0x8b51_f9dd;
+const MULT_B: u32 = 0x58f3_8ded;
+const MIX_MULT_L: u32 = 0xca01_f9dd;
+const MIX_MULT_R: u32 = 0x4973_f715;
+const POOL_SIZE: usize = 4;
+
+const PCG_MULTIPLIER: u128 = 0x2360_ed05_1fc6_5da4_4385_df64_9fcc_f645;
+
+/// PCG64 seeded as `np.random.default_rng(seed)`.
+#[derive(Debug, Clone)]
+pub struct NumpyRng {
+    state: u128,
+    increment: u128,
+}
+
+impl NumpyRng {
+    pub fn new(seed: u64) -> Self {
+        let (state, sequence) = seed_sequence(seed);
+        let mut rng = Self { state: 0, increment: (sequence << 1) | 1 };
+        rng.step();
+        rng.state = rng.state.wrapping_add(state);
+        rng.step();
+        rng
+    }
+
+    #[inline]
+    fn step(&mut self) {
+        self.state = self.state.wrapping_mul(PCG_MULTIPLIER).wrapping_add(self.increment);
+    }
+
+    /// Next raw output.
+    #[inline]
+    pub fn next_u64(&mut self) -> u64 {
+        self.step();
+        let rotation = (self.state >> 122) as u32;
+        (((self.state >> 64) as u64) ^ (self.state as u64)).rotate_right(rotation)
+    }
+
+    /// `rng.random()`: uniform on [0, 1) with 53 bits of precision.
+    #[inline]
+    pub fn random(&mut self) -> f64 {
+        (self.next_u64() >> 11) as f64 * (1.0 / 9_007_199_254_740_992.0)
+    }
+
+    /// `rng.uniform(low, high)`.
+    #[inline]
+    pub fn uniform(&mut self, low: f64, high: f64) -> f64 {
+        low + (high - low) * self.random()
+    }
+}
+
+/// `SeedSequence(seed).generate_state(4, np.uint64)` as PCG64's (state, sequence).
+fn seed_sequence(seed: u64) -> (u128, u128) {
+    // Entropy is the seed's little-endian 32-bit words; it always fits the pool
+    let low = seed as u32;
+    let high = (seed >> 32) as u32;
+    let entropy: &[u32] = if high == 0 { &[low] } else { &[low, high] };
+
+    let mut hash_const = INIT_A;
+    let mut hashmix = |value: u32| {
+        let mut value = value ^ hash_const;
+        hash_const = hash_const.wrapping_mul(MULT_A);
+        value = value.wrapping_mul(hash_const);
+        value ^ (value >> 16)
+    };
+    let mix = |x: u32, y: u32| {
+        let result = MIX_MULT_L.wrapping_mul(x).wrapping_sub(MIX_MULT_R.wrapping_mul(y));
+        result ^ (result >> 16)
+    };
+
+    let mut pool = [0u32; POOL_SIZE];
+    for (i, word) in pool.iter_mut().enumerate() {
+        *word = hashmix(entropy.get(i).copied().unwrap_or(0));
+    }
+    for src in 0..POOL_SIZE {
+        for dst in 0..POOL_SIZE {
+            if src != dst {
+                let hashed = hashmix(pool[src]);
+                pool[dst] = mix(pool[dst], hashed);
+            }
+        }
+    }
+
+    let mut hash_const = INIT_B;
+    let mut words = [0u64; 4];
+    for i in 0..2 * words.len() {
+        let mut value = pool[i % POOL_SIZE] ^ hash_const;
+        hash_const = hash_const.wrapping_mul(MULT_B);
+        value = value.wrapping_mul(hash_const);
+        value ^= value >> 16;
+        words[i / 2] |= (value as u64) << (32 * (i % 2));
+    }
+
+    let join = |high: u64, low: u64| ((high as u128) << 64) | low as u128;
+    (join(words[0], words[1]), join(words[2], words[3]))
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_matches_numpy_default_rng() {
+        // np.random.default_rng(seed).integers(0, 2**64, dtype=np.uint64)
+        assert_eq!(NumpyRng::new(0).next_u64(), 11_749_869_230_777_074_271);
+        assert_eq!(NumpyRng::new(u64::MAX).next_u64(), 12_544_278_110_101_001_871);
+
+        let mut rng = NumpyRng::new(0);
+        assert_eq!(rng.random(), 0.6369616873214543);
+        assert_eq!(rng.random(), 0.2697867137638703);
+
+        let mut rng = NumpyRng::new(3);
+        assert_eq!(rng.uniform(0.5, 2.0), 0.6284737507154365);
+        assert_eq!(rng.uniform(0.6, 1.0), 0.6947242026384399);
+    }
+}
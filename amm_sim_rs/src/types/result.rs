@@ -1,39 +1,320 @@
 //! Simulation result types.
 
+use pyo3::exceptions::PyBufferError;
+use pyo3::ffi;
 use pyo3::prelude::*;
 use std::collections::HashMap;
+use std::ffi::{c_int, c_void, CString};
+use std::ptr;
+use std::sync::Arc;
 
-/// Lightweight step result for charting (minimal memory footprint).
-#[pyclass]
+use crate::simulation::profile::BatchProfile;
+
+/// Backing storage for a [`StepArray`].
 #[derive(Debug, Clone)]
-pub struct LightweightStepResult {
-    /// Simulation step number
+enum ArrayData {
+    F64(Arc<Vec<f64>>),
+    U32(Arc<Vec<u32>>),
+}
+
+impl ArrayData {
+    fn as_ptr(&self) -> *const c_void {
+        match self {
+            ArrayData::F64(v) => v.as_ptr() as *const c_void,
+            ArrayData::U32(v) => v.as_ptr() as *const c_void,
+        }
+    }
+
+    fn len(&self) -> usize {
+        match self {
+            ArrayData::F64(v) => v.len(),
+            ArrayData::U32(v) => v.len(),
+        }
+    }
+
+    fn itemsize(&self) -> usize {
+        match self {
+            ArrayData::F64(_) => std::mem::size_of::<f64>(),
+            ArrayData::U32(_) => std::mem::size_of::<u32>(),
+        }
+    }
+
+    fn format(&self) -> &'static str {
+        match self {
+            ArrayData::F64(_) => "d",
+            ArrayData::U32(_) => "I",
+        }
+    }
+}
+
+/// Read-only, C-contiguous array exported through the buffer protocol.
+///
+/// `numpy.asarray(array)` returns a zero-copy view; the view keeps this
+/// object (and the shared Rust allocation) alive. Used for step traces and
+/// batch matrices alike.
+#[pyclass(frozen)]
+#[derive(Debug, Clone)]
+pub struct StepArray {
+    data: ArrayData,
+    shape: Vec<isize>,
+    strides: Vec<isize>,
+}
+
+impl StepArray {
+    /// Wrap shared f64 data with the given (row-major) shape.
+    pub fn from_f64(data: Arc<Vec<f64>>, shape: Vec<usize>) -> Self {
+        Self::new(ArrayData::F64(data), shape)
+    }
+
+    fn new(data: ArrayData, shape: Vec<usize>) -> Self {
+        let itemsize = data.itemsize() as isize;
+        let mut strides = vec![itemsize; shape.len()];
+        for i in (0..shape.len().saturating_sub(1)).rev() {
+            strides[i] = strides[i + 1] * shape[i + 1] as isize;
+        }
+        Self {
+            data,
+            shape: shape.into_iter().map(|d| d as isize).collect(),
+            strides,
+        }
+    }
+}
+
+#[pymethods]
+impl StepArray {
+    /// Array dimensions.
+    #[getter]
+    fn shape(&self) -> Vec<isize> {
+        self.shape.clone()
+    }
+
+    unsafe fn __getbuffer__(
+        slf: Bound<'_, Self>,
+        view: *mut ffi::Py_buffer,
+        flags: c_int,
+    ) -> PyResult<()> {
+        if view.is_null() {
+            return Err(PyBufferError::new_err("View is null"));
+        }
+        if (flags & ffi::PyBUF_WRITABLE) == ffi::PyBUF_WRITABLE {
+            return Err(PyBufferError::new_err("Step arrays are read-only"));
+        }
+
+        let array = slf.get();
+        (*view).buf = array.data.as_ptr() as *mut c_void;
+        (*view).len = (array.data.len() * array.data.itemsize()) as isize;
+        (*view).readonly = 1;
+        (*view).itemsize = array.data.itemsize() as isize;
+        (*view).format = if (flags & ffi::PyBUF_FORMAT) == ffi::PyBUF_FORMAT {
+            CString::new(array.data.format()).unwrap().into_raw()
+        } else {
+            ptr::null_mut()
+        };
+        (*view).ndim = array.shape.len() as c_int;
+        (*view).shape = if (flags & ffi::PyBUF_ND) == ffi::PyBUF_ND {
+            array.shape.as_ptr() as *mut isize
+        } else {
+            ptr::null_mut()
+        };
+        (*view).strides = if (flags & ffi::PyBUF_STRIDES) == ffi::PyBUF_STRIDES {
+            array.strides.as_ptr() as *mut isize
+        } else {
+            ptr::null_mut()
+        };
+        (*view).suboffsets = ptr::null_mut();
+        (*view).internal = ptr::null_mut();
+        (*view).obj = slf.into_any().into_ptr();
+
+        Ok(())
+    }
+
+    unsafe fn __releasebuffer__(&self, view: *mut ffi::Py_buffer) {
+        // Release the format string allocated in __getbuffer__
+        if !(*view).format.is_null() {
+            drop(CString::from_raw((*view).format));
+        }
+    }
+
+    fn __len__(&self) -> usize {
+        self.shape.first().copied().unwrap_or(0) as usize
+    }
+
+    fn __repr__(&self) -> String {
+        format!("StepArray(shape={:?}, format='{}')", self.shape, self.data.format())
+    }
+}
+
+/// Columnar per-step trace for charting.
+///
+/// Per-AMM columns are row-major `(n_steps, n_strategies)` arrays whose
+/// column order matches `strategies`.
+#[pyclass(frozen)]
+#[derive(Debug, Clone)]
+pub struct StepTrace {
+    /// Strategy names, in column order
     #[pyo3(get)]
-    pub timestamp: u32,
+    pub strategies: Vec<String>,
+    timestamps: Arc<Vec<u32>>,
+    fair_prices: Arc<Vec<f64>>,
+    spot_prices: Arc<Vec<f64>>,
+    pnls: Arc<Vec<f64>>,
+    bid_fees: Arc<Vec<f64>>,
+    ask_fees: Arc<Vec<f64>>,
+}
+
+impl StepTrace {
+    fn n_steps(&self) -> usize {
+        self.timestamps.len()
+    }
+
+    fn per_amm(&self, column: &Arc<Vec<f64>>) -> StepArray {
+        StepArray::new(
+            ArrayData::F64(Arc::clone(column)),
+            vec![self.n_steps(), self.strategies.len()],
+        )
+    }
+}
+
+#[pymethods]
+impl StepTrace {
+    /// Simulation step numbers, shape `(n_steps,)`
+    #[getter]
+    fn timestamps(&self) -> StepArray {
+        StepArray::new(ArrayData::U32(Arc::clone(&self.timestamps)), vec![self.n_steps()])
+    }
+
+    /// Fair price at each step, shape `(n_steps,)`
+    #[getter]
+    fn fair_prices(&self) -> StepArray {
+        StepArray::new(ArrayData::F64(Arc::clone(&self.fair_prices)), vec![self.n_steps()])
+    }
+
+    /// Spot prices, shape `(n_steps, n_strategies)`
+    #[getter]
+    fn spot_prices(&self) -> StepArray {
+        self.per_amm(&self.spot_prices)
+    }
 
-    /// Fair price at this step
+    /// Running PnL, shape `(n_steps, n_strategies)`
+    #[getter]
+    fn pnls(&self) -> StepArray {
+        self.per_amm(&self.pnls)
+    }
+
+    /// Bid fees, shape `(n_steps, n_strategies)`
+    #[getter]
+    fn bid_fees(&self) -> StepArray {
+        self.per_amm(&self.bid_fees)
+    }
+
+    /// Ask fees, shape `(n_steps, n_strategies)`
+    #[getter]
+    fn ask_fees(&self) -> StepArray {
+        self.per_amm(&self.ask_fees)
+    }
+
+    fn __len__(&self) -> usize {
+        self.n_steps()
+    }
+
+    fn __repr__(&self) -> String {
+        format!(
+            "StepTrace(n_steps={}, strategies={:?})",
+            self.n_steps(), self.strategies
+        )
+    }
+}
+
+/// Accumulates per-step columns during a simulation run.
+#[derive(Debug)]
+pub struct StepTraceBuilder {
+    strategies: Vec<String>,
+    timestamps: Vec<u32>,
+    fair_prices: Vec<f64>,
+    spot_prices: Vec<f64>,
+    pnls: Vec<f64>,
+    bid_fees: Vec<f64>,
+    ask_fees: Vec<f64>,
+}
+
+impl StepTraceBuilder {
+    /// Create a builder with room for `n_steps` rows.
+    pub fn with_capacity(strategies: Vec<String>, n_steps: usize) -> Self {
+        let cells = n_steps * strategies.len();
+        Self {
+            strategies,
+            timestamps: Vec::with_capacity(n_steps),
+            fair_prices: Vec::with_capacity(n_steps),
+            spot_prices: Vec::with_capacity(cells),
+            pnls: Vec::with_capacity(cells),
+            bid_fees: Vec::with_capacity(cells),
+            ask_fees: Vec::with_capacity(cells),
+        }
+    }
+
+    /// Start a new row.
+    pub fn begin_step(&mut self, timestamp: u32, fair_price: f64) {
+        self.timestamps.push(timestamp);
+        self.fair_prices.push(fair_price);
+    }
+
+    /// Append one AMM's values to the current row (in `strategies` order).
+    pub fn push_amm(&mut self, spot_price: f64, pnl: f64, bid_fee: f64, ask_fee: f64) {
+        self.spot_prices.push(spot_price);
+        self.pnls.push(pnl);
+        self.bid_fees.push(bid_fee);
+        self.ask_fees.push(ask_fee);
+    }
+
+    /// Freeze the columns into a shareable trace.
+    pub fn finish(self) -> StepTrace {
+        StepTrace {
+            strategies: self.strategies,
+            timestamps: Arc::new(self.timestamps),
+            fair_prices: Arc::new(self.fair_prices),
+            spot_prices: Arc::new(self.spot_prices),
+            pnls: Arc::new(self.pnls),
+            bid_fees: Arc::new(self.bid_fees),
+            ask_fees: Arc::new(self.ask_fees),
+        }
+    }
+}
+
+/// Gas used by a strategy's `afterSwap` calls over one simulation.
+#[pyclass(frozen)]
+#[derive(Debug, Clone, Default)]
+pub struct GasProfile {
+    /// Number of afterSwap calls
+    #[pyo3(get)]
+    pub calls: u64,
+
+    /// Mean gas per call
+    #[pyo3(get)]
+    pub mean: f64,
+
+    /// Minimum gas of a call
     #[pyo3(get)]
-    pub fair_price: f64,
+    pub min: u64,
 
-    /// Spot prices by strategy name
+    /// Maximum gas of a call
     #[pyo3(get)]
-    pub spot_prices: HashMap<String, f64>,
+    pub max: u64,
 
-    /// Running PnL by strategy name
+    /// 99th percentile gas, to the nearest 1000 above
     #[pyo3(get)]
-    pub pnls: HashMap<String, f64>,
+    pub p99: u64,
 
-    /// Fees (bid, ask) by strategy name
+    /// Executions by opcode mnemonic (empty unless opcode profiling is on)
     #[pyo3(get)]
-    pub fees: HashMap<String, (f64, f64)>,
+    pub opcodes: HashMap<String, u64>,
 }
 
 #[pymethods]
-impl LightweightStepResult {
+impl GasProfile {
     fn __repr__(&self) -> String {
         format!(
-            "LightweightStepResult(timestamp={}, fair_price={:.4})",
-            self.timestamp, self.fair_price
+            "GasProfile(calls={}, mean={:.0}, min={}, max={}, p99={})",
+            self.calls, self.mean, self.min, self.max, self.p99
         )
     }
 }
@@ -66,9 +347,9 @@ pub struct LightweightSimResult {
     #[pyo3(get)]
     pub initial_reserves: HashMap<String, (f64, f64)>,
 
-    /// Step results for charting
+    /// Columnar step trace for charting (empty in summary-only mode)
     #[pyo3(get)]
-    pub steps: Vec<LightweightStepResult>,
+    pub steps: StepTrace,
 
     /// Total arb volume (in Y) by strategy name
     #[pyo3(get)]
@@ -81,6 +362,10 @@ pub struct LightweightSimResult {
     /// Average fees (bid, ask) by strategy name over the simulation
     #[pyo3(get)]
     pub average_fees: HashMap<String, (f64, f64)>,
+
+    /// Gas profile of afterSwap calls by strategy name (EVM strategies only)
+    #[pyo3(get)]
+    pub gas: HashMap<String, GasProfile>,
 }
 
 #[pymethods]
@@ -133,6 +418,10 @@ pub struct BatchSimulationResult {
     /// Strategy names
     #[pyo3(get)]
     pub strategies: Vec<String>,
+
+    /// Per-phase timings, when the batch was run with `profile=True`
+    #[pyo3(get)]
+    pub profile: Option<BatchProfile>,
 }
 
 #[pymethods]
@@ -220,3 +509,75 @@ impl BatchSimulationResult {
         self.results.len()
     }
 }
+
+/// Paired results for many candidates run against one normalizer.
+///
+/// Every candidate sees the same price path and retail order stream for a
+/// given seed, so per-seed differences between candidates are paired.
+/// Matrices are row-major `(n_seeds, n_candidates)`.
+#[pyclass(frozen)]
+#[derive(Debug, Clone)]
+pub struct CandidateBatchResult {
+    /// Seed of each row
+    #[pyo3(get)]
+    pub seeds: Vec<u64>,
+    /// Number of candidate columns
+    #[pyo3(get)]
+    pub n_candidates: usize,
+    /// Candidate edge per (seed, candidate)
+    pub edges: Arc<Vec<f64>>,
+    /// Normalizer edge per (seed, candidate)
+    pub normalizer_edges: Arc<Vec<f64>>,
+    /// Candidate PnL per (seed, candidate)
+    pub pnl: Arc<Vec<f64>>,
+}
+
+impl CandidateBatchResult {
+    fn matrix(&self, data: &Arc<Vec<f64>>) -> StepArray {
+        StepArray::from_f64(Arc::clone(data), vec![self.seeds.len(), self.n_candidates])
+    }
+}
+
+#[pymethods]
+impl CandidateBatchResult {
+    /// Candidate edges, shape `(n_seeds, n_candidates)`
+    #[getter]
+    fn edges(&self) -> StepArray {
+        self.matrix(&self.edges)
+    }
+
+    /// Normalizer edges in each pairing, shape `(n_seeds, n_candidates)`
+    #[getter]
+    fn normalizer_edges(&self) -> StepArray {
+        self.matrix(&self.normalizer_edges)
+    }
+
+    /// Candidate PnL, shape `(n_seeds, n_candidates)`
+    #[getter]
+    fn pnl(&self) -> StepArray {
+        self.matrix(&self.pnl)
+    }
+
+    /// Mean edge per candidate.
+    fn mean_edges(&self) -> Vec<f64> {
+        let n_seeds = self.seeds.len().max(1) as f64;
+        let mut means = vec![0.0; self.n_candidates];
+        for row in self.edges.chunks(self.n_candidates.max(1)) {
+            for (mean, edge) in means.iter_mut().zip(row) {
+                *mean += edge / n_seeds;
+            }
+        }
+        means
+    }
+
+    fn __repr__(&self) -> String {
+        format!(
+            "CandidateBatchResult(n_seeds={}, n_candidates={})",
+            self.seeds.len(), self.n_candidates
+        )
+    }
+
+    fn __len__(&self) -> usize {
+        self.seeds.len()
+    }
+}
@@ -59,59 +59,34 @@ def main():
     result = runner.run_match(user_strategy, default_strategy, store_results=True)
     sim = result.simulation_results[0]
 
-    # Examine step structure
-    step0 = sim.steps[0]
-    print("Step 0 attributes:", [a for a in dir(step0) if not a.startswith('_')])
-    print()
-
-    for attr in dir(step0):
-        if attr.startswith('_'):
-            continue
-        try:
-            val = getattr(step0, attr)
-            if not callable(val):
-                print(f"  step.{attr} = {val}")
-        except:
-            pass
-
-    # Look at a few interesting steps (ones with arb + retail)
-    print("\n=== Analyzing step-by-step patterns ===")
-
-    arb_steps = 0
-    no_arb_steps = 0
-    retail_after_arb = 0
-    retail_no_arb = 0
-    sub_retail_buy_arb_buy = 0  # retail buys after arb buy (opposite = spiked ask)
-    sub_retail_sell_arb_buy = 0  # retail sells after arb buy (same = low bid)
-    sub_retail_buy_arb_sell = 0
-    sub_retail_sell_arb_sell = 0
-    sub_retail_noarb = 0
-
-    # Analyze fee at time of retail trades
-    sub_bid_fees_at_retail = []
-    sub_ask_fees_at_retail = []
-
-    for i, step in enumerate(sim.steps[:20]):
-        attrs = dir(step)
-        # Print first 20 steps in detail
-        has_arb = False
-        arb_dir = None
-
-        print(f"\nStep {i}:")
-        for attr in sorted(attrs):
-            if attr.startswith('_'):
-                continue
-            try:
-                val = getattr(step, attr)
-                if not callable(val):
-                    sval = str(val)
-                    if len(sval) < 300:
-                        print(f"  {attr}: {val}")
-                    else:
-                        print(f"  {attr}: (len={len(sval)})")
-            except:
-                pass
-
+    steps = sim.steps
+    sub = steps.column("submission")
+    norm = steps.column("normalizer")
+    print(f"Trace: {len(steps)} steps, strategies={steps.strategies}")
+
+    # Fee levels over the whole run (bps)
+    for name, col in (("submission", sub), ("normalizer", norm)):
+        bid = steps.bid_fees[:, col] * 1e4
+        ask = steps.ask_fees[:, col] * 1e4
+        print(f"  {name}: bid mean={bid.mean():.2f} p50={np.median(bid):.2f} max={bid.max():.2f}"
+              f" | ask mean={ask.mean():.2f} p50={np.median(ask):.2f} max={ask.max():.2f}")
+
+    # Spot price deviation from fair price
+    deviation = steps.spot_prices / steps.fair_prices[:, None] - 1.0
+    print(f"  |spot/fair - 1| mean (bps): sub={np.abs(deviation[:, sub]).mean() * 1e4:.2f}"
+          f" norm={np.abs(deviation[:, norm]).mean() * 1e4:.2f}")
+
+    # Fee asymmetry: how often the submission skews ask above bid
+    skew = steps.ask_fees[:, sub] - steps.bid_fees[:, sub]
+    print(f"  sub ask>bid: {(skew > 0).mean():.1%}  bid>ask: {(skew < 0).mean():.1%}")
+
+    # Look at the first few steps in detail
+    print("\n=== First 20 steps ===")
+    print(f"{'t':>4} {'fair':>10} {'sub spot':>10} {'sub bid':>8} {'sub ask':>8} {'sub pnl':>10} {'norm pnl':>10}")
+    for i in range(min(20, len(steps))):
+        print(f"{steps.timestamps[i]:>4} {steps.fair_prices[i]:>10.4f} {steps.spot_prices[i, sub]:>10.4f}"
+              f" {steps.bid_fees[i, sub] * 1e4:>8.2f} {steps.ask_fees[i, sub] * 1e4:>8.2f}"
+              f" {steps.pnls[i, sub]:>10.4f} {steps.pnls[i, norm]:>10.4f}")
 
 if __name__ == "__main__":
     main()
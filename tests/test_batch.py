@@ -0,0 +1,175 @@
+"""Tests for the vectorized Python engine."""
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from amm_competition.batch import BatchMarket, ConstantFee, run_batch
+from amm_competition.core.amm import AMM
+from amm_competition.core.interfaces import VectorizedAMMStrategy
+from amm_competition.market.arbitrageur import Arbitrageur
+from amm_competition.market.retail import RetailOrder
+from amm_competition.market.router import OrderRouter
+
+
+class ImpactFee(VectorizedAMMStrategy):
+    """Fee follows the last trade's price impact; bids are marked up after buys."""
+
+    def after_initialize_batch(self, initial_x, initial_y):
+        self.fee = np.full(len(initial_x), 0.003)
+        return self.fee, self.fee
+
+    def after_swap_batch(self, trades):
+        impact = np.where(trades.active, trades.amount_y / trades.reserve_y, 0.0)
+        self.fee = np.where(trades.active, 0.5 * self.fee + 0.0015 + 2 * impact, self.fee)
+        bid = np.where(trades.is_buy, self.fee * 1.5, self.fee)
+        return bid, self.fee
+
+
+def _config(seed: int, n_steps: int = 200):
+    return SimpleNamespace(
+        n_steps=n_steps,
+        initial_price=100.0,
+        initial_x=100.0,
+        initial_y=10000.0,
+        gbm_mu=0.0,
+        gbm_sigma=0.002,
+        gbm_dt=1.0,
+        retail_arrival_rate=3.0,
+        retail_mean_size=20.0,
+        retail_size_sigma=1.2,
+        retail_buy_prob=0.5,
+        seed=seed,
+    )
+
+
+def _reference(submission, normalizer, market: BatchMarket, i: int) -> tuple[list[float], list[float]]:
+    """Edges and PnL of seed ``i`` using the scalar Decimal components."""
+    amms = [
+        AMM(strategy=strategy, reserve_x=Decimal("100"), reserve_y=Decimal("10000"))
+        for strategy in (submission, normalizer)
+    ]
+    for amm in amms:
+        amm.initialize()
+    arbitrageur = Arbitrageur()
+    router = OrderRouter()
+    edges = [0.0, 0.0]
+
+    for t in range(market.n_steps):
+        fair = float(market.prices[i, t])
+        for j, amm in enumerate(amms):
+            result = arbitrageur.execute_arb(amm, Decimal(str(fair)), t)
+            if result is not None:
+                edges[j] -= float(result.profit)
+
+        start, end = market.order_offsets[i, t], market.order_offsets[i, t + 1]
+        for k in range(start, end):
+            order = RetailOrder(
+                side="buy" if market.order_buys[k] else "sell",
+                size=Decimal(str(float(market.order_sizes[k]))),
+            )
+            for trade in router.route_order(order, amms, Decimal(str(fair)), t):
+                j = amms.index(trade.amm)
+                amount_x = float(trade.trade_info.amount_x)
+                amount_y = float(trade.amount_y)
+                if trade.trade_info.side == "buy":
+                    edges[j] += amount_x * fair - amount_y
+                else:
+                    edges[j] += amount_y - amount_x * fair
+
+    final = float(market.prices[i, -1])
+    pnl = [
+        float(amm.reserve_x + amm.accumulated_fees_x) * final
+        + float(amm.reserve_y + amm.accumulated_fees_y)
+        - (100.0 * float(market.initial_prices[i]) + 10000.0)
+        for amm in amms
+    ]
+    return edges, pnl
+
+
+def test_generate_is_reproducible():
+    market = BatchMarket.generate([_config(seed) for seed in range(3)])
+    again = BatchMarket.generate([_config(seed) for seed in range(3)])
+
+    assert market.n_seeds == 3
+    assert market.n_steps == 200
+    assert market.order_offsets.shape == (3, 201)
+    assert market.order_offsets[-1, -1] == len(market.order_sizes) == len(market.order_buys)
+    np.testing.assert_array_equal(market.prices, again.prices)
+    np.testing.assert_array_equal(market.order_sizes, again.order_sizes)
+    assert not np.array_equal(market.prices[0], market.prices[1])
+
+
+def test_generate_rejects_mixed_lengths():
+    with pytest.raises(ValueError):
+        BatchMarket.generate([_config(0), _config(1, n_steps=100)])
+
+
+def test_matches_scalar_engine():
+    market = BatchMarket.generate([_config(seed) for seed in range(4)])
+
+    result = run_batch(ImpactFee(), ConstantFee(0.003), market)
+
+    assert result.strategies == ["submission", "normalizer"]
+    assert result.edges.shape == (4, 2)
+    for i in range(4):
+        edges, pnl = _reference(ImpactFee(), ConstantFee(0.003), market, i)
+        assert result.edges[i] == pytest.approx(edges, rel=1e-7)
+        assert result.pnl[i] == pytest.approx(pnl, rel=1e-7)
+
+
+def test_symmetric_strategies_split_flow():
+    market = BatchMarket.generate([_config(seed) for seed in range(8)])
+
+    result = run_batch(ConstantFee(0.003), ConstantFee(0.003), market)
+
+    np.testing.assert_allclose(result.average_bid_fees, 0.003)
+    np.testing.assert_allclose(result.retail_volume_y[:, 0], result.retail_volume_y[:, 1], rtol=0.05)
+    assert (result.arb_volume_y > 0).all()
+    assert sum(result.win_counts()) == 8
+
+
+def test_higher_fee_earns_more_edge_per_unit_volume():
+    market = BatchMarket.generate([_config(seed) for seed in range(8)])
+
+    result = run_batch(ConstantFee(0.01), ConstantFee(0.003), market)
+
+    assert result.retail_volume_y[:, 0].sum() < result.retail_volume_y[:, 1].sum()
+    assert result.average_ask_fees[:, 0] == pytest.approx(0.01)
+
+
+def test_fees_are_clamped():
+    market = BatchMarket.generate([_config(0)])
+
+    result = run_batch(ConstantFee(0.5, -0.1), ConstantFee(0.003), market)
+
+    assert result.average_bid_fees[0, 0] == pytest.approx(0.1)
+    assert result.average_ask_fees[0, 0] == 0.0
+
+
+def test_rejects_shared_strategy_instance():
+    strategy = ConstantFee(0.003)
+    with pytest.raises(ValueError):
+        run_batch(strategy, strategy, BatchMarket.generate([_config(0)]))
+
+
+def test_replays_rust_markets(vanilla_bytecode_and_abi, tmp_path):
+    import amm_sim_rs
+    from amm_competition.market.tape import MarketTapeReader
+
+    configs = [
+        amm_sim_rs.SimulationConfig(**vars(_config(seed))) for seed in range(3)
+    ]
+    path = tmp_path / "markets.tape"
+    amm_sim_rs.MarketTape.generate(configs).save(str(path))
+    bytecode = list(vanilla_bytecode_and_abi[0])
+    expected = amm_sim_rs.SimulationPool(1).run_batch(bytecode, bytecode, configs, capture_steps=False)
+
+    market = BatchMarket.from_tape(MarketTapeReader(path), initial_x=100.0, initial_y=10000.0)
+    result = run_batch(ConstantFee(0.003), ConstantFee(0.003), market)
+
+    for i, rust_result in enumerate(expected.results):
+        assert result.edges[i, 0] == pytest.approx(rust_result.edges["submission"], rel=1e-9)
+        assert result.edges[i, 1] == pytest.approx(rust_result.edges["normalizer"], rel=1e-9)
@@ -4,6 +4,7 @@ import pytest
 from decimal import Decimal
 
 import amm_sim_rs
+import numpy as np
 
 from amm_competition.competition.match import MatchRunner, HyperparameterVariance
 
@@ -165,6 +166,146 @@ class TestMatchRunner:
         result = runner.run_match(strategy_a, strategy_b, store_results=True)
 
         assert len(result.simulation_results) == 3
+        steps = result.simulation_results[0].steps
+        assert len(steps) == 50
+        assert steps.strategies == ["submission", "normalizer"]
+        assert steps.timestamps.tolist() == list(range(50))
+        assert steps.spot_prices.shape == (50, 2)
+        assert steps.bid_fees.shape == (50, 2)
+        # Arrays are views over the Rust buffers, not copies
+        assert not steps.fair_prices.flags.owndata
+        assert not steps.pnls.flags.writeable
+
+    def test_summary_only_matches_captured_run(self, vanilla_bytecode_and_abi):
+        bytecode, _ = vanilla_bytecode_and_abi
+        config = amm_sim_rs.SimulationConfig(
+            n_steps=50,
+            initial_price=100.0,
+            initial_x=100.0,
+            initial_y=10000.0,
+            gbm_mu=0.0,
+            gbm_sigma=0.001,
+            gbm_dt=1.0,
+            retail_arrival_rate=5.0,
+            retail_mean_size=2.0,
+            retail_size_sigma=0.7,
+            retail_buy_prob=0.5,
+            seed=42,
+        )
+
+        captured = amm_sim_rs.run_single(list(bytecode), list(bytecode), config)
+        summary = amm_sim_rs.run_single(
+            list(bytecode), list(bytecode), config, capture_steps=False
+        )
+
+        assert len(captured.steps) == 50
+        assert len(summary.steps) == 0
+        assert summary.edges == captured.edges
+        assert summary.pnl == captured.pnl
+        assert summary.average_fees == captured.average_fees
+
+    def test_result_store_skips_known_seeds(self, vanilla_bytecode_and_abi, tmp_path):
+        from amm_competition.competition.result_store import ResultStore
+        from amm_competition.evm.adapter import EVMStrategyAdapter
+
+        config = amm_sim_rs.SimulationConfig(
+            n_steps=50,
+            initial_price=100.0,
+            initial_x=100.0,
+            initial_y=10000.0,
+            gbm_mu=0.0,
+            gbm_sigma=0.001,
+            gbm_dt=1.0,
+            retail_arrival_rate=5.0,
+            retail_mean_size=2.0,
+            retail_size_sigma=0.7,
+            retail_buy_prob=0.5,
+            seed=None,
+        )
+        variance = HyperparameterVariance(
+            retail_mean_size_min=1.5,
+            retail_mean_size_max=2.5,
+            vary_retail_mean_size=True,
+            retail_arrival_rate_min=5.0,
+            retail_arrival_rate_max=5.0,
+            vary_retail_arrival_rate=False,
+            gbm_sigma_min=0.001,
+            gbm_sigma_max=0.001,
+            vary_gbm_sigma=False,
+        )
+        store = ResultStore(tmp_path / "results.sqlite")
+        bytecode, abi = vanilla_bytecode_and_abi
+        strategy = EVMStrategyAdapter(bytecode=bytecode, abi=abi)
+
+        def runner(n):
+            return MatchRunner(
+                n_simulations=n, config=config, n_workers=2, variance=variance, result_store=store
+            )
+
+        simulated = []
+        first = runner(3).run_match(strategy, strategy, progress=lambda c, t: simulated.append(t))
+        assert simulated[-1] == 3
+        assert len(store) == 3
+
+        # Two more seeds: only those are simulated
+        simulated.clear()
+        second = runner(5).run_match(strategy, strategy, progress=lambda c, t: simulated.append(t))
+        assert simulated[-1] == 2
+        assert second.seeds == [0, 1, 2, 3, 4]
+
+        uncached = MatchRunner(n_simulations=5, config=config, n_workers=2, variance=variance)
+        fresh = uncached.run_match(strategy, strategy)
+        assert second.total_edge_a == fresh.total_edge_a
+        assert second.total_pnl_b == fresh.total_pnl_b
+        assert (second.wins_a, second.wins_b, second.draws) == (fresh.wins_a, fresh.wins_b, fresh.draws)
+
+        # Fully cached: nothing is simulated
+        simulated.clear()
+        third = runner(3).run_match(strategy, strategy, progress=lambda c, t: simulated.append(t))
+        assert simulated == []
+        assert third.total_edge_a == first.total_edge_a
+
+    def test_tape_replay_matches_live_match(self, vanilla_bytecode_and_abi):
+        from amm_competition.evm.adapter import EVMStrategyAdapter
+
+        config = amm_sim_rs.SimulationConfig(
+            n_steps=50,
+            initial_price=100.0,
+            initial_x=100.0,
+            initial_y=10000.0,
+            gbm_mu=0.0,
+            gbm_sigma=0.001,
+            gbm_dt=1.0,
+            retail_arrival_rate=5.0,
+            retail_mean_size=2.0,
+            retail_size_sigma=0.7,
+            retail_buy_prob=0.5,
+            seed=None,
+        )
+        variance = HyperparameterVariance(
+            retail_mean_size_min=1.5,
+            retail_mean_size_max=2.5,
+            vary_retail_mean_size=True,
+            retail_arrival_rate_min=4.0,
+            retail_arrival_rate_max=6.0,
+            vary_retail_arrival_rate=True,
+            gbm_sigma_min=0.001,
+            gbm_sigma_max=0.002,
+            vary_gbm_sigma=True,
+        )
+        bytecode, abi = vanilla_bytecode_and_abi
+        strategy = EVMStrategyAdapter(bytecode=bytecode, abi=abi)
+
+        live = MatchRunner(n_simulations=4, config=config, n_workers=2, variance=variance)
+        replay = MatchRunner(
+            n_simulations=4, config=config, n_workers=2, variance=variance, tape=live.build_tape()
+        )
+
+        assert replay.tape.seeds == [0, 1, 2, 3]
+        expected = live.run_match(strategy, strategy)
+        result = replay.run_match(strategy, strategy)
+        assert result.total_edge_a == expected.total_edge_a
+        assert result.total_pnl_b == expected.total_pnl_b
 
     def test_same_name_strategies_no_collision(self, vanilla_bytecode_and_abi):
         """Test that strategies with the same getName() don't cause HashMap collision."""
@@ -216,3 +357,643 @@ class TestMatchRunner:
         # Check that simulation results contain data for both strategies
         first_sim = result.simulation_results[0]
         assert len(first_sim.pnl) == 2  # Should have PnL for both strategies
+
+    def test_configs_reproduce_numpy_draws(self):
+        config = amm_sim_rs.SimulationConfig(
+            n_steps=50,
+            initial_price=100.0,
+            initial_x=100.0,
+            initial_y=10000.0,
+            gbm_mu=0.0,
+            gbm_sigma=0.001,
+            gbm_dt=1.0,
+            retail_arrival_rate=5.0,
+            retail_mean_size=2.0,
+            retail_size_sigma=0.7,
+            retail_buy_prob=0.5,
+            seed=None,
+        )
+        variance = HyperparameterVariance(
+            retail_mean_size_min=19.0,
+            retail_mean_size_max=21.0,
+            vary_retail_mean_size=True,
+            retail_arrival_rate_min=0.6,
+            retail_arrival_rate_max=1.0,
+            vary_retail_arrival_rate=False,
+            gbm_sigma_min=0.000882,
+            gbm_sigma_max=0.001008,
+            vary_gbm_sigma=True,
+        )
+        runner = MatchRunner(n_simulations=10, config=config, n_workers=1, variance=variance)
+
+        configs = runner._build_configs(range(3, 7))
+
+        assert len(configs) == 4
+        assert configs[-1].seed == 6
+        for seed, built in zip(range(3, 7), configs.to_list()):
+            rng = np.random.default_rng(seed)
+            assert built.seed == seed
+            assert built.retail_mean_size == rng.uniform(19.0, 21.0)
+            assert built.retail_arrival_rate == 5.0
+            assert built.gbm_sigma == rng.uniform(0.000882, 0.001008)
+            assert built.n_steps == 50
+
+
+class TestAdaptiveMatch:
+    def test_stops_early_against_reference(self, vanilla_bytecode_and_abi):
+        from amm_competition.competition.sequential import StoppingRule
+        from amm_competition.evm.adapter import EVMStrategyAdapter
+
+        config = amm_sim_rs.SimulationConfig(
+            n_steps=50,
+            initial_price=100.0,
+            initial_x=100.0,
+            initial_y=10000.0,
+            gbm_mu=0.0,
+            gbm_sigma=0.001,
+            gbm_dt=1.0,
+            retail_arrival_rate=5.0,
+            retail_mean_size=2.0,
+            retail_size_sigma=0.7,
+            retail_buy_prob=0.5,
+            seed=42,
+        )
+        variance = HyperparameterVariance(
+            retail_mean_size_min=2.0,
+            retail_mean_size_max=2.0,
+            vary_retail_mean_size=False,
+            retail_arrival_rate_min=5.0,
+            retail_arrival_rate_max=5.0,
+            vary_retail_arrival_rate=False,
+            gbm_sigma_min=0.001,
+            gbm_sigma_max=0.001,
+            vary_gbm_sigma=False,
+        )
+        runner = MatchRunner(n_simulations=40, config=config, n_workers=1, variance=variance)
+
+        bytecode, abi = vanilla_bytecode_and_abi
+        strategy = EVMStrategyAdapter(bytecode=bytecode, abi=abi)
+
+        # Identical strategies: the paired difference is exactly zero
+        rule = StoppingRule(chunk_size=10, min_simulations=10, precision=1e-9)
+        result = runner.run_match_adaptive(strategy, strategy, rule, reference=strategy)
+
+        assert result.seeds == list(range(10))
+        assert result.total_games == 10
+        assert result.confidence_interval == (0.0, 0.0)
+
+
+class TestCandidateComparison:
+    def test_candidates_share_scenarios(self, vanilla_bytecode_and_abi):
+        from amm_competition.evm.adapter import EVMStrategyAdapter
+
+        config = amm_sim_rs.SimulationConfig(
+            n_steps=50,
+            initial_price=100.0,
+            initial_x=100.0,
+            initial_y=10000.0,
+            gbm_mu=0.0,
+            gbm_sigma=0.001,
+            gbm_dt=1.0,
+            retail_arrival_rate=5.0,
+            retail_mean_size=2.0,
+            retail_size_sigma=0.7,
+            retail_buy_prob=0.5,
+            seed=42,
+        )
+        variance = HyperparameterVariance(
+            retail_mean_size_min=2.0,
+            retail_mean_size_max=2.0,
+            vary_retail_mean_size=False,
+            retail_arrival_rate_min=5.0,
+            retail_arrival_rate_max=5.0,
+            vary_retail_arrival_rate=False,
+            gbm_sigma_min=0.001,
+            gbm_sigma_max=0.001,
+            vary_gbm_sigma=False,
+        )
+        runner = MatchRunner(n_simulations=4, config=config, n_workers=2, variance=variance)
+
+        bytecode, abi = vanilla_bytecode_and_abi
+        strategy = EVMStrategyAdapter(bytecode=bytecode, abi=abi)
+
+        comparison = runner.compare_candidates([strategy, strategy, strategy], strategy)
+        head_to_head = runner.run_match(strategy, strategy, store_results=True)
+
+        assert comparison.edges.shape == (4, 3)
+        assert comparison.seeds.tolist() == [0, 1, 2, 3]
+        # Identical candidates on common random numbers give identical columns
+        assert (comparison.paired_difference(0, 2) == 0).all()
+        # Replayed scenarios reproduce the live engine exactly
+        expected = [float(r.edges["submission"]) for r in head_to_head.simulation_results]
+        assert comparison.edges[:, 0].tolist() == pytest.approx(expected)
+
+    def test_parameter_grid_compiles_once(self, vanilla_bytecode_and_abi):
+        from amm_competition.evm.adapter import EVMStrategyAdapter
+        from amm_competition.evm.compiler import SolidityCompiler
+        from amm_competition.evm.params import StrategyTemplate
+
+        source = """// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.24;
+
+import {AMMStrategyBase} from "./AMMStrategyBase.sol";
+import {IAMMStrategy, TradeInfo} from "./IAMMStrategy.sol";
+
+contract Strategy is AMMStrategyBase {
+    // @param fee 0 bps
+
+    function afterInitialize(uint256, uint256) external override returns (uint256, uint256) {
+        return (slots[0], slots[0]);
+    }
+
+    function afterSwap(TradeInfo calldata) external override returns (uint256, uint256) {
+        return (slots[0], slots[0]);
+    }
+
+    function getName() external pure override returns (string memory) {
+        return "Flat";
+    }
+}
+"""
+        config = amm_sim_rs.SimulationConfig(
+            n_steps=50,
+            initial_price=100.0,
+            initial_x=100.0,
+            initial_y=10000.0,
+            gbm_mu=0.0,
+            gbm_sigma=0.001,
+            gbm_dt=1.0,
+            retail_arrival_rate=5.0,
+            retail_mean_size=2.0,
+            retail_size_sigma=0.7,
+            retail_buy_prob=0.5,
+            seed=42,
+        )
+        variance = HyperparameterVariance(
+            retail_mean_size_min=2.0,
+            retail_mean_size_max=2.0,
+            vary_retail_mean_size=False,
+            retail_arrival_rate_min=5.0,
+            retail_arrival_rate_max=5.0,
+            vary_retail_arrival_rate=False,
+            gbm_sigma_min=0.001,
+            gbm_sigma_max=0.001,
+            vary_gbm_sigma=False,
+        )
+        pool = amm_sim_rs.SimulationPool(n_workers=2)
+        runner = MatchRunner(n_simulations=4, config=config, n_workers=2, variance=variance, pool=pool)
+
+        template = StrategyTemplate.from_source(source)
+        compilation = SolidityCompiler(use_cache=False).compile(source)
+        assert compilation.success, compilation.errors
+
+        bytecode, abi = vanilla_bytecode_and_abi
+        vanilla = EVMStrategyAdapter(bytecode=bytecode, abi=abi)
+
+        comparison = runner.compare_parameters(
+            template,
+            compilation.bytecode,
+            [{"fee": 10}, {"fee": 30}, {"fee": 80}],
+            vanilla,
+        )
+        reference = runner.compare_candidates([vanilla], vanilla)
+
+        assert comparison.candidates == ["fee=10", "fee=30", "fee=80"]
+        assert comparison.edges.shape == (4, 3)
+        # One template deployment serves the whole grid
+        assert pool.cached_strategies == 2
+        # 30 bps via storage behaves exactly like the 30 bps vanilla strategy
+        assert comparison.edges[:, 1].tolist() == pytest.approx(reference.edges[:, 0].tolist())
+        assert not (comparison.paired_difference(0, 2) == 0).all()
+
+
+class TestSimulationPool:
+    def test_pool_reuses_deployments_across_batches(self, vanilla_bytecode_and_abi):
+        bytecode, _ = vanilla_bytecode_and_abi
+        config = amm_sim_rs.SimulationConfig(
+            n_steps=50,
+            initial_price=100.0,
+            initial_x=100.0,
+            initial_y=10000.0,
+            gbm_mu=0.0,
+            gbm_sigma=0.001,
+            gbm_dt=1.0,
+            retail_arrival_rate=5.0,
+            retail_mean_size=2.0,
+            retail_size_sigma=0.7,
+            retail_buy_prob=0.5,
+            seed=42,
+        )
+        pool = amm_sim_rs.SimulationPool(n_workers=2)
+
+        first = pool.run_batch(list(bytecode), list(bytecode), [config], capture_steps=False)
+        second = pool.run_batch(list(bytecode), list(bytecode), [config], capture_steps=False)
+        reference = amm_sim_rs.run_batch(
+            list(bytecode), list(bytecode), [config], 1, capture_steps=False
+        )
+
+        assert pool.n_workers == 2
+        assert pool.cached_strategies == 1
+        assert first.results[0].edges == second.results[0].edges == reference.results[0].edges
+
+        pool.clear_cache()
+        assert pool.cached_strategies == 0
+
+    def test_bytecode_accepts_bytes_and_buffers(self, vanilla_bytecode_and_abi):
+        bytecode = vanilla_bytecode_and_abi[0]
+        config = amm_sim_rs.SimulationConfig(
+            n_steps=20,
+            initial_price=100.0,
+            initial_x=100.0,
+            initial_y=10000.0,
+            gbm_mu=0.0,
+            gbm_sigma=0.001,
+            gbm_dt=1.0,
+            retail_arrival_rate=5.0,
+            retail_mean_size=2.0,
+            retail_size_sigma=0.7,
+            retail_buy_prob=0.5,
+            seed=42,
+        )
+        pool = amm_sim_rs.SimulationPool(n_workers=1)
+
+        edges = [
+            pool.run_batch(code, code, [config], capture_steps=False).results[0].edges
+            for code in (bytes(bytecode), bytearray(bytecode), memoryview(bytecode), list(bytecode))
+        ]
+
+        assert pool.cached_strategies == 1
+        assert all(e == edges[0] for e in edges)
+        assert amm_sim_rs.run_single(bytecode, bytecode, config).edges == edges[0]
+        with pytest.raises(TypeError):
+            pool.run_batch("not bytecode", bytecode, [config])
+
+    def test_native_strategies_match_contracts(self, vanilla_bytecode_and_abi):
+        from pathlib import Path
+        from amm_competition.evm.compiler import SolidityCompiler
+
+        source = (Path(__file__).parent.parent / "my_strategy.sol").read_text()
+        compilation = SolidityCompiler(use_cache=False).compile(source)
+        assert compilation.success, compilation.errors
+        vanilla = list(vanilla_bytecode_and_abi[0])
+        configs = [
+            amm_sim_rs.SimulationConfig(
+                n_steps=200,
+                initial_price=100.0,
+                initial_x=100.0,
+                initial_y=10000.0,
+                gbm_mu=0.0,
+                gbm_sigma=0.001,
+                gbm_dt=1.0,
+                retail_arrival_rate=5.0,
+                retail_mean_size=20.0,
+                retail_size_sigma=1.2,
+                retail_buy_prob=0.5,
+                seed=seed,
+            )
+            for seed in range(3)
+        ]
+        pool = amm_sim_rs.SimulationPool(n_workers=2)
+        native_vanilla = amm_sim_rs.NativeStrategySpec.constant_fee(30)
+        dir_contrarian = amm_sim_rs.NativeStrategySpec.spike_decay()
+
+        expected = pool.run_batch(list(compilation.bytecode), vanilla, configs, capture_steps=False)
+        result = pool.run_batch(dir_contrarian, native_vanilla, configs, capture_steps=False)
+
+        assert [r.edges for r in result.results] == [r.edges for r in expected.results]
+        assert [r.pnl for r in result.results] == [r.pnl for r in expected.results]
+        # Only the two compiled contracts were deployed
+        assert pool.cached_strategies == 2
+        with pytest.raises(ValueError):
+            amm_sim_rs.NativeStrategySpec.constant_fee(2000)
+
+    def test_constant_fee_bytecode_runs_natively(self, vanilla_bytecode_and_abi):
+        bytecode = list(vanilla_bytecode_and_abi[0])
+        configs = [
+            amm_sim_rs.SimulationConfig(
+                n_steps=100,
+                initial_price=100.0,
+                initial_x=100.0,
+                initial_y=10000.0,
+                gbm_mu=0.0,
+                gbm_sigma=0.001,
+                gbm_dt=1.0,
+                retail_arrival_rate=5.0,
+                retail_mean_size=2.0,
+                retail_size_sigma=0.7,
+                retail_buy_prob=0.5,
+                seed=seed,
+            )
+            for seed in range(3)
+        ]
+        evm_only = amm_sim_rs.SimulationPool(n_workers=2, native_substitution=False)
+        default = amm_sim_rs.SimulationPool(n_workers=2)
+        probed = amm_sim_rs.SimulationPool(n_workers=2, probe_constant_fees=True)
+        verified = amm_sim_rs.SimulationPool(
+            n_workers=2, probe_constant_fees=True, verify_native_calls=16
+        )
+        # A wrong registration is caught and the EVM result kept
+        misregistered = amm_sim_rs.SimulationPool(n_workers=2, verify_native_calls=16)
+        misregistered.register_native(bytecode, amm_sim_rs.NativeStrategySpec.constant_fee(31))
+
+        expected = evm_only.run_batch(bytecode, bytecode, configs, capture_steps=False)
+        for pool in (default, probed, verified, misregistered):
+            result = pool.run_batch(bytecode, bytecode, configs, capture_steps=False)
+            assert [r.edges for r in result.results] == [r.edges for r in expected.results]
+
+        # Unregistered bytecode stays in the EVM unless probing is asked for
+        def gas(pool):
+            return pool.run_batch(bytecode, bytecode, configs[:1], capture_steps=False).results[0].gas
+
+        assert len(gas(default)) == 2
+        assert len(gas(probed)) == 0
+        assert verified.native_mismatches == 0
+        assert misregistered.native_mismatches > 0
+
+    def test_gas_profiles(self, vanilla_bytecode_and_abi):
+        bytecode = list(vanilla_bytecode_and_abi[0])
+        config = amm_sim_rs.SimulationConfig(
+            n_steps=100,
+            initial_price=100.0,
+            initial_x=100.0,
+            initial_y=10000.0,
+            gbm_mu=0.0,
+            gbm_sigma=0.001,
+            gbm_dt=1.0,
+            retail_arrival_rate=5.0,
+            retail_mean_size=2.0,
+            retail_size_sigma=0.7,
+            retail_buy_prob=0.5,
+            seed=0,
+        )
+        vanilla = amm_sim_rs.NativeStrategySpec.constant_fee(30)
+
+        pool = amm_sim_rs.SimulationPool(n_workers=1, native_substitution=False)
+        result = pool.run_batch(bytecode, vanilla, [config], capture_steps=False).results[0]
+        # Native strategies run no EVM code, so report no gas
+        assert len(result.gas) == 1
+        (profile,) = result.gas.values()
+        assert profile.calls > 0
+        assert 21_000 < profile.min <= profile.mean <= profile.max <= 250_000
+        assert profile.min <= profile.p99 <= profile.max
+        assert profile.opcodes == {}
+
+        profiled = amm_sim_rs.SimulationPool(n_workers=1, opcode_profile=True)
+        result = profiled.run_batch(bytecode, vanilla, [config], capture_steps=False).results[0]
+        (opcoded,) = result.gas.values()
+        assert opcoded.calls == profile.calls
+        assert opcoded.max == profile.max
+        assert opcoded.opcodes["RETURN"] > 0
+
+    def test_batch_profile(self, vanilla_bytecode_and_abi):
+        bytecode = list(vanilla_bytecode_and_abi[0])
+        configs = [
+            amm_sim_rs.SimulationConfig(
+                n_steps=100,
+                initial_price=100.0,
+                initial_x=100.0,
+                initial_y=10000.0,
+                gbm_mu=0.0,
+                gbm_sigma=0.001,
+                gbm_dt=1.0,
+                retail_arrival_rate=5.0,
+                retail_mean_size=2.0,
+                retail_size_sigma=0.7,
+                retail_buy_prob=0.5,
+                seed=seed,
+            )
+            for seed in range(4)
+        ]
+        vanilla = amm_sim_rs.NativeStrategySpec.constant_fee(30)
+        pool = amm_sim_rs.SimulationPool(n_workers=2, native_substitution=False)
+
+        assert pool.run_batch(bytecode, vanilla, configs, capture_steps=False).profile is None
+        result = pool.run_batch(bytecode, vanilla, configs, capture_steps=False, profile=True)
+        profile = result.profile
+        assert len(profile.workers) == 2
+        total = profile.total
+        assert total.simulations == 4
+        assert total.steps == 400
+        assert 0 < total.evm_calls < total.strategy_calls
+        assert total.strategy_ns > 0
+        phases = (
+            total.setup_ns + total.price_ns + total.arbitrage_ns
+            + total.routing_ns + total.strategy_ns + total.capture_ns
+        )
+        assert phases + total.other_ns == total.total_ns
+        assert "arbitrage" in profile.report()
+
+        stream = pool.stream_batch(bytecode, vanilla, configs, capture_steps=False, profile=True)
+        assert len(list(stream)) == 4
+        assert stream.profile.total.simulations == 4
+
+    def test_stream_batch_ordered_with_progress(self, vanilla_bytecode_and_abi):
+        bytecode, _ = vanilla_bytecode_and_abi
+        configs = [
+            amm_sim_rs.SimulationConfig(
+                n_steps=50,
+                initial_price=100.0,
+                initial_x=100.0,
+                initial_y=10000.0,
+                gbm_mu=0.0,
+                gbm_sigma=0.001,
+                gbm_dt=1.0,
+                retail_arrival_rate=5.0,
+                retail_mean_size=2.0,
+                retail_size_sigma=0.7,
+                retail_buy_prob=0.5,
+                seed=seed,
+            )
+            for seed in range(6)
+        ]
+        pool = amm_sim_rs.SimulationPool(n_workers=2)
+        calls = []
+
+        stream = pool.stream_batch(
+            list(bytecode),
+            list(bytecode),
+            configs,
+            capture_steps=False,
+            ordered=True,
+            progress=lambda done, total: calls.append((done, total)),
+        )
+        seeds = [result.seed for result in stream]
+
+        assert seeds == list(range(6))
+        assert calls == [(i, 6) for i in range(1, 7)]
+        assert stream.completed == 6
+
+    def test_stream_batch_cancel_from_progress(self, vanilla_bytecode_and_abi):
+        bytecode, _ = vanilla_bytecode_and_abi
+        configs = [
+            amm_sim_rs.SimulationConfig(
+                n_steps=50,
+                initial_price=100.0,
+                initial_x=100.0,
+                initial_y=10000.0,
+                gbm_mu=0.0,
+                gbm_sigma=0.001,
+                gbm_dt=1.0,
+                retail_arrival_rate=5.0,
+                retail_mean_size=2.0,
+                retail_size_sigma=0.7,
+                retail_buy_prob=0.5,
+                seed=seed,
+            )
+            for seed in range(20)
+        ]
+        pool = amm_sim_rs.SimulationPool(n_workers=1)
+
+        def stop_after_two(done, total):
+            if done == 2:
+                raise KeyboardInterrupt
+
+        stream = pool.stream_batch(
+            list(bytecode), list(bytecode), configs, capture_steps=False, progress=stop_after_two
+        )
+        with pytest.raises(KeyboardInterrupt):
+            list(stream)
+
+        assert stream.cancelled
+        assert list(stream) == []
+
+    def test_cancelled_stream_releases_workers(self, vanilla_bytecode_and_abi):
+        import threading
+        import time
+
+        bytecode, _ = vanilla_bytecode_and_abi
+        configs = [
+            amm_sim_rs.SimulationConfig(
+                n_steps=20,
+                initial_price=100.0,
+                initial_x=100.0,
+                initial_y=10000.0,
+                gbm_mu=0.0,
+                gbm_sigma=0.001,
+                gbm_dt=1.0,
+                retail_arrival_rate=5.0,
+                retail_mean_size=2.0,
+                retail_size_sigma=0.7,
+                retail_buy_prob=0.5,
+                seed=seed,
+            )
+            for seed in range(64)
+        ]
+        pool = amm_sim_rs.SimulationPool(n_workers=1)
+
+        # Read one result, then let the worker fill the channel and block
+        stream = pool.stream_batch(list(bytecode), list(bytecode), configs, capture_steps=False)
+        next(stream)
+        time.sleep(0.5)
+        stream.cancel()
+
+        # The stream is still referenced; the pool must still take new work
+        results = []
+        worker = threading.Thread(
+            target=lambda: results.append(
+                pool.run_batch(list(bytecode), list(bytecode), configs[:2], capture_steps=False)
+            ),
+            daemon=True,
+        )
+        worker.start()
+        worker.join(timeout=30)
+
+        assert not worker.is_alive(), "pool still blocked by the cancelled stream"
+        assert len(results[0].results) == 2
+        assert stream.cancelled
+        assert list(stream) == []
+
+    def test_match_runner_with_pool(self, vanilla_bytecode_and_abi):
+        from amm_competition.evm.adapter import EVMStrategyAdapter
+
+        config = amm_sim_rs.SimulationConfig(
+            n_steps=50,
+            initial_price=100.0,
+            initial_x=100.0,
+            initial_y=10000.0,
+            gbm_mu=0.0,
+            gbm_sigma=0.001,
+            gbm_dt=1.0,
+            retail_arrival_rate=5.0,
+            retail_mean_size=2.0,
+            retail_size_sigma=0.7,
+            retail_buy_prob=0.5,
+            seed=42,
+        )
+        variance = HyperparameterVariance(
+            retail_mean_size_min=2.0,
+            retail_mean_size_max=2.0,
+            vary_retail_mean_size=False,
+            retail_arrival_rate_min=5.0,
+            retail_arrival_rate_max=5.0,
+            vary_retail_arrival_rate=False,
+            gbm_sigma_min=0.001,
+            gbm_sigma_max=0.001,
+            vary_gbm_sigma=False,
+        )
+        pool = amm_sim_rs.SimulationPool(n_workers=1)
+        runner = MatchRunner(
+            n_simulations=3, config=config, n_workers=1, variance=variance, pool=pool
+        )
+
+        bytecode, abi = vanilla_bytecode_and_abi
+        strategy_a = EVMStrategyAdapter(bytecode=bytecode, abi=abi)
+        strategy_b = EVMStrategyAdapter(bytecode=bytecode, abi=abi)
+
+        result = runner.run_match(strategy_a, strategy_b)
+
+        assert result.total_games == 3
+        assert pool.cached_strategies == 1
+
+    def test_run_match_async(self, vanilla_bytecode_and_abi):
+        import asyncio
+
+        from amm_competition.evm.adapter import EVMStrategyAdapter
+
+        config = amm_sim_rs.SimulationConfig(
+            n_steps=50,
+            initial_price=100.0,
+            initial_x=100.0,
+            initial_y=10000.0,
+            gbm_mu=0.0,
+            gbm_sigma=0.001,
+            gbm_dt=1.0,
+            retail_arrival_rate=5.0,
+            retail_mean_size=2.0,
+            retail_size_sigma=0.7,
+            retail_buy_prob=0.5,
+            seed=42,
+        )
+        variance = HyperparameterVariance(
+            retail_mean_size_min=2.0,
+            retail_mean_size_max=2.0,
+            vary_retail_mean_size=False,
+            retail_arrival_rate_min=5.0,
+            retail_arrival_rate_max=5.0,
+            vary_retail_arrival_rate=False,
+            gbm_sigma_min=0.001,
+            gbm_sigma_max=0.001,
+            vary_gbm_sigma=False,
+        )
+        runner = MatchRunner(
+            n_simulations=3,
+            config=config,
+            n_workers=1,
+            variance=variance,
+            pool=amm_sim_rs.SimulationPool(n_workers=2),
+        )
+
+        bytecode, abi = vanilla_bytecode_and_abi
+        strategy_a = EVMStrategyAdapter(bytecode=bytecode, abi=abi)
+        strategy_b = EVMStrategyAdapter(bytecode=bytecode, abi=abi)
+
+        async def run_two():
+            return await asyncio.gather(
+                runner.run_match_async(strategy_a, strategy_b),
+                runner.run_match_async(strategy_a, strategy_b),
+            )
+
+        first, second = asyncio.run(run_two())
+
+        assert first.total_games == second.total_games == 3
+        assert first.total_edge_a == second.total_edge_a
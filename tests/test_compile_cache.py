@@ -0,0 +1,149 @@
+"""Tests for the on-disk compile cache."""
+
+import os
+
+import pytest
+import solcx
+
+from amm_competition.evm.compile_cache import CompileCache
+from amm_competition.evm.compiler import SolidityCompiler
+
+# Returns (30 bps, 30 bps) for any call.
+RUNTIME_HEX = "660aa87bee538000600052660aa87bee53800060205260406000f3"
+INITCODE_HEX = "601b600c600039601b6000f3" + RUNTIME_HEX
+
+SOURCE = "contract Strategy {}"
+
+
+class FakeSolc:
+    """Stands in for solcx.compile_standard and counts invocations."""
+
+    def __init__(self, storage=None, errors=None):
+        self.calls = 0
+        self.storage = storage or []
+        self.errors = errors or []
+
+    def __call__(self, input_json, **kwargs):
+        self.calls += 1
+        return {
+            "errors": self.errors,
+            "contracts": {
+                "Strategy.sol": {
+                    "Strategy": {
+                        "abi": [{"type": "function", "name": "afterSwap"}],
+                        "evm": {
+                            "bytecode": {"object": INITCODE_HEX},
+                            "deployedBytecode": {"object": RUNTIME_HEX},
+                        },
+                        "storageLayout": {"storage": self.storage},
+                    }
+                }
+            },
+        }
+
+
+@pytest.fixture
+def fake_solc(monkeypatch):
+    fake = FakeSolc()
+    monkeypatch.setattr(solcx, "compile_standard", fake)
+    monkeypatch.setattr(SolidityCompiler, "_solc_ready", True)
+    monkeypatch.delenv("AMM_NO_COMPILE_CACHE", raising=False)
+    return fake
+
+
+def test_repeat_compile_is_served_from_cache(tmp_path, fake_solc):
+    compiler = SolidityCompiler(cache=CompileCache(tmp_path))
+
+    first = compiler.compile(SOURCE)
+    second = SolidityCompiler(cache=CompileCache(tmp_path)).compile(SOURCE)
+
+    assert fake_solc.calls == 1
+    assert first.success and second.success
+    assert second.bytecode == first.bytecode == bytes.fromhex(INITCODE_HEX)
+    assert second.deployed_bytecode == bytes.fromhex(RUNTIME_HEX)
+    assert second.abi == first.abi
+
+
+def test_changed_source_or_contract_misses(tmp_path, fake_solc):
+    compiler = SolidityCompiler(cache=CompileCache(tmp_path))
+
+    compiler.compile(SOURCE)
+    compiler.compile(SOURCE + "\n// tweak")
+    compiler.compile(SOURCE, contract_name="Other")
+
+    assert fake_solc.calls == 3
+
+
+def test_bypass_flag_and_env(tmp_path, fake_solc, monkeypatch):
+    SolidityCompiler(use_cache=False).compile(SOURCE)
+    SolidityCompiler(use_cache=False).compile(SOURCE)
+    assert fake_solc.calls == 2
+
+    monkeypatch.setenv("AMM_NO_COMPILE_CACHE", "1")
+    compiler = SolidityCompiler(cache=CompileCache(tmp_path))
+    assert compiler.cache is None
+    compiler.compile(SOURCE)
+    assert fake_solc.calls == 3
+    assert len(CompileCache(tmp_path)) == 0
+
+
+def test_failures_are_not_cached(tmp_path, monkeypatch, fake_solc):
+    failing = FakeSolc(errors=[{"severity": "error", "message": "boom"}])
+    monkeypatch.setattr(solcx, "compile_standard", failing)
+    compiler = SolidityCompiler(cache=CompileCache(tmp_path))
+
+    assert not compiler.compile(SOURCE).success
+    assert not compiler.compile(SOURCE).success
+    assert failing.calls == 2
+    assert len(compiler.cache) == 0
+
+
+def test_policy_is_reapplied_on_cache_hit(tmp_path, monkeypatch):
+    fake = FakeSolc(storage=[{"label": "x", "slot": "1", "offset": 0}])
+    monkeypatch.setattr(solcx, "compile_standard", fake)
+    monkeypatch.setattr(SolidityCompiler, "_solc_ready", True)
+    compiler = SolidityCompiler(cache=CompileCache(tmp_path))
+
+    first = compiler.compile(SOURCE)
+    second = compiler.compile(SOURCE)
+
+    assert fake.calls == 1
+    assert not first.success and not second.success
+    assert "State storage outside" in second.errors[0]
+
+
+def test_corrupt_entry_is_recompiled(tmp_path, fake_solc):
+    compiler = SolidityCompiler(cache=CompileCache(tmp_path))
+    compiler.compile(SOURCE)
+    for entry in tmp_path.glob("*.json"):
+        entry.write_text("{not json")
+
+    assert compiler.compile(SOURCE).success
+    assert fake_solc.calls == 2
+
+
+def test_lru_eviction_bounds_size(tmp_path):
+    cache = CompileCache(tmp_path, max_bytes=3000)
+    artifact = {"bytecode": "00" * 400}
+    keys = [f"{i:064x}" for i in range(4)]
+
+    for i, key in enumerate(keys[:3]):
+        cache.put(key, artifact)
+        os.utime(tmp_path / f"{key}.json", (1000 + i, 1000 + i))
+    # A hit makes the oldest entry the most recently used
+    assert cache.get(keys[0]) is not None
+
+    cache.put(keys[3], artifact)
+
+    assert cache.size_bytes() <= 3000
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[3]) is not None
+
+
+def test_key_is_order_independent():
+    a = {"language": "Solidity", "settings": {"viaIR": True, "evmVersion": "paris"}}
+    b = {"settings": {"evmVersion": "paris", "viaIR": True}, "language": "Solidity"}
+
+    assert CompileCache.key(a, "0.8.24", "Strategy") == CompileCache.key(b, "0.8.24", "Strategy")
+    assert CompileCache.key(a, "0.8.24", "Strategy") != CompileCache.key(a, "0.8.25", "Strategy")
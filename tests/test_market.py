@@ -5,7 +5,7 @@ import pytest
 from decimal import Decimal
 
 from amm_competition.market.price_process import GBMPriceProcess
-from amm_competition.market.retail import RetailTrader
+from amm_competition.market.retail import RetailOrder, RetailTrader
 from amm_competition.market.arbitrageur import Arbitrageur
 from amm_competition.market.router import OrderRouter
 from amm_competition.core.amm import AMM
@@ -255,3 +255,72 @@ class TestOrderRouter:
 
         # Both AMMs have same 30bps fee, so split should be roughly equal
         assert all(s[1] > 0 for s in splits)
+
+    @staticmethod
+    def _fixed_fee_amm(bps: int, reserve_x: str, reserve_y: str) -> AMM:
+        fee = Decimal(bps) / Decimal(10000)
+        amm = AMM(
+            strategy=FixedFeeStrategy(bid_fee=fee, ask_fee=fee),
+            reserve_x=Decimal(reserve_x),
+            reserve_y=Decimal(reserve_y),
+            name=f"Fixed{bps}",
+        )
+        amm.initialize()
+        return amm
+
+    @pytest.mark.parametrize("side, total", [("buy", Decimal("200")), ("sell", Decimal("2"))])
+    def test_many_amm_split_equalizes_marginal_prices(self, side, total):
+        """Every pool that trades should end at the same marginal price."""
+        amms = [
+            self._fixed_fee_amm(30, "100", "10000"),
+            self._fixed_fee_amm(50, "120", "12050"),
+            self._fixed_fee_amm(10, "80", "7990"),
+            self._fixed_fee_amm(900, "100", "10000"),
+        ]
+        router = OrderRouter()
+        if side == "buy":
+            splits = router.compute_optimal_split_buy(amms, total)
+        else:
+            splits = router.compute_optimal_split_sell(amms, total)
+
+        assert [amm for amm, _ in splits] == amms
+        assert abs(float(sum(amount for _, amount in splits) - total)) < 1e-9
+
+        # sqrt of the post-trade marginal price: (r + γΔ) / sqrt(γxy)
+        levels = []
+        for amm, amount in splits:
+            x, y = float(amm.reserve_x), float(amm.reserve_y)
+            fee = amm.current_fees.ask_fee if side == "buy" else amm.current_fees.bid_fee
+            gamma = 1.0 - float(fee)
+            reserve_in = y if side == "buy" else x
+            levels.append((reserve_in + gamma * float(amount)) / math.sqrt(x * gamma * y))
+
+        # The three cheap pools share the order; the 9% pool sits out
+        assert all(amount > 0 for _, amount in splits[:3])
+        assert levels[1] == pytest.approx(levels[0], rel=1e-12)
+        assert levels[2] == pytest.approx(levels[0], rel=1e-12)
+        assert splits[3][1] == 0
+        assert levels[3] > levels[0]
+
+    def test_many_amm_split_matches_two_amm_closed_form(self):
+        """Water-filling over two pools should agree with the closed form."""
+        amms = [self._fixed_fee_amm(30, "100", "10000"), self._fixed_fee_amm(50, "120", "12050")]
+        router = OrderRouter()
+
+        pools = [(float(amm.reserve_y), float(amm.reserve_x), float(amm.current_fees.ask_fee)) for amm in amms]
+        amounts = router._water_fill(pools, 200.0)
+        closed_form = router.compute_optimal_split_buy(amms, Decimal("200"))
+        for amount, (_, expected) in zip(amounts, closed_form):
+            assert amount == pytest.approx(float(expected), rel=1e-9)
+
+    def test_route_order_fills_every_amm(self):
+        """Identical pools should share an order equally."""
+        amms = [self._fixed_fee_amm(30, "100", "10000") for _ in range(3)]
+        router = OrderRouter()
+
+        trades = router.route_orders(
+            [RetailOrder(side="buy", size=Decimal("90"))], amms, Decimal("100"), timestamp=0
+        )
+        assert [trade.amm for trade in trades] == amms
+        for trade in trades:
+            assert float(trade.amount_y) == pytest.approx(30.0)
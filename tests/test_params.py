@@ -0,0 +1,69 @@
+"""Tests for parameterized strategy templates."""
+
+import pytest
+
+from amm_competition.evm.params import StrategyParam, StrategyTemplate
+
+TEMPLATE = """
+contract Strategy is AMMStrategyBase {
+    // @param baseFee 10 bps
+    // @param decayNum 11
+    // @param quadCoef 12 wad
+}
+"""
+
+
+def test_parses_declarations():
+    template = StrategyTemplate.from_source(TEMPLATE)
+
+    assert template.params == (
+        StrategyParam("baseFee", 10, "bps"),
+        StrategyParam("decayNum", 11, "raw"),
+        StrategyParam("quadCoef", 12, "wad"),
+    )
+
+
+def test_encodes_units_to_slot_values():
+    template = StrategyTemplate.from_source(TEMPLATE)
+
+    writes = template.encode({"baseFee": 24, "decayNum": 8, "quadCoef": 1.5})
+
+    assert writes == [(10, 24 * 10**14), (11, 8), (12, 15 * 10**17)]
+    assert template.label({"baseFee": 24, "decayNum": 8, "quadCoef": 1.5}) == (
+        "baseFee=24,decayNum=8,quadCoef=1.5"
+    )
+
+
+def test_fractional_bps_are_exact():
+    param = StrategyParam("fee", 0, "bps")
+    assert param.encode(0.5) == 5 * 10**13
+    assert param.encode("12.25") == 1225 * 10**12
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        {"baseFee": 24, "decayNum": 8},
+        {"baseFee": 24, "decayNum": 8, "quadCoef": 1, "extra": 2},
+        {"baseFee": 24, "decayNum": 8.5, "quadCoef": 1},
+        {"baseFee": -1, "decayNum": 8, "quadCoef": 1},
+    ],
+)
+def test_rejects_bad_values(values):
+    template = StrategyTemplate.from_source(TEMPLATE)
+    with pytest.raises(ValueError):
+        template.encode(values)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "contract Strategy {}",
+        "// @param a 32",
+        "// @param a 1\n// @param a 2",
+        "// @param a 1\n// @param b 1",
+    ],
+)
+def test_rejects_bad_declarations(source):
+    with pytest.raises(ValueError):
+        StrategyTemplate.from_source(source)
@@ -0,0 +1,101 @@
+"""Tests for the persistent per-seed result store."""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import amm_sim_rs
+
+from amm_competition.competition.result_store import ResultStore, SeedRecord, engine_version
+
+
+def _config(seed: int, sigma: float = 0.001):
+    return SimpleNamespace(
+        n_steps=100,
+        initial_price=100.0,
+        initial_x=100.0,
+        initial_y=10000.0,
+        gbm_mu=0.0,
+        gbm_sigma=sigma,
+        gbm_dt=1.0,
+        retail_arrival_rate=0.8,
+        retail_mean_size=20.0,
+        retail_size_sigma=1.2,
+        retail_buy_prob=0.5,
+        seed=seed,
+    )
+
+
+def _record(seed: int) -> SeedRecord:
+    return SeedRecord(seed, 300.0 + seed, 250.5, 1.25, -0.5, 10.0, 12.0, 40.0, 35.0)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(tmp_path / "results.sqlite", engine="test")
+    yield store
+    store.close()
+
+
+def test_round_trip_and_misses(store):
+    configs = [_config(seed) for seed in range(3)]
+    store.put_many(b"\x01", b"\x02", [(configs[0], _record(0)), (configs[2], _record(2))])
+
+    records = store.get_many(b"\x01", b"\x02", configs)
+
+    assert records == [_record(0), None, _record(2)]
+    assert len(store) == 2
+
+
+def test_key_covers_bytecodes_config_and_engine(store, tmp_path):
+    config = _config(0)
+    store.put_many(b"\x01", b"\x02", [(config, _record(0))])
+
+    assert store.get_many(b"\x03", b"\x02", [config]) == [None]
+    assert store.get_many(b"\x01", b"\x03", [config]) == [None]
+    assert store.get_many(b"\x01", b"\x02", [_config(0, sigma=0.002)]) == [None]
+    assert store.get_many(b"\x01", b"\x02", [_config(1)]) == [None]
+
+    other_engine = ResultStore(tmp_path / "results.sqlite", engine="other")
+    assert other_engine.get_many(b"\x01", b"\x02", [config]) == [None]
+    other_engine.close()
+
+
+def test_persists_across_instances(tmp_path):
+    path = tmp_path / "results.sqlite"
+    first = ResultStore(path, engine="test")
+    first.put_many(b"\x01", b"\x02", [(_config(5), _record(5))])
+    first.close()
+
+    second = ResultStore(path, engine="test")
+    assert second.get_many(b"\x01", b"\x02", [_config(5)]) == [_record(5)]
+    second.clear()
+    assert len(second) == 0
+    second.close()
+
+
+def test_shared_between_threads(store):
+    def write(offset: int) -> None:
+        store.put_many(
+            b"\x01", b"\x02", [(_config(seed), _record(seed)) for seed in range(offset, offset + 50)]
+        )
+
+    threads = [threading.Thread(target=write, args=(i * 50,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(store) == 200
+
+
+def test_engine_version_tracks_the_build(monkeypatch):
+    monkeypatch.setattr(amm_sim_rs, "__version__", "0.1.0", raising=False)
+    monkeypatch.setattr(amm_sim_rs, "__build__", "aaaa", raising=False)
+    before = engine_version()
+    monkeypatch.setattr(amm_sim_rs, "__build__", "bbbb")
+
+    # Same crate version, different sources: different key
+    assert engine_version() != before
+    assert engine_version() == "0.1.0+bbbb"
@@ -0,0 +1,107 @@
+"""Tests for sequential stopping rules."""
+
+import random
+import statistics
+
+import pytest
+
+from amm_competition.competition.sequential import RunningStats, StoppingRule
+
+
+class TestRunningStats:
+    def test_matches_batch_statistics(self):
+        values = [3.0, -1.5, 4.25, 0.0, 2.5, 7.0, -3.0]
+        stats = RunningStats()
+        for v in values:
+            stats.add(v)
+
+        assert stats.n == len(values)
+        assert stats.mean == pytest.approx(statistics.mean(values))
+        assert stats.variance == pytest.approx(statistics.variance(values))
+
+    def test_confidence_interval_centered_on_mean(self):
+        stats = RunningStats()
+        for v in [1.0, 2.0, 3.0, 4.0]:
+            stats.add(v)
+
+        low, high = stats.confidence_interval(0.95)
+        assert low < stats.mean < high
+        assert (low + high) / 2 == pytest.approx(stats.mean)
+
+    def test_wider_interval_for_higher_confidence(self):
+        stats = RunningStats()
+        for v in [1.0, 5.0, 2.0, 8.0]:
+            stats.add(v)
+
+        low_90, high_90 = stats.confidence_interval(0.90)
+        low_99, high_99 = stats.confidence_interval(0.99)
+        assert high_99 - low_99 > high_90 - low_90
+
+    def test_single_value_has_zero_variance(self):
+        stats = RunningStats()
+        stats.add(5.0)
+        assert stats.variance == 0.0
+
+
+class TestStoppingRule:
+    def _stats(self, values):
+        stats = RunningStats()
+        for v in values:
+            stats.add(v)
+        return stats
+
+    def test_never_stops_before_minimum(self):
+        rule = StoppingRule(min_simulations=10, threshold=0.0)
+        assert not rule.should_stop(self._stats([100.0, 101.0, 99.0]))
+
+    def test_stops_when_interval_excludes_threshold(self):
+        rule = StoppingRule(min_simulations=5, threshold=0.0)
+        assert rule.should_stop(self._stats([-10.0, -11.0, -9.5, -10.5, -10.2]))
+
+    def test_continues_when_interval_straddles_threshold(self):
+        rule = StoppingRule(min_simulations=5, threshold=0.0)
+        assert not rule.should_stop(self._stats([-5.0, 4.0, -3.0, 6.0, -1.0]))
+
+    def test_stops_at_precision(self):
+        rule = StoppingRule(min_simulations=5, precision=1.0)
+        assert rule.should_stop(self._stats([10.0, 10.1, 9.9, 10.05, 9.95]))
+        assert not rule.should_stop(self._stats([0.0, 20.0, -20.0, 40.0, 10.0]))
+
+    def test_without_criteria_runs_to_completion(self):
+        rule = StoppingRule(min_simulations=2)
+        assert not rule.should_stop(self._stats([1.0] * 100))
+
+    def test_looks_spend_the_error_budget(self):
+        rule = StoppingRule(confidence=0.9, chunk_size=50)
+        # Ten looks at most: 1% each
+        assert rule.look_confidence(50, max_simulations=500) == pytest.approx(0.99)
+        assert rule.look_confidence(500, max_simulations=500) == pytest.approx(0.99)
+        # Unbounded: later looks spend less
+        assert rule.look_confidence(50) < rule.look_confidence(100) < rule.look_confidence(150)
+
+        stats = self._stats([1.0, 5.0, 2.0, 8.0])
+        low, high = rule.interval(stats, max_simulations=500)
+        fixed_low, fixed_high = stats.confidence_interval(0.9)
+        assert high - low > fixed_high - fixed_low
+
+    @pytest.mark.parametrize("max_simulations", [1000, None])
+    def test_false_stop_rate_under_null(self, max_simulations):
+        """Looking after every chunk must not inflate the error rate."""
+        rule = StoppingRule(confidence=0.9, chunk_size=50, min_simulations=50, threshold=0.0)
+        rng = random.Random(11)
+        runs = 400
+        false_stops = 0
+        for _ in range(runs):
+            stats = RunningStats()
+            for _ in range(0, 1000, rule.chunk_size):
+                for _ in range(rule.chunk_size):
+                    stats.add(rng.gauss(0.0, 1.0))
+                if rule.should_stop(stats, max_simulations):
+                    false_stops += 1
+                    break
+
+        assert false_stops / runs <= 1 - rule.confidence
+
+    def test_rejects_invalid_confidence(self):
+        with pytest.raises(ValueError):
+            StoppingRule(confidence=1.5)
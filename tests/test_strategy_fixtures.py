@@ -0,0 +1,88 @@
+"""Tests for the assembled strategy bytecode used by the Rust benchmarks."""
+
+import random
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from amm_competition.core.trade import TradeInfo
+from amm_competition.evm.executor import EVMStrategyExecutor
+
+FIXTURES = Path(__file__).parent.parent / "amm_sim_rs" / "benches" / "fixtures"
+
+WAD = 10**18
+BPS = 10**14
+MAX_FEE = WAD // 10
+
+
+def _executor(name: str) -> EVMStrategyExecutor:
+    return EVMStrategyExecutor(bytes.fromhex((FIXTURES / f"{name}.hex").read_text().strip()))
+
+
+def _trade(side: str, amount_y: Decimal, reserve_y: Decimal) -> TradeInfo:
+    return TradeInfo(
+        side=side,
+        amount_x=amount_y / 100,
+        amount_y=amount_y,
+        timestamp=1,
+        reserve_x=Decimal(100),
+        reserve_y=reserve_y,
+    )
+
+
+def _dir_contrarian(bid: int, ask: int, trade: TradeInfo) -> tuple[int, int]:
+    """my_strategy.sol's afterSwap in integer arithmetic."""
+    base = 24 * BPS
+    ratio = int(trade.amount_y * WAD) * WAD // int(trade.reserve_y * WAD)
+    fresh = base + ratio * 5 // 4 + ratio * ratio // WAD * 15
+    decayed_bid = max(bid * 8 // 9, base)
+    decayed_ask = max(ask * 8 // 9, base)
+    if trade.side == "buy":
+        bid, ask = decayed_bid, max(fresh, decayed_ask)
+    else:
+        bid, ask = max(fresh, decayed_bid), decayed_ask
+    return min(bid, MAX_FEE), min(ask, MAX_FEE)
+
+
+@pytest.mark.parametrize(
+    "name, strategy_name, fee",
+    [("vanilla", "Vanilla_30bps", 30 * BPS), ("starter", "StarterStrategy", 50 * BPS)],
+)
+def test_constant_fee_fixtures(name, strategy_name, fee):
+    executor = _executor(name)
+
+    assert executor.get_name() == strategy_name
+    result = executor.after_initialize(Decimal(100), Decimal(10000))
+    assert result.success
+    assert executor._decimal_to_wad(result.bid_fee) == fee
+    for side in ("buy", "sell"):
+        assert executor.after_swap_fast(_trade(side, Decimal(5), Decimal(10000))) == (fee, fee)
+
+
+def test_dir_contrarian_fixture_matches_contract_rule():
+    executor = _executor("dir_contrarian")
+    assert executor.get_name() == "DirContrarian"
+    executor.after_initialize(Decimal(100), Decimal(10000))
+
+    rng = random.Random(7)
+    fees = (24 * BPS, 24 * BPS)
+    for _ in range(200):
+        trade = _trade(
+            rng.choice(("buy", "sell")),
+            Decimal(rng.randint(1, 5000)),
+            Decimal(rng.randint(1000, 20000)),
+        )
+        fees = _dir_contrarian(*fees, trade)
+        assert executor.after_swap_fast(trade) == fees
+
+
+def test_dir_contrarian_fixture_reverts_like_contract():
+    executor = _executor("dir_contrarian")
+    executor.after_initialize(Decimal(100), Decimal(10000))
+
+    with pytest.raises(RuntimeError):
+        executor.after_swap_fast(_trade("buy", Decimal(1), Decimal(0)))
+    # amountY * WAD overflows uint256
+    with pytest.raises(RuntimeError):
+        executor.after_swap_fast(_trade("buy", Decimal(2**150), Decimal(1)))
@@ -0,0 +1,140 @@
+"""Tests for in-process sweeps."""
+
+import io
+import math
+
+import pytest
+import amm_sim_rs
+
+from amm_competition.competition.match import HyperparameterVariance, MatchRunner
+from amm_competition.sweep import (
+    SweepResult,
+    SweepRow,
+    expand_grid,
+    parse_grid,
+    sweep_sources,
+    sweep_template,
+    write_table,
+)
+
+TEMPLATE = """// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.24;
+
+import {AMMStrategyBase} from "./AMMStrategyBase.sol";
+import {IAMMStrategy, TradeInfo} from "./IAMMStrategy.sol";
+
+contract Strategy is AMMStrategyBase {
+    // @param fee 0 bps
+
+    function afterInitialize(uint256, uint256) external override returns (uint256, uint256) {
+        return (slots[0], slots[0]);
+    }
+
+    function afterSwap(TradeInfo calldata) external override returns (uint256, uint256) {
+        return (slots[0], slots[0]);
+    }
+
+    function getName() external pure override returns (string memory) {
+        return "Flat";
+    }
+}
+"""
+
+
+def _runner(n_simulations: int = 3) -> MatchRunner:
+    config = amm_sim_rs.SimulationConfig(
+        n_steps=50,
+        initial_price=100.0,
+        initial_x=100.0,
+        initial_y=10000.0,
+        gbm_mu=0.0,
+        gbm_sigma=0.001,
+        gbm_dt=1.0,
+        retail_arrival_rate=5.0,
+        retail_mean_size=2.0,
+        retail_size_sigma=0.7,
+        retail_buy_prob=0.5,
+        seed=None,
+    )
+    variance = HyperparameterVariance(
+        retail_mean_size_min=2.0,
+        retail_mean_size_max=2.0,
+        vary_retail_mean_size=False,
+        retail_arrival_rate_min=5.0,
+        retail_arrival_rate_max=5.0,
+        vary_retail_arrival_rate=False,
+        gbm_sigma_min=0.001,
+        gbm_sigma_max=0.001,
+        vary_gbm_sigma=False,
+    )
+    return MatchRunner(n_simulations=n_simulations, config=config, n_workers=2, variance=variance)
+
+
+def test_parse_and_expand_grid():
+    grid = parse_grid(["base=20, 24", "decay=8,9,10"])
+
+    assert grid == {"base": ["20", "24"], "decay": ["8", "9", "10"]}
+    sets = expand_grid(grid)
+    assert len(sets) == 6
+    assert sets[0] == {"base": "20", "decay": "8"}
+    assert sets[-1] == {"base": "24", "decay": "10"}
+
+
+@pytest.mark.parametrize("spec", ["base", "base=", "=1,2", "base=,"])
+def test_parse_grid_rejects_malformed(spec):
+    with pytest.raises(ValueError):
+        parse_grid([spec])
+
+
+def test_parse_grid_rejects_duplicates():
+    with pytest.raises(ValueError):
+        parse_grid(["a=1", "a=2"])
+
+
+def test_write_table():
+    result = SweepResult(
+        rows=[
+            SweepRow("fee=30", 310.5, 2.25, 280.0, 12.0, {"fee": "30"}),
+            SweepRow("fee=10", 250.0, math.nan, 300.0, 8.0, {"fee": "10"}),
+        ],
+        param_names=["fee"],
+    )
+    out = io.StringIO()
+    write_table(result, out, delimiter="\t")
+
+    lines = out.getvalue().splitlines()
+    assert lines[0].split("\t") == [
+        "rank", "label", "fee", "mean_edge", "std_error", "mean_normalizer_edge", "mean_pnl",
+    ]
+    assert lines[1].split("\t")[:4] == ["1", "fee=30", "30", "310.5000"]
+    assert lines[2].split("\t")[4] == "nan"
+
+
+def test_sweep_template_ranks_parameter_sets(vanilla_strategy):
+    runner = _runner()
+    result = sweep_template(
+        runner, TEMPLATE, expand_grid({"fee": ["10", "30", "80"]}), vanilla_strategy
+    )
+
+    assert result.param_names == ["fee"]
+    assert sorted(row.label for row in result.rows) == ["fee=10", "fee=30", "fee=80"]
+    assert [row.mean_edge for row in result.rows] == sorted(
+        (row.mean_edge for row in result.rows), reverse=True
+    )
+    # 30 bps via storage matches the vanilla strategy head-to-head
+    head_to_head = runner.run_match(vanilla_strategy, vanilla_strategy)
+    row_30 = next(row for row in result.rows if row.label == "fee=30")
+    assert row_30.mean_edge == pytest.approx(float(head_to_head.total_edge_a) / 3)
+
+
+def test_sweep_sources_reports_failures(vanilla_strategy):
+    runner = _runner()
+    good = TEMPLATE.replace("slots[0], slots[0]", "bpsToWad(30), bpsToWad(30)")
+    result = sweep_sources(
+        runner,
+        {"good.sol": good, "broken.sol": "contract Strategy {"},
+        vanilla_strategy,
+    )
+
+    assert [row.label for row in result.rows] == ["good.sol"]
+    assert "broken.sol" in result.failures
@@ -0,0 +1,131 @@
+"""Tests for market tapes."""
+
+import numpy as np
+import pytest
+import amm_sim_rs
+
+from amm_competition.market.tape import (
+    ENTRY_DTYPE,
+    HEADER_DTYPE,
+    MAGIC,
+    MarketTapeReader,
+    SIDE_BUY,
+    SIDE_SELL,
+)
+
+
+def _aligned(buf: bytearray, data: bytes) -> int:
+    buf.extend(b"\0" * (-len(buf) % 8))
+    offset = len(buf)
+    buf.extend(data)
+    return offset
+
+
+def _write_tape(path, scenarios) -> None:
+    """Write (seed, prices, order_offsets, sides, sizes) tuples in tape format."""
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header["magic"] = MAGIC
+    header["version"] = 1
+    header["n_scenarios"] = len(scenarios)
+    index = np.zeros(len(scenarios), dtype=ENTRY_DTYPE)
+
+    buf = bytearray(header.tobytes() + index.tobytes())
+    for entry, (seed, prices, offsets, sides, sizes) in zip(index, scenarios):
+        entry["seed"] = seed
+        entry["n_steps"] = len(prices)
+        entry["n_orders"] = len(sides)
+        entry["initial_price"] = 100.0
+        entry["retail_buy_prob"] = 0.5
+        entry["prices_at"] = _aligned(buf, np.asarray(prices, "<f8").tobytes())
+        entry["offsets_at"] = _aligned(buf, np.asarray(offsets, "<u4").tobytes())
+        entry["sides_at"] = _aligned(buf, np.asarray(sides, "u1").tobytes())
+        entry["sizes_at"] = _aligned(buf, np.asarray(sizes, "<f8").tobytes())
+    buf[HEADER_DTYPE.itemsize:HEADER_DTYPE.itemsize + index.nbytes] = index.tobytes()
+    path.write_bytes(bytes(buf))
+
+
+def _config(seed: int, n_steps: int = 50) -> amm_sim_rs.SimulationConfig:
+    return amm_sim_rs.SimulationConfig(
+        n_steps=n_steps,
+        initial_price=100.0,
+        initial_x=100.0,
+        initial_y=10000.0,
+        gbm_mu=0.0,
+        gbm_sigma=0.001,
+        gbm_dt=1.0,
+        retail_arrival_rate=5.0,
+        retail_mean_size=2.0,
+        retail_size_sigma=0.7,
+        retail_buy_prob=0.5,
+        seed=seed,
+    )
+
+
+def test_reader_views_scenarios(tmp_path):
+    path = tmp_path / "markets.tape"
+    _write_tape(path, [
+        (7, [100.5, 101.0, 99.5], [0, 2, 2, 3], [SIDE_BUY, SIDE_SELL, SIDE_BUY], [1.5, 2.5, 3.5]),
+        (9, [98.0], [0, 0], [], []),
+    ])
+
+    reader = MarketTapeReader(path)
+
+    assert len(reader) == 2
+    assert reader.seeds == [7, 9]
+    scenario = reader.scenario(7)
+    assert scenario.n_steps == 3
+    assert scenario.initial_price == 100.0
+    np.testing.assert_array_equal(scenario.prices, [100.5, 101.0, 99.5])
+    sides, sizes = scenario.orders(0)
+    np.testing.assert_array_equal(sides, [SIDE_BUY, SIDE_SELL])
+    np.testing.assert_array_equal(sizes, [1.5, 2.5])
+    assert len(scenario.orders(1)[0]) == 0
+    assert [s.seed for s in reader] == [7, 9]
+    assert len(reader.scenario(9).sizes) == 0
+    with pytest.raises(KeyError):
+        reader.scenario(8)
+
+
+def test_reader_rejects_other_files(tmp_path):
+    path = tmp_path / "not.tape"
+    path.write_bytes(b"PK\x03\x04" + b"\0" * 60)
+
+    with pytest.raises(ValueError):
+        MarketTapeReader(path)
+
+
+def test_rust_tape_round_trips_through_reader(tmp_path):
+    configs = [_config(seed) for seed in range(3)]
+    tape = amm_sim_rs.MarketTape.generate(configs)
+    path = tmp_path / "markets.tape"
+    tape.save(str(path))
+
+    reader = MarketTapeReader(path)
+    assert reader.seeds == tape.seeds == [0, 1, 2]
+    assert [int(s.order_offsets[-1]) for s in reader] == tape.n_orders
+    assert all(s.n_steps == 50 for s in reader)
+    assert amm_sim_rs.MarketTape.load(str(path)).seeds == [0, 1, 2]
+
+
+def test_replay_matches_live_run(vanilla_bytecode_and_abi):
+    configs = [_config(seed) for seed in range(4)]
+    tape = amm_sim_rs.MarketTape.generate(configs)
+    pool = amm_sim_rs.SimulationPool(2)
+    bytecode = list(vanilla_bytecode_and_abi[0])
+
+    live = pool.run_batch(bytecode, bytecode, configs, capture_steps=False)
+    replayed = pool.run_batch(bytecode, bytecode, configs, capture_steps=False, tape=tape)
+
+    assert [r.edges for r in replayed.results] == [r.edges for r in live.results]
+    assert [r.pnl for r in replayed.results] == [r.pnl for r in live.results]
+
+
+def test_replay_requires_matching_config(vanilla_bytecode_and_abi):
+    tape = amm_sim_rs.MarketTape.generate([_config(0)])
+    pool = amm_sim_rs.SimulationPool(1)
+    bytecode = list(vanilla_bytecode_and_abi[0])
+
+    with pytest.raises(RuntimeError):
+        pool.run_batch(bytecode, bytecode, [_config(1)], tape=tape)
+    with pytest.raises(RuntimeError):
+        pool.run_batch(bytecode, bytecode, [_config(0, n_steps=60)], tape=tape)